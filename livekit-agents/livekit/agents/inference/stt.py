@@ -4,7 +4,9 @@ import asyncio
 import base64
 import json
 import os
+import struct
 import weakref
+from collections import deque
 from dataclasses import dataclass, replace
 from typing import Any, Literal, TypedDict, Union, overload
 
@@ -81,6 +83,15 @@ DEFAULT_ENCODING: STTEncoding = "pcm_s16le"
 DEFAULT_SAMPLE_RATE: int = 16000
 DEFAULT_BASE_URL = "https://agent-gateway.livekit.cloud/v1"
 
+# Once the gateway acknowledges binary audio in session.created, audio is sent as binary
+# messages: a 1-byte frame type and the little-endian uint32 index of the frame within the
+# session, followed by the raw PCM. Before that, or when the gateway ignores the setting, it's
+# base64 encoded in input_audio JSON messages.
+BINARY_AUDIO_FRAME_TYPE = 0x01
+_BINARY_AUDIO_HEADER = struct.Struct("<BI")
+# audio sent before session.created that is kept to be sent again on a retried connection
+_MAX_UNACKED_AUDIO_FRAMES = 200  # 10s
+
 
 @dataclass
 class STTOptions:
@@ -107,6 +118,7 @@ class STT(stt.STT):
         api_key: NotGivenOr[str] = NOT_GIVEN,
         api_secret: NotGivenOr[str] = NOT_GIVEN,
         http_session: aiohttp.ClientSession | None = None,
+        prewarm_connections: int = 1,
         extra_kwargs: NotGivenOr[CartesiaOptions] = NOT_GIVEN,
     ) -> None: ...
 
@@ -122,6 +134,7 @@ class STT(stt.STT):
         api_key: NotGivenOr[str] = NOT_GIVEN,
         api_secret: NotGivenOr[str] = NOT_GIVEN,
         http_session: aiohttp.ClientSession | None = None,
+        prewarm_connections: int = 1,
         extra_kwargs: NotGivenOr[DeepgramOptions] = NOT_GIVEN,
     ) -> None: ...
 
@@ -137,6 +150,7 @@ class STT(stt.STT):
         api_key: NotGivenOr[str] = NOT_GIVEN,
         api_secret: NotGivenOr[str] = NOT_GIVEN,
         http_session: aiohttp.ClientSession | None = None,
+        prewarm_connections: int = 1,
         extra_kwargs: NotGivenOr[AssemblyaiOptions] = NOT_GIVEN,
     ) -> None: ...
 
@@ -152,6 +166,7 @@ class STT(stt.STT):
         api_key: NotGivenOr[str] = NOT_GIVEN,
         api_secret: NotGivenOr[str] = NOT_GIVEN,
         http_session: aiohttp.ClientSession | None = None,
+        prewarm_connections: int = 1,
         extra_kwargs: NotGivenOr[dict[str, Any]] = NOT_GIVEN,
     ) -> None: ...
 
@@ -166,6 +181,7 @@ class STT(stt.STT):
         api_key: NotGivenOr[str] = NOT_GIVEN,
         api_secret: NotGivenOr[str] = NOT_GIVEN,
         http_session: aiohttp.ClientSession | None = None,
+        prewarm_connections: int = 1,
         extra_kwargs: NotGivenOr[
             dict[str, Any] | CartesiaOptions | DeepgramOptions | AssemblyaiOptions
         ] = NOT_GIVEN,
@@ -181,6 +197,8 @@ class STT(stt.STT):
             api_key (str, optional): LIVEKIT_API_KEY, if not provided, read from environment variable.
             api_secret (str, optional): LIVEKIT_API_SECRET, if not provided, read from environment variable.
             http_session (aiohttp.ClientSession, optional): HTTP session to use.
+            prewarm_connections (int, optional): Number of connections opened by prewarm() and
+                parked until streams adopt them. Defaults to 1.
             extra_kwargs (dict, optional): Extra kwargs to pass to the STT model.
         """
         super().__init__(
@@ -225,7 +243,17 @@ class STT(stt.STT):
         )
 
         self._session = http_session
+        self._prewarm_connections = prewarm_connections
+        # authenticated connections waiting for a stream, the session is created by the stream
+        self._pool = utils.ConnectionPool[aiohttp.ClientWebSocketResponse](
+            connect_cb=self._connect_ws,
+            close_cb=self._close_ws,
+            health_check_cb=self._is_ws_alive,
+            max_session_duration=60,
+        )
         self._streams = weakref.WeakSet[SpeechStream]()
+        # cleared once the gateway rejects binary audio, new connections then use JSON
+        self._binary_audio = True
 
     @classmethod
     def from_model_string(cls, model: str) -> STT:
@@ -257,6 +285,36 @@ class STT(stt.STT):
             self._session = utils.http_context.http_session()
         return self._session
 
+    async def _connect_ws(self, timeout: float) -> aiohttp.ClientWebSocketResponse:
+        base_url = self._opts.base_url
+        if base_url.startswith(("http://", "https://")):
+            base_url = base_url.replace("http", "ws", 1)
+        headers = {
+            "Authorization": f"Bearer {create_access_token(self._opts.api_key, self._opts.api_secret)}"
+        }
+        try:
+            return await asyncio.wait_for(
+                self._ensure_session().ws_connect(f"{base_url}/stt", headers=headers), timeout
+            )
+        except (aiohttp.ClientConnectorError, asyncio.TimeoutError) as e:
+            if isinstance(e, aiohttp.ClientResponseError) and e.status == 429:
+                raise APIStatusError("LiveKit STT quota exceeded", status_code=e.status) from e
+            raise APIConnectionError("failed to connect to LiveKit STT") from e
+
+    async def _close_ws(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        await ws.close()
+
+    async def _is_ws_alive(self, ws: aiohttp.ClientWebSocketResponse) -> bool:
+        # the gateway may have closed an idle connection
+        return not ws.closed and ws.exception() is None
+
+    def prewarm(self) -> None:
+        """Open connections ahead of the first stream, so it doesn't wait for the handshake"""
+        self._pool.prewarm(self._prewarm_connections)
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
+
     async def _recognize_impl(
         self,
         buffer: utils.AudioBuffer,
@@ -308,6 +366,8 @@ class STT(stt.STT):
 
 
 class SpeechStream(stt.SpeechStream):
+    _stt: STT
+
     def __init__(
         self,
         *,
@@ -323,6 +383,13 @@ class SpeechStream(stt.SpeechStream):
         self._reconnect_event = asyncio.Event()
         self._speaking = False
         self._speech_duration: float = 0
+        # kept across connections, so the audio buffered for the next frame isn't lost
+        self._audio_bstream = utils.audio.AudioByteStream(
+            sample_rate=opts.sample_rate,
+            num_channels=1,
+            samples_per_channel=opts.sample_rate // 20,  # 50ms
+        )
+        self._unacked_audio: deque[bytes] = deque(maxlen=_MAX_UNACKED_AUDIO_FRAMES)
 
     def update_options(
         self,
@@ -342,31 +409,53 @@ class SpeechStream(stt.SpeechStream):
         closing_ws = False
 
         @utils.log_exceptions(logger=logger)
-        async def send_task(ws: aiohttp.ClientWebSocketResponse) -> None:
+        async def send_task(
+            ws: aiohttp.ClientWebSocketResponse, binary_audio_fut: asyncio.Future[bool]
+        ) -> None:
             nonlocal closing_ws
 
-            audio_bstream = utils.audio.AudioByteStream(
-                sample_rate=self._opts.sample_rate,
-                num_channels=1,
-                samples_per_channel=self._opts.sample_rate // 20,  # 50ms
-            )
+            # audio sent before session.created is kept, it's sent again on the next
+            # connection if the gateway errors before creating the session
+            unacked_audio = self._unacked_audio
+            self._unacked_audio = deque(maxlen=_MAX_UNACKED_AUDIO_FRAMES)
+            frame_index = 0
+
+            async def _send_audio(frames: list[bytes]) -> None:
+                nonlocal frame_index
+                # JSON until the gateway acknowledges binary audio, so the first frames
+                # don't wait for the session to be created
+                binary_audio = False
+                if binary_audio_fut.done():
+                    self._unacked_audio.clear()
+                    binary_audio = binary_audio_fut.result()
+                else:
+                    self._unacked_audio.extend(frames)
+
+                for data in frames:
+                    if binary_audio:
+                        header = _BINARY_AUDIO_HEADER.pack(BINARY_AUDIO_FRAME_TYPE, frame_index)
+                        await ws.send_bytes(b"".join((header, data)))
+                    else:
+                        base64_audio = base64.b64encode(data).decode("utf-8")
+                        audio_msg = {
+                            "type": "input_audio",
+                            "audio": base64_audio,
+                        }
+                        await ws.send_str(json.dumps(audio_msg))
+                    frame_index += 1
+
+            await _send_audio(list(unacked_audio))
 
             async for ev in self._input_ch:
                 frames: list[rtc.AudioFrame] = []
                 if isinstance(ev, rtc.AudioFrame):
-                    frames.extend(audio_bstream.push(ev.data))
+                    frames.extend(self._audio_bstream.push(ev.data))
                 elif isinstance(ev, self._FlushSentinel):
-                    frames.extend(audio_bstream.flush())
+                    frames.extend(self._audio_bstream.flush())
 
                 for frame in frames:
                     self._speech_duration += frame.duration
-                    audio_bytes = frame.data.tobytes()
-                    base64_audio = base64.b64encode(audio_bytes).decode("utf-8")
-                    audio_msg = {
-                        "type": "input_audio",
-                        "audio": base64_audio,
-                    }
-                    await ws.send_str(json.dumps(audio_msg))
+                await _send_audio([bytes(frame.data) for frame in frames])
 
             closing_ws = True
             finalize_msg = {
@@ -375,7 +464,9 @@ class SpeechStream(stt.SpeechStream):
             await ws.send_str(json.dumps(finalize_msg))
 
         @utils.log_exceptions(logger=logger)
-        async def recv_task(ws: aiohttp.ClientWebSocketResponse) -> None:
+        async def recv_task(
+            ws: aiohttp.ClientWebSocketResponse, binary_audio_fut: asyncio.Future[bool]
+        ) -> None:
             nonlocal closing_ws
             while True:
                 msg = await ws.receive()
@@ -395,7 +486,8 @@ class SpeechStream(stt.SpeechStream):
                 data = json.loads(msg.data)
                 msg_type = data.get("type")
                 if msg_type == "session.created":
-                    pass
+                    if not binary_audio_fut.done():
+                        binary_audio_fut.set_result(data.get("audio_frames") == "binary")
                 elif msg_type == "interim_transcript":
                     self._process_transcript(data, is_final=False)
                 elif msg_type == "final_transcript":
@@ -405,6 +497,15 @@ class SpeechStream(stt.SpeechStream):
                 elif msg_type == "session.closed":
                     pass
                 elif msg_type == "error":
+                    if (
+                        self._stt._binary_audio
+                        and not binary_audio_fut.done()
+                        and "audio_frames" in str(data.get("message", ""))
+                    ):
+                        # the gateway doesn't understand the audio_frames setting, retry the
+                        # connection without it
+                        logger.warning("LiveKit STT rejected binary audio, falling back to JSON")
+                        self._stt._binary_audio = False
                     raise APIError(f"LiveKit STT returned error: {msg.data}")
                 else:
                     logger.warning("received unexpected message from LiveKit STT: %s", data)
@@ -414,9 +515,13 @@ class SpeechStream(stt.SpeechStream):
         while True:
             try:
                 ws = await self._connect_ws()
+                binary_audio_fut = asyncio.Future[bool]()
+                if not self._stt._binary_audio:
+                    binary_audio_fut.set_result(False)
+
                 tasks = [
-                    asyncio.create_task(send_task(ws)),
-                    asyncio.create_task(recv_task(ws)),
+                    asyncio.create_task(send_task(ws, binary_audio_fut)),
+                    asyncio.create_task(recv_task(ws, binary_audio_fut)),
                 ]
                 tasks_group = asyncio.gather(*tasks)
                 wait_reconnect_task = asyncio.create_task(self._reconnect_event.wait())
@@ -459,23 +564,23 @@ class SpeechStream(stt.SpeechStream):
         if self._opts.language:
             params["settings"]["language"] = self._opts.language
 
-        base_url = self._opts.base_url
-        if base_url.startswith(("http://", "https://")):
-            base_url = base_url.replace("http", "ws", 1)
-        headers = {
-            "Authorization": f"Bearer {create_access_token(self._opts.api_key, self._opts.api_secret)}"
-        }
+        if self._stt._binary_audio:
+            params["settings"]["audio_frames"] = "binary"
+
+        # adopt a prewarmed connection when there is one, it's used by this stream only
+        pool = self._stt._pool
+        try:
+            ws = await pool.get(timeout=self._conn_options.timeout)
+        except asyncio.TimeoutError as e:
+            raise APIConnectionError("failed to connect to LiveKit STT") from e
+        pool.detach(ws)
+
         try:
-            ws = await asyncio.wait_for(
-                self._session.ws_connect(f"{base_url}/stt", headers=headers),
-                self._conn_options.timeout,
-            )
             params["type"] = "session.create"
             await ws.send_str(json.dumps(params))
-        except (aiohttp.ClientConnectorError, asyncio.TimeoutError) as e:
-            if isinstance(e, aiohttp.ClientResponseError) and e.status == 429:
-                raise APIStatusError("LiveKit STT quota exceeded", status_code=e.status) from e
-            raise APIConnectionError("failed to connect to LiveKit STT") from e
+        except Exception as e:
+            await ws.close()
+            raise APIConnectionError("failed to send session.create message to LiveKit STT") from e
         return ws
 
     def _process_transcript(self, data: dict, is_final: bool) -> None:
@@ -247,6 +247,7 @@ class TTS(tts.TTS):
         self._pool = utils.ConnectionPool[aiohttp.ClientWebSocketResponse](
             connect_cb=self._connect_ws,
             close_cb=self._close_ws,
+            health_check_cb=self._is_ws_alive,
             max_session_duration=300,
             mark_refreshed_on_get=True,
         )
@@ -320,6 +321,10 @@ class TTS(tts.TTS):
     async def _close_ws(self, ws: aiohttp.ClientWebSocketResponse) -> None:
         await ws.close()
 
+    async def _is_ws_alive(self, ws: aiohttp.ClientWebSocketResponse) -> bool:
+        # the gateway may have closed an idle connection
+        return not ws.closed and ws.exception() is None
+
     def _ensure_session(self) -> aiohttp.ClientSession:
         if not self._session:
             self._session = utils.http_context.http_session()
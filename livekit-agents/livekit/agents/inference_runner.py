@@ -16,6 +16,9 @@ _RunnersDict = dict[str, type["_InferenceRunner"]]
 class _InferenceRunner(ABC, _RunnerMeta):
     registered_runners: _RunnersDict = {}
 
+    SUPPORTS_BATCHING: ClassVar[bool] = False
+    """When True, the inference process coalesces concurrent requests into `run_batch` calls"""
+
     @classmethod
     def register_runner(cls, runner_class: type[_InferenceRunner]) -> None:
         if threading.current_thread() != threading.main_thread():
@@ -33,5 +36,15 @@ class _InferenceRunner(ABC, _RunnerMeta):
 
     @abstractmethod
     def run(self, data: bytes) -> bytes | None:
-        """Run inference on the given data."""
+        """Run inference on the given data.
+
+        Requests are dispatched concurrently, this method may be called from multiple threads
+        at the same time."""
         ...
+
+    def run_batch(self, data: list[bytes]) -> list[bytes | None]:
+        """Run inference on several inputs at once, returning one result per input.
+
+        Only called when `SUPPORTS_BATCHING` is set. Runners that can evaluate multiple inputs
+        in a single model invocation should override this method."""
+        return [self.run(d) for d in data]
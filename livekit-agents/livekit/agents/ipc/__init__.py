@@ -1,21 +1,25 @@
 from . import (
     channel,
     inference_proc_executor,
+    inference_proc_pool,
     job_executor,
     job_proc_executor,
     job_thread_executor,
     proc_pool,
     proto,
+    shm_ring,
 )
 
 __all__ = [
     "channel",
     "inference_proc_executor",
+    "inference_proc_pool",
     "job_executor",
     "job_proc_executor",
     "job_thread_executor",
     "proc_pool",
     "proto",
+    "shm_ring",
 ]
 
 # Cleanup docs of unexported modules
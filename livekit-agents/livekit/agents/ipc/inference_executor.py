@@ -4,4 +4,9 @@ from typing import Protocol
 
 
 class InferenceExecutor(Protocol):
-    async def do_inference(self, method: str, data: bytes) -> bytes | None: ...
+    async def do_inference(
+        self, method: str, data: bytes, *, routing_key: str | None = None
+    ) -> bytes | None:
+        """Run inference on the given data. Requests sharing the same routing_key (e.g. the job
+        id) are sent to the same inference process when possible."""
+        ...
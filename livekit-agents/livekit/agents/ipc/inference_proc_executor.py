@@ -4,16 +4,27 @@ import asyncio
 import contextlib
 import multiprocessing as mp
 import socket
+import time
 from multiprocessing.context import BaseContext
 from typing import Any
 
 from ..inference_runner import _RunnersDict
 from ..log import logger
+from ..telemetry import metrics
 from ..utils import aio, log_exceptions, shortuuid
+from ..utils.aio import duplex_unix
 from . import channel, proto
 from .inference_proc_lazy_main import ProcStartArgs, proc_main
+from .shm_ring import SharedMemoryRing
 from .supervised_proc import SupervisedProc
 
+# smaller payloads aren't worth a shared memory region, they're sent inline
+SHM_MIN_PAYLOAD_SIZE = 64 * 1024
+
+
+class InferenceProcExitedError(RuntimeError):
+    """Raised for the requests still pending when the inference process exits"""
+
 
 class InferenceProcExecutor(SupervisedProc):
     def __init__(
@@ -30,6 +41,10 @@ class InferenceProcExecutor(SupervisedProc):
         mp_ctx: BaseContext,
         loop: asyncio.AbstractEventLoop,
         http_proxy: str | None,
+        batch_window: float = 0.005,
+        max_batch_size: int = 16,
+        shm_size: int = 0,
+        index: int = 0,
     ) -> None:
         super().__init__(
             initialize_timeout=initialize_timeout,
@@ -45,13 +60,25 @@ class InferenceProcExecutor(SupervisedProc):
         )
 
         self._runners = runners
+        self._index = index
+        self._batch_window = batch_window
+        self._max_batch_size = max_batch_size
+        self._shm_size = shm_size
+        self._shm_ring: SharedMemoryRing | None = None
+        self._shm_regions: dict[str, int] = {}  # request_id -> offset in the ring
         self._active_requests: dict[str, asyncio.Future[proto.InferenceResponse]] = {}
 
     def _create_process(self, cch: socket.socket, log_cch: socket.socket) -> mp.Process:
+        if self._shm_size > 0 and self._shm_ring is None:
+            self._shm_ring = SharedMemoryRing(self._shm_size)
+
         proc_args = ProcStartArgs(
             log_cch=log_cch,
             mp_cch=cch,
             runners=self._runners,
+            batch_window=self._batch_window,
+            max_batch_size=self._max_batch_size,
+            shm_name=self._shm_ring.name if self._shm_ring else None,
         )
 
         return self._mp_ctx.Process(  # type: ignore
@@ -64,40 +91,119 @@ class InferenceProcExecutor(SupervisedProc):
     async def _main_task(self, ipc_ch: aio.ChanReceiver[channel.Message]) -> None:
         async for msg in ipc_ch:
             if isinstance(msg, proto.InferenceResponse):
+                # the inference process is done with the request data
+                self._release_shm_region(msg.request_id)
+
                 fut = self._active_requests.pop(msg.request_id, None)
                 if fut is None:
                     logger.warning(
                         "received unexpected inference response",
                         extra={"request_id": msg.request_id},
                     )
-                    return
+                    continue
 
                 with contextlib.suppress(asyncio.InvalidStateError):
                     fut.set_result(msg)
 
-    async def do_inference(self, method: str, data: bytes) -> bytes | None:
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def outstanding_requests(self) -> int:
+        return len(self._active_requests)
+
+    async def do_inference(
+        self, method: str, data: bytes, *, routing_key: str | None = None
+    ) -> bytes | None:
         if not self.started:
             raise RuntimeError("process not started")
 
+        if self._supervise_atask is not None and self._supervise_atask.done():
+            raise InferenceProcExitedError("inference process exited")
+
+        start_time = time.perf_counter()
+
         request_id = shortuuid("inference_req_")
         fut = asyncio.Future[proto.InferenceResponse]()
 
-        await channel.asend_message(
-            self._pch,
-            proto.InferenceRequest(request_id=request_id, method=method, data=data),
-        )
-
+        # requests are answered concurrently, register the future before the response can arrive
         self._active_requests[request_id] = fut
-
-        inf_resp = await fut
+        metrics.inference_queue_depth(proc=self._index, depth=len(self._active_requests))
+        shm_offset: int | None = None
+        if self._shm_ring is not None and len(data) >= SHM_MIN_PAYLOAD_SIZE:
+            # falls back to sending the data inline when the ring is full
+            shm_offset = self._shm_ring.write(data)
+
+        req: channel.Message
+        if shm_offset is not None:
+            # released once the response is received, even if the caller stopped waiting
+            self._shm_regions[request_id] = shm_offset
+            req = proto.SharedMemoryInferenceRequest(
+                request_id=request_id, method=method, offset=shm_offset, length=len(data)
+            )
+        else:
+            req = proto.InferenceRequest(request_id=request_id, method=method, data=data)
+
+        try:
+            try:
+                await channel.asend_message(self._pch, req)
+            except BaseException as e:
+                # no response will release the region of a request that wasn't sent
+                self._release_shm_region(request_id)
+                if isinstance(e, duplex_unix.DuplexClosed):
+                    raise InferenceProcExitedError("inference process exited") from e
+                raise
+
+            inf_resp = await fut
+        finally:
+            self._active_requests.pop(request_id, None)
+            metrics.inference_queue_depth(proc=self._index, depth=len(self._active_requests))
+
+        metrics.inference_completed(
+            proc=self._index,
+            duration=time.perf_counter() - start_time,
+            queue_time=inf_resp.queue_time,
+        )
+        logger.debug(
+            "inference request completed",
+            extra={
+                "method": method,
+                "queue_time": round(inf_resp.queue_time, 4),
+                "batch_size": inf_resp.batch_size,
+            },
+        )
         if inf_resp.error:
             raise RuntimeError(f"inference of {method} failed: {inf_resp.error}")
 
         return inf_resp.data
 
+    def _release_shm_region(self, request_id: str) -> None:
+        shm_offset = self._shm_regions.pop(request_id, None)
+        if shm_offset is not None and self._shm_ring is not None:
+            self._shm_ring.release(shm_offset)
+
+    @log_exceptions(logger=logger)
+    async def _supervise_task(self) -> None:
+        try:
+            await super()._supervise_task()
+        finally:
+            for fut in self._active_requests.values():
+                with contextlib.suppress(asyncio.InvalidStateError):
+                    fut.set_exception(InferenceProcExitedError("inference process exited"))
+
+            self._active_requests.clear()
+            metrics.inference_queue_depth(proc=self._index, depth=0)
+
+            if self._shm_ring is not None:
+                self._shm_regions.clear()
+                self._shm_ring.close()
+                self._shm_ring = None
+
     def logging_extra(self) -> dict[str, Any]:
         extra = super().logging_extra()
         extra["inference"] = True
+        extra["inference_proc"] = self._index
         return extra
 
     def is_alive(self) -> bool:
@@ -14,14 +14,15 @@ import math
 import socket
 import time
 from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-from ..inference_runner import _RunnersDict
+from ..inference_runner import _InferenceRunner, _RunnersDict
 from ..log import logger
 from ..utils import aio, hw, log_exceptions
 from . import proto
 from .channel import Message
 from .proc_client import _ProcClient
+from .shm_ring import SharedMemoryRing
 
 
 @dataclass
@@ -29,12 +30,26 @@ class ProcStartArgs:
     log_cch: socket.socket
     mp_cch: socket.socket
     runners: _RunnersDict
+    batch_window: float = 0.005
+    max_batch_size: int = 16
+    shm_name: str | None = None
+
+
+@dataclass
+class _PendingRequest:
+    msg: proto.InferenceRequest
+    received_at: float = field(default_factory=time.perf_counter)
 
 
 def proc_main(args: ProcStartArgs) -> None:
     from .proc_client import _ProcClient
 
-    inf_proc = _InferenceProc(args.runners)
+    inf_proc = _InferenceProc(
+        args.runners,
+        batch_window=args.batch_window,
+        max_batch_size=args.max_batch_size,
+        shm_name=args.shm_name,
+    )
 
     client = _ProcClient(args.mp_cch, args.log_cch, inf_proc.initialize, inf_proc.entrypoint)
     try:
@@ -46,10 +61,20 @@ def proc_main(args: ProcStartArgs) -> None:
 
 
 class _InferenceProc:
-    def __init__(self, runners: _RunnersDict) -> None:
+    def __init__(
+        self,
+        runners: _RunnersDict,
+        *,
+        batch_window: float = 0.005,
+        max_batch_size: int = 16,
+        shm_name: str | None = None,
+    ) -> None:
         # create an instance of each runner (the ctor must not requires any argument)
         self._runners = {name: runner() for name, runner in runners.items()}
         self._executor = ThreadPoolExecutor(max_workers=math.ceil(hw.get_cpu_monitor().cpu_count()))
+        self._batch_window = batch_window
+        self._max_batch_size = max_batch_size
+        self._shm_ring = SharedMemoryRing(name=shm_name) if shm_name else None
 
     def initialize(self, init_req: proto.InitializeRequest, client: _ProcClient) -> None:
         self._client = client
@@ -77,27 +102,145 @@ class _InferenceProc:
 
     @log_exceptions(logger=logger)
     async def entrypoint(self, cch: aio.ChanReceiver[Message]) -> None:
-        async for msg in cch:
-            if isinstance(msg, proto.InferenceRequest):
-                await self._handle_inference_request(msg)
-
-            if isinstance(msg, proto.ShutdownRequest):
-                await self._client.send(proto.Exiting(reason=msg.reason))
-                break
+        tasks: set[asyncio.Task[None]] = set()
+        batch_chs: dict[str, aio.Chan[_PendingRequest]] = {}
+
+        for method, runner in self._runners.items():
+            if runner.SUPPORTS_BATCHING and self._max_batch_size > 1:
+                batch_chs[method] = aio.Chan[_PendingRequest]()
+                task = asyncio.create_task(
+                    self._batch_task(runner, batch_chs[method], tasks),
+                    name=f"inference_batch_{method}",
+                )
+                tasks.add(task)
 
-    async def _handle_inference_request(self, msg: proto.InferenceRequest) -> None:
+        try:
+            async for msg in cch:
+                if isinstance(msg, proto.SharedMemoryInferenceRequest):
+                    assert self._shm_ring is not None
+                    msg = proto.InferenceRequest(
+                        method=msg.method,
+                        request_id=msg.request_id,
+                        data=self._shm_ring.read(msg.offset, msg.length),
+                    )
+
+                if isinstance(msg, proto.InferenceRequest):
+                    req = _PendingRequest(msg=msg)
+                    if msg.method in batch_chs:
+                        batch_chs[msg.method].send_nowait(req)
+                    else:
+                        # dispatch concurrently, the executor bounds the parallelism
+                        task = asyncio.create_task(self._handle_inference_request(req))
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+
+                if isinstance(msg, proto.ShutdownRequest):
+                    await self._client.send(proto.Exiting(reason=msg.reason))
+                    break
+        finally:
+            for ch in batch_chs.values():
+                ch.close()
+
+            await aio.cancel_and_wait(*tasks)
+
+            if self._shm_ring is not None:
+                self._shm_ring.close()
+
+    async def _batch_task(
+        self,
+        runner: _InferenceRunner,
+        ch: aio.Chan[_PendingRequest],
+        tasks: set[asyncio.Task[None]],
+    ) -> None:
+        async for first_req in ch:
+            batch = [first_req]
+            while len(batch) < self._max_batch_size and not ch.empty():
+                batch.append(ch.recv_nowait())
+
+            if 1 < len(batch) < self._max_batch_size and self._batch_window > 0:
+                # concurrent sessions are sending requests, give the others a chance to join
+                # this batch. A lone request isn't delayed
+                await asyncio.sleep(self._batch_window)
+                while len(batch) < self._max_batch_size and not ch.empty():
+                    batch.append(ch.recv_nowait())
+
+            # don't wait for the batch to complete, the next one can be collected meanwhile
+            task = asyncio.create_task(self._handle_inference_batch(runner, batch))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+    async def _handle_inference_request(self, req: _PendingRequest) -> None:
         loop = asyncio.get_running_loop()
+        msg = req.msg
 
         if msg.method not in self._runners:
             logger.warning("unknown inference method", extra={"method": msg.method})
 
+        queue_time = 0.0
+
+        def _run() -> bytes | None:
+            nonlocal queue_time
+            queue_time = time.perf_counter() - req.received_at
+            return self._runners[msg.method].run(msg.data)
+
         try:
-            data = await loop.run_in_executor(
-                self._executor, self._runners[msg.method].run, msg.data
+            data = await loop.run_in_executor(self._executor, _run)
+            await self._client.send(
+                proto.InferenceResponse(request_id=msg.request_id, data=data, queue_time=queue_time)
             )
-            await self._client.send(proto.InferenceResponse(request_id=msg.request_id, data=data))
         except Exception as e:
             logger.exception("error running inference")
             await self._client.send(
-                proto.InferenceResponse(request_id=msg.request_id, error=str(e))
+                proto.InferenceResponse(
+                    request_id=msg.request_id, error=str(e), queue_time=queue_time
+                )
+            )
+
+    async def _handle_inference_batch(
+        self, runner: _InferenceRunner, batch: list[_PendingRequest]
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        started_at = 0.0
+
+        def _run() -> list[bytes | None]:
+            nonlocal started_at
+            started_at = time.perf_counter()
+            return runner.run_batch([req.msg.data for req in batch])
+
+        try:
+            results = await loop.run_in_executor(self._executor, _run)
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"run_batch returned {len(results)} results for {len(batch)} inputs"
+                )
+        except Exception as e:
+            if len(batch) > 1:
+                # a single invalid input must not fail every request of the batch,
+                # retry them individually so the error is only reported to its sender
+                logger.warning(
+                    "error running batched inference, retrying requests individually",
+                    exc_info=True,
+                    extra={"method": runner.__class__.INFERENCE_METHOD, "batch_size": len(batch)},
+                )
+                await asyncio.gather(*(self._handle_inference_request(req) for req in batch))
+                return
+
+            logger.exception("error running inference")
+            await self._client.send(
+                proto.InferenceResponse(
+                    request_id=batch[0].msg.request_id,
+                    error=str(e),
+                    queue_time=max(started_at - batch[0].received_at, 0.0),
+                )
+            )
+            return
+
+        for req, data in zip(batch, results):
+            await self._client.send(
+                proto.InferenceResponse(
+                    request_id=req.msg.request_id,
+                    data=data,
+                    queue_time=max(started_at - req.received_at, 0.0),
+                    batch_size=len(batch),
+                )
             )
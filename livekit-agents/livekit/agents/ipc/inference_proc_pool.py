@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from multiprocessing.context import BaseContext
+from typing import Literal
+
+from ..inference_runner import _RunnersDict
+from ..log import logger
+from ..telemetry import metrics
+from .inference_proc_executor import InferenceProcExecutor, InferenceProcExitedError
+
+InferenceRoutingStrategy = Literal["least_outstanding", "job_affinity"]
+
+RESTART_BACKOFF = 1.0
+
+
+class InferenceProcPool:
+    """Runs several inference processes and routes each request to one of them.
+
+    With the "job_affinity" strategy, requests sharing a routing key (the job id) always go to
+    the same process so per-session state kept by the runners (e.g. tokenization caches) stays
+    warm. Requests without a routing key, or with the "least_outstanding" strategy, go to the
+    process with the fewest requests in flight. Crashed processes are restarted in the
+    background and their in-flight requests are retried on another process.
+    """
+
+    def __init__(
+        self,
+        *,
+        runners: _RunnersDict,
+        num_processes: int,
+        routing: InferenceRoutingStrategy,
+        initialize_timeout: float,
+        close_timeout: float,
+        memory_warn_mb: float,
+        memory_limit_mb: float,
+        ping_interval: float,
+        ping_timeout: float,
+        high_ping_threshold: float,
+        mp_ctx: BaseContext,
+        loop: asyncio.AbstractEventLoop,
+        http_proxy: str | None,
+        batch_window: float = 0.005,
+        max_batch_size: int = 16,
+        shm_size: int = 0,
+    ) -> None:
+        if num_processes < 1:
+            raise ValueError("num_processes must be at least 1")
+
+        self._runners = runners
+        self._routing = routing
+        self._initialize_timeout = initialize_timeout
+        self._close_timeout = close_timeout
+        self._memory_warn_mb = memory_warn_mb
+        self._memory_limit_mb = memory_limit_mb
+        self._ping_interval = ping_interval
+        self._ping_timeout = ping_timeout
+        self._high_ping_threshold = high_ping_threshold
+        self._mp_ctx = mp_ctx
+        self._loop = loop
+        self._http_proxy = http_proxy
+        self._batch_window = batch_window
+        self._max_batch_size = max_batch_size
+        self._shm_size = shm_size
+
+        self._executors = [self._create_executor(i) for i in range(num_processes)]
+        self._ready = [False] * num_processes
+        self._monitor_tasks: set[asyncio.Task[None]] = set()
+        self._started = False
+        self._closing = False
+
+    @property
+    def processes(self) -> list[InferenceProcExecutor]:
+        return self._executors
+
+    def _create_executor(self, index: int) -> InferenceProcExecutor:
+        return InferenceProcExecutor(
+            runners=self._runners,
+            initialize_timeout=self._initialize_timeout,
+            close_timeout=self._close_timeout,
+            memory_warn_mb=self._memory_warn_mb,
+            memory_limit_mb=self._memory_limit_mb,
+            ping_interval=self._ping_interval,
+            ping_timeout=self._ping_timeout,
+            high_ping_threshold=self._high_ping_threshold,
+            mp_ctx=self._mp_ctx,
+            loop=self._loop,
+            http_proxy=self._http_proxy,
+            batch_window=self._batch_window,
+            max_batch_size=self._max_batch_size,
+            shm_size=self._shm_size,
+            index=index,
+        )
+
+    async def start(self) -> None:
+        if self._started:
+            raise RuntimeError("pool already started")
+
+        self._started = True
+        await asyncio.gather(*[proc.start() for proc in self._executors])
+
+    async def initialize(self) -> None:
+        results = await asyncio.gather(
+            *[proc.initialize() for proc in self._executors], return_exceptions=True
+        )
+
+        if all(isinstance(res, BaseException) for res in results):
+            raise RuntimeError("failed to initialize the inference processes") from results[0]
+
+        for index, res in enumerate(results):
+            if isinstance(res, BaseException):
+                logger.error(
+                    "failed to initialize inference process",
+                    exc_info=res,
+                    extra={"inference_proc": index},
+                )
+            else:
+                self._ready[index] = True
+
+            task = asyncio.create_task(self._monitor_task(index))
+            self._monitor_tasks.add(task)
+            task.add_done_callback(self._monitor_tasks.discard)
+
+    async def _monitor_task(self, index: int) -> None:
+        while True:
+            await self._executors[index].join()
+            self._ready[index] = False
+            if self._closing:
+                return
+
+            logger.warning("inference process exited, restarting", extra={"inference_proc": index})
+            metrics.inference_proc_restarted()
+
+            # never cancelled, an interrupted initialization would leave the process unsupervised
+            proc = self._create_executor(index)
+            self._executors[index] = proc
+            try:
+                await proc.start()
+                await proc.initialize()
+            except Exception:
+                logger.exception(
+                    "failed to restart inference process", extra={"inference_proc": index}
+                )
+                await asyncio.sleep(RESTART_BACKOFF)
+                continue
+
+            if self._closing:
+                await proc.aclose()
+                return
+
+            self._ready[index] = True
+
+    def _pick(self, routing_key: str | None, exclude: set[int]) -> InferenceProcExecutor | None:
+        candidates = [
+            proc
+            for i, proc in enumerate(self._executors)
+            if self._ready[i] and i not in exclude and proc.is_alive()
+        ]
+        if not candidates:
+            return None
+
+        if self._routing == "job_affinity" and routing_key is not None:
+            # rendezvous hashing, only the keys of a dead process move when it is unavailable
+            return max(
+                candidates,
+                key=lambda proc: hashlib.blake2b(
+                    f"{routing_key}:{proc.index}".encode(), digest_size=8
+                ).digest(),
+            )
+
+        return min(candidates, key=lambda proc: proc.outstanding_requests)
+
+    async def do_inference(
+        self, method: str, data: bytes, *, routing_key: str | None = None
+    ) -> bytes | None:
+        if not self._started:
+            raise RuntimeError("pool not started")
+
+        tried: set[int] = set()
+        while (proc := self._pick(routing_key, tried)) is not None:
+            tried.add(proc.index)
+            try:
+                return await proc.do_inference(method, data, routing_key=routing_key)
+            except InferenceProcExitedError:
+                logger.warning(
+                    "inference process exited during a request, retrying on another process",
+                    extra={"inference_proc": proc.index, "method": method},
+                )
+
+        raise RuntimeError("no inference process available")
+
+    def is_alive(self) -> bool:
+        return any(proc.is_alive() for proc in self._executors if proc.started)
+
+    async def aclose(self) -> None:
+        if not self._started:
+            return
+
+        self._closing = True
+        await asyncio.gather(*[proc.aclose() for proc in self._executors])
+        await asyncio.gather(*self._monitor_tasks)
@@ -119,7 +119,10 @@ class _InfClient(InferenceExecutor):
         self._client = proc_client
         self._active_requests: dict[str, asyncio.Future[InferenceResponse]] = {}
 
-    async def do_inference(self, method: str, data: bytes) -> bytes | None:
+    async def do_inference(
+        self, method: str, data: bytes, *, routing_key: str | None = None
+    ) -> bytes | None:
+        # routed by the worker using the id of this job
         request_id = shortuuid("inference_job_")
         fut = asyncio.Future[InferenceResponse]()
 
@@ -215,7 +215,11 @@ class ThreadJobExecutor:
             return
 
         try:
-            inf_res = await self._inference_executor.do_inference(inf_req.method, inf_req.data)
+            inf_res = await self._inference_executor.do_inference(
+                inf_req.method,
+                inf_req.data,
+                routing_key=self._running_job.job.id if self._running_job else None,
+            )
             await channel.asend_message(
                 self._pch,
                 proto.InferenceResponse(request_id=inf_req.request_id, data=inf_res),
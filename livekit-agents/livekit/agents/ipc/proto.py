@@ -176,6 +176,8 @@ class InferenceResponse:
     request_id: str = ""
     data: bytes | None = None
     error: str = ""
+    queue_time: float = 0.0  # time spent waiting in the inference process before running
+    batch_size: int = 1  # number of requests evaluated together with this one
 
     def write(self, b: io.BytesIO) -> None:
         channel.write_string(b, self.request_id)
@@ -183,6 +185,8 @@ class InferenceResponse:
         if self.data is not None:
             channel.write_bytes(b, self.data)
         channel.write_string(b, self.error)
+        channel.write_double(b, self.queue_time)
+        channel.write_int(b, self.batch_size)
 
     def read(self, b: io.BytesIO) -> None:
         self.request_id = channel.read_string(b)
@@ -190,6 +194,32 @@ class InferenceResponse:
         if has_data:
             self.data = channel.read_bytes(b)
         self.error = channel.read_string(b)
+        self.queue_time = channel.read_double(b)
+        self.batch_size = channel.read_int(b)
+
+
+@dataclass
+class SharedMemoryInferenceRequest:
+    """same as InferenceRequest, but the data was written in the shared memory ring of the
+    inference process, only its location is sent over the channel"""
+
+    MSG_ID: ClassVar[int] = 9
+    method: str = ""
+    request_id: str = ""
+    offset: int = 0
+    length: int = 0
+
+    def write(self, b: io.BytesIO) -> None:
+        channel.write_string(b, self.method)
+        channel.write_string(b, self.request_id)
+        channel.write_long(b, self.offset)
+        channel.write_long(b, self.length)
+
+    def read(self, b: io.BytesIO) -> None:
+        self.method = channel.read_string(b)
+        self.request_id = channel.read_string(b)
+        self.offset = channel.read_long(b)
+        self.length = channel.read_long(b)
 
 
 IPC_MESSAGES = {
@@ -202,4 +232,5 @@ IPC_MESSAGES = {
     Exiting.MSG_ID: Exiting,
     InferenceRequest.MSG_ID: InferenceRequest,
     InferenceResponse.MSG_ID: InferenceResponse,
+    SharedMemoryInferenceRequest.MSG_ID: SharedMemoryInferenceRequest,
 }
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from collections import deque
+from multiprocessing import shared_memory
+
+
+class SharedMemoryRing:
+    """Fixed-size shared memory block used as a ring of variable-sized payloads.
+
+    Only the creating process allocates and releases regions, the other side only reads them
+    at the offsets it receives over the IPC channel. Regions can be released out of order, the
+    space is reclaimed once every older region has been released too.
+    """
+
+    def __init__(self, size: int = 0, *, name: str | None = None) -> None:
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self._owner = True
+        else:
+            # child processes share the resource tracker of the worker, so attaching doesn't
+            # register the block twice. the creator is responsible for unlinking it
+            self._shm = shared_memory.SharedMemory(name=name)
+            self._owner = False
+
+        assert self._shm.buf is not None
+        self._buf = self._shm.buf
+        self._size = self._shm.size
+        # offsets of the live regions, in allocation order
+        self._regions: deque[int] = deque()
+        self._lengths: dict[int, int] = {}
+        self._released: set[int] = set()
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def used(self) -> int:
+        return sum(self._lengths.values())
+
+    def write(self, data: bytes) -> int | None:
+        """Copy data into the ring, returns its offset or None when there isn't enough space"""
+        length = len(data)
+        offset = self._allocate(length)
+        if offset is None:
+            return None
+
+        self._buf[offset : offset + length] = data
+        return offset
+
+    def read(self, offset: int, length: int) -> bytes:
+        return bytes(self._buf[offset : offset + length])
+
+    def release(self, offset: int) -> None:
+        if offset not in self._lengths:
+            return
+
+        self._released.add(offset)
+        while self._regions and self._regions[0] in self._released:
+            first = self._regions.popleft()
+            self._released.discard(first)
+            del self._lengths[first]
+
+    def close(self) -> None:
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def _allocate(self, length: int) -> int | None:
+        if length == 0 or length > self._size:
+            return None
+
+        if not self._regions:
+            offset = 0
+        else:
+            first = self._regions[0]
+            last = self._regions[-1]
+            end = last + self._lengths[last]
+            if last >= first:
+                # not wrapped: free space is after the last region and before the first one
+                if self._size - end >= length:
+                    offset = end
+                elif first >= length:
+                    offset = 0
+                else:
+                    return None
+            else:
+                # wrapped: free space is between the last region and the first one
+                if first - end >= length:
+                    offset = end
+                else:
+                    return None
+
+        self._regions.append(offset)
+        self._lengths[offset] = length
+        return offset
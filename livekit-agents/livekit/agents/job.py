@@ -266,6 +266,8 @@ class JobContext:
         if recorder_io:
             if recorder_io.output_path:
                 sr.audio_recording_path = recorder_io.output_path
+            if len(recorder_io.output_paths) > 1:
+                sr.audio_recording_segments = recorder_io.output_paths
             if recorder_io.recording_started_at:
                 sr.audio_recording_started_at = recorder_io.recording_started_at
                 sr.duration = sr.timestamp - sr.audio_recording_started_at
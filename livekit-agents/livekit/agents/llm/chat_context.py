@@ -15,10 +15,10 @@
 from __future__ import annotations
 
 import time
-from collections.abc import Sequence
-from typing import TYPE_CHECKING, Annotated, Any, Literal, Union, overload
+from collections.abc import Iterable, Sequence
+from typing import TYPE_CHECKING, Annotated, Any, Literal, SupportsIndex, Union, overload
 
-from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, TypeAdapter
 from typing_extensions import TypeAlias, TypedDict
 
 from livekit import rtc
@@ -26,6 +26,7 @@ from livekit import rtc
 from .. import utils
 from ..log import logger
 from ..types import NOT_GIVEN, NotGivenOr
+from ..utils.images import FrameEncodeCache
 from ..utils.misc import is_given
 from . import _provider_format
 
@@ -93,8 +94,15 @@ class ImageContent(BaseModel):
     """
     MIME type of the image
     """
+    encode_cache: FrameEncodeCache | None = Field(default=None, exclude=True)
+    """
+    Cache of the video source the rtc.VideoFrame comes from, reuses the encoding of a previous
+    frame when the new one is unchanged (see utils.images.FrameEncodeCache)
+    """
     _cache: dict[Any, Any] = PrivateAttr(default_factory=dict)
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
 
 class AudioContent(BaseModel):
     type: Literal["audio_content"] = Field(default="audio_content")
@@ -208,9 +216,128 @@ ChatItem = Annotated[
 ]
 
 
+class _ChatItemList(list[ChatItem]):
+    """List of chat items with an id index and a sortedness flag, both computed lazily.
+
+    Every mutating method drops the cached state, appends keep it up to date. Items are
+    expected to keep their id and created_at while they are in the list.
+    """
+
+    __slots__ = ("_index", "_index_shared", "_sorted")
+
+    def __init__(self, items: Iterable[ChatItem] = ()) -> None:
+        super().__init__(items)
+        self._index: dict[str, int] | None = None
+        self._index_shared = False  # the index belongs to a snapshot too, don't update it
+        self._sorted: bool | None = None  # sorted by created_at
+
+    def snapshot(self) -> _ChatItemList:
+        """Copy of the list reusing the cached state until either of them is mutated"""
+        items = _ChatItemList(self)
+        if self._index is not None:
+            items._index = self._index
+            items._index_shared = self._index_shared = True
+        items._sorted = self._sorted
+        return items
+
+    def index_of(self, item_id: str) -> int | None:
+        if self._index is None:
+            self._build_index()
+            assert self._index is not None
+
+        idx = self._index.get(item_id)
+        if idx is not None and self[idx].id != item_id:
+            # an item id was changed in place
+            self._build_index()
+            idx = self._index.get(item_id)
+        return idx
+
+    def is_sorted(self) -> bool:
+        if self._sorted is None:
+            self._sorted = all(
+                self[i].created_at <= self[i + 1].created_at for i in range(len(self) - 1)
+            )
+        return self._sorted
+
+    def _build_index(self) -> None:
+        index: dict[str, int] = {}
+        for i, item in enumerate(self):
+            index.setdefault(item.id, i)  # the first item wins, like a linear scan
+        self._index = index
+        self._index_shared = False
+
+    def _invalidate(self) -> None:
+        self._index = None
+        self._index_shared = False
+        self._sorted = None
+
+    def append(self, item: ChatItem) -> None:
+        if self._sorted and self and item.created_at < self[-1].created_at:
+            self._sorted = False
+        super().append(item)
+
+        if self._index is not None:
+            if self._index_shared:
+                self._index = None
+                self._index_shared = False
+            else:
+                self._index.setdefault(item.id, len(self) - 1)
+
+    def insert(self, index: SupportsIndex, item: ChatItem) -> None:
+        super().insert(index, item)
+        self._invalidate()
+
+    def extend(self, items: Iterable[ChatItem]) -> None:
+        super().extend(items)
+        self._invalidate()
+
+    def pop(self, index: SupportsIndex = -1) -> ChatItem:
+        item = super().pop(index)
+        self._invalidate()
+        return item
+
+    def remove(self, item: ChatItem) -> None:
+        super().remove(item)
+        self._invalidate()
+
+    def clear(self) -> None:
+        super().clear()
+        self._invalidate()
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        super().sort(*args, **kwargs)
+        self._invalidate()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._invalidate()
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self._invalidate()
+
+    def __delitem__(self, key: Any) -> None:
+        super().__delitem__(key)
+        self._invalidate()
+
+    def __iadd__(self, items: Iterable[ChatItem]) -> _ChatItemList:  # type: ignore[override,misc]
+        super().__iadd__(items)
+        self._invalidate()
+        return self
+
+    def __imul__(self, n: SupportsIndex) -> _ChatItemList:
+        super().__imul__(n)
+        self._invalidate()
+        return self
+
+
+def _to_item_list(items: list[ChatItem]) -> _ChatItemList:
+    return items if isinstance(items, _ChatItemList) else _ChatItemList(items)
+
+
 class ChatContext:
     def __init__(self, items: NotGivenOr[list[ChatItem]] = NOT_GIVEN):
-        self._items: list[ChatItem] = items if is_given(items) else []
+        self._items: _ChatItemList = _to_item_list(items) if is_given(items) else _ChatItemList()
 
     @classmethod
     def empty(cls) -> ChatContext:
@@ -222,7 +349,7 @@ class ChatContext:
 
     @items.setter
     def items(self, items: list[ChatItem]) -> None:
-        self._items = items
+        self._items = _to_item_list(items)
 
     def add_message(
         self,
@@ -268,10 +395,11 @@ class ChatContext:
             self._items.insert(idx, _item)
 
     def get_by_id(self, item_id: str) -> ChatItem | None:
-        return next((item for item in self.items if item.id == item_id), None)
+        idx = self._items.index_of(item_id)
+        return self._items[idx] if idx is not None else None
 
     def index_by_id(self, item_id: str) -> int | None:
-        return next((i for i, item in enumerate(self.items) if item.id == item_id), None)
+        return self._items.index_of(item_id)
 
     def copy(
         self,
@@ -281,6 +409,14 @@ class ChatContext:
         exclude_empty_message: bool = False,
         tools: NotGivenOr[Sequence[FunctionTool | RawFunctionTool | str | Any]] = NOT_GIVEN,
     ) -> ChatContext:
+        if not (
+            exclude_function_call
+            or exclude_instructions
+            or exclude_empty_message
+            or is_given(tools)
+        ):
+            return ChatContext(self._items.snapshot())
+
         items = []
 
         from .tool_context import (
@@ -492,11 +628,25 @@ class ChatContext:
         """
         Returns the index to insert an item by creation time.
 
-        Iterates in reverse, assuming items are sorted by `created_at`.
-        Finds the position after the last item with `created_at <=` the given timestamp.
+        Finds the position after the last item with `created_at <=` the given timestamp,
+        with a binary search when the items are sorted by `created_at`.
         """
-        for i in reversed(range(len(self._items))):
-            if self._items[i].created_at <= created_at:
+        items = self._items
+        if not items or items[-1].created_at <= created_at:
+            return len(items)
+
+        if items.is_sorted():
+            lo, hi = 0, len(items) - 1
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if items[mid].created_at <= created_at:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            return lo
+
+        for i in reversed(range(len(items))):
+            if items[i].created_at <= created_at:
                 return i + 1
 
         return 0
@@ -573,7 +723,7 @@ class ChatContext:
 
             preserved.append(it)
 
-        self._items = preserved
+        self._items = _to_item_list(preserved)
 
         created_at_hint = (tail[0].created_at - 1e-6) if tail else (head[-1].created_at + 1e-6)
         self.add_message(
@@ -648,13 +798,13 @@ class _ReadOnlyChatContext(ChatContext):
         "please use .copy() and agent.update_chat_ctx() to modify the chat context"
     )
 
-    class _ImmutableList(list[ChatItem]):
+    class _ImmutableList(_ChatItemList):
         def _raise_error(self, *args: Any, **kwargs: Any) -> None:
             logger.error(_ReadOnlyChatContext.error_msg)
             raise RuntimeError(_ReadOnlyChatContext.error_msg)
 
         # override all mutating methods to raise errors
-        append = extend = pop = remove = clear = sort = reverse = _raise_error  # type: ignore
+        append = extend = insert = pop = remove = clear = sort = reverse = _raise_error  # type: ignore
         __setitem__ = __delitem__ = __iadd__ = __imul__ = _raise_error  # type: ignore
 
         def copy(self) -> list[ChatItem]:
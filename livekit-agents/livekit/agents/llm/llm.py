@@ -30,6 +30,7 @@ from ..types import (
 from ..utils import aio
 from .chat_context import ChatContext, ChatRole
 from .tool_context import FunctionTool, RawFunctionTool, ToolChoice
+from .utils import serialize_frames
 
 
 class CompletionUsage(BaseModel):
@@ -183,6 +184,7 @@ class LLMStream(ABC):
     async def _main_task(self) -> None:
         self._llm_request_span = trace.get_current_span()
         self._llm_request_span.set_attribute(trace_types.ATTR_GEN_AI_REQUEST_MODEL, self._llm.model)
+        await serialize_frames(self._chat_ctx)
 
         for i in range(self._conn_options.max_retry + 1):
             try:
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 
-from .chat_context import ChatContext, ChatItem
+from .chat_context import ChatContext, ChatItem, _ReadOnlyChatContext
 
 __all__ = ["RemoteChatContext"]
 
@@ -19,15 +19,37 @@ class RemoteChatContext:
         self._head: _RemoteChatItem | None = None
         self._tail: _RemoteChatItem | None = None
         self._id_to_item: dict[str, _RemoteChatItem] = {}
+        self._version = 0
+        self._snapshot: _ReadOnlyChatContext | None = None
+
+    @property
+    def version(self) -> int:
+        """Incremented by every insert and delete."""
+        return self._version
+
+    def snapshot(self) -> ChatContext:
+        """Read-only ChatContext of the items in order, cached until the next insert or delete.
+
+        The items are shared with the remote context, so in place updates of an item (e.g. an
+        appended transcript) are visible without invalidating the snapshot.
+        """
+        if self._snapshot is None:
+            items: list[ChatItem] = []
+            current_node = self._head
+            while current_node is not None:
+                items.append(current_node.item)
+                current_node = current_node._next
+
+            self._snapshot = _ReadOnlyChatContext(items)
+
+        return self._snapshot
 
     def to_chat_ctx(self) -> ChatContext:
-        items: list[ChatItem] = []
-        current_node = self._head
-        while current_node is not None:
-            items.append(current_node.item)
-            current_node = current_node._next
+        return self.snapshot().copy()
 
-        return ChatContext(items=items)
+    def _invalidate(self) -> None:
+        self._version += 1
+        self._snapshot = None
 
     def get(self, item_id: str) -> _RemoteChatItem | None:
         return self._id_to_item.get(item_id)
@@ -53,6 +75,7 @@ class RemoteChatContext:
 
             self._head = new_node
             self._id_to_item[item_id] = new_node
+            self._invalidate()
             return
 
         prev_node = self._id_to_item.get(previous_item_id)
@@ -70,6 +93,7 @@ class RemoteChatContext:
             self._tail = new_node
 
         self._id_to_item[item_id] = new_node
+        self._invalidate()
 
     def delete(self, item_id: str) -> None:
         node = self._id_to_item.get(item_id)
@@ -96,3 +120,4 @@ class RemoteChatContext:
                 next_node._prev = prev_node
 
         del self._id_to_item[item_id]
+        self._invalidate()
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import bisect
 import inspect
 import sys
 import types
@@ -45,9 +46,52 @@ THINK_TAG_END = "</think>"
 
 
 def _compute_lcs(old_ids: list[str], new_ids: list[str]) -> list[str]:
+    """
+    LCS of the IDs (in order) that appear in both old_ids and new_ids.
+
+    IDs are unique within a context, so this is the longest increasing run of old positions
+    along new_ids, found with patience sorting in O(n log n). When several subsequences are
+    equally long, the one picked by the DP backtrack of _compute_lcs_dp is returned.
+    """
+    if len(set(old_ids)) != len(old_ids) or len(set(new_ids)) != len(new_ids):
+        return _compute_lcs_dp(old_ids, new_ids)
+
+    old_index = {id: i for i, id in enumerate(old_ids)}
+
+    # piles[k] holds the old positions ending an increasing run of length k + 1, in the order
+    # of new_ids. They are decreasing along a pile, stored negated so bisect can search them.
+    piles: list[list[int]] = []
+    tails: list[int] = []  # last old position of each pile
+    for id in new_ids:
+        pos = old_index.get(id)
+        if pos is None:
+            continue
+
+        k = bisect.bisect_left(tails, pos)
+        if k == len(piles):
+            piles.append([])
+            tails.append(pos)
+        else:
+            tails[k] = pos
+        piles[k].append(-pos)
+
+    # walking back from the longest run, the DP backtrack keeps the earliest item of each pile
+    # that comes before the item kept after it, which is the first one with a smaller position
+    lcs_ids: list[str] = []
+    bound = len(old_ids)
+    for pile in reversed(piles):
+        pos = -pile[bisect.bisect_right(pile, -bound)]
+        lcs_ids.append(old_ids[pos])
+        bound = pos
+
+    return list(reversed(lcs_ids))
+
+
+def _compute_lcs_dp(old_ids: list[str], new_ids: list[str]) -> list[str]:
     """
     Standard dynamic-programming LCS to get the common subsequence
     of IDs (in order) that appear in both old_ids and new_ids.
+    Quadratic, only used when the IDs aren't unique.
     """
     n, m = len(old_ids), len(new_ids)
     dp = [[0] * (m + 1) for _ in range(n + 1)]
@@ -180,7 +224,10 @@ def serialize_image(image: ImageContent, *, use_cache: bool = True) -> Serialize
                 height=image.inference_height,
                 strategy="scale_aspect_fit",
             )
-        encoded_data = images.encode(image.image, opts)
+        if image.encode_cache is not None:
+            encoded_data = image.encode_cache.encode(image.image, opts)
+        else:
+            encoded_data = images.encode(image.image, opts)
 
         serialized_image = SerializedImage(
             data_bytes=encoded_data,
@@ -195,6 +242,28 @@ def serialize_image(image: ImageContent, *, use_cache: bool = True) -> Serialize
     return serialized_image
 
 
+async def serialize_frames(chat_ctx: ChatContext) -> None:
+    """Serialize the rtc.VideoFrame images of the chat context in a worker thread, so encoding
+    them doesn't block the event loop when the provider format is built. Errors are left for the
+    provider format to raise."""
+    frames = [
+        content
+        for item in chat_ctx.items
+        if item.type == "message"
+        for content in item.content
+        if isinstance(content, ImageContent)
+        and isinstance(content.image, rtc.VideoFrame)
+        and "serialized_image" not in content._cache
+    ]
+    if not frames:
+        return
+
+    try:
+        await asyncio.to_thread(lambda: [serialize_image(image) for image in frames])
+    except Exception:
+        logger.debug("failed to serialize video frames ahead of the LLM request", exc_info=True)
+
+
 def build_legacy_openai_schema(
     function_tool: FunctionTool, *, internally_tagged: bool = False
 ) -> dict[str, Any]:
@@ -2,7 +2,9 @@ from .base import (
     AgentMetrics,
     EOUMetrics,
     LLMMetrics,
+    PreemptiveGenerationMetrics,
     RealtimeModelMetrics,
+    RecorderMetrics,
     STTMetrics,
     TTSMetrics,
     VADMetrics,
@@ -18,6 +20,8 @@ __all__ = [
     "STTMetrics",
     "TTSMetrics",
     "RealtimeModelMetrics",
+    "PreemptiveGenerationMetrics",
+    "RecorderMetrics",
     "UsageSummary",
     "UsageCollector",
     "log_metrics",
@@ -88,6 +88,53 @@ class EOUMetrics(BaseModel):
     metadata: Metadata | None = None
 
 
+class PreemptiveGenerationMetrics(BaseModel):
+    """Outcome of the preemptive generations started during a user turn."""
+
+    type: Literal["preemptive_generation_metrics"] = "preemptive_generation_metrics"
+    timestamp: float
+    candidates: int
+    """Number of speculative generations started while the user was speaking."""
+    reused: int
+    """Number of transcript updates that kept a running generation instead of restarting it."""
+    cancelled: int
+    """Number of speculative generations cancelled, including the ones that were not used."""
+    used: bool
+    """Whether one of the speculative generations was used as the reply."""
+    completion_tokens: int
+    """Completion tokens of all the speculative generations, the streamed chunks are counted for
+    the generations cancelled before the LLM reported their usage."""
+    wasted_completion_tokens: int
+    """Completion tokens of the speculative generations that were not used."""
+    speech_id: str | None = None
+    """The id of the speech that was used as the reply."""
+    metadata: Metadata | None = None
+
+    @property
+    def wasted_ratio(self) -> float:
+        """Fraction of the completion tokens spent on generations that were not used."""
+        if not self.completion_tokens:
+            return 0.0
+        return self.wasted_completion_tokens / self.completion_tokens
+
+
+class RecorderMetrics(BaseModel):
+    """Progress of the session recording encoder."""
+
+    type: Literal["recorder_metrics"] = "recorder_metrics"
+    timestamp: float
+    encoder_lag: float
+    """Time between the audio being queued and encoded, for the last encoded audio."""
+    max_encoder_lag: float
+    """Highest encoder lag since the recording started."""
+    pending_duration: float
+    """Duration of the audio waiting to be encoded."""
+    encoded_duration: float
+    dropped_duration: float
+    """Duration of the audio dropped because the encoder couldn't keep up."""
+    metadata: Metadata | None = None
+
+
 class RealtimeModelMetrics(BaseModel):
     class CachedTokenDetails(BaseModel):
         audio_tokens: int
@@ -139,4 +186,6 @@ AgentMetrics = Union[
     VADMetrics,
     EOUMetrics,
     RealtimeModelMetrics,
+    PreemptiveGenerationMetrics,
+    RecorderMetrics,
 ]
@@ -3,7 +3,16 @@ from __future__ import annotations
 import logging
 
 from ..log import logger as default_logger
-from .base import AgentMetrics, EOUMetrics, LLMMetrics, RealtimeModelMetrics, STTMetrics, TTSMetrics
+from .base import (
+    AgentMetrics,
+    EOUMetrics,
+    LLMMetrics,
+    PreemptiveGenerationMetrics,
+    RealtimeModelMetrics,
+    RecorderMetrics,
+    STTMetrics,
+    TTSMetrics,
+)
 
 
 def log_metrics(metrics: AgentMetrics, *, logger: logging.Logger | None = None) -> None:
@@ -83,3 +92,26 @@ def log_metrics(metrics: AgentMetrics, *, logger: logging.Logger | None = None)
                 "audio_duration": round(metrics.audio_duration, 2),
             },
         )
+    elif isinstance(metrics, PreemptiveGenerationMetrics):
+        logger.info(
+            "Preemptive generation metrics",
+            extra=metadata
+            | {
+                "candidates": metrics.candidates,
+                "reused": metrics.reused,
+                "cancelled": metrics.cancelled,
+                "used": metrics.used,
+                "wasted_ratio": round(metrics.wasted_ratio, 2),
+            },
+        )
+    elif isinstance(metrics, RecorderMetrics):
+        logger.info(
+            "Recorder metrics",
+            extra=metadata
+            | {
+                "encoder_lag": round(metrics.encoder_lag, 2),
+                "max_encoder_lag": round(metrics.max_encoder_lag, 2),
+                "encoded_duration": round(metrics.encoded_duration, 2),
+                "dropped_duration": round(metrics.dropped_duration, 2),
+            },
+        )
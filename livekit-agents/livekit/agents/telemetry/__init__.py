@@ -1,5 +1,6 @@
 from . import http_server, metrics, trace_types, utils
 from .traces import _setup_cloud_tracer, _upload_session_report, set_tracer_provider, tracer
+from .utils import set_chat_ctx_tracing
 
 __all__ = [
     "tracer",
@@ -7,6 +8,7 @@ __all__ = [
     "trace_types",
     "http_server",
     "set_tracer_provider",
+    "set_chat_ctx_tracing",
     "utils",
     "_setup_cloud_tracer",
     "_upload_session_report",
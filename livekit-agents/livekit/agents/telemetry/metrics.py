@@ -35,6 +35,33 @@ CPU_LOAD_GAUGE = prometheus_client.Gauge(
     ["nodename"],
 )
 
+INFERENCE_QUEUE_DEPTH_GAUGE = prometheus_client.Gauge(
+    "lk_agents_inference_queue_depth",
+    "Inference requests waiting for a response from an inference process",
+    ["nodename", "inference_proc"],
+    multiprocess_mode="livesum",
+)
+
+INFERENCE_DURATION = prometheus_client.Histogram(
+    "lk_agents_inference_duration_seconds",
+    "Round-trip time of inference requests sent to an inference process",
+    ["nodename", "inference_proc"],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5],
+)
+
+INFERENCE_QUEUE_TIME = prometheus_client.Histogram(
+    "lk_agents_inference_queue_duration_seconds",
+    "Time inference requests wait inside an inference process before running",
+    ["nodename", "inference_proc"],
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1],
+)
+
+INFERENCE_PROC_RESTARTS = prometheus_client.Counter(
+    "lk_agents_inference_proc_restarts",
+    "Number of times an inference process was restarted after exiting unexpectedly",
+    ["nodename"],
+)
+
 
 # Note: set_function() is not supported in multiprocess mode.# We need to update this metric explicitly.
 def _update_child_proc_count() -> None:
@@ -61,3 +88,19 @@ def job_ended() -> None:
 
 def proc_initialized(*, time_elapsed: float) -> None:
     PROC_INITIALIZE_TIME.labels(nodename=utils.nodename()).observe(time_elapsed)
+
+
+def inference_queue_depth(*, proc: int, depth: int) -> None:
+    INFERENCE_QUEUE_DEPTH_GAUGE.labels(nodename=utils.nodename(), inference_proc=str(proc)).set(
+        depth
+    )
+
+
+def inference_completed(*, proc: int, duration: float, queue_time: float) -> None:
+    labels = {"nodename": utils.nodename(), "inference_proc": str(proc)}
+    INFERENCE_DURATION.labels(**labels).observe(duration)
+    INFERENCE_QUEUE_TIME.labels(**labels).observe(queue_time)
+
+
+def inference_proc_restarted() -> None:
+    INFERENCE_PROC_RESTARTS.labels(nodename=utils.nodename()).inc()
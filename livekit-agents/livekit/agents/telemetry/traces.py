@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-from collections.abc import Iterator
+import os
+from collections.abc import AsyncIterator, Iterator
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import aiofiles
@@ -357,17 +360,23 @@ async def _upload_session_report(
     part.headers["Content-Length"] = str(len(chat_history_json))
 
     if report.audio_recording_path and report.audio_recording_started_at:
+        # the segments of a segmented recording are uploaded as a chained Ogg stream, read
+        # while the request is sent
+        recording_paths = report.audio_recording_segments or [report.audio_recording_path]
         try:
-            async with aiofiles.open(report.audio_recording_path, "rb") as f:
-                audio_bytes = await f.read()
-        except Exception:
-            audio_bytes = b""
+            audio_size = sum(
+                await asyncio.gather(
+                    *[asyncio.to_thread(os.path.getsize, path) for path in recording_paths]
+                )
+            )
+        except OSError:
+            audio_size = 0
 
-        if audio_bytes:
-            part = mp.append(audio_bytes)
+        if audio_size:
+            part = mp.append(_read_files(recording_paths))
             part.set_content_disposition("form-data", name="audio", filename="recording.ogg")
             part.headers["Content-Type"] = "audio/ogg"
-            part.headers["Content-Length"] = str(len(audio_bytes))
+            part.headers["Content-Length"] = str(audio_size)
             part.headers["Created-At"] = _to_rfc3339(report.audio_recording_started_at)
 
     url = f"https://{cloud_hostname}/observability/recordings/v0"
@@ -381,3 +390,10 @@ async def _upload_session_report(
         resp.raise_for_status()
 
     logger.debug("finished uploading")
+
+
+async def _read_files(paths: list[Path], chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    for path in paths:
+        async with aiofiles.open(path, "rb") as f:
+            while chunk := await f.read(chunk_size):
+                yield chunk
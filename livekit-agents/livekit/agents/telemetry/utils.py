@@ -1,17 +1,136 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import traceback
+import weakref
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Literal
 
 from opentelemetry import trace
 
 from . import trace_types
 
 if TYPE_CHECKING:
+    from ..llm import ChatContext, ChatItem
     from ..metrics import RealtimeModelMetrics
 
 
+ChatCtxTracingMode = Literal["full", "last_n", "hash"]
+
+
+@dataclass
+class _ChatCtxTracingOptions:
+    mode: ChatCtxTracingMode = "full"
+    max_items: int = 20
+
+
+_chat_ctx_tracing = _ChatCtxTracingOptions()
+
+
+def set_chat_ctx_tracing(mode: ChatCtxTracingMode, *, max_items: int = 20) -> None:
+    """Choose how chat contexts are recorded on spans.
+
+    Args:
+        mode: "full" records every item, "last_n" only the last `max_items` items and "hash"
+            only the number of items and a hash of their content.
+        max_items: number of items recorded with "last_n".
+    """
+    if max_items < 1:
+        raise ValueError("max_items must be at least 1")
+
+    _chat_ctx_tracing.mode = mode
+    _chat_ctx_tracing.max_items = max_items
+
+
+_SCALAR_TYPES = (str, int, float, bool, bytes, type(None))
+
+
+def _fingerprint(value: Any) -> Any:
+    # shallow snapshot of a field, compared to detect items mutated since they were serialized.
+    # objects that can't be compared cheaply are compared by identity
+    if type(value) in _SCALAR_TYPES:
+        return value
+    if isinstance(value, list):
+        return tuple([_fingerprint(v) for v in value]) if value else ()
+    if isinstance(value, dict):
+        return tuple([(k, _fingerprint(v)) for k, v in value.items()]) if value else ()
+    return id(value)
+
+
+class _ChatItemJSONCache:
+    """Serialized chat items, reused across turns for as long as the items are alive"""
+
+    def __init__(self) -> None:
+        self._entries: dict[int, tuple[weakref.ref[ChatItem], Any, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, item: ChatItem) -> str:
+        key = id(item)
+        fingerprint = tuple([_fingerprint(v) for v in item.__dict__.values()])
+        entry = self._entries.get(key)
+        if entry is not None and entry[0]() is item and entry[1] == fingerprint:
+            return entry[2]
+
+        dumped = item
+        if item.type == "message":
+            # same filtering as ChatContext.to_dict(exclude_audio=True, exclude_image=True)
+            from ..llm import AudioContent, ImageContent
+
+            dumped = item.model_copy()
+            dumped.content = [
+                c for c in item.content if not isinstance(c, (ImageContent, AudioContent))
+            ]
+
+        data = json.dumps(dumped.model_dump(mode="json", exclude_none=True, exclude_defaults=False))
+        self._entries[key] = (weakref.ref(item, self._on_collected(key)), fingerprint, data)
+        return data
+
+    def _on_collected(self, key: int) -> Any:
+        def _remove(ref: weakref.ref[ChatItem]) -> None:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is ref:
+                del self._entries[key]
+
+        return _remove
+
+
+_chat_item_cache = _ChatItemJSONCache()
+
+
+def record_chat_ctx(
+    span: trace.Span, chat_ctx: ChatContext, *, attribute: str = trace_types.ATTR_CHAT_CTX
+) -> None:
+    """Record the chat context on the span, only serialized when the span is recording.
+
+    Items are serialized like `ChatContext.to_dict(exclude_audio=True, exclude_image=True,
+    exclude_timestamp=False)` and cached, so only the items added or modified since the
+    previous turn are serialized again.
+    """
+    if not span.is_recording():
+        return
+
+    items = chat_ctx.items
+    opts = _chat_ctx_tracing
+    if opts.mode == "hash":
+        h = hashlib.blake2b(digest_size=16)
+        for item in items:
+            h.update(_chat_item_cache.get(item).encode())
+        value = json.dumps({"items_count": len(items), "hash": h.hexdigest()})
+    elif opts.mode == "last_n" and len(items) > opts.max_items:
+        parts = [_chat_item_cache.get(item) for item in items[-opts.max_items :]]
+        omitted = len(items) - opts.max_items
+        value = f'{{"items": [{", ".join(parts)}], "omitted_items": {omitted}}}'
+    else:
+        parts = [_chat_item_cache.get(item) for item in items]
+        value = f'{{"items": [{", ".join(parts)}]}}'
+
+    span.set_attribute(attribute, value)
+
+
 def record_exception(span: trace.Span, exception: Exception) -> None:
     span.record_exception(exception)
     span.set_status(trace.Status(trace.StatusCode.ERROR, str(exception)))
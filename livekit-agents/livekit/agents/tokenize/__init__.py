@@ -1,5 +1,5 @@
 from . import basic, blingfire, utils
-from .token_stream import BufferedSentenceStream, BufferedWordStream
+from .token_stream import BufferedSentenceStream, BufferedWordStream, IncrementalTokenizer
 from .tokenizer import (
     SentenceStream,
     SentenceTokenizer,
@@ -16,6 +16,7 @@ __all__ = [
     "TokenData",
     "BufferedSentenceStream",
     "BufferedWordStream",
+    "IncrementalTokenizer",
     "basic",
     "blingfire",
     "utils",
@@ -1,12 +1,15 @@
 import re
 
+# every sentence boundary is right after one of these characters (or a newline when retaining the
+# format)
+_STOP_CHARS_RE = re.compile(r"[.!?。！？]")
+
 
 # rule based segmentation based on https://stackoverflow.com/a/31505798, works surprisingly well
-def split_sentences(
-    text: str, min_sentence_len: int = 20, retain_format: bool = False
-) -> list[tuple[str, int, int]]:
+def _split_on_stops(text: str, retain_format: bool) -> list[str]:
     """
-    the text may not contain substrings "<prd>" or "<stop>"
+    split the text at every end of sentence punctuation, the parts have the same total length as
+    the text. the text may not contain substrings "<prd>" or "<stop>"
     """
     alphabets = r"([A-Za-z])"
     prefixes = r"(Mr|St|Mrs|Ms|Dr)[.]"
@@ -49,8 +52,30 @@ def split_sentences(
 
     if retain_format:
         text = text.replace("<nel>", "\n")
-    splitted_sentences = text.split("<stop>")
-    text = text.replace("<stop>", "")
+    return text.split("<stop>")
+
+
+def find_boundaries(text: str, retain_format: bool = False) -> list[int]:
+    """offsets of the sentence boundaries found in the text, not counting the end of the text"""
+    if not _STOP_CHARS_RE.search(text) and not (retain_format and "\n" in text):
+        return []
+
+    boundaries = []
+    offset = 0
+    for part in _split_on_stops(text, retain_format)[:-1]:
+        offset += len(part)
+        boundaries.append(offset)
+
+    return boundaries
+
+
+def split_sentences(
+    text: str, min_sentence_len: int = 20, retain_format: bool = False
+) -> list[tuple[str, int, int]]:
+    """
+    the text may not contain substrings "<prd>" or "<stop>"
+    """
+    splitted_sentences = _split_on_stops(text, retain_format)
 
     sentences: list[tuple[str, int, int]] = []
 
@@ -59,10 +59,15 @@ class SentenceTokenizer(tokenizer.SentenceTokenizer):
 
     def stream(self, *, language: str | None = None) -> tokenizer.SentenceStream:
         return token_stream.BufferedSentenceStream(
-            tokenizer=functools.partial(
-                _basic_sent.split_sentences,
-                min_sentence_len=self._config.min_sentence_len,
-                retain_format=self._config.retain_format,
+            tokenizer=token_stream.ScanningTokenizer(
+                tokenize_fnc=functools.partial(
+                    _basic_sent.split_sentences,
+                    min_sentence_len=self._config.min_sentence_len,
+                    retain_format=self._config.retain_format,
+                ),
+                find_boundaries_fnc=functools.partial(
+                    _basic_sent.find_boundaries, retain_format=self._config.retain_format
+                ),
             ),
             min_token_len=self._config.min_sentence_len,
             min_ctx_len=self._config.stream_context_len,
@@ -43,6 +43,17 @@ def _split_sentences(
     return merged_sentences
 
 
+def _find_boundaries(text: str, *, retain_format: bool = False) -> list[int]:
+    _, offsets = blingfire.text_to_sentences_with_offsets(text)
+    boundaries = [end for _, end in offsets]
+    # the last sentence ends with the text, except for the trailing whitespace which is kept as
+    # its own token when retaining the format
+    if boundaries and (not retain_format or boundaries[-1] == len(text)):
+        boundaries.pop()
+
+    return boundaries
+
+
 @dataclass
 class _TokenizerOptions:
     min_sentence_len: int
@@ -76,10 +87,15 @@ class SentenceTokenizer(tokenizer.SentenceTokenizer):
 
     def stream(self, *, language: str | None = None) -> tokenizer.SentenceStream:
         return token_stream.BufferedSentenceStream(
-            tokenizer=functools.partial(
-                _split_sentences,
-                min_sentence_len=self._config.min_sentence_len,
-                retain_format=self._config.retain_format,
+            tokenizer=token_stream.ScanningTokenizer(
+                tokenize_fnc=functools.partial(
+                    _split_sentences,
+                    min_sentence_len=self._config.min_sentence_len,
+                    retain_format=self._config.retain_format,
+                ),
+                find_boundaries_fnc=functools.partial(
+                    _find_boundaries, retain_format=self._config.retain_format
+                ),
             ),
             min_token_len=self._config.min_sentence_len,
             min_ctx_len=self._config.stream_context_len,
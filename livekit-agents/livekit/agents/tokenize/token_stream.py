@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import typing
+from abc import ABC, abstractmethod
 from typing import Callable, Union
 
 from ..utils import aio, shortuuid
@@ -10,49 +10,153 @@ from .tokenizer import SentenceStream, TokenData, WordStream
 # If the start and end indices are not available, we attempt to locate the token within the text using str.find.  # noqa: E501
 TokenizeCallable = Callable[[str], Union[list[str], list[tuple[str, int, int]]]]
 
+# Offsets of the token boundaries found in the text, used to know when the text must be tokenized again  # noqa: E501
+FindBoundariesCallable = Callable[[str], list[int]]
+
+
+class IncrementalTokenizer(ABC):
+    """Tokenizer fed with the text of a stream as it arrives.
+
+    Tokens are only taken out of the buffer once they are followed by another token, the rest of
+    the text stays buffered until more text is pushed or the tokenizer is flushed.
+    """
+
+    @abstractmethod
+    def push_text(self, text: str) -> None: ...
+
+    @abstractmethod
+    def pop_token(self) -> str | None:
+        """Remove and return the first buffered token, if it's complete"""
+
+    @abstractmethod
+    def flush(self) -> list[str]:
+        """Return the tokens left in the buffer and clear it"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Length of the buffered text"""
+
+
+class _FullBufferTokenizer(IncrementalTokenizer):
+    """Tokenizes the whole buffered text every time a token is requested"""
+
+    def __init__(self, tokenize_fnc: TokenizeCallable) -> None:
+        self._tokenize_fnc = tokenize_fnc
+        self._buf = ""
+
+    def push_text(self, text: str) -> None:
+        self._buf += text
+
+    def pop_token(self) -> str | None:
+        tokens = self._tokenize_fnc(self._buf)
+        if len(tokens) <= 1:
+            return None
+
+        tok = tokens[0]
+        if isinstance(tok, tuple):
+            self._buf = self._buf[tok[2] :]
+            return tok[0]
+
+        tok_i = max(self._buf.find(tok), 0)
+        self._buf = self._buf[tok_i + len(tok) :].lstrip()
+        return tok
+
+    def flush(self) -> list[str]:
+        tokens = self._tokenize_fnc(self._buf)
+        self._buf = ""
+        return [tok[0] if isinstance(tok, tuple) else tok for tok in tokens]
+
+    def __len__(self) -> int:
+        return len(self._buf)
+
+
+class ScanningTokenizer(_FullBufferTokenizer):
+    """Only tokenizes the buffered text again when a new boundary shows up near its end.
+
+    Without a boundary, the tokens of the buffer can't change, so a long sentence streamed in
+    small pieces is scanned once instead of after every piece. Boundaries are searched in a
+    window around the end of the buffer, find_boundaries_fnc must only depend on nearby text.
+    """
 
-class BufferedTokenStream:
     def __init__(
         self,
         *,
         tokenize_fnc: TokenizeCallable,
+        find_boundaries_fnc: FindBoundariesCallable,
+        lookbehind: int = 32,
+        lookahead: int = 16,
+    ) -> None:
+        super().__init__(tokenize_fnc)
+        self._find_boundaries_fnc = find_boundaries_fnc
+        self._lookbehind = lookbehind
+        self._lookahead = lookahead
+        # boundaries before this offset are settled and were already seen by the tokenizer
+        self._scanned = 0
+        self._dirty = False
+
+    def push_text(self, text: str) -> None:
+        super().push_text(text)
+
+        window_start = max(self._scanned - self._lookbehind, 0)
+        boundaries = self._find_boundaries_fnc(self._buf[window_start:])
+        if any(window_start + b >= self._scanned for b in boundaries):
+            self._dirty = True
+
+        # trailing whitespace doesn't settle a boundary, the next token may not have started yet
+        self._scanned = max(self._scanned, len(self._buf.rstrip()) - self._lookahead)
+
+    def pop_token(self) -> str | None:
+        if not self._dirty:
+            return None
+
+        buf_len = len(self._buf)
+        tok = super().pop_token()
+        if tok is None:
+            self._dirty = False
+            return None
+
+        self._scanned = max(self._scanned - (buf_len - len(self._buf)), 0)
+        return tok
+
+    def flush(self) -> list[str]:
+        self._scanned = 0
+        self._dirty = False
+        return super().flush()
+
+
+class BufferedTokenStream:
+    def __init__(
+        self,
+        *,
+        tokenize_fnc: TokenizeCallable | IncrementalTokenizer,
         min_token_len: int,
         min_ctx_len: int,
         retain_format: bool = False,
     ) -> None:
         self._event_ch = aio.Chan[TokenData]()
-        self._tokenize_fnc = tokenize_fnc
+        if not isinstance(tokenize_fnc, IncrementalTokenizer):
+            tokenize_fnc = _FullBufferTokenizer(tokenize_fnc)
+
+        self._tokenizer = tokenize_fnc
         self._min_ctx_len = min_ctx_len
         self._min_token_len = min_token_len
         self._retain_format = retain_format
         self._current_segment_id = shortuuid()
 
-        self._buf_tokens: list[str] = []  # <= min_token_len
-        self._in_buf = ""
         self._out_buf = ""
 
-    @typing.no_type_check
     def push_text(self, text: str) -> None:
         self._check_not_closed()
-        self._in_buf += text
+        self._tokenizer.push_text(text)
 
-        if len(self._in_buf) < self._min_ctx_len:
+        if len(self._tokenizer) < self._min_ctx_len:
             return
 
-        while True:
-            tokens = self._tokenize_fnc(self._in_buf)
-            if len(tokens) <= 1:
-                break
-
+        while (tok := self._tokenizer.pop_token()) is not None:
             if self._out_buf:
                 self._out_buf += " "
 
-            tok = tokens.pop(0)
-            tok_text = tok
-            if isinstance(tok, tuple):
-                tok_text = tok[0]
-
-            self._out_buf += tok_text
+            self._out_buf += tok
             if len(self._out_buf) >= self._min_token_len:
                 self._event_ch.send_nowait(
                     TokenData(token=self._out_buf, segment_id=self._current_segment_id)
@@ -60,26 +164,16 @@ class BufferedTokenStream:
 
                 self._out_buf = ""
 
-            if isinstance(tok, tuple):
-                self._in_buf = self._in_buf[tok[2] :]
-            else:
-                tok_i = max(self._in_buf.find(tok), 0)
-                self._in_buf = self._in_buf[tok_i + len(tok) :].lstrip()
-
-    @typing.no_type_check
     def flush(self) -> None:
         self._check_not_closed()
 
-        if self._in_buf or self._out_buf:
-            tokens = self._tokenize_fnc(self._in_buf)
+        if len(self._tokenizer) or self._out_buf:
+            tokens = self._tokenizer.flush()
             if tokens:
                 if self._out_buf:
                     self._out_buf += " "
 
-                if isinstance(tokens[0], tuple):
-                    self._out_buf += " ".join([tok[0] for tok in tokens])
-                else:
-                    self._out_buf += " ".join(tokens)
+                self._out_buf += " ".join(tokens)
 
             if self._out_buf:
                 self._event_ch.send_nowait(
@@ -87,7 +181,6 @@ class BufferedTokenStream:
                 )
 
         self._current_segment_id = shortuuid()
-        self._in_buf = ""
         self._out_buf = ""
 
     def end_input(self) -> None:
@@ -113,7 +206,7 @@ class BufferedSentenceStream(BufferedTokenStream, SentenceStream):
     def __init__(
         self,
         *,
-        tokenizer: TokenizeCallable,
+        tokenizer: TokenizeCallable | IncrementalTokenizer,
         min_token_len: int,
         min_ctx_len: int,
     ) -> None:
@@ -128,7 +221,7 @@ class BufferedWordStream(BufferedTokenStream, WordStream):
     def __init__(
         self,
         *,
-        tokenizer: TokenizeCallable,
+        tokenizer: TokenizeCallable | IncrementalTokenizer,
         min_token_len: int,
         min_ctx_len: int,
     ) -> None:
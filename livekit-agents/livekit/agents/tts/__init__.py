@@ -1,3 +1,9 @@
+from .cache_adapter import (
+    CacheAdapter,
+    CacheAdapterStats,
+    CacheChunkedStream,
+    CacheSynthesizeStream,
+)
 from .fallback_adapter import (
     AvailabilityChangedEvent,
     FallbackAdapter,
@@ -28,6 +34,10 @@ __all__ = [
     "FallbackAdapter",
     "FallbackChunkedStream",
     "FallbackSynthesizeStream",
+    "CacheAdapter",
+    "CacheAdapterStats",
+    "CacheChunkedStream",
+    "CacheSynthesizeStream",
     "AudioEmitter",
     "TTSError",
     "SentenceStreamPacer",
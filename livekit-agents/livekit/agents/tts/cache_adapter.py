@@ -0,0 +1,748 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import enum
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, ClassVar, Literal
+
+import av
+import numpy as np
+
+from .. import utils
+from ..log import logger
+from ..types import (
+    DEFAULT_API_CONNECT_OPTIONS,
+    NOT_GIVEN,
+    USERDATA_TIMED_TRANSCRIPT,
+    APIConnectOptions,
+    NotGiven,
+)
+from ..utils import aio
+from ..utils.aio.channel import ChanEmpty
+from .tts import (
+    TTS,
+    AudioEmitter,
+    ChunkedStream,
+    SynthesizedAudio,
+    SynthesizeStream,
+    TTSCapabilities,
+)
+
+# already a retry mechanism in the wrapped TTS, don't retry in the cache adapter
+DEFAULT_CACHE_ADAPTER_API_CONNECT_OPTIONS = APIConnectOptions(
+    max_retry=0, timeout=DEFAULT_API_CONNECT_OPTIONS.timeout
+)
+
+CacheFormat = Literal["pcm", "opus"]
+
+_FILE_SUFFIX = ".lktts"
+_FILE_MAGIC = b"LKTC"
+_FILE_VERSION = 1
+_FILE_HEADER = struct.Struct("<4sBI")  # magic, version, metadata length
+_OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+_REPLAY_CHUNK_DURATION = 0.1
+# the other processes sharing cache_dir are only seen when it is scanned again
+_DISK_RESCAN_INTERVAL = 30.0
+# option fields that would only fragment the cache (or shouldn't end up in a cache key)
+_IGNORED_OPTION_FIELDS = ("api_key", "api_secret", "token", "base_url", "ws_url", "http_session")
+
+
+@dataclass
+class CacheAdapterStats:
+    """Counters of a CacheAdapter, see CacheAdapter.stats."""
+
+    hits: int = 0
+    misses: int = 0
+    stored: int = 0
+    evicted: int = 0
+    """entries removed to stay within the memory or disk budget"""
+    expired: int = 0
+    """entries older than the ttl, counted as misses"""
+    memory_bytes: int = 0
+    disk_bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CacheAdapter(TTS):
+    """
+    Caches the synthesized audio of a TTS, so repeated phrases (greetings, hold messages,
+    disclaimers) are replayed instead of synthesized again.
+
+    Entries are keyed on the provider, model, voice options, sample rate and the text with
+    whitespace normalized. Recently used entries are kept in memory, and written to
+    `cache_dir` when given. Files there are memory-mapped when read back, so the worker
+    processes sharing a cache_dir share both the files and the pages holding them.
+
+    synthesize() is always cached. With stream(), only text pushed all at once (e.g.
+    session.say(text)) is looked up and stored, text streamed from the LLM goes straight to the
+    wrapped TTS.
+    """
+
+    def __init__(
+        self,
+        tts: TTS,
+        *,
+        cache_dir: str | Path | None = None,
+        format: CacheFormat = "pcm",
+        max_memory_bytes: int = 32 * 1024 * 1024,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+        ttl: float | None = None,
+        voice_key: Callable[[TTS], Any] | None = None,
+    ) -> None:
+        """
+        Initialize a CacheAdapter wrapping a TTS.
+
+        Args:
+            tts (TTS): The TTS to cache.
+            cache_dir (str | Path | None, optional): Directory persisting the cache across processes and restarts. If None, the cache is only kept in memory.
+            format (CacheFormat, optional): "pcm" replays without any decoding, "opus" takes about a tenth of the space but is decoded on every hit. Defaults to "pcm".
+            max_memory_bytes (int, optional): Budget of the encoded audio kept in memory. Defaults to 32MB.
+            max_disk_bytes (int, optional): Budget of the files in cache_dir, shared by the processes using it, the least recently used are removed first. The files of the other processes are counted when the directory is scanned again, once this process crosses the budget or at most every 30s. Defaults to 512MB.
+            ttl (float | None, optional): Seconds after which an entry is synthesized again. Defaults to None, entries never expire.
+            voice_key (Callable[[TTS], Any] | None, optional): Returns the voice options of the wrapped TTS, as a JSON serializable value, to include in the cache key. Defaults to the fields of the plugin options dataclass (`tts._opts`), without credentials and URLs.
+        """  # noqa: E501
+        if format not in ("pcm", "opus"):
+            raise ValueError("format must be 'pcm' or 'opus'")
+
+        super().__init__(
+            capabilities=TTSCapabilities(
+                streaming=tts.capabilities.streaming,
+                aligned_transcript=tts.capabilities.aligned_transcript,
+            ),
+            sample_rate=tts.sample_rate,
+            num_channels=tts.num_channels,
+        )
+        self._wrapped_tts = tts
+        self._format: CacheFormat = format
+        self._voice_key = voice_key or _default_voice_key
+        self._cache = _AudioCache(
+            cache_dir=Path(cache_dir) if cache_dir is not None else None,
+            max_memory_bytes=max_memory_bytes,
+            max_disk_bytes=max_disk_bytes,
+            ttl=ttl,
+        )
+        self._store_tasks: set[asyncio.Task[None]] = set()
+
+        self._wrapped_tts.on("metrics_collected", self._on_metrics_collected)
+
+    @property
+    def model(self) -> str:
+        return self._wrapped_tts.model
+
+    @property
+    def provider(self) -> str:
+        return self._wrapped_tts.provider
+
+    @property
+    def stats(self) -> CacheAdapterStats:
+        """A snapshot of the hit/miss counters and of the cache size."""
+        return self._cache.stats()
+
+    def synthesize(
+        self, text: str, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS
+    ) -> CacheChunkedStream:
+        return CacheChunkedStream(tts=self, input_text=text, conn_options=conn_options)
+
+    def stream(
+        self, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS
+    ) -> CacheSynthesizeStream:
+        if not self._wrapped_tts.capabilities.streaming:
+            return super().stream(conn_options=conn_options)  # type: ignore[return-value]
+
+        return CacheSynthesizeStream(tts=self, conn_options=conn_options)
+
+    async def populate(
+        self,
+        phrases: Iterable[str],
+        *,
+        conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS,
+    ) -> None:
+        """Synthesize and store the phrases that aren't cached yet.
+
+        Meant for the phrases known ahead of time, e.g. from a prewarm/setup function. With a
+        cache_dir, they are then available to every process using the same directory.
+        """
+        for phrase in phrases:
+            if not (key := self._cache_key(phrase)):
+                continue
+
+            if await self._cache.get(key, count=False) is not None:
+                continue
+
+            recording = _Recording()
+            async with self._wrapped_tts.synthesize(phrase, conn_options=conn_options) as stream:
+                async for audio in stream:
+                    recording.add(audio)
+
+            await self._store(key, recording)
+
+    def prewarm(self) -> None:
+        self._wrapped_tts.prewarm()
+
+    def _cache_key(self, text: str) -> str | None:
+        if not (text := " ".join(text.split())):
+            return None
+
+        key = json.dumps(
+            [
+                self._wrapped_tts.provider,
+                self._wrapped_tts.model,
+                self._wrapped_tts.label,
+                self.sample_rate,
+                self.num_channels,
+                self._voice_key(self._wrapped_tts),
+                self._format,
+                text,
+            ],
+            default=repr,
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _store_in_background(self, key: str, recording: _Recording) -> None:
+        task = asyncio.create_task(self._store(key, recording))
+        self._store_tasks.add(task)
+        task.add_done_callback(self._store_tasks.discard)
+
+    async def _store(self, key: str, recording: _Recording) -> None:
+        if not recording.pcm:
+            return
+
+        try:
+            entry = await asyncio.to_thread(
+                _CacheEntry.encode,
+                recording,
+                format=self._format,
+                sample_rate=self.sample_rate,
+                num_channels=self.num_channels,
+            )
+            await self._cache.put(key, entry)
+        except Exception:
+            logger.exception("failed to store synthesized audio in the tts cache")
+
+    def _on_metrics_collected(self, *args: Any, **kwargs: Any) -> None:
+        self.emit("metrics_collected", *args, **kwargs)
+
+    async def aclose(self) -> None:
+        if self._store_tasks:
+            await asyncio.gather(*self._store_tasks, return_exceptions=True)
+
+        self._wrapped_tts.off("metrics_collected", self._on_metrics_collected)
+
+
+class CacheChunkedStream(ChunkedStream):
+    _tts_request_span_name: ClassVar[str] = "tts_cache_adapter"
+
+    def __init__(
+        self, *, tts: CacheAdapter, input_text: str, conn_options: APIConnectOptions
+    ) -> None:
+        super().__init__(
+            tts=tts,
+            input_text=input_text,
+            conn_options=DEFAULT_CACHE_ADAPTER_API_CONNECT_OPTIONS,
+        )
+        self._cache_adapter = tts
+        self._wrapped_tts_conn_options = conn_options
+
+    async def _metrics_monitor_task(self, event_aiter: AsyncIterable[SynthesizedAudio]) -> None:
+        pass  # do nothing, metrics are forwarded from the wrapped TTS
+
+    async def _run(self, output_emitter: AudioEmitter) -> None:
+        output_emitter.initialize(
+            request_id=utils.shortuuid(),
+            sample_rate=self._cache_adapter.sample_rate,
+            num_channels=self._cache_adapter.num_channels,
+            mime_type="audio/pcm",
+        )
+
+        key = self._cache_adapter._cache_key(self._input_text)
+        if key is not None and (entry := await self._cache_adapter._cache.get(key)) is not None:
+            await _replay(entry, output_emitter)
+            return
+
+        recording = _Recording()
+        async with self._cache_adapter._wrapped_tts.synthesize(
+            self._input_text, conn_options=self._wrapped_tts_conn_options
+        ) as stream:
+            async for audio in stream:
+                recording.push_to(audio, output_emitter)
+
+        output_emitter.flush()
+        if key is not None:
+            self._cache_adapter._store_in_background(key, recording)
+
+
+class CacheSynthesizeStream(SynthesizeStream):
+    _tts_request_span_name: ClassVar[str] = "tts_cache_adapter"
+
+    def __init__(self, *, tts: CacheAdapter, conn_options: APIConnectOptions) -> None:
+        super().__init__(tts=tts, conn_options=DEFAULT_CACHE_ADAPTER_API_CONNECT_OPTIONS)
+        self._cache_adapter = tts
+        self._wrapped_tts_conn_options = conn_options
+
+    async def _metrics_monitor_task(self, event_aiter: AsyncIterable[SynthesizedAudio]) -> None:
+        pass  # do nothing, metrics are forwarded from the wrapped TTS
+
+    async def _run(self, output_emitter: AudioEmitter) -> None:
+        output_emitter.initialize(
+            request_id=utils.shortuuid(),
+            sample_rate=self._cache_adapter.sample_rate,
+            num_channels=self._cache_adapter.num_channels,
+            mime_type="audio/pcm",
+            stream=True,
+        )
+        output_emitter.start_segment(segment_id=utils.shortuuid())
+
+        try:
+            pending = [await self._input_ch.recv()]
+        except aio.ChanClosed:
+            return
+
+        # text pushed all at once is already followed by its flush when the first token is read
+        while not isinstance(pending[-1], self._FlushSentinel):
+            try:
+                pending.append(self._input_ch.recv_nowait())
+            except (ChanEmpty, aio.ChanClosed):
+                break
+
+        key: str | None = None
+        if isinstance(pending[-1], self._FlushSentinel):
+            text = "".join(data for data in pending if isinstance(data, str))
+            key = self._cache_adapter._cache_key(text)
+
+        if key is not None and (entry := await self._cache_adapter._cache.get(key)) is not None:
+            await _replay(entry, output_emitter)
+            return
+
+        stream = self._cache_adapter._wrapped_tts.stream(
+            conn_options=self._wrapped_tts_conn_options
+        )
+
+        def _forward(data: str | SynthesizeStream._FlushSentinel) -> None:
+            if isinstance(data, str):
+                stream.push_text(data)
+            else:
+                stream.flush()
+
+        @utils.log_exceptions(logger=logger)
+        async def _forward_input_task() -> None:
+            try:
+                for data in pending:
+                    _forward(data)
+
+                async for data in self._input_ch:
+                    _forward(data)
+            finally:
+                stream.end_input()
+
+        input_task = asyncio.create_task(_forward_input_task())
+        recording = _Recording()
+        try:
+            async with stream:
+                async for audio in stream:
+                    recording.push_to(audio, output_emitter)
+        finally:
+            await utils.aio.cancel_and_wait(input_task)
+
+        output_emitter.flush()
+        if key is not None:
+            self._cache_adapter._store_in_background(key, recording)
+
+
+@dataclass
+class _Recording:
+    pcm: bytearray = field(default_factory=bytearray)
+    # (offset in pcm, text, start_time, end_time)
+    timed_transcripts: list[tuple[int, str, float | None, float | None]] = field(
+        default_factory=list
+    )
+
+    def add(self, audio: SynthesizedAudio) -> None:
+        for text in audio.frame.userdata.get(USERDATA_TIMED_TRANSCRIPT, []):
+            self.timed_transcripts.append(
+                (
+                    len(self.pcm),
+                    str(text),
+                    _given_or_none(getattr(text, "start_time", None)),
+                    _given_or_none(getattr(text, "end_time", None)),
+                )
+            )
+        self.pcm += audio.frame.data.cast("B")
+
+    def push_to(self, audio: SynthesizedAudio, output_emitter: AudioEmitter) -> None:
+        if texts := audio.frame.userdata.get(USERDATA_TIMED_TRANSCRIPT):
+            output_emitter.push_timed_transcript(texts)
+
+        output_emitter.push(audio.frame.data.tobytes())
+        self.add(audio)
+
+
+@dataclass
+class _CacheEntry:
+    format: CacheFormat
+    sample_rate: int
+    num_channels: int
+    num_samples: int
+    created_at: float
+    timed_transcripts: list[tuple[int, str, float | None, float | None]]
+    data: bytes | mmap.mmap
+    """encoded audio, starting at data_offset (the metadata of a mapped file comes before)"""
+    data_offset: int = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.data) - self.data_offset
+
+    def metadata(self) -> bytes:
+        return json.dumps(
+            {
+                "format": self.format,
+                "sample_rate": self.sample_rate,
+                "num_channels": self.num_channels,
+                "num_samples": self.num_samples,
+                "created_at": self.created_at,
+                "timed_transcripts": self.timed_transcripts,
+            }
+        ).encode()
+
+    @classmethod
+    def encode(
+        cls, recording: _Recording, *, format: CacheFormat, sample_rate: int, num_channels: int
+    ) -> _CacheEntry:
+        pcm = bytes(recording.pcm)
+        num_samples = len(pcm) // (2 * num_channels)
+        return cls(
+            format=format,
+            sample_rate=sample_rate,
+            num_channels=num_channels,
+            num_samples=num_samples,
+            created_at=time.time(),
+            timed_transcripts=list(recording.timed_transcripts),
+            data=_encode_opus(pcm, sample_rate, num_channels) if format == "opus" else pcm,
+        )
+
+    def decode(self) -> bytes:
+        data = self.data[self.data_offset :]
+        if self.format == "pcm":
+            return bytes(data)
+
+        pcm = _decode_opus(bytes(data), self.sample_rate, self.num_channels)
+        # the opus frames are padded, trim or pad to the original length
+        length = self.num_samples * 2 * self.num_channels
+        return pcm[:length].ljust(length, b"\x00")
+
+
+class _AudioCache:
+    """In-memory LRU backed by a directory of memory-mapped files, one per entry."""
+
+    def __init__(
+        self,
+        *,
+        cache_dir: Path | None,
+        max_memory_bytes: int,
+        max_disk_bytes: int,
+        ttl: float | None,
+    ) -> None:
+        self._cache_dir = cache_dir
+        self._max_memory_bytes = max_memory_bytes
+        self._max_disk_bytes = max_disk_bytes
+        self._ttl = ttl
+        self._memory: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._memory_bytes = 0
+        # key -> file size, least recently used first. accessed from threads, loaded lazily
+        self._disk: OrderedDict[str, int] | None = None
+        self._disk_bytes = 0
+        self._disk_scanned_at = 0.0
+        self._disk_lock = threading.Lock()
+        self._stats = CacheAdapterStats()
+
+    def stats(self) -> CacheAdapterStats:
+        return dataclasses.replace(
+            self._stats, memory_bytes=self._memory_bytes, disk_bytes=self._disk_bytes
+        )
+
+    async def get(self, key: str, *, count: bool = True) -> _CacheEntry | None:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            if self._cache_dir is not None:
+                # keep the file from being evicted first
+                await asyncio.to_thread(self._touch_file, key)
+        elif self._cache_dir is not None:
+            entry = await asyncio.to_thread(self._read_file, key)
+            if entry is not None:
+                self._add_to_memory(key, entry)
+
+        if entry is not None and self._expired(entry):
+            self._stats.expired += 1
+            self._remove_from_memory(key)
+            if self._cache_dir is not None:
+                await asyncio.to_thread(self._remove_file, key)
+            entry = None
+
+        if count:
+            if entry is not None:
+                self._stats.hits += 1
+            else:
+                self._stats.misses += 1
+
+        return entry
+
+    async def put(self, key: str, entry: _CacheEntry) -> None:
+        if self._cache_dir is not None:
+            await asyncio.to_thread(self._write_file, key, entry)
+
+        self._remove_from_memory(key)
+        self._add_to_memory(key, entry)
+        self._stats.stored += 1
+
+    def _expired(self, entry: _CacheEntry) -> bool:
+        return self._ttl is not None and time.time() - entry.created_at > self._ttl
+
+    def _add_to_memory(self, key: str, entry: _CacheEntry) -> None:
+        if entry.size > self._max_memory_bytes:
+            return
+
+        self._memory[key] = entry
+        self._memory_bytes += entry.size
+        while self._memory_bytes > self._max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.size
+            self._stats.evicted += 1
+
+    def _remove_from_memory(self, key: str) -> None:
+        if (entry := self._memory.pop(key, None)) is not None:
+            self._memory_bytes -= entry.size
+
+    def _path(self, key: str) -> Path:
+        assert self._cache_dir is not None
+        return self._cache_dir / f"{key}{_FILE_SUFFIX}"
+
+    def _disk_index(self) -> OrderedDict[str, int]:
+        """Must be called with the disk lock held"""
+        if self._disk is None:
+            self._scan_dir()
+            self._evict_files()
+
+        assert self._disk is not None
+        return self._disk
+
+    def _scan_dir(self) -> None:
+        """Must be called with the disk lock held"""
+        assert self._cache_dir is not None
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        files = []
+        with os.scandir(self._cache_dir) as it:
+            for file in it:
+                if file.name.endswith(_FILE_SUFFIX):
+                    try:
+                        stat = file.stat()
+                    except FileNotFoundError:  # evicted by another process
+                        continue
+                    files.append((stat.st_mtime_ns, file.name[: -len(_FILE_SUFFIX)], stat.st_size))
+
+        # the files are touched when used, so the least recently used come first
+        self._disk = OrderedDict((key, size) for _, key, size in sorted(files))
+        self._disk_bytes = sum(self._disk.values())
+        self._disk_scanned_at = time.monotonic()
+
+    def _evict_files(self) -> None:
+        """Must be called with the disk lock held"""
+        assert self._disk is not None
+        while self._disk_bytes > self._max_disk_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self._stats.evicted += 1
+            self._path(key).unlink(missing_ok=True)
+
+    def _read_file(self, key: str) -> _CacheEntry | None:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):  # ValueError when the file is empty
+            return None
+
+        try:
+            magic, version, metadata_len = _FILE_HEADER.unpack_from(data, 0)
+            if magic != _FILE_MAGIC or version != _FILE_VERSION:
+                raise ValueError(f"unsupported tts cache file version {version}")
+
+            metadata = json.loads(data[_FILE_HEADER.size : _FILE_HEADER.size + metadata_len])
+            entry = _CacheEntry(
+                format=metadata["format"],
+                sample_rate=metadata["sample_rate"],
+                num_channels=metadata["num_channels"],
+                num_samples=metadata["num_samples"],
+                created_at=metadata["created_at"],
+                timed_transcripts=[tuple(t) for t in metadata["timed_transcripts"]],
+                data=data,
+                data_offset=_FILE_HEADER.size + metadata_len,
+            )
+        except (struct.error, ValueError, KeyError):
+            logger.warning("removing invalid tts cache file", extra={"path": str(path)})
+            data.close()
+            self._remove_file(key)
+            return None
+
+        with self._disk_lock:
+            disk = self._disk_index()
+            if key not in disk:  # written by another process
+                disk[key] = len(data)
+                self._disk_bytes += len(data)
+            disk.move_to_end(key)
+
+        os.utime(path)
+        return entry
+
+    def _write_file(self, key: str, entry: _CacheEntry) -> None:
+        path = self._path(key)
+        metadata = entry.metadata()
+        with self._disk_lock:
+            disk = self._disk_index()  # creates the directory
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(_FILE_HEADER.pack(_FILE_MAGIC, _FILE_VERSION, len(metadata)))
+                f.write(metadata)
+                f.write(entry.data[entry.data_offset :])
+                size = f.tell()
+            os.replace(tmp_path, path)
+
+            self._disk_bytes += size - disk.pop(key, 0)
+            disk[key] = size
+
+            # the processes sharing the directory write to it too, the budget covers their
+            # files as well. only scan it again when the budget is crossed or the index is stale
+            if (
+                self._disk_bytes > self._max_disk_bytes
+                or time.monotonic() - self._disk_scanned_at > _DISK_RESCAN_INTERVAL
+            ):
+                self._scan_dir()
+                assert self._disk is not None
+                if key in self._disk:
+                    self._disk.move_to_end(key)
+            self._evict_files()
+
+    def _touch_file(self, key: str) -> None:
+        with self._disk_lock:
+            disk = self._disk_index()
+            if key in disk:
+                disk.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _remove_file(self, key: str) -> None:
+        with self._disk_lock:
+            disk = self._disk_index()
+            self._disk_bytes -= disk.pop(key, 0)
+            self._path(key).unlink(missing_ok=True)
+
+
+async def _replay(entry: _CacheEntry, output_emitter: AudioEmitter) -> None:
+    from ..voice.io import TimedString
+
+    pcm = entry.decode() if entry.format == "pcm" else await asyncio.to_thread(entry.decode)
+    chunk_size = int(entry.sample_rate * _REPLAY_CHUNK_DURATION) * 2 * entry.num_channels
+    timed_transcripts = iter(entry.timed_transcripts)
+    next_transcript = next(timed_transcripts, None)
+    for offset in range(0, len(pcm), chunk_size):
+        # push the transcripts along the audio they came with
+        while next_transcript is not None and next_transcript[0] < offset + chunk_size:
+            _, text, start_time, end_time = next_transcript
+            output_emitter.push_timed_transcript(
+                TimedString(
+                    text,
+                    start_time=NOT_GIVEN if start_time is None else start_time,
+                    end_time=NOT_GIVEN if end_time is None else end_time,
+                )
+            )
+            next_transcript = next(timed_transcripts, None)
+
+        output_emitter.push(pcm[offset : offset + chunk_size])
+
+    output_emitter.flush()
+
+
+def _encode_opus(pcm: bytes, sample_rate: int, num_channels: int) -> bytes:
+    layout = "mono" if num_channels == 1 else "stereo"
+    rate = sample_rate if sample_rate in _OPUS_SAMPLE_RATES else 48000
+    buf = io.BytesIO()
+    with av.open(buf, mode="w", format="ogg") as container:
+        stream: av.AudioStream = container.add_stream("opus", rate=rate, layout=layout)  # type: ignore
+        samples = np.frombuffer(pcm, dtype=np.int16).reshape(1, -1)
+        frame = av.AudioFrame.from_ndarray(samples, format="s16", layout=layout)
+        frame.sample_rate = sample_rate
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+
+    return buf.getvalue()
+
+
+def _decode_opus(data: bytes, sample_rate: int, num_channels: int) -> bytes:
+    layout = "mono" if num_channels == 1 else "stereo"
+    resampler = av.AudioResampler(format="s16", layout=layout, rate=sample_rate)
+    pcm = bytearray()
+    with av.open(io.BytesIO(data), mode="r", format="ogg") as container:
+        for frame in container.decode(audio=0):
+            for resampled in resampler.resample(frame):
+                pcm += resampled.to_ndarray().tobytes()
+
+    for resampled in resampler.resample(None):
+        pcm += resampled.to_ndarray().tobytes()
+
+    return bytes(pcm)
+
+
+def _given_or_none(value: Any) -> Any:
+    return None if isinstance(value, NotGiven) else value
+
+
+def _default_voice_key(tts: TTS) -> Any:
+    opts = getattr(tts, "_opts", None)
+    if opts is None or not dataclasses.is_dataclass(opts):
+        return None
+
+    return _plain_options(opts)
+
+
+def _plain_options(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            f.name: _plain_options(getattr(value, f.name))
+            for f in dataclasses.fields(value)
+            if f.name.lstrip("_") not in _IGNORED_OPTION_FIELDS
+        }
+    if isinstance(value, enum.Enum):
+        return _plain_options(value.value)
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, NotGiven):
+        return None
+    if isinstance(value, (list, tuple)):
+        return [_plain_options(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _plain_options(v) for k, v in value.items()}
+    if hasattr(value, "model_dump"):  # pydantic models
+        return _plain_options(value.model_dump())
+
+    # clients, sessions and other objects that don't change the audio
+    return None
@@ -29,7 +29,20 @@ class StreamAdapter(TTS):
         tts: TTS,
         sentence_tokenizer: NotGivenOr[tokenize.SentenceTokenizer] = NOT_GIVEN,
         text_pacing: SentenceStreamPacer | bool = False,
+        look_ahead: int = 1,
     ) -> None:
+        """
+        Args:
+            tts: The non-streaming TTS to synthesize each sentence with.
+            sentence_tokenizer: Splits the input text into sentences.
+            text_pacing: Paces the sentences sent to the TTS by the audio already generated.
+            look_ahead: Number of upcoming sentences requested while one is being played out,
+                their audio is buffered and emitted in order. 0 synthesizes one sentence at a
+                time, at the cost of a request round trip of silence between sentences.
+        """
+        if look_ahead < 0:
+            raise ValueError("look_ahead must be greater than or equal to 0")
+
         super().__init__(
             capabilities=TTSCapabilities(streaming=True, aligned_transcript=True),
             sample_rate=tts.sample_rate,
@@ -45,6 +58,7 @@ class StreamAdapter(TTS):
         elif isinstance(text_pacing, SentenceStreamPacer):
             self._stream_pacer = text_pacing
 
+        self._look_ahead = look_ahead
         self._wrapped_tts.on("metrics_collected", self._on_metrics_collected)
 
     @property
@@ -116,25 +130,56 @@ class StreamAdapterWrapper(SynthesizeStream):
 
             sent_stream.end_input()
 
+        # sentences synthesized ahead of the one being played out, in order. a ChunkedStream
+        # starts its request when created and buffers its audio until it's read
+        synth_ch: utils.aio.Chan[tuple[str, ChunkedStream | None]] = utils.aio.Chan()
+        synth_slots = asyncio.Semaphore(self._tts._look_ahead + 1)
+
+        async def _request_sentences() -> None:
+            try:
+                async for ev in sent_stream:
+                    if not (text := ev.token.strip()):
+                        synth_ch.send_nowait((ev.token, None))
+                        continue
+
+                    await synth_slots.acquire()
+                    tts_stream = self._tts._wrapped_tts.synthesize(
+                        text, conn_options=self._wrapped_tts_conn_options
+                    )
+                    synth_ch.send_nowait((ev.token, tts_stream))
+            finally:
+                synth_ch.close()
+
         async def _synthesize() -> None:
             from ..voice.io import TimedString
 
-            duration = 0.0
-            async for ev in sent_stream:
-                output_emitter.push_timed_transcript(
-                    TimedString(text=ev.token, start_time=duration)
-                )
-
-                if not (text := ev.token.strip()):
-                    continue
-
-                async with self._tts._wrapped_tts.synthesize(
-                    text, conn_options=self._wrapped_tts_conn_options
-                ) as tts_stream:
-                    async for audio in tts_stream:
-                        output_emitter.push(audio.frame.data.tobytes())
-                        duration += audio.frame.duration
-                    output_emitter.flush()
+            request_task = asyncio.create_task(_request_sentences())
+            try:
+                duration = 0.0
+                async for token, tts_stream in synth_ch:
+                    output_emitter.push_timed_transcript(
+                        TimedString(text=token, start_time=duration)
+                    )
+
+                    if tts_stream is None:
+                        continue
+
+                    async with tts_stream:
+                        async for audio in tts_stream:
+                            output_emitter.push(audio.frame.data.tobytes())
+                            duration += audio.frame.duration
+                        output_emitter.flush()
+
+                    synth_slots.release()
+
+                await request_task
+            finally:
+                await utils.aio.cancel_and_wait(request_task)
+                # cancel the requests made ahead that won't be played out
+                while not synth_ch.empty():
+                    _, tts_stream = synth_ch.recv_nowait()
+                    if tts_stream is not None:
+                        await tts_stream.aclose()
 
         tasks = [
             asyncio.create_task(_forward_input()),
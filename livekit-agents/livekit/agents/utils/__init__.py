@@ -3,7 +3,7 @@ from livekit import rtc
 from . import aio, audio, codecs, http_context, http_server, hw, images
 from .audio import AudioBuffer, combine_frames, merge_frames
 from .bounded_dict import BoundedDict
-from .connection_pool import ConnectionPool
+from .connection_pool import ConnectionPool, ConnectionPoolStats
 from .exp_filter import ExpFilter
 from .log import log_exceptions
 from .misc import is_given, nodename, shortuuid, time_ms
@@ -33,6 +33,7 @@ __all__ = [
     "hw",
     "is_given",
     "ConnectionPool",
+    "ConnectionPoolStats",
     "wait_for_participant",
     "wait_for_track_publication",
 ]
@@ -85,7 +85,7 @@ class AudioByteStream:
         Add audio data to the buffer and retrieve fixed-size frames.
 
         Parameters:
-            data (bytes): The incoming audio data to buffer.
+            data (bytes | memoryview): The incoming audio data to buffer.
 
         Returns:
             list[rtc.AudioFrame]: A list of `AudioFrame` objects of fixed size.
@@ -99,24 +99,41 @@ class AudioByteStream:
         (e.g., from a stream or file) and receive back a list of
         fixed-size audio frames ready for processing or transmission.
         """
-        self._buf.extend(data)
+        if isinstance(data, memoryview):
+            data = data.cast("B")
 
-        frames = []
-        while len(self._buf) >= self._bytes_per_frame:
-            frame_data = self._buf[: self._bytes_per_frame]
-            self._buf = self._buf[self._bytes_per_frame :]
-
-            frames.append(
-                rtc.AudioFrame(
-                    data=frame_data,
-                    sample_rate=self._sample_rate,
-                    num_channels=self._num_channels,
-                    samples_per_channel=len(frame_data) // self._bytes_per_sample,
-                )
-            )
+        # _buf only ever holds the start of a single incomplete frame
+        buffered = len(self._buf)
+        if buffered + len(data) < self._bytes_per_frame:
+            self._buf.extend(data)
+            return []
 
+        view = memoryview(data)
+        frames = []
+        if buffered:
+            needed = self._bytes_per_frame - buffered
+            self._buf.extend(view[:needed])
+            view = view[needed:]
+            frames.append(self._new_frame(self._buf))
+            self._buf.clear()
+
+        # the remaining frames are sliced directly from the input, AudioFrame copies its data
+        offset = 0
+        while len(view) - offset >= self._bytes_per_frame:
+            frames.append(self._new_frame(view[offset : offset + self._bytes_per_frame]))
+            offset += self._bytes_per_frame
+
+        self._buf.extend(view[offset:])
         return frames
 
+    def _new_frame(self, data: bytes | bytearray | memoryview) -> rtc.AudioFrame:
+        return rtc.AudioFrame(
+            data=data,
+            sample_rate=self._sample_rate,
+            num_channels=self._num_channels,
+            samples_per_channel=len(data) // self._bytes_per_sample,
+        )
+
     write = push  # Alias for the push method.
 
     def flush(self) -> list[rtc.AudioFrame]:
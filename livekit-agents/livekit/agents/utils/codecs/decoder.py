@@ -15,11 +15,11 @@
 from __future__ import annotations
 
 import asyncio
-import io
+import os
 import struct
 import threading
-from collections.abc import AsyncIterator
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from collections.abc import AsyncIterator, Callable
 from typing import cast
 
 import av
@@ -32,6 +32,75 @@ from .. import aio
 from ..audio import AudioByteStream
 
 
+class _DecoderThreads:
+    """Runs each decode loop on its own thread, threads left idle are reused by the next streams.
+
+    PyAV reads its input synchronously, so a decoder holds its thread until the stream ends. A
+    bounded pool would make new decoders wait behind streams that are still being written.
+    """
+
+    def __init__(self, idle_timeout: float) -> None:
+        self._idle_timeout = idle_timeout
+        self._cond = threading.Condition()
+        self._pending: deque[Callable[[], None]] = deque()
+        self._idle = 0
+        self._started = 0
+
+    def submit(self, fn: Callable[[], None]) -> None:
+        with self._cond:
+            if self._idle:
+                self._idle -= 1
+                self._pending.append(fn)
+                self._cond.notify()
+                return
+
+            self._started += 1
+            name = f"AudioDecoder_{self._started}"
+
+        threading.Thread(target=self._worker, args=(fn,), name=name, daemon=True).start()
+
+    def _worker(self, fn: Callable[[], None] | None) -> None:
+        while fn is not None:
+            try:
+                fn()
+            except Exception:
+                logger.exception("error in audio decoder thread")
+
+            with self._cond:
+                self._idle += 1
+                if self._cond.wait_for(lambda: self._pending, timeout=self._idle_timeout):
+                    fn = self._pending.popleft()  # the idle count was taken by submit
+                else:
+                    self._idle -= 1
+                    fn = None
+
+
+DECODER_THREAD_IDLE_TIMEOUT = 30.0
+
+_threads: _DecoderThreads | None = None
+_threads_lock = threading.Lock()
+
+
+def _decoder_threads() -> _DecoderThreads:
+    """Process-wide threads shared by every AudioStreamDecoder"""
+    global _threads
+    with _threads_lock:
+        if _threads is None:
+            _threads = _DecoderThreads(DECODER_THREAD_IDLE_TIMEOUT)
+        return _threads
+
+
+def _reset_decoder_threads() -> None:
+    # the idle threads of the parent don't exist in a forked child
+    global _threads, _threads_lock
+    _threads = None
+    _threads_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_decoder_threads)
+
+
 def _mime_to_av_format(mime: str | None) -> str | None:
     """Return the libav *container* short‑name for a given MIME‑type.
 
@@ -66,46 +135,73 @@ class StreamBuffer:
     """
     A thread-safe buffer that behaves like an IO stream.
     Allows writing from one thread and reading from another.
+
+    Written chunks are queued as they are, reads only copy the bytes they return.
     """
 
     def __init__(self) -> None:
-        self._buffer = io.BytesIO()
+        self._chunks: deque[bytes] = deque()
+        self._offset = 0  # read position inside the first chunk
+        self._size = 0
         self._lock = threading.Lock()
         self._data_available = threading.Condition(self._lock)
         self._eof = False
+        self._closed = False
 
     def write(self, data: bytes) -> None:
         """Write data to the buffer from a writer thread."""
+        if not data:
+            return
+
         with self._data_available:
-            self._buffer.seek(0, io.SEEK_END)
-            self._buffer.write(data)
+            if self._closed:
+                return
+
+            self._chunks.append(bytes(data))
+            self._size += len(data)
             self._data_available.notify_all()
 
     def read(self, size: int = -1) -> bytes:
         """Read data from the buffer in a reader thread."""
-
-        if self._buffer.closed:
-            return b""
-
         with self._data_available:
             while True:
-                if self._buffer.closed:
+                if self._closed:
                     return b""
-                # always read from beginning
-                self._buffer.seek(0)
-                data = self._buffer.read(size)
 
-                if data:
-                    # shrink the buffer to remove already-read data
-                    remaining = self._buffer.read()
-                    self._buffer = io.BytesIO(remaining)
-                    return data
+                if self._size:
+                    return self._pop(size)
 
                 if self._eof:
                     return b""
 
                 self._data_available.wait()
 
+    def _pop(self, size: int) -> bytes:
+        if size < 0 or size > self._size:
+            size = self._size
+
+        first = self._chunks[0]
+        if self._offset == 0 and size == len(first):
+            self._chunks.popleft()
+            self._size -= size
+            return first
+
+        parts: list[memoryview] = []
+        remaining = size
+        while remaining:
+            chunk = self._chunks[0]
+            end = min(len(chunk), self._offset + remaining)
+            parts.append(memoryview(chunk)[self._offset : end])
+            remaining -= end - self._offset
+            if end == len(chunk):
+                self._chunks.popleft()
+                self._offset = 0
+            else:
+                self._offset = end
+
+        self._size -= size
+        return b"".join(parts)
+
     def end_input(self) -> None:
         """Signal that no more data will be written."""
         with self._data_available:
@@ -113,7 +209,11 @@ class StreamBuffer:
             self._data_available.notify_all()
 
     def close(self) -> None:
-        self._buffer.close()
+        with self._data_available:
+            self._closed = True
+            self._chunks.clear()
+            self._size = 0
+            self._data_available.notify_all()
 
 
 class AudioStreamDecoder:
@@ -145,14 +245,12 @@ class AudioStreamDecoder:
         self._input_buf = StreamBuffer()
         self._loop = asyncio.get_event_loop()
 
-        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="AudioDecoder")
-
     def push(self, chunk: bytes) -> None:
         self._input_buf.write(chunk)
         if not self._started:
             self._started = True
             target = self._decode_wav_loop if self._av_format == "wav" else self._decode_loop
-            self._loop.run_in_executor(self._executor, target)
+            _decoder_threads().submit(target)
 
     def end_input(self) -> None:
         self._input_buf.end_input()
@@ -164,6 +262,9 @@ class AudioStreamDecoder:
         container: av.container.InputContainer | None = None
         resampler: av.AudioResampler | None = None
         try:
+            if self._closed:
+                return  # closed before the decode started
+
             # open container in low-latency streaming mode
             container = av.open(
                 self._input_buf,
@@ -231,6 +332,9 @@ class AudioStreamDecoder:
         """
 
         try:
+            if self._closed:
+                return
+
             # parse RIFF header
             header = b""
             while len(header) < 12:
@@ -335,5 +439,3 @@ class AudioStreamDecoder:
 
         async for _ in self._output_ch:
             pass
-
-        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,15 +1,38 @@
 import asyncio
 import time
-import weakref
+from collections import deque
 from collections.abc import AsyncGenerator, Awaitable
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
 from typing import Callable, Generic, Optional, TypeVar
 
+from ..log import logger
 from . import aio
 
 T = TypeVar("T")
 
 
+@dataclass
+class ConnectionPoolStats:
+    """Counters of a ConnectionPool, see ConnectionPool.stats."""
+
+    hits: int = 0
+    """get() calls served by an idle connection"""
+    misses: int = 0
+    """get() calls that had to wait for a new connection"""
+    connects: int = 0
+    """connections established, on demand or by the refiller"""
+    connect_errors: int = 0
+    discarded: int = 0
+    """idle connections that failed the health check or expired"""
+    last_connect_latency: float = 0.0
+    total_connect_latency: float = 0.0
+
+    @property
+    def avg_connect_latency(self) -> float:
+        return self.total_connect_latency / self.connects if self.connects else 0.0
+
+
 class ConnectionPool(Generic[T]):
     """Helper class to manage persistent connections like websockets.
 
@@ -25,6 +48,9 @@ class ConnectionPool(Generic[T]):
         connect_cb: Optional[Callable[[float], Awaitable[T]]] = None,
         close_cb: Optional[Callable[[T], Awaitable[None]]] = None,
         connect_timeout: float = 10.0,
+        min_idle: int = 0,
+        max_size: Optional[int] = None,
+        health_check_cb: Optional[Callable[[T], Awaitable[bool]]] = None,
     ) -> None:
         """Initialize the connection wrapper.
 
@@ -33,24 +59,48 @@ class ConnectionPool(Generic[T]):
             mark_refreshed_on_get: If True, the session will be marked as fresh when get() is called. only used when max_session_duration is set.
             connect_cb: Optional async callback to create new connections
             close_cb: Optional async callback to close connections
+            connect_timeout: Timeout used when connecting in the background (prewarm and refill)
+            min_idle: Number of idle connections kept ready in the background once the pool is in use or prewarmed
+            max_size: Maximum number of connections (idle, in use and connecting). get() waits for one to be returned when reached
+            health_check_cb: Optional async callback returning False when an idle connection is dead, called before it's handed out. It should be cheap (e.g. check that the socket isn't closed)
         """  # noqa: E501
+        if min_idle < 0:
+            raise ValueError("min_idle must be greater than or equal to 0")
+        if max_size is not None and max_size < max(min_idle, 1):
+            raise ValueError("max_size must be at least 1 and at least min_idle")
+
         self._max_session_duration = max_session_duration
         self._mark_refreshed_on_get = mark_refreshed_on_get
         self._connect_cb = connect_cb
         self._close_cb = close_cb
+        self._health_check_cb = health_check_cb
         self._connections: dict[T, float] = {}  # conn -> connected_at timestamp
         self._available: set[T] = set()
         self._connect_timeout = connect_timeout
-        self._connect_lock = asyncio.Lock()
+        self._min_idle = min_idle
+        self._max_size = max_size
+        self._connecting = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._stats = ConnectionPoolStats()
 
         # store connections to be reaped (closed) later.
         self._to_close: set[T] = set()
 
-        self._prewarm_task: Optional[weakref.ref[asyncio.Task[None]]] = None
+        self._refill_task: Optional[asyncio.Task[None]] = None
+        self._refill_target = 0
+        self._refill_connecting = 0
+
+    @property
+    def stats(self) -> ConnectionPoolStats:
+        """A snapshot of the pool hit/miss and connect latency counters."""
+        return replace(self._stats)
 
     async def _connect(self, timeout: float) -> T:
         """Create a new connection.
 
+        Connections being established count towards max_size, but the pool isn't locked while
+        connecting so concurrent callers don't wait on each other's handshake.
+
         Returns:
             The new connection object
 
@@ -59,15 +109,30 @@ class ConnectionPool(Generic[T]):
         """
         if self._connect_cb is None:
             raise NotImplementedError("Must provide connect_cb or implement connect()")
-        connection = await self._connect_cb(timeout)
+
+        self._connecting += 1
+        start = time.perf_counter()
+        try:
+            connection = await self._connect_cb(timeout)
+        except BaseException:
+            self._stats.connect_errors += 1
+            raise
+        finally:
+            self._connecting -= 1
+            self._notify_waiter()
+
+        latency = time.perf_counter() - start
+        self._stats.connects += 1
+        self._stats.last_connect_latency = latency
+        self._stats.total_connect_latency += latency
         self._connections[connection] = time.time()
         return connection
 
     async def _drain_to_close(self) -> None:
         """Drain and close all the connections queued for closing."""
-        for conn in list(self._to_close):
+        to_close, self._to_close = self._to_close, set()
+        for conn in to_close:
             await self._maybe_close_connection(conn)
-        self._to_close.clear()
 
     @asynccontextmanager
     async def connection(self, *, timeout: float) -> AsyncGenerator[T, None]:
@@ -91,24 +156,85 @@ class ConnectionPool(Generic[T]):
         Returns:
             An active connection object
         """
-        async with self._connect_lock:
-            await self._drain_to_close()
-            now = time.time()
-
-            # try to reuse an available connection that hasn't expired
-            while self._available:
-                conn = self._available.pop()
-                if (
-                    self._max_session_duration is None
-                    or now - self._connections[conn] <= self._max_session_duration
-                ):
-                    if self._mark_refreshed_on_get:
-                        self._connections[conn] = now
-                    return conn
+        await self._drain_to_close()
+        deadline = time.perf_counter() + timeout
+
+        while True:
+            conn = await self._pop_available()
+            if conn is not None:
+                self._stats.hits += 1
+                self._schedule_refill(self._min_idle)
+                return conn
+
+            # a connection being prewarmed is ready sooner than a new one, but only wait for
+            # one when it isn't already awaited by another get()
+            if not self._at_capacity() and len(self._waiters) >= self._refill_connecting:
+                break
+
+            # wait for a connection to be returned, removed or to finish connecting
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, deadline - time.perf_counter())
+            finally:
+                if not waiter.done() or waiter.cancelled():
+                    try:
+                        self._waiters.remove(waiter)
+                    except ValueError:
+                        pass
+
+        self._stats.misses += 1
+        try:
+            return await self._connect(timeout)
+        finally:
+            self._schedule_refill(self._min_idle)
+
+    async def _pop_available(self) -> Optional[T]:
+        now = time.time()
+
+        # try to reuse an available connection that hasn't expired
+        while self._available:
+            conn = self._available.pop()
+            if (
+                self._max_session_duration is not None
+                and now - self._connections[conn] > self._max_session_duration
+            ):
                 # connection expired; mark it for resetting.
+                self._stats.discarded += 1
                 self.remove(conn)
+                continue
 
-            return await self._connect(timeout)
+            if self._health_check_cb is not None and not await self._is_alive(conn):
+                self._stats.discarded += 1
+                self.remove(conn)
+                continue
+
+            if self._mark_refreshed_on_get:
+                self._connections[conn] = now
+            return conn
+
+        return None
+
+    async def _is_alive(self, conn: T) -> bool:
+        assert self._health_check_cb is not None
+        try:
+            return await self._health_check_cb(conn)
+        except Exception:
+            logger.debug("connection health check failed", exc_info=True)
+            return False
+
+    def _at_capacity(self) -> bool:
+        return (
+            self._max_size is not None
+            and len(self._connections) + self._connecting >= self._max_size
+        )
+
+    def _notify_waiter(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
 
     def put(self, conn: T) -> None:
         """Mark a connection as available for reuse.
@@ -120,6 +246,7 @@ class ConnectionPool(Generic[T]):
         """
         if conn in self._connections:
             self._available.add(conn)
+            self._notify_waiter()
 
     async def _maybe_close_connection(self, conn: T) -> None:
         """Close a connection if close_cb is provided.
@@ -142,6 +269,20 @@ class ConnectionPool(Generic[T]):
         if conn in self._connections:
             self._to_close.add(conn)
             self._connections.pop(conn, None)
+            self._notify_waiter()
+
+    def detach(self, conn: T) -> None:
+        """Stop tracking a connection returned by get(), without closing it.
+
+        Used for connections that can't be reused (e.g. a websocket bound to a single stream),
+        the caller is responsible for closing it.
+
+        Args:
+            conn: The connection to detach
+        """
+        self._available.discard(conn)
+        if self._connections.pop(conn, None) is not None:
+            self._notify_waiter()
 
     def invalidate(self) -> None:
         """Clear all existing connections.
@@ -152,31 +293,83 @@ class ConnectionPool(Generic[T]):
             self._to_close.add(conn)
         self._connections.clear()
         self._available.clear()
+        while self._waiters:
+            self._notify_waiter()
 
-    def prewarm(self) -> None:
+    def prewarm(self, count: Optional[int] = None) -> None:
         """Initiate prewarming of the connection pool without blocking.
 
-        This method starts a background task that creates a new connection if none exist.
-        The task automatically cleans itself up when the connection pool is closed.
+        This method starts a background task that creates min_idle connections, or a single one
+        if min_idle is 0 and none exist. The task is cancelled when the connection pool is closed.
+
+        Args:
+            count: Number of idle connections to open instead, regardless of the existing ones
         """
-        if self._prewarm_task is not None or self._connections:
+        if count is not None:
+            self._schedule_refill(count)
+            return
+
+        if self._connections and self._min_idle == 0:
             return
 
-        async def _prewarm_impl() -> None:
-            async with self._connect_lock:
-                if not self._connections:
-                    conn = await self._connect(timeout=self._connect_timeout)
-                    self._available.add(conn)
+        self._schedule_refill(max(self._min_idle, 1))
 
-        task = asyncio.create_task(_prewarm_impl())
-        self._prewarm_task = weakref.ref(task)
+    def _schedule_refill(self, target: int) -> None:
+        """Make sure a background task is connecting until target connections are idle."""
+        if target == 0:
+            return
+
+        self._refill_target = max(self._refill_target, target)
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self._refill())
+
+    async def _refill(self) -> None:
+        try:
+            while True:
+                await self._drain_to_close()
+                target = self._refill_target
+                missing = target - len(self._available)
+                if self._max_size is not None:
+                    missing = min(
+                        missing, self._max_size - len(self._connections) - self._connecting
+                    )
+                if missing <= 0:
+                    return
+
+                # connect concurrently, each handshake pays the full round trip
+                self._refill_connecting += missing
+                try:
+                    results = await asyncio.gather(
+                        *(self._connect_idle() for _ in range(missing)),
+                        return_exceptions=True,
+                    )
+                finally:
+                    self._refill_connecting -= missing
+                    # the waiters left connect on their own
+                    while self._waiters:
+                        self._notify_waiter()
+
+                errors = [result for result in results if isinstance(result, BaseException)]
+                if errors:
+                    logger.warning("failed to refill the connection pool", exc_info=errors[0])
+                    # don't retry until the pool is used again
+                    return
+
+                if self._refill_target == target:
+                    # connections handed out to waiting get() calls meanwhile are only
+                    # replaced to keep min_idle
+                    self._refill_target = self._min_idle
+        finally:
+            self._refill_target = self._min_idle
+
+    async def _connect_idle(self) -> None:
+        # hand it out right away to a get() waiting on it
+        self.put(await self._connect(self._connect_timeout))
 
     async def aclose(self) -> None:
         """Close all connections, draining any pending connection closures."""
-        if self._prewarm_task is not None:
-            task = self._prewarm_task()
-            if task:
-                await aio.gracefully_cancel(task)
+        if self._refill_task is not None:
+            await aio.gracefully_cancel(self._refill_task)
 
         self.invalidate()
         await self._drain_to_close()
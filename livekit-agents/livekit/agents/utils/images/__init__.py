@@ -12,9 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .image import EncodeOptions, ResizeOptions, encode
+from .image import EncodeOptions, FrameEncodeCache, ResizeOptions, encode
 
-__all__ = ["EncodeOptions", "ResizeOptions", "encode"]
+__all__ = ["EncodeOptions", "FrameEncodeCache", "ResizeOptions", "encode"]
 
 # Cleanup docs of unexported modules
 _module = dir()
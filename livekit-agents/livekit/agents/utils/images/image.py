@@ -12,11 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import io
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, replace
 from importlib import import_module
 from typing import TYPE_CHECKING, Literal, Optional
 
+import numpy as np
+
 from livekit import rtc
 
 if TYPE_CHECKING:
@@ -76,11 +80,15 @@ def import_pil() -> None:
 def encode(frame: rtc.VideoFrame, options: EncodeOptions) -> bytes:
     """Encode a rtc.VideoFrame to a portable image format (JPEG or PNG).
 
+    When resizing, the frame is first downsampled by an integer factor in its native buffer
+    format, so only the pixels that are kept are converted to RGB. This is CPU bound (a few ms
+    for a 1080p frame), use encode_async to run it without blocking the event loop.
+
     See EncodeOptions for more details.
     """
     import_pil()
-    img = _image_from_frame(frame)
-    resized = _resize_image(img, options)
+    img = _image_from_frame(frame, _reduce_factor(frame, options))
+    resized = _resize_image(img, options, source_size=(frame.width, frame.height))
     buffer = io.BytesIO()
     kwargs = {}
     if options.format == "JPEG" and options.quality is not None:
@@ -90,88 +98,209 @@ def encode(frame: rtc.VideoFrame, options: EncodeOptions) -> bytes:
     return buffer.read()
 
 
-def _image_from_frame(frame: rtc.VideoFrame) -> "Image.Image":
-    converted = frame
-    if frame.type != rtc.VideoBufferType.RGBA:
-        converted = frame.convert(rtc.VideoBufferType.RGBA)
+async def encode_async(frame: rtc.VideoFrame, options: EncodeOptions) -> bytes:
+    """Same as encode, but runs in a worker thread."""
+    return await asyncio.to_thread(encode, frame, options)
 
-    rgb_image = Image.frombytes("RGBA", (frame.width, frame.height), converted.data).convert("RGB")
-    return rgb_image
 
+class FrameEncodeCache:
+    """Reuses the encoding of a recent frame of the same video source when a new frame is
+    unchanged, e.g. the camera of a user sitting still sampled on every turn.
 
-def _resize_image(image: "Image.Image", options: EncodeOptions) -> "Image.Image":
-    if options.resize_options is None:
-        return image
+    Create one per video track and pass it to ``ImageContent(image=frame, encode_cache=...)``,
+    frames of different sources must not share a cache.
 
-    resize_opts = options.resize_options
+    Frames are compared by a thumbnail: the frame box-averaged down to about 96 pixels on its
+    short side, in RGB. Frames match when no channel of any thumbnail pixel differs by more than
+    max_diff, which absorbs sensor noise but not a color shift or a thin line of text.
+    """
+
+    def __init__(self, *, max_entries: int = 4, max_diff: int = 4) -> None:
+        self._max_entries = max_entries
+        self._max_diff = max_diff
+        self._lock = threading.Lock()
+        self._entries: list[_CachedEncoding] = []  # most recently used last
+
+    def encode(self, frame: rtc.VideoFrame, options: EncodeOptions) -> bytes:
+        size = (frame.width, frame.height)
+        thumbnail = _thumbnail(frame)
+        with self._lock:
+            for entry in reversed(self._entries):
+                if (
+                    entry.size == size
+                    and entry.options == options
+                    and np.abs(entry.thumbnail - thumbnail).max() <= self._max_diff
+                ):
+                    self._entries.remove(entry)
+                    self._entries.append(entry)
+                    return entry.data
+
+        data = encode(frame, options)
+        with self._lock:
+            self._entries.append(_CachedEncoding(size, replace(options), thumbnail, data))
+            del self._entries[: -self._max_entries]
+        return data
+
+
+@dataclass
+class _CachedEncoding:
+    size: tuple[int, int]
+    options: EncodeOptions
+    thumbnail: np.ndarray
+    data: bytes
+
+
+_THUMBNAIL_SIZE = 96
+
+
+def _thumbnail(frame: rtc.VideoFrame) -> np.ndarray:
+    import_pil()
+    factor = max(min(frame.width, frame.height) // _THUMBNAIL_SIZE, 1)
+    thumbnail: np.ndarray = np.asarray(_image_from_frame(frame, factor), dtype=np.int16)
+    return thumbnail
+
+
+# memory layout of the RGB buffer types, as PIL raw modes
+_RGB_RAW_MODES = {
+    rtc.VideoBufferType.RGBA: "RGBX",
+    rtc.VideoBufferType.BGRA: "BGRX",
+    rtc.VideoBufferType.ARGB: "XRGB",
+    rtc.VideoBufferType.ABGR: "XBGR",
+    rtc.VideoBufferType.RGB24: "RGB",
+}
+
+
+def _reduce_factor(frame: rtc.VideoFrame, options: EncodeOptions) -> int:
+    """Largest integer factor the frame can be downsampled by while staying larger than the
+    size it's resized to."""
+    if options.resize_options is None:
+        return 1
+
+    new_width, new_height = _scaled_size(frame.width, frame.height, options.resize_options)
+    factor = min(frame.width // max(new_width, 1), frame.height // max(new_height, 1))
+    # I420 is reduced to even dimensions
+    while factor > 1 and (
+        (frame.width // factor) & ~1 < new_width or (frame.height // factor) & ~1 < new_height
+    ):
+        factor -= 1
+    return max(factor, 1)
+
+
+def _image_from_frame(frame: rtc.VideoFrame, reduce_factor: int = 1) -> "Image.Image":
+    raw_mode = _RGB_RAW_MODES.get(frame.type)
+    if raw_mode is not None:
+        img = Image.frombytes("RGB", (frame.width, frame.height), frame.data, "raw", raw_mode)
+        return img.reduce(reduce_factor) if reduce_factor > 1 else img
+
+    # YUV frames are reduced before the conversion to RGB
+    if frame.type != rtc.VideoBufferType.I420:
+        frame = frame.convert(rtc.VideoBufferType.I420)
+    if reduce_factor > 1:
+        frame = _reduce_i420(frame, reduce_factor)
+
+    rgb = frame.convert(rtc.VideoBufferType.RGB24)
+    return Image.frombytes("RGB", (rgb.width, rgb.height), rgb.data)
+
+
+def _reduce_i420(frame: rtc.VideoFrame, factor: int) -> rtc.VideoFrame:
+    """Box-downsample each plane of an I420 frame by factor."""
+    width = (frame.width // factor) & ~1
+    height = (frame.height // factor) & ~1
+    chroma_width, chroma_height = (frame.width + 1) // 2, (frame.height + 1) // 2
+    data = np.frombuffer(frame.data, dtype=np.uint8)
+    luma_size, chroma_size = frame.width * frame.height, chroma_width * chroma_height
+    y = data[:luma_size].reshape(frame.height, frame.width)
+    u = data[luma_size : luma_size + chroma_size].reshape(chroma_height, chroma_width)
+    v = data[luma_size + chroma_size : luma_size + 2 * chroma_size].reshape(u.shape)
+
+    planes = []
+    for plane, plane_width, plane_height in (
+        (y, width, height),
+        (u, width // 2, height // 2),
+        (v, width // 2, height // 2),
+    ):
+        box = (0, 0, plane_width * factor, plane_height * factor)
+        planes.append(Image.fromarray(plane).reduce(factor, box=box).tobytes())
+
+    return rtc.VideoFrame(width, height, rtc.VideoBufferType.I420, b"".join(planes))
+
+
+def _scaled_size(width: int, height: int, resize_opts: ResizeOptions) -> tuple[int, int]:
+    """Size the image is resized to, before letterboxing or cropping for the center strategies."""
     if resize_opts.strategy == "skew":
-        return image.resize((resize_opts.width, resize_opts.height))
+        return resize_opts.width, resize_opts.height
     elif resize_opts.strategy == "center_aspect_fit":
-        result = Image.new("RGB", (resize_opts.width, resize_opts.height))  # noqa
-
         # Start with assuming the new image is narrower than the original
         new_width = resize_opts.width
-        new_height = int(image.height * (resize_opts.width / image.width))
+        new_height = int(height * (resize_opts.width / width))
 
         # If the new image is wider than the original
-        if resize_opts.width / resize_opts.height > image.width / image.height:
+        if resize_opts.width / resize_opts.height > width / height:
             new_height = resize_opts.height
-            new_width = int(image.width * (resize_opts.height / image.height))
-
-        resized = image.resize((new_width, new_height))
-
-        Image.Image.paste(
-            result,
-            resized,
-            (
-                (resize_opts.width - new_width) // 2,
-                (resize_opts.height - new_height) // 2,
-            ),
-        )
-        return result
-    elif resize_opts.strategy == "center_aspect_cover":
-        result = Image.new("RGB", (resize_opts.width, resize_opts.height))  # noqa
+            new_width = int(width * (resize_opts.height / height))
 
+        return new_width, new_height
+    elif resize_opts.strategy == "center_aspect_cover":
         # Start with assuming the new image is shorter than the original
-        new_height = int(image.height * (resize_opts.width / image.width))
+        new_height = int(height * (resize_opts.width / width))
         new_width = resize_opts.width
 
         # If the new image is taller than the original
-        if resize_opts.height / resize_opts.width > image.height / image.width:
-            new_width = int(image.width * (resize_opts.height / image.height))
+        if resize_opts.height / resize_opts.width > height / width:
+            new_width = int(width * (resize_opts.height / height))
             new_height = resize_opts.height
 
-        resized = image.resize((new_width, new_height))
-        Image.Image.paste(  # noqa
-            result,
-            resized,
-            (
-                (resize_opts.width - new_width) // 2,
-                (resize_opts.height - new_height) // 2,
-            ),
-        )
-        return result
+        return new_width, new_height
     elif resize_opts.strategy == "scale_aspect_cover":
         # Start with assuming width is the limiting dimension
         new_width = resize_opts.width
-        new_height = int(image.height * (resize_opts.width / image.width))
+        new_height = int(height * (resize_opts.width / width))
 
         # If height is under the limit, scale based on height instead
         if new_height < resize_opts.height:
             new_height = resize_opts.height
-            new_width = int(image.width * (resize_opts.height / image.height))
+            new_width = int(width * (resize_opts.height / height))
 
-        return image.resize((new_width, new_height))
+        return new_width, new_height
     elif resize_opts.strategy == "scale_aspect_fit":
         # Start with assuming width is the limiting dimension
         new_width = resize_opts.width
-        new_height = int(image.height * (resize_opts.width / image.width))
+        new_height = int(height * (resize_opts.width / width))
 
         # If height would exceed the limit, scale based on height instead
         if new_height > resize_opts.height:
             new_height = resize_opts.height
-            new_width = int(image.width * (resize_opts.height / image.height))
+            new_width = int(width * (resize_opts.height / height))
 
-        return image.resize((new_width, new_height))
+        return new_width, new_height
 
     raise ValueError(f"Unknown resize strategy: {resize_opts.strategy}")
+
+
+def _resize_image(
+    image: "Image.Image",
+    options: EncodeOptions,
+    *,
+    source_size: Optional[tuple[int, int]] = None,
+) -> "Image.Image":
+    """Resize the image, computing the dimensions from source_size when the image was already
+    downsampled from it."""
+    if options.resize_options is None:
+        return image
+
+    resize_opts = options.resize_options
+    new_size = _scaled_size(*(source_size or image.size), resize_opts)
+    resized = image.resize(new_size) if image.size != new_size else image
+    if resize_opts.strategy not in ("center_aspect_fit", "center_aspect_cover"):
+        return resized
+
+    result = Image.new("RGB", (resize_opts.width, resize_opts.height))  # noqa
+    Image.Image.paste(
+        result,
+        resized,
+        (
+            (resize_opts.width - new_size[0]) // 2,
+            (resize_opts.height - new_size[1]) // 2,
+        ),
+    )
+    return result
@@ -1,6 +1,7 @@
 from . import io, run_result
 from .agent import Agent, AgentTask, ModelSettings
 from .agent_session import AgentSession, VoiceActivityVideoSampler
+from .audio_recognition import STTGatingOptions
 from .events import (
     AgentEvent,
     AgentFalseInterruptionEvent,
@@ -27,6 +28,7 @@ from .transcription import TranscriptSynchronizer
 __all__ = [
     "AgentSession",
     "VoiceActivityVideoSampler",
+    "STTGatingOptions",
     "Agent",
     "ModelSettings",
     "AgentTask",
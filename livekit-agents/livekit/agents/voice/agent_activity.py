@@ -4,9 +4,10 @@ import asyncio
 import contextvars
 import heapq
 import json
+import re
 import time
-from collections.abc import AsyncIterable, Coroutine, Sequence
-from dataclasses import dataclass
+from collections.abc import AsyncIterable, AsyncIterator, Coroutine, Sequence
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Optional, Union, cast
 
 from opentelemetry import context as otel_context, trace
@@ -30,6 +31,7 @@ from ..log import logger
 from ..metrics import (
     EOUMetrics,
     LLMMetrics,
+    PreemptiveGenerationMetrics,
     RealtimeModelMetrics,
     STTMetrics,
     TTSMetrics,
@@ -64,6 +66,7 @@ from .events import (
 from .generation import (
     ToolExecutionOutput,
     _AudioOutput,
+    _LLMGenerationData,
     _TextOutput,
     _TTSGenerationData,
     perform_audio_forwarding,
@@ -102,6 +105,30 @@ class _PreemptiveGeneration:
     tools: list[llm.FunctionTool | llm.RawFunctionTool]
     tool_choice: llm.ToolChoice | None
     created_at: float
+    transcript: str
+    """The normalized transcript, see _normalize_transcript"""
+
+
+@dataclass
+class _PreemptiveTurn:
+    """The speculative generations started during a user turn, for PreemptiveGenerationMetrics"""
+
+    speech_handles: list[SpeechHandle] = field(default_factory=list)
+    completion_tokens: dict[str, int] = field(default_factory=dict)
+    """The completion tokens reported by the LLM usage, per speech id"""
+    llm_gen_data: dict[str, list[_LLMGenerationData]] = field(default_factory=dict)
+    """The LLM generations of each speech, a cancelled LLMStream never reports its usage"""
+    reused: int = 0
+    cancelled: int = 0
+    used: SpeechHandle | None = None
+
+
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*\s")
+
+
+def _normalize_transcript(transcript: str) -> str:
+    # ignore the casing and punctuation, the STT often revises them when finalizing a transcript
+    return " ".join(re.findall(r"[\w']+", transcript.lower()))
 
 
 # NOTE: AgentActivity isn't exposed to the public API
@@ -134,7 +161,10 @@ class AgentActivity(RecognitionHooks):
         self._user_turn_completed_atask: asyncio.Task[None] | None = None
         self._speech_tasks: list[asyncio.Task[Any]] = []
 
-        self._preemptive_generation: _PreemptiveGeneration | None = None
+        self._preemptive_generations: list[_PreemptiveGeneration] = []
+        self._preemptive_turn: _PreemptiveTurn | None = None
+        # speech_id -> turn, until the PreemptiveGenerationMetrics of the turn are emitted
+        self._preemptive_speeches: dict[str, _PreemptiveTurn] = {}
 
         self._drain_blocked_tasks: list[asyncio.Task[Any]] = []
         self._mcp_tools: list[mcp.MCPTool] = []
@@ -585,6 +615,7 @@ class AgentActivity(RecognitionHooks):
             min_endpointing_delay=self.min_endpointing_delay,
             max_endpointing_delay=self.max_endpointing_delay,
             turn_detection=self._turn_detection,
+            stt_gating=self._session.options.stt_gating,
         )
         self._audio_recognition.start()
 
@@ -907,6 +938,7 @@ class AgentActivity(RecognitionHooks):
                         if utils.is_given(tool_choice) or self._tool_choice is None
                         else self._tool_choice
                     ),
+                    speculative_tts=not schedule_speech,
                 ),
                 speech_handle=handle,
                 name="AgentActivity.pipeline_reply",
@@ -919,9 +951,70 @@ class AgentActivity(RecognitionHooks):
         return handle
 
     def _cancel_preemptive_generation(self) -> None:
-        if self._preemptive_generation is not None:
-            self._preemptive_generation.speech_handle._cancel()
-            self._preemptive_generation = None
+        for preemptive in self._preemptive_generations:
+            preemptive.speech_handle._cancel()
+            if self._preemptive_turn is not None:
+                self._preemptive_turn.cancelled += 1
+
+        self._preemptive_generations = []
+        self._close_preemptive_turn()
+
+    def _close_preemptive_turn(self) -> None:
+        """Emit the PreemptiveGenerationMetrics of the turn once all its generations are done"""
+        if (turn := self._preemptive_turn) is None:
+            return
+
+        self._preemptive_turn = None
+        pending = {handle for handle in turn.speech_handles if not handle.done()}
+
+        def _emit_metrics() -> None:
+            for handle in turn.speech_handles:
+                self._preemptive_speeches.pop(handle.id, None)
+
+            completion_tokens = used_tokens = 0
+            for handle in turn.speech_handles:
+                tokens = turn.completion_tokens.get(handle.id, 0)
+                if not tokens:
+                    # cancelled before the usage was received, count the streamed chunks instead
+                    # (the LLMs stream about one token per chunk)
+                    tokens = sum(
+                        data.generated_text_chunks for data in turn.llm_gen_data.get(handle.id, [])
+                    )
+                completion_tokens += tokens
+                if handle is turn.used:
+                    used_tokens = tokens
+            ev = PreemptiveGenerationMetrics(
+                timestamp=time.time(),
+                candidates=len(turn.speech_handles),
+                reused=turn.reused,
+                cancelled=turn.cancelled,
+                used=turn.used is not None,
+                completion_tokens=completion_tokens,
+                wasted_completion_tokens=completion_tokens - used_tokens,
+                speech_id=turn.used.id if turn.used else None,
+            )
+            self._session.emit("metrics_collected", MetricsCollectedEvent(metrics=ev))
+
+        def _on_speech_done(speech_handle: SpeechHandle) -> None:
+            pending.discard(speech_handle)
+            if not pending:
+                _emit_metrics()
+
+        if not pending:
+            _emit_metrics()
+
+        for handle in list(pending):
+            handle.add_done_callback(_on_speech_done)
+
+    def _preemptive_generation_valid(
+        self, preemptive: _PreemptiveGeneration, chat_ctx: llm.ChatContext
+    ) -> bool:
+        # the request parameters must not have changed since the generation started
+        return (
+            preemptive.chat_ctx.is_equivalent(chat_ctx)
+            and preemptive.tools == self.tools
+            and preemptive.tool_choice == self._tool_choice
+        )
 
     def _interrupt_background_speeches(self, force: bool = False) -> list[SpeechHandle]:
         interrupted_speeches: list[SpeechHandle] = []
@@ -1079,6 +1172,12 @@ class AgentActivity(RecognitionHooks):
             isinstance(ev, LLMMetrics) or isinstance(ev, TTSMetrics)
         ):
             ev.speech_id = speech_handle.id
+            if isinstance(ev, LLMMetrics) and (
+                turn := self._preemptive_speeches.get(speech_handle.id)
+            ):
+                turn.completion_tokens[speech_handle.id] = (
+                    turn.completion_tokens.get(speech_handle.id, 0) + ev.completion_tokens
+                )
         if (
             isinstance(ev, RealtimeModelMetrics)
             and self._realtime_spans is not None
@@ -1315,7 +1414,28 @@ class AgentActivity(RecognitionHooks):
         ):
             return
 
-        self._cancel_preemptive_generation()
+        transcript = _normalize_transcript(info.new_transcript)
+        turn = self._preemptive_turn or _PreemptiveTurn()
+        self._preemptive_turn = turn
+
+        # keep the generations whose transcript is extended by the new one, the turn may still
+        # end there (e.g. the last words were a preflight transcript that gets revised)
+        kept: list[_PreemptiveGeneration] = []
+        for preemptive in self._preemptive_generations:
+            if (
+                transcript == preemptive.transcript
+                or transcript.startswith(preemptive.transcript + " ")
+            ) and self._preemptive_generation_valid(preemptive, self._agent.chat_ctx):
+                kept.append(preemptive)
+            else:
+                preemptive.speech_handle._cancel()
+                turn.cancelled += 1
+
+        self._preemptive_generations = kept
+        if any(preemptive.transcript == transcript for preemptive in kept):
+            # only the casing or punctuation changed, the running generation is still valid
+            turn.reused += 1
+            return
 
         user_message = llm.ChatMessage(
             role="user",
@@ -1330,17 +1450,27 @@ class AgentActivity(RecognitionHooks):
             chat_ctx=chat_ctx,
             schedule_speech=False,
         )
+        turn.speech_handles.append(speech_handle)
+        self._preemptive_speeches[speech_handle.id] = turn
 
-        self._preemptive_generation = _PreemptiveGeneration(
-            speech_handle=speech_handle,
-            user_message=user_message,
-            info=info,
-            chat_ctx=chat_ctx.copy(),
-            tools=self.tools.copy(),
-            tool_choice=self._tool_choice,
-            created_at=time.time(),
+        self._preemptive_generations.append(
+            _PreemptiveGeneration(
+                speech_handle=speech_handle,
+                user_message=user_message,
+                info=info,
+                chat_ctx=chat_ctx.copy(),
+                tools=self.tools.copy(),
+                tool_choice=self._tool_choice,
+                created_at=time.time(),
+                transcript=transcript,
+            )
         )
 
+        max_generations = max(self._session.options.max_preemptive_generations, 1)
+        while len(self._preemptive_generations) > max_generations:
+            self._preemptive_generations.pop(0).speech_handle._cancel()
+            turn.cancelled += 1
+
     def on_end_of_turn(self, info: _EndOfTurnInfo) -> bool:
         # IMPORTANT: This method is sync to avoid it being cancelled by the AudioRecognition
         # We explicitly create a new task here
@@ -1497,32 +1627,37 @@ class AgentActivity(RecognitionHooks):
             user_message.metrics = metrics_report
 
         speech_handle: SpeechHandle | None = None
-        if preemptive := self._preemptive_generation:
-            # make sure the on_user_turn_completed didn't change some request parameters
-            # otherwise invalidate the preemptive generation
-            if (
-                preemptive.info.new_transcript == user_message.text_content
-                and preemptive.chat_ctx.is_equivalent(temp_mutable_chat_ctx)
-                and preemptive.tools == self.tools
-                and preemptive.tool_choice == self._tool_choice
-            ):
+        if self._preemptive_generations:
+            transcript = _normalize_transcript(user_message.text_content or "")
+            for preemptive in self._preemptive_generations:
+                if preemptive.transcript != transcript:
+                    continue
+
+                # make sure the on_user_turn_completed didn't change some request parameters
+                # otherwise invalidate the preemptive generation
+                if not self._preemptive_generation_valid(preemptive, temp_mutable_chat_ctx):
+                    logger.warning(
+                        "preemptive generation enabled but chat context or tools have changed after `on_user_turn_completed`",  # noqa: E501
+                    )
+                    break
+
                 speech_handle = preemptive.speech_handle
 
                 # preemptive generation is using another ChatMessage created outside of the on_end_of_turn callback,
-                # inject the metrics here.
+                # inject the metrics and the final transcript here.
+                preemptive.user_message.content = list(user_message.content)
                 preemptive.user_message.metrics = metrics_report
                 self._schedule_speech(speech_handle, priority=SpeechHandle.SPEECH_PRIORITY_NORMAL)
                 logger.debug(
                     "using preemptive generation",
                     extra={"preemptive_lead_time": time.time() - preemptive.created_at},
                 )
-            else:
-                logger.warning(
-                    "preemptive generation enabled but chat context or tools have changed after `on_user_turn_completed`",  # noqa: E501
-                )
-                preemptive.speech_handle._cancel()
+                self._preemptive_generations.remove(preemptive)
+                if self._preemptive_turn is not None:
+                    self._preemptive_turn.used = speech_handle
+                break
 
-            self._preemptive_generation = None
+            self._cancel_preemptive_generation()
 
         if speech_handle is None:
             # Ensure the new message is passed to generate_reply
@@ -1708,6 +1843,7 @@ class AgentActivity(RecognitionHooks):
         model_settings: ModelSettings,
         new_message: llm.ChatMessage | None = None,
         instructions: str | None = None,
+        speculative_tts: bool = False,
         _previous_user_metrics: llm.MetricsReport | None = None,
         _previous_tools_messages: Sequence[llm.FunctionCall | llm.FunctionCallOutput] | None = None,
     ) -> None:
@@ -1752,10 +1888,46 @@ class AgentActivity(RecognitionHooks):
             model_settings=model_settings,
         )
         tasks.append(llm_task)
+        if turn := self._preemptive_speeches.get(speech_handle.id):
+            turn.llm_gen_data.setdefault(speech_handle.id, []).append(llm_gen_data)
 
         text_tee = utils.aio.itertools.tee(llm_gen_data.text_ch, 2)
         tts_text_input, tr_input = text_tee
 
+        async def _first_sentence_until_scheduled(
+            llm_output: AsyncIterable[str | FlushSentinel],
+        ) -> AsyncIterator[str | FlushSentinel]:
+            # synthesize the first sentence right away, the rest only if the speech gets used
+            first_sentence = ""
+            async for chunk in llm_output:
+                if speech_handle.scheduled or isinstance(chunk, FlushSentinel):
+                    yield chunk
+                    continue
+
+                first_sentence += chunk
+                if not (m := _SENTENCE_END.search(first_sentence)):
+                    yield chunk
+                    continue
+
+                split = len(chunk) - (len(first_sentence) - m.end())
+                yield chunk[:split]
+                yield FlushSentinel()
+
+                wait_for_scheduled = asyncio.ensure_future(speech_handle._wait_for_scheduled())
+                try:
+                    await speech_handle.wait_if_not_interrupted([wait_for_scheduled])
+                finally:
+                    wait_for_scheduled.cancel()
+
+                if speech_handle.interrupted:
+                    return
+
+                if chunk[split:]:
+                    yield chunk[split:]
+
+        if speculative_tts:
+            tts_text_input = _first_sentence_until_scheduled(tts_text_input)
+
         tts_task: asyncio.Task[bool] | None = None
         tts_gen_data: _TTSGenerationData | None = None
         read_transcript_from_tts = False
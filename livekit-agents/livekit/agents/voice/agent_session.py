@@ -39,7 +39,7 @@ from . import io, room_io
 from ._utils import _set_participant_attributes
 from .agent import Agent
 from .agent_activity import AgentActivity
-from .audio_recognition import TurnDetectionMode
+from .audio_recognition import STTGatingOptions, TurnDetectionMode
 from .events import (
     AgentEvent,
     AgentState,
@@ -53,7 +53,7 @@ from .events import (
     UserStateChangedEvent,
 )
 from .ivr import IVRActivity
-from .recorder_io import RecorderIO
+from .recorder_io import RecorderIO, RecorderOptions
 from .run_result import RunResult
 from .speech_handle import SpeechHandle
 
@@ -87,8 +87,10 @@ class AgentSessionOptions:
     min_consecutive_speech_delay: float
     use_tts_aligned_transcript: bool | None
     preemptive_generation: bool
+    max_preemptive_generations: int
     tts_text_transforms: Sequence[TextTransforms] | None
     ivr_detection: bool
+    stt_gating: STTGatingOptions | None
 
 
 Userdata_T = TypeVar("Userdata_T")
@@ -158,7 +160,9 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
         use_tts_aligned_transcript: NotGivenOr[bool] = NOT_GIVEN,
         tts_text_transforms: NotGivenOr[Sequence[TextTransforms] | None] = NOT_GIVEN,
         preemptive_generation: bool = False,
+        max_preemptive_generations: int = 1,
         ivr_detection: bool = False,
+        stt_gating: bool | STTGatingOptions = False,
         conn_options: NotGivenOr[SessionConnectOptions] = NOT_GIVEN,
         loop: asyncio.AbstractEventLoop | None = None,
         # deprecated
@@ -243,8 +247,20 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
                 can reduce response latency by overlapping model inference with user audio,
                 but may incur extra compute if the user interrupts or revises mid-utterance.
                 Defaults to ``False``.
+            max_preemptive_generations (int): The maximum number of speculative generations
+                kept running at once, the oldest ones are cancelled first. A transcript update
+                that only changes the casing or punctuation always reuses the running generation.
+                With ``2`` or more, a generation is also kept next to the new one while the new
+                transcripts only extend its own, so it can still be used if the STT revises the
+                end of the transcript, this trades LLM tokens for latency. With ``1`` an extended
+                transcript cancels it. Only the first sentence of a speculative reply is
+                synthesized before it is used. Default ``1``.
             ivr_detection (bool): Whether to detect if the agent is interacting with an IVR system.
                 Default ``False``.
+            stt_gating (bool | STTGatingOptions): Whether to only send the user audio to the
+                STT while the VAD detects speech, with some padding before and after it.
+                Saves uploading long silences, the transcript timestamps are kept on the
+                user audio timeline. Requires a VAD. Default ``False``.
             conn_options (SessionConnectOptions, optional): Connection options for
                 stt, llm, and tts.
             loop (asyncio.AbstractEventLoop, optional): Event loop to bind the
@@ -264,6 +280,9 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
 
         self._video_sampler = video_sampler
 
+        if stt_gating is True:
+            stt_gating = STTGatingOptions()
+
         # This is the "global" chat_context, it holds the entire conversation history
         self._chat_ctx = ChatContext.empty()
         self._opts = AgentSessionOptions(
@@ -284,7 +303,9 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
                 else DEFAULT_TTS_TEXT_TRANSFORMS
             ),
             preemptive_generation=preemptive_generation,
+            max_preemptive_generations=max_preemptive_generations,
             ivr_detection=ivr_detection,
+            stt_gating=stt_gating if isinstance(stt_gating, STTGatingOptions) else None,
             use_tts_aligned_transcript=use_tts_aligned_transcript
             if is_given(use_tts_aligned_transcript)
             else None,
@@ -353,6 +374,7 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
 
         self._recorded_events: list[AgentEvent] = []
         self._enable_recording: bool = False
+        self._recorder_options: RecorderOptions | None = None
         self._started_at: float | None = None
 
         # ivr activity
@@ -444,7 +466,7 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
         # deprecated
         room_input_options: NotGivenOr[room_io.RoomInputOptions] = NOT_GIVEN,
         room_output_options: NotGivenOr[room_io.RoomOutputOptions] = NOT_GIVEN,
-        record: bool = True,
+        record: bool | RecorderOptions = True,
     ) -> RunResult: ...
 
     @overload
@@ -458,7 +480,7 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
         # deprecated
         room_input_options: NotGivenOr[room_io.RoomInputOptions] = NOT_GIVEN,
         room_output_options: NotGivenOr[room_io.RoomOutputOptions] = NOT_GIVEN,
-        record: bool = True,
+        record: bool | RecorderOptions = True,
     ) -> None: ...
 
     async def start(
@@ -471,7 +493,7 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
         # deprecated
         room_input_options: NotGivenOr[room_io.RoomInputOptions] = NOT_GIVEN,
         room_output_options: NotGivenOr[room_io.RoomOutputOptions] = NOT_GIVEN,
-        record: NotGivenOr[bool] = NOT_GIVEN,
+        record: NotGivenOr[bool | RecorderOptions] = NOT_GIVEN,
     ) -> RunResult | None:
         """Start the voice agent.
 
@@ -483,7 +505,7 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
             room: The room to use for input and output
             room_input_options: Options for the room input
             room_output_options: Options for the room output
-            record: Whether to record the audio
+            record: Whether to record the audio, pass RecorderOptions to configure the encoder
         """
         async with self._lock:
             if self._started:
@@ -498,7 +520,8 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
                 if not is_given(record):
                     record = job_ctx.job.enable_recording
 
-                self._enable_recording = record
+                self._enable_recording = record is not False
+                self._recorder_options = record if isinstance(record, RecorderOptions) else None
 
                 if self._enable_recording:
                     job_ctx.init_recording()
@@ -568,7 +591,9 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
                 # these aren't relevant during eval mode, as they require job context and/or room_io
                 if self.input.audio and self.output.audio:
                     if self._enable_recording:
-                        self._recorder_io = RecorderIO(agent_session=self)
+                        self._recorder_io = RecorderIO(
+                            agent_session=self, options=self._recorder_options
+                        )
                         self.input.audio = self._recorder_io.record_input(self.input.audio)
                         self.output.audio = self._recorder_io.record_output(self.output.audio)
 
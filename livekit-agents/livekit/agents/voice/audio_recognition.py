@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import bisect
 import math
 import time
+from collections import deque
 from collections.abc import AsyncIterable
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Literal, Optional, Protocol, Union, cast
@@ -14,7 +15,7 @@ from livekit import rtc
 
 from .. import llm, stt, utils, vad
 from ..log import logger
-from ..telemetry import trace_types, tracer
+from ..telemetry import trace_types, tracer, utils as trace_utils
 from ..types import NOT_GIVEN, NotGivenOr
 from ..utils import aio, is_given
 from . import io
@@ -46,6 +47,114 @@ class _PreemptiveGenerationInfo:
     started_speaking_at: float | None
 
 
+@dataclass
+class STTGatingOptions:
+    """Send the user audio to the STT only around the speech detected by the VAD.
+
+    Long silences (e.g. while the user is on hold) are not uploaded, the timestamps of the
+    transcripts are mapped back to the user audio timeline.
+    """
+
+    pre_roll: float = 0.5
+    """Audio kept before the VAD start of speech and sent with it, must cover the VAD
+    detection latency so the first syllables aren't cut."""
+    hangover: float = 0.5
+    """Audio still sent after the VAD end of speech, so the STT can endpoint the utterance."""
+    keepalive_interval: float | None = 5.0
+    """While no audio is sent, send a short frame of silence at this interval, so STTs closing
+    idle streams keep them open. Set to ``None`` to disable."""
+
+
+class _STTAudioGate:
+    """Forwards the audio frames to an STT channel while the VAD detects speech"""
+
+    KEEPALIVE_DURATION = 0.02
+
+    def __init__(self, opts: STTGatingOptions, ch: aio.Chan[rtc.AudioFrame]) -> None:
+        self._opts = opts
+        self._ch = ch
+        self._speaking = False
+        self._hangover_left = 0.0
+        self._pre_roll: deque[tuple[rtc.AudioFrame, float]] = deque()
+        self._pre_roll_duration = 0.0
+        self._gated_duration = 0.0  # since the last frame sent
+        self._input_time = 0.0  # duration of the audio pushed
+        self._sent_time = 0.0  # duration of the audio sent to the STT
+        self._next_input_time = 0.0
+        # where the sent audio jumps in the input timeline, used to remap the STT timestamps
+        self._sent_starts: list[float] = [0.0]
+        self._input_starts: list[float] = [0.0]
+
+    @property
+    def input_duration(self) -> float:
+        return self._input_time
+
+    @property
+    def sent_duration(self) -> float:
+        return self._sent_time
+
+    def push_frame(self, frame: rtc.AudioFrame) -> None:
+        if self._speaking or self._hangover_left > 0.0:
+            if not self._speaking:
+                self._hangover_left -= frame.duration
+            self._send(frame, self._input_time)
+        else:
+            self._pre_roll.append((frame, self._input_time))
+            self._pre_roll_duration += frame.duration
+            while (
+                self._pre_roll
+                and self._pre_roll_duration - self._pre_roll[0][0].duration >= self._opts.pre_roll
+            ):
+                dropped, _ = self._pre_roll.popleft()
+                self._pre_roll_duration -= dropped.duration
+                self._gated_duration += dropped.duration
+
+            interval = self._opts.keepalive_interval
+            if interval is not None and self._gated_duration >= interval:
+                keepalive = rtc.AudioFrame.create(
+                    frame.sample_rate,
+                    frame.num_channels,
+                    int(frame.sample_rate * self.KEEPALIVE_DURATION),
+                )
+                self._send(keepalive, self._input_time)
+
+        self._input_time += frame.duration
+
+    def update_speaking(self, speaking: bool) -> None:
+        if speaking and not self._speaking:
+            for frame, input_time in self._pre_roll:
+                self._send(frame, input_time)
+            self._pre_roll.clear()
+            self._pre_roll_duration = 0.0
+        elif not speaking and self._speaking:
+            self._hangover_left = self._opts.hangover
+
+        self._speaking = speaking
+
+    def remap_event(self, ev: stt.SpeechEvent) -> None:
+        """Move the timestamps of the event from the sent audio to the input audio timeline"""
+        for data in ev.alternatives:
+            if data.start_time == 0.0 and data.end_time == 0.0:
+                continue  # the STT doesn't report timestamps
+
+            data.start_time = self._remap(data.start_time)
+            data.end_time = self._remap(data.end_time)
+
+    def _remap(self, sent_time: float) -> float:
+        i = bisect.bisect_right(self._sent_starts, sent_time) - 1
+        return self._input_starts[i] + sent_time - self._sent_starts[i]
+
+    def _send(self, frame: rtc.AudioFrame, input_time: float) -> None:
+        if abs(input_time - self._next_input_time) > 1e-6:
+            self._sent_starts.append(self._sent_time)
+            self._input_starts.append(input_time)
+
+        self._ch.send_nowait(frame)
+        self._sent_time += frame.duration
+        self._next_input_time = input_time + frame.duration
+        self._gated_duration = 0.0
+
+
 class _TurnDetector(Protocol):
     @property
     def model(self) -> str:
@@ -103,6 +212,7 @@ class AudioRecognition:
         turn_detection: TurnDetectionMode | None,
         min_endpointing_delay: float,
         max_endpointing_delay: float,
+        stt_gating: STTGatingOptions | None = None,
     ) -> None:
         self._session = session
         self._hooks = hooks
@@ -137,6 +247,8 @@ class AudioRecognition:
         self._last_language: str | None = None
 
         self._stt_ch: aio.Chan[rtc.AudioFrame] | None = None
+        self._stt_gating = stt_gating
+        self._stt_gate: _STTAudioGate | None = None
         self._vad_ch: aio.Chan[rtc.AudioFrame] | None = None
         self._tasks: set[asyncio.Task[Any]] = set()
 
@@ -182,7 +294,9 @@ class AudioRecognition:
 
     def push_audio(self, frame: rtc.AudioFrame) -> None:
         self._sample_rate = frame.sample_rate
-        if self._stt_ch is not None:
+        if self._stt_gate is not None:
+            self._stt_gate.push_frame(frame)
+        elif self._stt_ch is not None:
             self._stt_ch.send_nowait(frame)
 
         if self._vad_ch is not None:
@@ -209,8 +323,13 @@ class AudioRecognition:
         self._stt = stt
         if stt:
             self._stt_ch = aio.Chan[rtc.AudioFrame]()
+            self._stt_gate = None
+            if self._stt_gating is not None and self._vad is not None:
+                self._stt_gate = _STTAudioGate(self._stt_gating, self._stt_ch)
+                self._stt_gate.update_speaking(self._speaking)
+
             self._stt_atask = asyncio.create_task(
-                self._stt_task(stt, self._stt_ch, self._stt_atask)
+                self._stt_task(stt, self._stt_ch, self._stt_atask, self._stt_gate)
             )
         elif self._stt_atask is not None:
             task = asyncio.create_task(aio.cancel_and_wait(self._stt_atask))
@@ -218,9 +337,13 @@ class AudioRecognition:
             self._tasks.add(task)
             self._stt_atask = None
             self._stt_ch = None
+            self._stt_gate = None
 
     def update_vad(self, vad: vad.VAD | None) -> None:
         self._vad = vad
+        if vad is None and self._stt_gate is not None:
+            # nothing will open the gate anymore
+            self._stt_gate.update_speaking(True)
         if vad:
             self._vad_ch = aio.Chan[rtc.AudioFrame]()
             self._vad_atask = asyncio.create_task(
@@ -473,6 +596,8 @@ class AudioRecognition:
                 self._hooks.on_start_of_speech(ev)
 
             self._speaking = True
+            if self._stt_gate is not None:
+                self._stt_gate.update_speaking(True)
 
             if self._end_of_turn_task is not None:
                 self._end_of_turn_task.cancel()
@@ -492,6 +617,8 @@ class AudioRecognition:
                 self._hooks.on_end_of_speech(ev)
 
             self._speaking = False
+            if self._stt_gate is not None:
+                self._stt_gate.update_speaking(False)
 
             if self._vad_base_turn_detection or (
                 self._turn_detection_mode == "stt" and self._user_turn_committed
@@ -546,15 +673,9 @@ class AudioRecognition:
                         except Exception:
                             logger.exception("Error predicting end of turn")
 
+                        trace_utils.record_chat_ctx(eou_detection_span, chat_ctx)
                         eou_detection_span.set_attributes(
                             {
-                                trace_types.ATTR_CHAT_CTX: json.dumps(
-                                    chat_ctx.to_dict(
-                                        exclude_audio=True,
-                                        exclude_image=True,
-                                        exclude_timestamp=False,
-                                    )
-                                ),
                                 trace_types.ATTR_EOU_PROBABILITY: end_of_turn_probability,
                                 trace_types.ATTR_EOU_UNLIKELY_THRESHOLD: unlikely_threshold or 0,
                                 trace_types.ATTR_EOU_DELAY: endpointing_delay,
@@ -645,6 +766,7 @@ class AudioRecognition:
         stt_node: io.STTNode,
         audio_input: AsyncIterable[rtc.AudioFrame],
         task: asyncio.Task[None] | None,
+        gate: _STTAudioGate | None,
     ) -> None:
         if task is not None:
             await aio.cancel_and_wait(task)
@@ -661,6 +783,8 @@ class AudioRecognition:
                 assert isinstance(ev, stt.SpeechEvent), (
                     f"STT node must yield SpeechEvent, got: {type(ev)}"
                 )
+                if gate is not None:
+                    gate.remap_event(ev)
                 await self._on_stt_event(ev)
 
     @utils.log_exceptions(logger=logger)
@@ -2,9 +2,13 @@ from __future__ import annotations
 
 import asyncio
 import atexit
+import concurrent.futures
 import contextlib
 import enum
+import os
 import random
+import threading
+from collections import OrderedDict
 from collections.abc import AsyncGenerator, AsyncIterator, Generator
 from importlib.resources import as_file, files
 from typing import Any, NamedTuple, Union, cast
@@ -60,6 +64,109 @@ class AudioConfig(NamedTuple):
 # Instead, we remove the sound from the mixer, and it will get removed 400ms later.
 _AUDIO_SOURCE_BUFFER_MS = 400
 
+_SAMPLE_RATE = 48000
+_CLIP_FRAME_SAMPLES = 960  # 20ms
+
+# decoded clips are shared by every player of the process, clips bigger than the budget
+# are streamed from the file on each play instead
+CLIP_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _apply_volume(data: np.ndarray, volume: float) -> np.ndarray:
+    out = np.multiply(data, np.float32(volume), dtype=np.float32)
+    np.clip(out, -32768, 32767, out=out)
+    result = np.empty(len(out), dtype=np.int16)
+    np.copyto(result, out, casting="unsafe")
+    return result
+
+
+class _ClipCache:
+    """LRU cache of decoded clips, as mono 48kHz PCM with the volume already applied"""
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._clips: OrderedDict[tuple[Any, ...], np.ndarray] = OrderedDict()
+        self._size = 0
+        self._oversized: set[tuple[Any, ...]] = set()
+        # one decode per clip, the other players wait for it (they may run on other event loops)
+        self._decoding: dict[tuple[Any, ...], concurrent.futures.Future[None]] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, path: str, volume: float) -> np.ndarray | None:
+        """Return the decoded clip, or None if it doesn't fit in the cache"""
+        stat = await asyncio.to_thread(os.stat, path)
+        if stat.st_size > self._max_bytes:
+            return None  # compressed size is already over budget
+
+        # the file metadata is part of the key so a rewritten file is decoded again
+        key = (path, stat.st_mtime_ns, stat.st_size, _SAMPLE_RATE, volume)
+        while True:
+            with self._lock:
+                clip = self._clips.get(key)
+                if clip is not None:
+                    self._clips.move_to_end(key)
+                    return clip
+
+                if key in self._oversized:
+                    return None
+
+                decoding = self._decoding.get(key)
+                if decoding is None:
+                    decoding = self._decoding[key] = concurrent.futures.Future()
+                    break
+
+            # the clip is cached once the decode is done, or decoded again if it failed
+            await asyncio.wait([asyncio.wrap_future(decoding)])
+
+        try:
+            clip = await self._decode(path, volume)
+            with self._lock:
+                if clip is None:
+                    self._oversized.add(key)
+                    return None
+
+                clip.flags.writeable = False
+                self._clips[key] = clip
+                self._size += clip.nbytes
+                while self._size > self._max_bytes:
+                    _, evicted = self._clips.popitem(last=False)
+                    self._size -= evicted.nbytes
+
+            return clip
+        finally:
+            with self._lock:
+                del self._decoding[key]
+            decoding.set_result(None)
+
+    async def _decode(self, path: str, volume: float) -> np.ndarray | None:
+        frames: list[np.ndarray] = []
+        nbytes = 0
+        stream = audio_frames_from_file(path, sample_rate=_SAMPLE_RATE)
+        try:
+            async for frame in stream:
+                data = np.frombuffer(frame.data, dtype=np.int16)
+                nbytes += data.nbytes
+                if nbytes > self._max_bytes:
+                    return None  # stop decoding, the clip is streamed from the file instead
+
+                frames.append(data)
+        finally:
+            await stream.aclose()
+
+        clip = np.concatenate(frames) if frames else np.empty(0, dtype=np.int16)
+        if volume != 1.0:
+            clip = _apply_volume(clip, volume)
+        return clip
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clips.clear()
+            self._oversized.clear()
+            self._size = 0
+
+
+_clip_cache = _ClipCache(CLIP_CACHE_MAX_BYTES)
+
 
 class BackgroundAudioPlayer:
     def __init__(
@@ -335,7 +442,11 @@ class BackgroundAudioPlayer:
             sound = sound.path()
 
         if isinstance(sound, str):
-            if loop:
+            clip = await _clip_cache.get(sound, volume)
+            if clip is not None:
+                sound = _clip_frames(clip, loop=loop)
+                volume = 1.0  # already applied to the cached clip
+            elif loop:
                 sound = _loop_audio_frames(sound)
             else:
                 sound = audio_frames_from_file(sound)
@@ -343,11 +454,9 @@ class BackgroundAudioPlayer:
         async def _gen_wrapper() -> AsyncGenerator[rtc.AudioFrame, None]:
             async for frame in sound:
                 if volume != 1.0:
-                    data = np.frombuffer(frame.data, dtype=np.int16).astype(np.float32)
-                    data *= 10 ** (np.log10(volume))
-                    np.clip(data, -32768, 32767, out=data)
+                    data = _apply_volume(np.frombuffer(frame.data, dtype=np.int16), volume)
                     yield rtc.AudioFrame(
-                        data=data.astype(np.int16).tobytes(),
+                        data=data.data,
                         sample_rate=frame.sample_rate,
                         num_channels=frame.num_channels,
                         samples_per_channel=frame.samples_per_channel,
@@ -431,6 +540,24 @@ class PlayHandle:
             self._done_fut.set_result(None)
 
 
+async def _clip_frames(clip: np.ndarray, *, loop: bool) -> AsyncGenerator[rtc.AudioFrame, None]:
+    if len(clip) == 0:
+        return
+
+    while True:
+        for i in range(0, len(clip), _CLIP_FRAME_SAMPLES):
+            data = clip[i : i + _CLIP_FRAME_SAMPLES]
+            yield rtc.AudioFrame(
+                data=data.data,
+                sample_rate=_SAMPLE_RATE,
+                num_channels=1,
+                samples_per_channel=len(data),
+            )
+
+        if not loop:
+            return
+
+
 async def _loop_audio_frames(file_path: str) -> AsyncGenerator[rtc.AudioFrame, None]:
     while True:
         async for frame in audio_frames_from_file(file_path):
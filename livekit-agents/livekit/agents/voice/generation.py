@@ -28,7 +28,7 @@ from ..llm.tool_context import (
     is_raw_function_tool,
 )
 from ..log import logger
-from ..telemetry import trace_types, tracer
+from ..telemetry import trace_types, tracer, utils as trace_utils
 from ..types import USERDATA_TIMED_TRANSCRIPT, FlushSentinel, NotGivenOr
 from ..utils import aio, is_given
 from ..utils.aio import itertools
@@ -52,6 +52,7 @@ class _LLMGenerationData:
     text_ch: aio.Chan[str | FlushSentinel]
     function_ch: aio.Chan[llm.FunctionCall]
     generated_text: str = ""
+    generated_text_chunks: int = 0
     generated_functions: list[llm.FunctionCall] = field(default_factory=list)
     id: str = field(default_factory=lambda: utils.shortuuid("item_"))
     started_fut: asyncio.Future[None] = field(default_factory=asyncio.Future)
@@ -99,15 +100,11 @@ async def _llm_inference_task(
     text_ch, function_ch = data.text_ch, data.function_ch
     tools = list(tool_ctx.function_tools.values())
 
-    current_span.set_attribute(
-        trace_types.ATTR_CHAT_CTX,
-        json.dumps(
-            chat_ctx.to_dict(exclude_audio=True, exclude_image=True, exclude_timestamp=False)
-        ),
-    )
-    current_span.set_attribute(
-        trace_types.ATTR_FUNCTION_TOOLS, json.dumps(list(tool_ctx.function_tools.keys()))
-    )
+    trace_utils.record_chat_ctx(current_span, chat_ctx)
+    if current_span.is_recording():
+        current_span.set_attribute(
+            trace_types.ATTR_FUNCTION_TOOLS, json.dumps(list(tool_ctx.function_tools.keys()))
+        )
 
     llm_node = node(chat_ctx, tools, model_settings)
     if asyncio.iscoroutine(llm_node):
@@ -118,6 +115,7 @@ async def _llm_inference_task(
 
     if isinstance(llm_node, str):
         data.generated_text = llm_node
+        data.generated_text_chunks = 1
         text_ch.send_nowait(llm_node)
         current_span.set_attribute(trace_types.ATTR_RESPONSE_TEXT, data.generated_text)
         return True
@@ -134,6 +132,7 @@ async def _llm_inference_task(
             # io.LLMNode can either return a string or a ChatChunk
             if isinstance(chunk, str):
                 data.generated_text += chunk
+                data.generated_text_chunks += 1
                 text_ch.send_nowait(chunk)
 
             elif isinstance(chunk, ChatChunk):
@@ -156,6 +155,7 @@ async def _llm_inference_task(
 
                 if chunk.delta.content:
                     data.generated_text += chunk.delta.content
+                    data.generated_text_chunks += 1
                     text_ch.send_nowait(chunk.delta.content)
 
             elif isinstance(chunk, FlushSentinel):
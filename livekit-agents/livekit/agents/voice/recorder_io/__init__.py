@@ -1,3 +1,17 @@
-from .recorder_io import RecorderAudioInput, RecorderAudioOutput, RecorderIO
+from .recorder_io import (
+    LOW_CPU_RECORDER_OPTIONS,
+    RecorderAudioInput,
+    RecorderAudioOutput,
+    RecorderIO,
+    RecorderOptions,
+    RecorderStats,
+)
 
-__all__ = ["RecorderIO", "RecorderAudioInput", "RecorderAudioOutput"]
+__all__ = [
+    "RecorderIO",
+    "RecorderAudioInput",
+    "RecorderAudioOutput",
+    "RecorderOptions",
+    "RecorderStats",
+    "LOW_CPU_RECORDER_OPTIONS",
+]
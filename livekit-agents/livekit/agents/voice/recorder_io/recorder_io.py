@@ -5,7 +5,8 @@ import contextlib
 import queue
 import threading
 import time
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable
 
@@ -14,8 +15,11 @@ import numpy as np
 
 from livekit import rtc
 
+from ... import utils
 from ...log import logger
+from ...metrics import RecorderMetrics
 from .. import io
+from ..events import MetricsCollectedEvent
 
 if TYPE_CHECKING:
     from ..agent_session import AgentSession
@@ -24,6 +28,49 @@ if TYPE_CHECKING:
 
 
 WRITE_INTERVAL = 2.5
+METRICS_INTERVAL = 30.0
+"""Interval between the RecorderMetrics emitted on the session"""
+BLOCK_DURATION = 0.1
+"""Duration of the stereo blocks handed to the encoder"""
+_INV_INT16 = 1.0 / 32768.0
+
+
+@dataclass(frozen=True)
+class RecorderOptions:
+    sample_rate: int = 48000
+    bitrate: int | None = None
+    """Opus bitrate in bits/s, the encoder default when None"""
+    complexity: int | None = None
+    """Opus complexity (0-10, the encoder default is 10), lower values are cheaper to encode"""
+    segment_duration: float | None = None
+    """Start a new file every segment_duration seconds of audio, named after the output path
+    with a -000, -001... suffix"""
+    max_pending_duration: float = 30.0
+    """Audio waiting to be encoded above which new audio is dropped (and counted in
+    RecorderStats.dropped_duration) rather than queued, when the encoder can't keep up"""
+
+
+LOW_CPU_RECORDER_OPTIONS = RecorderOptions(sample_rate=24000, bitrate=32000, complexity=0)
+"""About 2.5x cheaper to encode than the defaults, at a lower audio quality"""
+
+
+@dataclass
+class RecorderStats:
+    encoder_lag: float = 0.0
+    """Time between the audio being queued and encoded, for the last encoded audio"""
+    max_encoder_lag: float = 0.0
+    pending_duration: float = 0.0
+    """Duration of the audio waiting to be encoded"""
+    encoded_duration: float = 0.0
+    dropped_duration: float = 0.0
+
+
+@dataclass
+class _PendingAudio:
+    input_frames: list[rtc.AudioFrame]
+    output_frames: list[rtc.AudioFrame]
+    duration: float
+    queued_at: float
 
 
 class RecorderIO:
@@ -33,19 +80,23 @@ class RecorderIO:
         agent_session: AgentSession,
         sample_rate: int = 48000,
         loop: asyncio.AbstractEventLoop | None = None,
+        options: RecorderOptions | None = None,
     ) -> None:
         self._in_record: RecorderAudioInput | None = None
         self._out_record: RecorderAudioOutput | None = None
 
-        self._in_q: queue.Queue[list[rtc.AudioFrame] | None] = queue.Queue()
-        self._out_q: queue.Queue[list[rtc.AudioFrame] | None] = queue.Queue()
+        self._opts = options or RecorderOptions(sample_rate=sample_rate)
+        self._q: queue.Queue[_PendingAudio | None] = queue.Queue()
+        self._stats = RecorderStats()
+        self._stats_lock = threading.Lock()
         self._session = agent_session
-        self._sample_rate = sample_rate
+        self._sample_rate = self._opts.sample_rate
         self._started = False
         self._loop = loop or asyncio.get_event_loop()
         self._lock = asyncio.Lock()
         self._close_fut: asyncio.Future[None] = self._loop.create_future()
         self._output_path: Path | None = None
+        self._output_paths: list[Path] = []
 
     async def start(self, *, output_path: str | Path) -> None:
         async with self._lock:
@@ -59,6 +110,7 @@ class RecorderIO:
                 )
 
             self._output_path = Path(output_path)
+            self._output_paths = []
             self._started = True
             self._close_fut = self._loop.create_future()
             self._forward_atask = asyncio.create_task(self._forward_task())
@@ -73,10 +125,11 @@ class RecorderIO:
             if not self._started:
                 return
 
-            self._in_q.put_nowait(None)
-            self._out_q.put_nowait(None)
+            await utils.aio.cancel_and_wait(self._forward_atask)
+            self._q.put_nowait(None)
             await asyncio.shield(self._close_fut)
             self._started = False
+            self._emit_metrics()
 
     def record_input(self, audio_input: io.AudioInput) -> RecorderAudioInput:
         self._in_record = RecorderAudioInput(recording_io=self, source=audio_input)
@@ -94,8 +147,21 @@ class RecorderIO:
 
     @property
     def output_path(self) -> Path | None:
+        """The recording, or its first segment when segment_duration is set"""
+        if self._output_paths:
+            return self._output_paths[0]
         return self._output_path
 
+    @property
+    def output_paths(self) -> list[Path]:
+        """The files written so far, one per segment"""
+        return list(self._output_paths)
+
+    @property
+    def stats(self) -> RecorderStats:
+        with self._stats_lock:
+            return replace(self._stats)
+
     @property
     def recording_started_at(self) -> float | None:
         in_t = self._in_record.started_wall_time if self._in_record else None
@@ -109,78 +175,84 @@ class RecorderIO:
 
         return min(in_t, out_t)
 
+    def _emit_metrics(self) -> None:
+        stats = self.stats
+        metrics = RecorderMetrics(
+            timestamp=time.time(),
+            encoder_lag=stats.encoder_lag,
+            max_encoder_lag=stats.max_encoder_lag,
+            pending_duration=stats.pending_duration,
+            encoded_duration=stats.encoded_duration,
+            dropped_duration=stats.dropped_duration,
+        )
+        self._session.emit("metrics_collected", MetricsCollectedEvent(metrics=metrics))
+
     def _write_cb(self, buf: list[rtc.AudioFrame]) -> None:
         assert self._in_record is not None
 
         input_buf = self._in_record.take_buf()
-        self._in_q.put_nowait(input_buf)
-        self._out_q.put_nowait(buf)
+        self._push(input_buf, buf)
+
+    def _push(self, input_buf: list[rtc.AudioFrame], output_buf: list[rtc.AudioFrame]) -> None:
+        duration = max(sum(f.duration for f in input_buf), sum(f.duration for f in output_buf))
+        with self._stats_lock:
+            pending = self._stats.pending_duration
+            if pending > 0 and pending + duration > self._opts.max_pending_duration:
+                if self._stats.dropped_duration == 0:
+                    logger.warning(
+                        "the recorder encoder can't keep up, dropping audio",
+                        extra={"pending_duration": pending},
+                    )
+                self._stats.dropped_duration += duration
+                return
+
+            self._stats.pending_duration += duration
+
+        self._q.put_nowait(
+            _PendingAudio(
+                input_frames=input_buf,
+                output_frames=output_buf,
+                duration=duration,
+                queued_at=time.perf_counter(),
+            )
+        )
 
     async def _forward_task(self) -> None:
         assert self._in_record is not None
         assert self._out_record is not None
 
         # Forward the input audio to the encoder every 5s.
+        metrics_at = time.monotonic() + METRICS_INTERVAL
         while True:
             await asyncio.sleep(WRITE_INTERVAL)
+            if time.monotonic() >= metrics_at:
+                metrics_at += METRICS_INTERVAL
+                self._emit_metrics()
+
             if self._out_record.has_pending_data:
                 # if the output is currenetly playing audio, wait for it to stay in sync
                 continue  # always wait for the complete output
 
             input_buf = self._in_record.take_buf()
-            self._in_q.put_nowait(input_buf)
-            self._out_q.put_nowait([])
+            self._push(input_buf, [])
 
     def _encode_thread(self) -> None:
-        GROW_FACTOR = 1.5
-        INV_INT16 = 1.0 / 32768.0
-
         assert self._output_path is not None
-        self._output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        container = av.open(self._output_path, mode="w", format="ogg")
-        stream: av.AudioStream = container.add_stream(
-            "opus", rate=self._sample_rate, layout="stereo"
-        )  # type: ignore
+        writer = _RecordingWriter(self._output_path, self._opts, self._output_paths)
+        blocks = _StereoBlocks(int(self._sample_rate * BLOCK_DURATION))
 
         in_resampler: rtc.AudioResampler | None = None
         out_resampler: rtc.AudioResampler | None = None
 
-        capacity = self._sample_rate * 6  # 6s, 1ch
-        stereo_buf = np.zeros((2, capacity), dtype=np.float32)
-
-        def remix_and_resample(frames: list[rtc.AudioFrame], channel_idx: int) -> int:
-            total_samples = sum(f.samples_per_channel * f.num_channels for f in frames)
-
-            nonlocal capacity, stereo_buf
-            if total_samples > capacity:
-                while capacity < total_samples:
-                    capacity = int(capacity * GROW_FACTOR)
-
-                stereo_buf.resize((2, capacity), refcheck=False)
-
-            pos = 0
-            dest = stereo_buf[channel_idx]
-            for f in frames:
-                count = f.samples_per_channel * f.num_channels
-                arr_i16 = np.frombuffer(f.data, dtype=np.int16, count=count).reshape(
-                    -1, f.num_channels
-                )
-                slice_ = dest[pos : pos + f.samples_per_channel]
-                np.sum(arr_i16, axis=1, dtype=np.float32, out=slice_)
-                slice_ *= INV_INT16 / f.num_channels
-                pos += f.samples_per_channel
-
-            return pos
-
-        with container:
+        try:
             while True:
-                input_buf = self._in_q.get()
-                output_buf = self._out_q.get()
-
-                if input_buf is None or output_buf is None:
+                pending = self._q.get()
+                if pending is None:
                     break
 
+                input_buf, output_buf = pending.input_frames, pending.output_frames
+
                 # lazy creation of the resamplers
                 if in_resampler is None and len(input_buf):
                     input_rate, num_channels = input_buf[0].sample_rate, input_buf[0].num_channels
@@ -213,43 +285,180 @@ class RecorderIO:
                     # the output is sent per-segment. Always flush when the playback is done
                     output_resampled.extend(out_resampler.flush())
 
-                len_left = remix_and_resample(input_resampled, 0)
-                len_right = remix_and_resample(output_resampled, 1)
-
-                if len_left != len_right:
-                    diff = abs(len_right - len_left)
-                    if len_left < len_right:
-                        logger.warning(
-                            f"Input is shorter by {diff} samples; silence has been prepended to "
-                            "align the input channel. The resulting recording may not accurately "
-                            "reflect the original audio."
-                        )
-                        stereo_buf[0, diff : diff + len_left] = stereo_buf[0, :len_left]
-                        stereo_buf[0, :diff] = 0.0
-                        len_left = len_right
-                    else:
-                        stereo_buf[1, diff : diff + len_right] = stereo_buf[1, :len_right]
-                        stereo_buf[1, :diff] = 0.0
-                        len_right = len_left
-
-                max_len = max(len_left, len_right)
-                if max_len <= 0:
-                    continue
-
-                stereo_slice = stereo_buf[:, :max_len]
-                av_frame = av.AudioFrame.from_ndarray(stereo_slice, format="fltp", layout="stereo")
-                av_frame.sample_rate = self._sample_rate
-
-                for packet in stream.encode(av_frame):
-                    container.mux(packet)
-
-            for packet in stream.encode(None):
-                container.mux(packet)
+                len_left = sum(f.samples_per_channel for f in input_resampled)
+                len_right = sum(f.samples_per_channel for f in output_resampled)
+                if len_left < len_right:
+                    logger.warning(
+                        f"Input is shorter by {len_right - len_left} samples; silence has been "
+                        "prepended to align the input channel. The resulting recording may not "
+                        "accurately reflect the original audio."
+                    )
+
+                # the shorter channel is padded with leading silence
+                blocks.write(
+                    [max(len_right - len_left, 0), *input_resampled],
+                    [max(len_left - len_right, 0), *output_resampled],
+                    writer.write,
+                )
+
+                lag = time.perf_counter() - pending.queued_at
+                with self._stats_lock:
+                    self._stats.pending_duration -= pending.duration
+                    self._stats.encoded_duration += max(len_left, len_right) / self._sample_rate
+                    self._stats.encoder_lag = lag
+                    self._stats.max_encoder_lag = max(self._stats.max_encoder_lag, lag)
+
+            blocks.flush(writer.write)
+        finally:
+            writer.close()
 
         with contextlib.suppress(RuntimeError):
             self._loop.call_soon_threadsafe(self._close_fut.set_result, None)
 
 
+class _StereoBlocks:
+    """Downmixes the input and output audio into the two channels of a preallocated block,
+    handed to the encoder each time it's full."""
+
+    def __init__(self, block_size: int) -> None:
+        self._block = np.zeros((2, block_size), dtype=np.float32)
+        self._fill = [0, 0]
+
+    def write(
+        self,
+        left: Iterable[rtc.AudioFrame | int],
+        right: Iterable[rtc.AudioFrame | int],
+        encode: Callable[[np.ndarray], None],
+    ) -> None:
+        """Write audio frames, or a number of samples of silence, to each channel.
+
+        Both channels must receive the same number of samples.
+        """
+        block_size = self._block.shape[1]
+        channels = [_ChunkReader(left), _ChunkReader(right)]
+        while True:
+            for ch, reader in enumerate(channels):
+                self._fill[ch] = reader.read_into(self._block[ch], self._fill[ch])
+
+            if self._fill[0] == self._fill[1] == block_size:
+                encode(self._block)
+                self._fill = [0, 0]
+            elif channels[0].exhausted or channels[1].exhausted:
+                return
+
+    def flush(self, encode: Callable[[np.ndarray], None]) -> None:
+        length = min(self._fill)
+        if length > 0:
+            encode(self._block[:, :length])
+        self._fill = [0, 0]
+
+
+class _ChunkReader:
+    def __init__(self, chunks: Iterable[rtc.AudioFrame | int]) -> None:
+        self._chunks = iter(chunks)
+        self._chunk: np.ndarray | int | None = None
+        self._offset = 0
+        self.exhausted = False
+
+    def read_into(self, dest: np.ndarray, fill: int) -> int:
+        """Copy samples into dest[fill:] until it's full or the chunks are exhausted, returns the
+        new fill position."""
+        while fill < len(dest):
+            if self._chunk is None:
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    self.exhausted = True
+                    break
+                if isinstance(chunk, rtc.AudioFrame):
+                    self._chunk = np.frombuffer(chunk.data, dtype=np.int16).reshape(
+                        -1, chunk.num_channels
+                    )
+                else:
+                    self._chunk = chunk
+                self._offset = 0
+
+            length = self._chunk if isinstance(self._chunk, int) else len(self._chunk)
+            n = min(length - self._offset, len(dest) - fill)
+            out = dest[fill : fill + n]
+            if isinstance(self._chunk, int):
+                out.fill(0.0)
+            else:
+                samples = self._chunk[self._offset : self._offset + n]
+                np.sum(samples, axis=1, dtype=np.float32, out=out)
+                out *= _INV_INT16 / samples.shape[1]
+
+            fill += n
+            self._offset += n
+            if self._offset == length:
+                self._chunk = None
+
+        return fill
+
+
+class _RecordingWriter:
+    """Encodes stereo blocks to Ogg/Opus, starting a new file every segment_duration."""
+
+    def __init__(self, output_path: Path, opts: RecorderOptions, paths: list[Path]) -> None:
+        self._output_path = output_path
+        self._opts = opts
+        self._paths = paths
+        self._segment_samples = (
+            int(opts.segment_duration * opts.sample_rate) if opts.segment_duration else None
+        )
+        self._container: av.container.OutputContainer | None = None
+        self._stream: av.AudioStream | None = None
+        self._written = 0
+        self._open()
+
+    def _open(self) -> None:
+        path = self._output_path
+        if self._segment_samples is not None:
+            path = path.with_name(f"{path.stem}-{len(self._paths):03d}{path.suffix}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        options = {}
+        if self._opts.complexity is not None:
+            options["compression_level"] = str(self._opts.complexity)
+
+        self._container = av.open(path, mode="w", format="ogg")
+        stream: av.AudioStream = self._container.add_stream(  # type: ignore
+            "opus", rate=self._opts.sample_rate, layout="stereo", options=options
+        )
+        if self._opts.bitrate is not None:
+            stream.bit_rate = self._opts.bitrate
+        self._stream = stream
+        self._written = 0
+        self._paths.append(path)
+
+    def write(self, samples: np.ndarray) -> None:
+        if self._container is None:
+            self._open()
+        assert self._container is not None and self._stream is not None
+
+        av_frame = av.AudioFrame.from_ndarray(samples, format="fltp", layout="stereo")
+        av_frame.sample_rate = self._opts.sample_rate
+        for packet in self._stream.encode(av_frame):
+            self._container.mux(packet)
+
+        self._written += samples.shape[1]
+        if self._segment_samples is not None and self._written >= self._segment_samples:
+            # the next segment is opened lazily, so the last one isn't empty
+            self._close_container()
+
+    def _close_container(self) -> None:
+        if self._container is None or self._stream is None:
+            return
+
+        for packet in self._stream.encode(None):
+            self._container.mux(packet)
+        self._container.close()
+        self._container = None
+        self._stream = None
+
+    def close(self) -> None:
+        self._close_container()
+
+
 class RecorderAudioInput(io.AudioInput):
     def __init__(self, *, recording_io: RecorderIO, source: io.AudioInput) -> None:
         super().__init__(label="RecorderIO", source=source)
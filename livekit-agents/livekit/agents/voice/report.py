@@ -19,6 +19,8 @@ class SessionReport:
     events: list[AgentEvent]
     chat_history: ChatContext
     audio_recording_path: Path | None = None
+    audio_recording_segments: list[Path] = field(default_factory=list)
+    """Files of a segmented recording, audio_recording_path is the first one"""
     audio_recording_started_at: float | None = None
     """Timestamp when the audio recording started"""
     duration: float | None = None
@@ -44,6 +46,9 @@ class SessionReport:
             "audio_recording_path": (
                 str(self.audio_recording_path.absolute()) if self.audio_recording_path else None
             ),
+            "audio_recording_segments": [
+                str(path.absolute()) for path in self.audio_recording_segments
+            ],
             "audio_recording_started_at": self.audio_recording_started_at,
             "options": {
                 "allow_interruptions": self.options.allow_interruptions,
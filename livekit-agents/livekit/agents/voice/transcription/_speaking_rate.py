@@ -72,22 +72,25 @@ class SpeakingRateStream:
     @log_exceptions(logger=logger)
     async def _main_task(self) -> None:
         _inference_sample_rate = 0
-        inference_f32_data = np.empty(0, dtype=np.float32)
+        # samples of the segment, starting at the current window
+        samples = np.empty(0, dtype=np.float32)
+        pending: list[np.ndarray] = []
+        pending_samples = 0
+        window_index = 0
+        spectral_flux: _SpectralFlux | None = None
 
         pub_timestamp = self._opts.window_duration / 2
-        inference_frames: list[rtc.AudioFrame] = []
         resampler: rtc.AudioResampler | None = None
 
         async for input_frame in self._input_ch:
             if not isinstance(input_frame, rtc.AudioFrame):
                 # estimate the speech rate for the last frame
-                available_samples = sum(frame.samples_per_channel for frame in inference_frames)
-                if available_samples > self._window_size_samples * 0.5:
-                    frame = rtc.combine_audio_frames(inference_frames)
-                    frame_f32_data = np.divide(frame.data, np.iinfo(np.int16).max, dtype=np.float32)
-
-                    sr = self._compute_speaking_rate(frame_f32_data, _inference_sample_rate)
-                    pub_timestamp += frame.duration
+                samples = np.concatenate([samples, *pending])
+                pending = []
+                pending_samples = 0
+                if spectral_flux is not None and len(samples) > self._window_size_samples * 0.5:
+                    sr = self._compute_speaking_rate(samples, spectral_flux)
+                    pub_timestamp += len(samples) / _inference_sample_rate
                     self._event_ch.send_nowait(
                         SpeakingRateEvent(
                             timestamp=pub_timestamp,
@@ -95,7 +98,10 @@ class SpeakingRateStream:
                             speaking_rate=sr,
                         )
                     )
-                inference_frames = []
+                samples = np.empty(0, dtype=np.float32)
+                window_index = 0
+                if spectral_flux is not None:
+                    spectral_flux.reset()
                 continue
 
             # resample the input frame if necessary
@@ -105,7 +111,11 @@ class SpeakingRateStream:
 
                 self._window_size_samples = int(self._opts.window_duration * _inference_sample_rate)
                 self._step_size_samples = int(self._opts.step_size * _inference_sample_rate)
-                inference_f32_data = np.empty(self._window_size_samples, dtype=np.float32)
+                spectral_flux = _SpectralFlux(
+                    sample_rate=_inference_sample_rate,
+                    window_size=self._window_size_samples,
+                    step_size=self._step_size_samples,
+                )
 
                 if self._input_sample_rate != _inference_sample_rate:
                     resampler = rtc.AudioResampler(
@@ -124,26 +134,34 @@ class SpeakingRateStream:
                 )
                 continue
 
-            if resampler is not None:
-                inference_frames.extend(resampler.push(input_frame))
-            else:
-                inference_frames.append(input_frame)
-
-            while True:
-                available_samples = sum(frame.samples_per_channel for frame in inference_frames)
-                if available_samples < self._window_size_samples:
-                    break
-
-                inference_frame = rtc.combine_audio_frames(inference_frames)
-                np.divide(
-                    inference_frame.data[: self._window_size_samples],
-                    np.iinfo(np.int16).max,
-                    out=inference_f32_data,
-                    dtype=np.float32,
+            assert spectral_flux is not None
+            frames = resampler.push(input_frame) if resampler is not None else [input_frame]
+            if not frames:
+                continue
+
+            for frame in frames:
+                pending.append(
+                    np.divide(
+                        np.frombuffer(frame.data, dtype=np.int16),
+                        np.iinfo(np.int16).max,
+                        dtype=np.float32,
+                    )
                 )
+                pending_samples += frame.samples_per_channel
 
+            # only copy the pending samples once a window can be computed
+            if len(samples) + pending_samples < self._window_size_samples:
+                continue
+
+            samples = np.concatenate([samples, *pending])
+            pending = []
+            pending_samples = 0
+
+            while len(samples) >= self._window_size_samples:
                 # run the inference
-                sr = self._compute_speaking_rate(inference_f32_data, _inference_sample_rate)
+                sr = self._compute_speaking_rate(
+                    samples[: self._window_size_samples], spectral_flux, window_index
+                )
                 self._event_ch.send_nowait(
                     SpeakingRateEvent(
                         timestamp=pub_timestamp,
@@ -154,88 +172,34 @@ class SpeakingRateStream:
 
                 # move the window forward by the hop size
                 pub_timestamp += self._opts.step_size
-                if len(inference_frame.data) - self._step_size_samples > 0:
-                    data = inference_frame.data[self._step_size_samples :]
-                    inference_frames = [
-                        rtc.AudioFrame(
-                            data=data,
-                            sample_rate=inference_frame.sample_rate,
-                            num_channels=1,
-                            samples_per_channel=len(data) // 2,
-                        )
-                    ]
+                samples = samples[self._step_size_samples :]
+                window_index += 1
 
     def _compute_speaking_rate(
-        self, audio: np.ndarray[tuple[int], np.dtype[np.float32]], sample_rate: int
+        self,
+        audio: np.ndarray[tuple[int], np.dtype[np.float32]],
+        spectral_flux: _SpectralFlux,
+        window_index: int | None = None,
     ) -> float:
         """
         Compute the speaking rate of the audio using the selected method
         """
         silence_threshold = self._opts._silence_threshold
 
-        audio_sq = audio**2
         # check if the audio is silent
-        overall_rms = np.sqrt(np.mean(audio_sq))
+        overall_rms = np.sqrt(np.dot(audio, audio) / len(audio))
         if overall_rms < silence_threshold:
             return 0.0
 
         # or if the tail of the audio is silent
-        tail_audio_sq = audio_sq[int(len(audio_sq) * 0.7) :]
-        if len(tail_audio_sq) > 0 and np.sqrt(np.mean(tail_audio_sq)) < silence_threshold * 0.5:
-            return 0.0
-
-        return self._spectral_flux(audio, sample_rate)
-
-    def _stft(
-        self,
-        audio: np.ndarray[tuple[int], np.dtype[np.float32]],
-        frame_length: int,
-        hop_length: int,
-    ) -> np.ndarray[tuple[int, int], np.dtype[np.complex128]]:
-        num_frames = (len(audio) - frame_length) // hop_length + 1
-        result = np.zeros((frame_length // 2 + 1, num_frames), dtype=np.complex128)
-
-        window = np.hanning(frame_length)
-        scale_factor = 1.0 / np.sqrt(np.sum(window**2))
-        for i in range(num_frames):
-            start = i * hop_length
-            end = start + frame_length
-            frame = audio[start:end]
-            windowed = frame * window
-
-            # perform fft and scale
-            fft_result = np.fft.rfft(windowed)
-            result[:, i] = fft_result * scale_factor
-
-        return result
-
-    def _spectral_flux(
-        self, audio: np.ndarray[tuple[int], np.dtype[np.float32]], sample_rate: int
-    ) -> float:
-        """
-        Calculate speaking rate based on spectral flux.
-        Higher spectral flux correlates with more rapid speech articulation.
-        """
-        # Parameters
-        frame_length = int(sample_rate * 0.025)  # 25ms
-        hop_length = frame_length // 2  # 50% overlap
-
-        Zxx = self._stft(audio, frame_length, hop_length)
-
-        # calculate spectral flux (sum of spectral magnitude changes between frames)
-        spectral_magnitudes = np.abs(Zxx)
-        spectral_flux_values = []
-
-        for i in range(1, spectral_magnitudes.shape[1]):
-            # l1 norm of difference between consecutive spectral frames
-            flux = np.sum(np.abs(spectral_magnitudes[:, i] - spectral_magnitudes[:, i - 1]))
-            spectral_flux_values.append(flux)
-
-        if not spectral_flux_values:
+        tail_audio = audio[int(len(audio) * 0.7) :]
+        if (
+            len(tail_audio) > 0
+            and np.sqrt(np.dot(tail_audio, tail_audio) / len(tail_audio)) < silence_threshold * 0.5
+        ):
             return 0.0
 
-        avg_flux = float(np.mean(spectral_flux_values))
-        return avg_flux
+        return spectral_flux.compute(audio, window_index)
 
     def push_frame(self, frame: rtc.AudioFrame) -> None:
         """Push audio frame for syllable rate detection"""
@@ -258,3 +222,93 @@ class SpeakingRateStream:
 
     def __aiter__(self) -> AsyncIterator[SpeakingRateEvent]:
         return self._event_ch
+
+
+class _SpectralFlux:
+    """
+    Calculate speaking rate based on spectral flux.
+    Higher spectral flux correlates with more rapid speech articulation.
+
+    Consecutive windows overlap, the STFT frames they share are computed once and the flux
+    between them is kept for the next windows, each step only transforms the new frames.
+    """
+
+    def __init__(self, *, sample_rate: int, window_size: int, step_size: int) -> None:
+        self._frame_length = int(sample_rate * 0.025)  # 25ms
+        self._hop_length = max(self._frame_length // 2, 1)  # 50% overlap
+
+        window = np.hanning(self._frame_length)
+        self._window = (window / np.sqrt(np.sum(window**2))).astype(np.float32)
+
+        self._frames_per_window = max((window_size - self._frame_length) // self._hop_length + 1, 0)
+        # the frames of consecutive windows only line up when the step is a multiple of the hop
+        self._frames_per_step = (
+            step_size // self._hop_length if step_size % self._hop_length == 0 else 0
+        )
+
+        self._next_frame = 0  # index of the next frame to compute, since the start of the segment
+        self._last_magnitudes: np.ndarray | None = None
+        self._flux = np.empty(0, dtype=np.float32)  # flux between frame i - 1 and i
+        self._flux_start = 0  # frame index of self._flux[0]
+
+    def reset(self) -> None:
+        """Start a new segment"""
+        self._next_frame = 0
+        self._last_magnitudes = None
+        self._flux = np.empty(0, dtype=np.float32)
+        self._flux_start = 0
+
+    def compute(
+        self, audio: np.ndarray[tuple[int], np.dtype[np.float32]], window_index: int | None = None
+    ) -> float:
+        """Average spectral flux of the audio. window_index is the position of the audio in the
+        segment, in steps, when it is a full window"""
+        if window_index is None or self._frames_per_step == 0:
+            magnitudes = self._magnitudes(audio)
+            if len(magnitudes) < 2:
+                return 0.0
+
+            # l1 norm of difference between consecutive spectral frames
+            return float(np.mean(np.sum(np.abs(np.diff(magnitudes, axis=0)), axis=1)))
+
+        first_frame = window_index * self._frames_per_step
+        end_frame = first_frame + self._frames_per_window
+        if self._last_magnitudes is None or not (first_frame < self._next_frame <= end_frame):
+            # nothing to reuse (first window of the segment or too many skipped windows)
+            self.reset()
+            self._next_frame = first_frame
+            self._flux_start = first_frame + 1
+
+        if self._next_frame < end_frame:
+            offset = (self._next_frame - first_frame) * self._hop_length
+            magnitudes = self._magnitudes(audio[offset:])
+            if self._last_magnitudes is not None:
+                magnitudes = np.concatenate([self._last_magnitudes[np.newaxis], magnitudes])
+
+            flux = np.sum(np.abs(np.diff(magnitudes, axis=0)), axis=1)
+            self._flux = np.concatenate([self._flux, flux])
+            self._last_magnitudes = magnitudes[-1]
+            self._next_frame = end_frame
+
+        window_flux = self._flux[first_frame + 1 - self._flux_start :]
+        # the flux before the next window isn't needed anymore
+        drop = min(first_frame + self._frames_per_step + 1 - self._flux_start, len(self._flux))
+        self._flux = self._flux[drop:]
+        self._flux_start += drop
+
+        if len(window_flux) == 0:
+            return 0.0
+
+        return float(np.mean(window_flux))
+
+    def _magnitudes(
+        self, audio: np.ndarray[tuple[int], np.dtype[np.float32]]
+    ) -> np.ndarray[tuple[int, int], np.dtype[np.float32]]:
+        """Magnitude spectrum of every frame of the audio, computed in a single batch"""
+        if len(audio) < self._frame_length:
+            return np.empty((0, self._frame_length // 2 + 1), dtype=np.float32)
+
+        frames = np.lib.stride_tricks.sliding_window_view(audio, self._frame_length)[
+            :: self._hop_length
+        ]
+        return np.abs(np.fft.rfft(frames * self._window, axis=-1)).astype(np.float32, copy=False)
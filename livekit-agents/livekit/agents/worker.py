@@ -41,6 +41,7 @@ from livekit.protocol import agent, models
 from . import ipc, telemetry, utils
 from ._exceptions import AssignmentTimeoutError
 from .inference_runner import _InferenceRunner
+from .ipc.inference_proc_pool import InferenceRoutingStrategy
 from .job import (
     JobAcceptArguments,
     JobContext,
@@ -229,6 +230,21 @@ class ServerOptions:
     When set, the PROMETHEUS_MULTIPROC_DIR environment variable will be configured automatically.
     When None (default), multiprocess mode is disabled and only main process metrics are collected.
     Users can also set PROMETHEUS_MULTIPROC_DIR environment variable directly before starting the worker."""
+    inference_batch_window: float = 0.005
+    """Time in seconds the inference process waits to coalesce concurrent requests into a single
+    batch, for inference runners that support batching."""
+    inference_max_batch_size: int = 16
+    """Maximum number of requests evaluated together in a single batch by the inference process."""
+    inference_shm_size: int = 0
+    """Size in bytes of the shared memory ring used to pass large payloads to the inference
+    process without copying them through the IPC socket. Defaults to 0 (disabled)."""
+    num_inference_processes: int = 1
+    """Number of inference processes to run. Requests are routed across them according to
+    `inference_routing` and crashed processes are restarted."""
+    inference_routing: InferenceRoutingStrategy = "job_affinity"
+    """How inference requests are routed across the inference processes. "job_affinity" keeps
+    each job on the same process so per-session caches stay warm, "least_outstanding" picks the
+    process with the fewest requests in flight."""
 
     def validate_config(self, devmode: bool) -> None:
         load_threshold = ServerEnvOption.getvalue(self.load_threshold, devmode)
@@ -281,6 +297,11 @@ class AgentServer(utils.EventEmitter[EventTypes]):
         setup_fnc: Callable[[JobProcess], Any] | None = None,
         load_fnc: Callable[[AgentServer], float] | Callable[[], float] | None = None,
         prometheus_port: int | None = None,
+        inference_batch_window: float = 0.005,
+        inference_max_batch_size: int = 16,
+        inference_shm_size: int = 0,
+        num_inference_processes: int = 1,
+        inference_routing: InferenceRoutingStrategy = "job_affinity",
     ) -> None:
         super().__init__()
         self._ws_url = ws_url or os.environ.get("LIVEKIT_URL") or ""
@@ -301,6 +322,11 @@ class AgentServer(utils.EventEmitter[EventTypes]):
         self._permissions = permissions
         self._max_retry = max_retry
         self._prometheus_port = prometheus_port
+        self._inference_batch_window = inference_batch_window
+        self._inference_max_batch_size = inference_max_batch_size
+        self._inference_shm_size = inference_shm_size
+        self._num_inference_processes = num_inference_processes
+        self._inference_routing: InferenceRoutingStrategy = inference_routing
         self._mp_ctx_str = multiprocessing_context
         self._mp_ctx = mp.get_context(multiprocessing_context)
 
@@ -383,6 +409,11 @@ class AgentServer(utils.EventEmitter[EventTypes]):
             prometheus_port=options.prometheus_port if is_given(options.prometheus_port) else None,
             setup_fnc=options.prewarm_fnc,
             load_fnc=options.load_fnc,
+            inference_batch_window=options.inference_batch_window,
+            inference_max_batch_size=options.inference_max_batch_size,
+            inference_shm_size=options.inference_shm_size,
+            num_inference_processes=options.num_inference_processes,
+            inference_routing=options.inference_routing,
         )
         server.rtc_session(
             options.entrypoint_fnc,
@@ -527,12 +558,12 @@ class AgentServer(utils.EventEmitter[EventTypes]):
             self._close_future: asyncio.Future[None] | None = None
             self._msg_chan = utils.aio.Chan[agent.WorkerMessage](128, loop=self._loop)
 
-            self._inference_executor: ipc.inference_proc_executor.InferenceProcExecutor | None = (
-                None
-            )
+            self._inference_executor: ipc.inference_proc_pool.InferenceProcPool | None = None
             if len(_InferenceRunner.registered_runners) > 0:
-                self._inference_executor = ipc.inference_proc_executor.InferenceProcExecutor(
+                self._inference_executor = ipc.inference_proc_pool.InferenceProcPool(
                     runners=_InferenceRunner.registered_runners,
+                    num_processes=self._num_inference_processes,
+                    routing=self._inference_routing,
                     initialize_timeout=5 * 60,
                     close_timeout=5,
                     memory_warn_mb=2000,
@@ -543,6 +574,9 @@ class AgentServer(utils.EventEmitter[EventTypes]):
                     mp_ctx=self._mp_ctx,
                     loop=self._loop,
                     http_proxy=self._http_proxy or None,
+                    batch_window=self._inference_batch_window,
+                    max_batch_size=self._inference_max_batch_size,
+                    shm_size=self._inference_shm_size,
                 )
 
             self._proc_pool = ipc.proc_pool.ProcPool(
@@ -623,7 +657,10 @@ class AgentServer(utils.EventEmitter[EventTypes]):
                 self._mp_ctx.set_forkserver_preload(plugin_packages)
 
             if self._inference_executor is not None:
-                logger.info("starting inference executor")
+                logger.info(
+                    "starting inference executor",
+                    extra={"num_processes": self._num_inference_processes},
+                )
                 await self._inference_executor.start()
                 await self._inference_executor.initialize()
 
@@ -94,6 +94,7 @@ class STT(stt.STT):
         base_url: str = "https://api.deepgram.com/v1/listen",
         numerals: bool = False,
         mip_opt_out: bool = False,
+        prewarm_connections: int = 1,
     ) -> None:
         """Create a new instance of Deepgram STT.
 
@@ -120,6 +121,7 @@ class STT(stt.STT):
             base_url: The base URL for Deepgram API. Defaults to "https://api.deepgram.com/v1/listen".
             numerals: Whether to include numerals in the transcription. Defaults to False.
             mip_opt_out: Whether to take part in the model improvement program
+            prewarm_connections: Number of connections opened by prewarm() and parked until streams using the same options adopt them. Defaults to 1.
 
         Raises:
             ValueError: If no API key is provided or found in environment variables.
@@ -166,6 +168,13 @@ class STT(stt.STT):
         )
         self._session = http_session
         self._streams = weakref.WeakSet[SpeechStream]()
+        self._prewarm_connections = prewarm_connections
+        self._pool = utils.ConnectionPool[aiohttp.ClientWebSocketResponse](
+            connect_cb=self._connect_ws,
+            close_cb=self._close_ws,
+            # deepgram closes connections that receive no audio or KeepAlive for 10s
+            max_session_duration=8,
+        )
 
     @property
     def model(self) -> str:
@@ -236,6 +245,24 @@ class STT(stt.STT):
         except Exception as e:
             raise APIConnectionError() from e
 
+    def _live_url(self) -> str:
+        return _live_url(self._sanitize_options())
+
+    async def _connect_ws(self, timeout: float) -> aiohttp.ClientWebSocketResponse:
+        return await _connect_ws(self._ensure_session(), self._live_url(), self._api_key, timeout)
+
+    async def _close_ws(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        await ws.close()
+
+    def prewarm(self) -> None:
+        if self._opts.detect_language:
+            return  # not supported in streaming mode
+
+        self._pool.prewarm(self._prewarm_connections)
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
+
     def stream(
         self,
         *,
@@ -310,6 +337,9 @@ class STT(stt.STT):
         if is_given(endpoint_url):
             self._opts.endpoint_url = endpoint_url
 
+        # the parked connections were opened with the previous options
+        self._pool.invalidate()
+
         for stream in self._streams:
             stream.update_options(
                 language=language,
@@ -343,6 +373,7 @@ class STT(stt.STT):
 
 
 class SpeechStream(stt.SpeechStream):
+    _stt: STT
     _KEEPALIVE_MSG: str = json.dumps({"type": "KeepAlive"})
     _CLOSE_MSG: str = json.dumps({"type": "CloseStream"})
     _FINALIZE_MSG: str = json.dumps({"type": "Finalize"})
@@ -546,54 +577,17 @@ class SpeechStream(stt.SpeechStream):
                     await ws.close()
 
     async def _connect_ws(self) -> aiohttp.ClientWebSocketResponse:
-        live_config: dict[str, Any] = {
-            "model": self._opts.model,
-            "punctuate": self._opts.punctuate,
-            "smart_format": self._opts.smart_format,
-            "no_delay": self._opts.no_delay,
-            "interim_results": self._opts.interim_results,
-            "encoding": "linear16",
-            "vad_events": True,
-            "sample_rate": self._opts.sample_rate,
-            "channels": self._opts.num_channels,
-            "endpointing": False if self._opts.endpointing_ms == 0 else self._opts.endpointing_ms,
-            "filler_words": self._opts.filler_words,
-            "profanity_filter": self._opts.profanity_filter,
-            "numerals": self._opts.numerals,
-            "mip_opt_out": self._opts.mip_opt_out,
-        }
-        if self._opts.enable_diarization:
-            live_config["diarize"] = True
-        if self._opts.keywords:
-            live_config["keywords"] = self._opts.keywords
-        if self._opts.keyterms:
-            # the query param is `keyterm`
-            # See: https://developers.deepgram.com/docs/keyterm
-            live_config["keyterm"] = self._opts.keyterms
-
-        if self._opts.language:
-            live_config["language"] = self._opts.language
-
-        if self._opts.tags:
-            live_config["tag"] = self._opts.tags
+        url = _live_url(self._opts)
+        if url != self._stt._live_url():
+            return await _connect_ws(self._session, url, self._api_key, self._conn_options.timeout)
 
+        # adopt a prewarmed connection when there is one, it's used by this stream only
+        pool = self._stt._pool
         try:
-            ws = await asyncio.wait_for(
-                self._session.ws_connect(
-                    _to_deepgram_url(live_config, base_url=self._opts.endpoint_url, websocket=True),
-                    headers={"Authorization": f"Token {self._api_key}"},
-                ),
-                self._conn_options.timeout,
-            )
-            ws_headers = {
-                k: v for k, v in ws._response.headers.items() if k.startswith("dg-") or k == "Date"
-            }
-            logger.debug(
-                "Established new Deepgram STT WebSocket connection:",
-                extra={"headers": ws_headers},
-            )
-        except (aiohttp.ClientConnectorError, asyncio.TimeoutError) as e:
+            ws = await pool.get(timeout=self._conn_options.timeout)
+        except asyncio.TimeoutError as e:
             raise APIConnectionError("failed to connect to deepgram") from e
+        pool.detach(ws)
         return ws
 
     def _on_audio_duration_report(self, duration: float) -> None:
@@ -670,6 +664,60 @@ class SpeechStream(stt.SpeechStream):
             logger.warning("received unexpected message from deepgram %s", data)
 
 
+def _live_url(opts: STTOptions) -> str:
+    live_config: dict[str, Any] = {
+        "model": opts.model,
+        "punctuate": opts.punctuate,
+        "smart_format": opts.smart_format,
+        "no_delay": opts.no_delay,
+        "interim_results": opts.interim_results,
+        "encoding": "linear16",
+        "vad_events": True,
+        "sample_rate": opts.sample_rate,
+        "channels": opts.num_channels,
+        "endpointing": False if opts.endpointing_ms == 0 else opts.endpointing_ms,
+        "filler_words": opts.filler_words,
+        "profanity_filter": opts.profanity_filter,
+        "numerals": opts.numerals,
+        "mip_opt_out": opts.mip_opt_out,
+    }
+    if opts.enable_diarization:
+        live_config["diarize"] = True
+    if opts.keywords:
+        live_config["keywords"] = opts.keywords
+    if opts.keyterms:
+        # the query param is `keyterm`
+        # See: https://developers.deepgram.com/docs/keyterm
+        live_config["keyterm"] = opts.keyterms
+
+    if opts.language:
+        live_config["language"] = opts.language
+
+    if opts.tags:
+        live_config["tag"] = opts.tags
+
+    return _to_deepgram_url(live_config, base_url=opts.endpoint_url, websocket=True)
+
+
+async def _connect_ws(
+    session: aiohttp.ClientSession, url: str, api_key: str, timeout: float
+) -> aiohttp.ClientWebSocketResponse:
+    try:
+        ws = await asyncio.wait_for(
+            session.ws_connect(url, headers={"Authorization": f"Token {api_key}"}), timeout
+        )
+        ws_headers = {
+            k: v for k, v in ws._response.headers.items() if k.startswith("dg-") or k == "Date"
+        }
+        logger.debug(
+            "Established new Deepgram STT WebSocket connection:",
+            extra={"headers": ws_headers},
+        )
+    except (aiohttp.ClientConnectorError, asyncio.TimeoutError) as e:
+        raise APIConnectionError("failed to connect to deepgram") from e
+    return ws
+
+
 def live_transcription_to_speech_data(
     language: str, data: dict, *, is_final: bool
 ) -> list[stt.SpeechData]:
@@ -1013,7 +1013,7 @@ class RealtimeSession(
 
     @property
     def chat_ctx(self) -> llm.ChatContext:
-        return self._remote_chat_ctx.to_chat_ctx()
+        return self._remote_chat_ctx.snapshot()
 
     @property
     def tools(self) -> llm.ToolContext:
@@ -1126,7 +1126,7 @@ class RealtimeSession(
         self, chat_ctx: llm.ChatContext
     ) -> list[ConversationItemCreateEvent | ConversationItemDeleteEvent]:
         events: list[ConversationItemCreateEvent | ConversationItemDeleteEvent] = []
-        remote_ctx = self._remote_chat_ctx.to_chat_ctx()
+        remote_ctx = self._remote_chat_ctx.snapshot()
         diff_ops = llm.utils.compute_chat_ctx_diff(remote_ctx, chat_ctx)
 
         def _delete_item(msg_id: str) -> None:
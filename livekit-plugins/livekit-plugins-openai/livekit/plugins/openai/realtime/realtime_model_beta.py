@@ -900,7 +900,7 @@ class RealtimeSessionBeta(
 
     @property
     def chat_ctx(self) -> llm.ChatContext:
-        return self._remote_chat_ctx.to_chat_ctx()
+        return self._remote_chat_ctx.snapshot()
 
     @property
     def tools(self) -> llm.ToolContext:
@@ -992,7 +992,7 @@ class RealtimeSessionBeta(
         self, chat_ctx: llm.ChatContext
     ) -> list[ConversationItemCreateEvent | ConversationItemDeleteEvent]:
         events: list[ConversationItemCreateEvent | ConversationItemDeleteEvent] = []
-        diff_ops = llm.utils.compute_chat_ctx_diff(self._remote_chat_ctx.to_chat_ctx(), chat_ctx)
+        diff_ops = llm.utils.compute_chat_ctx_diff(self._remote_chat_ctx.snapshot(), chat_ctx)
 
         def _delete_item(msg_id: str) -> None:
             events.append(
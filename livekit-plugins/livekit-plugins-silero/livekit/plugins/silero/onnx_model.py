@@ -4,6 +4,9 @@ from __future__ import annotations
 
 import atexit
 import importlib.resources
+import threading
+import time
+from concurrent.futures import Future
 from contextlib import ExitStack, nullcontext
 from pathlib import Path
 
@@ -96,3 +99,108 @@ class OnnxModel:
         out, self._state = self._sess.run(None, ort_inputs)
         self._context = self._input_buffer[:, -self._context_size :]  # type: ignore
         return out.item()  # type: ignore
+
+
+class BatchedOnnxEngine:
+    """Runs the windows submitted by many streams as a single batched call to the session.
+
+    The RNN state and context of each stream stay in its own OnnxModel, they are stacked along
+    the batch axis for the call and written back afterwards the same way OnnxModel.__call__
+    does, so both paths produce the same probabilities. Inference runs on a dedicated
+    thread and results are delivered through concurrent futures, so streams from different
+    event loops (e.g. jobs running in threads) can share the same engine.
+    """
+
+    def __init__(
+        self,
+        *,
+        onnx_session: onnxruntime.InferenceSession,
+        sample_rate: int,
+        max_batch_size: int = 64,
+        batch_window: float = 0.002,
+    ) -> None:
+        self._sess = onnx_session
+        self._sample_rate_nd = np.array(sample_rate, dtype=np.int64)
+        self._max_batch_size = max_batch_size
+        self._batch_window = batch_window
+
+        self._cond = threading.Condition()
+        self._pending: list[tuple[OnnxModel, np.ndarray, Future[float], float]] = []
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def submit(self, model: OnnxModel, x: np.ndarray) -> Future[float]:
+        """Queue a window of the stream owning `model`, x must not change until the future is done"""
+        fut: Future[float] = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("engine is closed")
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="silero_vad_engine", daemon=True
+                )
+                self._thread.start()
+
+            self._pending.append((model, x, fut, time.monotonic()))
+            self._cond.notify()
+
+        return fut
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+
+                if self._closed:
+                    for _, _, fut, _ in self._pending:
+                        fut.cancel()
+                    self._pending.clear()
+                    return
+
+                # wait a bit for the windows of the other streams to come in
+                deadline = self._pending[0][3] + self._batch_window
+                while (
+                    len(self._pending) < self._max_batch_size
+                    and (remaining := deadline - time.monotonic()) > 0
+                    and not self._closed
+                ):
+                    self._cond.wait(remaining)
+
+                batch = self._pending[: self._max_batch_size]
+                del self._pending[: self._max_batch_size]
+
+            batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+            if batch:
+                self._run_batch(batch)
+
+    def _run_batch(self, batch: list[tuple[OnnxModel, np.ndarray, Future[float], float]]) -> None:
+        model = batch[0][0]
+        context_size = model.context_size
+        input_buffer = np.empty(
+            (len(batch), context_size + model.window_size_samples), dtype=np.float32
+        )
+        rnn_state = np.empty((2, len(batch), 128), dtype=np.float32)
+        for i, (model, x, _, _) in enumerate(batch):
+            input_buffer[i, :context_size] = model._context
+            input_buffer[i, context_size:] = x
+            rnn_state[:, i] = model._rnn_state[:, 0]
+
+        ort_inputs = {"input": input_buffer, "state": rnn_state, "sr": self._sample_rate_nd}
+        try:
+            out, rnn_state = self._sess.run(None, ort_inputs)
+        except Exception as e:
+            for _, _, fut, _ in batch:
+                fut.set_exception(e)
+            return
+
+        for i, (model, _, fut, _) in enumerate(batch):
+            model._context = input_buffer[i : i + 1, -context_size:]
+            model._state = rnn_state[:, i : i + 1]
+            fut.set_result(float(out[i, 0]))
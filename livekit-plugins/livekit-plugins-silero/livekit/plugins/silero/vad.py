@@ -38,6 +38,46 @@ from .log import logger
 SLOW_INFERENCE_THRESHOLD = 0.2  # late by 200ms
 
 
+class _SampleBuffer:
+    """Preallocated int16 sample queue.
+
+    Consumed samples are only skipped over, the pending ones are moved back to the start of the
+    array once there is no room left at the end, so steady streaming doesn't allocate.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._data = np.empty(capacity, dtype=np.int16)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def push(self, samples: np.ndarray) -> None:
+        n = len(samples)
+        if self._end + n > len(self._data):
+            pending = self._end - self._start
+            if pending + n > len(self._data):
+                data = np.empty(max(pending + n, len(self._data) * 2), dtype=np.int16)
+                data[:pending] = self._data[self._start : self._end]
+                self._data = data
+            else:
+                self._data[:pending] = self._data[self._start : self._end]
+            self._start, self._end = 0, pending
+
+        self._data[self._end : self._end + n] = samples
+        self._end += n
+
+    def peek(self) -> np.ndarray:
+        """View of the pending samples, only valid until the next push"""
+        return self._data[self._start : self._end]
+
+    def consume(self, n: int) -> None:
+        self._start = min(self._start + n, self._end)
+        if self._start == self._end:
+            self._start = self._end = 0
+
+
 @dataclass
 class _VADOptions:
     min_speech_duration: float
@@ -67,6 +107,7 @@ class VAD(agents.vad.VAD):
         sample_rate: Literal[8000, 16000] = 16000,
         force_cpu: bool = True,
         onnx_file_path: NotGivenOr[Path | str] = NOT_GIVEN,
+        batch_inference: bool = False,
         # deprecated
         padding_duration: NotGivenOr[float] = NOT_GIVEN,
     ) -> VAD:
@@ -105,6 +146,7 @@ class VAD(agents.vad.VAD):
             sample_rate (Literal[8000, 16000]): Sample rate for the inference (only 8KHz and 16KHz are supported).
             onnx_file_path (Path | str | None): Path to the ONNX model file. If not provided, the default model will be loaded. This can be helpful if you want to use a previous version of the silero model.
             force_cpu (bool): Force the use of CPU for inference.
+            batch_inference (bool): Run the inference windows of all the streams created from this VAD as batched calls on a shared thread instead of one executor call per window. Useful when many sessions run in the same process.
             padding_duration (float | None): **Deprecated**. Use `prefix_padding_duration` instead.
 
         Returns:
@@ -131,19 +173,27 @@ class VAD(agents.vad.VAD):
             activation_threshold=activation_threshold,
             sample_rate=sample_rate,
         )
-        return cls(session=session, opts=opts)
+        return cls(session=session, opts=opts, batch_inference=batch_inference)
 
     def __init__(
         self,
         *,
         session: onnxruntime.InferenceSession,
         opts: _VADOptions,
+        batch_inference: bool = False,
     ) -> None:
         super().__init__(capabilities=agents.vad.VADCapabilities(update_interval=0.032))
         self._onnx_session = session
         self._opts = opts
         self._streams = weakref.WeakSet[VADStream]()
 
+        self._engine: onnx_model.BatchedOnnxEngine | None = None
+        if batch_inference:
+            self._engine = onnx_model.BatchedOnnxEngine(
+                onnx_session=session, sample_rate=opts.sample_rate
+            )
+            weakref.finalize(self, self._engine.close)
+
     @property
     def model(self) -> str:
         return "silero"
@@ -165,6 +215,7 @@ class VAD(agents.vad.VAD):
             onnx_model.OnnxModel(
                 onnx_session=self._onnx_session, sample_rate=self._opts.sample_rate
             ),
+            engine=self._engine,
         )
         self._streams.add(stream)
         return stream
@@ -212,9 +263,16 @@ class VAD(agents.vad.VAD):
 
 
 class VADStream(agents.vad.VADStream):
-    def __init__(self, vad: VAD, opts: _VADOptions, model: onnx_model.OnnxModel) -> None:
+    def __init__(
+        self,
+        vad: VAD,
+        opts: _VADOptions,
+        model: onnx_model.OnnxModel,
+        *,
+        engine: onnx_model.BatchedOnnxEngine | None = None,
+    ) -> None:
         super().__init__(vad)
-        self._opts, self._model = opts, model
+        self._opts, self._model, self._engine = opts, model, engine
         self._loop = asyncio.get_event_loop()
         self._exp_filter = utils.ExpFilter(alpha=0.35)
 
@@ -287,8 +345,9 @@ class VADStream(agents.vad.VADStream):
         speech_threshold_duration = 0.0
         silence_threshold_duration = 0.0
 
-        input_frames: list[rtc.AudioFrame] = []
-        inference_frames: list[rtc.AudioFrame] = []
+        # sized for a few windows, the buffers only grow if the input frames are larger
+        input_buffer: _SampleBuffer | None = None
+        inference_buffer = _SampleBuffer(self._model.window_size_samples * 4)
         resampler: rtc.AudioResampler | None = None
 
         # used to avoid drift when the sample_rate ratio is not an integer
@@ -314,6 +373,11 @@ class VADStream(agents.vad.VADStream):
                     dtype=np.int16,
                 )
 
+                input_buffer = _SampleBuffer(
+                    int(self._model.window_size_samples * 4 * self._input_sample_rate)
+                    // self._opts.sample_rate
+                )
+
                 if self._input_sample_rate != self._opts.sample_rate:
                     # resampling needed: the input sample rate isn't the same as the model's
                     # sample rate used for inference
@@ -327,38 +391,41 @@ class VADStream(agents.vad.VADStream):
                 logger.error("a frame with another sample rate was already pushed")
                 continue
 
-            assert self._speech_buffer is not None
+            assert self._speech_buffer is not None and input_buffer is not None
 
-            input_frames.append(input_frame)
+            input_buffer.push(np.frombuffer(input_frame.data, dtype=np.int16))
             if resampler is not None:
                 # the resampler may have a bit of latency, but it is OK to ignore since it should be
                 # negligible
-                inference_frames.extend(resampler.push(input_frame))
+                for frame in resampler.push(input_frame):
+                    inference_buffer.push(np.frombuffer(frame.data, dtype=np.int16))
             else:
-                inference_frames.append(input_frame)
+                inference_buffer.push(np.frombuffer(input_frame.data, dtype=np.int16))
 
             while True:
                 start_time = time.perf_counter()
 
-                available_inference_samples = sum(
-                    [frame.samples_per_channel for frame in inference_frames]
-                )
-                if available_inference_samples < self._model.window_size_samples:
+                if len(inference_buffer) < self._model.window_size_samples:
                     break  # not enough samples to run inference
 
-                input_frame = utils.combine_frames(input_frames)
-                inference_frame = utils.combine_frames(inference_frames)
+                # no push happens until the end of this iteration, the views stay valid
+                input_data = input_buffer.peek()
 
                 # convert data to f32
                 np.divide(
-                    inference_frame.data[: self._model.window_size_samples],
+                    inference_buffer.peek()[: self._model.window_size_samples],
                     np.iinfo(np.int16).max,
                     out=inference_f32_data,
                     dtype=np.float32,
                 )
 
                 # run the inference
-                p = await self._loop.run_in_executor(None, self._model, inference_f32_data)
+                if self._engine is not None:
+                    p = await asyncio.wrap_future(
+                        self._engine.submit(self._model, inference_f32_data)
+                    )
+                else:
+                    p = await self._loop.run_in_executor(None, self._model, inference_f32_data)
                 p = self._exp_filter.apply(exp=1.0, sample=p)
 
                 window_duration = self._model.window_size_samples / self._opts.sample_rate
@@ -379,7 +446,7 @@ class VADStream(agents.vad.VADStream):
                 if to_copy_buffer > 0:
                     self._speech_buffer[
                         speech_buffer_index : speech_buffer_index + to_copy_buffer
-                    ] = input_frame.data[:to_copy_buffer]
+                    ] = input_data[:to_copy_buffer]
                     speech_buffer_index += to_copy_buffer
                 elif not self._speech_buffer_max_reached:
                     # reached self._opts.max_buffered_speech (padding is included)
@@ -442,7 +509,7 @@ class VADStream(agents.vad.VADStream):
                         inference_duration=inference_duration,
                         frames=[
                             rtc.AudioFrame(
-                                data=input_frame.data[:to_copy_int].tobytes(),
+                                data=input_data[:to_copy_int].tobytes(),
                                 sample_rate=self._input_sample_rate,
                                 num_channels=1,
                                 samples_per_channel=to_copy_int,
@@ -506,29 +573,6 @@ class VADStream(agents.vad.VADStream):
 
                         _reset_write_cursor()
 
-                # remove the frames that were used for inference from the input and inference frames
-                input_frames = []
-                inference_frames = []
-
-                # add the remaining data
-                if len(input_frame.data) - to_copy_int > 0:
-                    data = input_frame.data[to_copy_int:].tobytes()
-                    input_frames.append(
-                        rtc.AudioFrame(
-                            data=data,
-                            sample_rate=self._input_sample_rate,
-                            num_channels=1,
-                            samples_per_channel=len(data) // 2,
-                        )
-                    )
-
-                if len(inference_frame.data) - self._model.window_size_samples > 0:
-                    data = inference_frame.data[self._model.window_size_samples :].tobytes()
-                    inference_frames.append(
-                        rtc.AudioFrame(
-                            data=data,
-                            sample_rate=self._opts.sample_rate,
-                            num_channels=1,
-                            samples_per_channel=len(data) // 2,
-                        )
-                    )
+                # drop the samples that were used for inference
+                input_buffer.consume(to_copy_int)
+                inference_buffer.consume(self._model.window_size_samples)
@@ -5,18 +5,23 @@ import json
 import logging
 import math
 import re
+import struct
+import threading
 import time
 import unicodedata
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Any
 
+import numpy as np
 from huggingface_hub import errors
 
 from livekit.agents import Plugin, llm
 from livekit.agents.inference_runner import _InferenceRunner
 from livekit.agents.ipc.inference_executor import InferenceExecutor
 from livekit.agents.job import get_job_context
-from livekit.agents.utils import hw
+from livekit.agents.utils import hw, shortuuid
 
 from .log import logger
 from .models import HG_MODEL, MODEL_REVISIONS, ONNX_FILENAME, EOUModelType
@@ -25,6 +30,76 @@ from .version import __version__
 MAX_HISTORY_TOKENS = 128
 MAX_HISTORY_TURNS = 6
 
+# per-session tokenization cache kept by the inference process
+TOKENIZATION_CACHE_SIZE = 512
+TOKENIZATION_CACHE_TTL = 600.0
+
+# special tokens are never merged with their neighbours, so the conversation can be tokenized
+# piece by piece and concatenated. splitting before <|im_end|> too lets the last (unterminated)
+# user turn be reused once it's followed by the next turn
+_TURN_SPLIT_RE = re.compile(r"(?=<\|im_start\|>|<\|im_end\|>)")
+
+
+@dataclass
+class _TokenizationCacheEntry:
+    # raw message content -> normalized content
+    normalized: dict[str, str] = field(default_factory=dict)
+    # formatted turn -> token ids
+    turns: dict[str, list[int]] = field(default_factory=dict)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+# compact encoding of the EOU requests sent to the inference process (JSON always starts with "{")
+_BINARY_REQUEST_MAGIC = b"\x01"
+_ROLES = ("user", "assistant")
+_ROLE_IDS = {role: i for i, role in enumerate(_ROLES)}
+
+
+def _encode_eou_request(messages: list[dict[str, Any]], session_id: str | None) -> bytes:
+    """Encode the chat context as
+    magic | u16 session id length | session id | u8 count | (u8 role | u32 length | content)*"""
+    session = (session_id or "").encode()
+    contents = [msg["content"].encode() for msg in messages]
+    buf = bytearray(4 + len(session) + sum(5 + len(c) for c in contents))
+    struct.pack_into("!cH", buf, 0, _BINARY_REQUEST_MAGIC, len(session))
+    offset = 3
+    buf[offset : offset + len(session)] = session
+    offset += len(session)
+    buf[offset] = len(messages)
+    offset += 1
+    for msg, content in zip(messages, contents):
+        struct.pack_into("!BI", buf, offset, _ROLE_IDS[msg["role"]], len(content))
+        offset += 5
+        buf[offset : offset + len(content)] = content
+        offset += len(content)
+
+    return bytes(buf)
+
+
+def _decode_eou_request(data: bytes) -> tuple[list[dict[str, Any]], str | None]:
+    if data[:1] != _BINARY_REQUEST_MAGIC:
+        data_json = json.loads(data)
+        return data_json.get("chat_ctx", None), data_json.get("session_id", None)
+
+    view = memoryview(data)
+    (session_len,) = struct.unpack_from("!H", view, 1)
+    offset = 3
+    session_id = str(view[offset : offset + session_len], "utf-8") or None
+    offset += session_len
+    count = view[offset]
+    offset += 1
+
+    chat_ctx: list[dict[str, Any]] = []
+    for _ in range(count):
+        role, length = struct.unpack_from("!BI", view, offset)
+        offset += 5
+        chat_ctx.append(
+            {"role": _ROLES[role], "content": str(view[offset : offset + length], "utf-8")}
+        )
+        offset += length
+
+    return chat_ctx, session_id
+
 
 def _download_from_hf_hub(repo_id: str, filename: str, **kwargs: Any) -> str:
     from huggingface_hub import hf_hub_download
@@ -45,6 +120,11 @@ def _download_from_hf_hub(repo_id: str, filename: str, **kwargs: Any) -> str:
 
 
 class _EUORunnerBase(_InferenceRunner):
+    SUPPORTS_BATCHING = True
+
+    # cleared when the model only outputs the last position, padded batches can't be read then
+    _per_position_output = True
+
     @classmethod
     @abstractmethod
     def model_type(cls) -> EOUModelType: ...
@@ -66,14 +146,21 @@ class _EUORunnerBase(_InferenceRunner):
         text = re.sub(r"\s+", " ", text).strip()
         return text
 
-    def _format_chat_ctx(self, chat_ctx: list[dict[str, Any]]) -> str:
+    def _format_chat_ctx(
+        self, chat_ctx: list[dict[str, Any]], normalized: dict[str, str] | None = None
+    ) -> str:
         new_chat_ctx = []
         last_msg: dict[str, Any] | None = None
         for msg in chat_ctx:
             if not msg["content"]:
                 continue
 
-            content = self._normalize_text(msg["content"])
+            if normalized is not None:
+                content = normalized.get(msg["content"])
+                if content is None:
+                    content = normalized[msg["content"]] = self._normalize_text(msg["content"])
+            else:
+                content = self._normalize_text(msg["content"])
 
             # need to combine adjacent turns together to match training data
             if last_msg and last_msg["role"] == msg["role"]:
@@ -136,6 +223,14 @@ class _EUORunnerBase(_InferenceRunner):
                 local_files_only=True,
                 truncation_side="left",
             )
+            # the inference process runs requests concurrently, and fast tokenizers aren't
+            # safe to call from multiple threads when truncation is enabled
+            self._tokenizer_lock = threading.Lock()
+            self._pad_token_id = self._tokenizer.pad_token_id or 0
+            self._tokenization_cache: OrderedDict[str, _TokenizationCacheEntry] = OrderedDict()
+            self._use_attention_mask = any(
+                inp.name == "attention_mask" for inp in self._session.get_inputs()
+            )
 
         except (errors.LocalEntryNotFoundError, OSError):
             logger.error(
@@ -149,32 +244,128 @@ class _EUORunnerBase(_InferenceRunner):
             ) from None
 
     def run(self, data: bytes) -> bytes | None:
-        data_json = json.loads(data)
-        chat_ctx = data_json.get("chat_ctx", None)
+        return self.run_batch([data])[0]
 
-        if not chat_ctx:
-            raise ValueError("chat_ctx is required on the inference input data")
+    def run_batch(self, data: list[bytes]) -> list[bytes | None]:
+        requests: list[tuple[list[dict[str, Any]], str | None]] = []
+        for d in data:
+            chat_ctx, session_id = _decode_eou_request(d)
+            if not chat_ctx:
+                raise ValueError("chat_ctx is required on the inference input data")
+
+            requests.append((chat_ctx, session_id))
 
         start_time = time.perf_counter()
-        text = self._format_chat_ctx(chat_ctx)
-        inputs = self._tokenizer(
-            text,
-            add_special_tokens=False,
-            return_tensors="np",
-            max_length=MAX_HISTORY_TOKENS,
-            truncation=True,
-        )
-        # run inference
-        outputs = self._session.run(None, {"input_ids": inputs["input_ids"].astype("int64")})
-        eou_probability = outputs[0].flatten()[-1]
+        texts: list[str] = []
+        input_ids: list[list[int]] = []
+        with self._tokenizer_lock:
+            for chat_ctx, session_id in requests:
+                if session_id:
+                    text, ids = self._encode_cached(session_id, chat_ctx)
+                else:
+                    text = self._format_chat_ctx(chat_ctx)
+                    ids = self._tokenizer(
+                        text,
+                        add_special_tokens=False,
+                        max_length=MAX_HISTORY_TOKENS,
+                        truncation=True,
+                    )["input_ids"]
+
+                texts.append(text)
+                input_ids.append(ids)
+
+        eou_probabilities = self._predict(input_ids)
         end_time = time.perf_counter()
 
-        result: dict[str, Any] = {
-            "eou_probability": float(eou_probability),
-            "duration": round(end_time - start_time, 3),
-            "input": text,
-        }
-        return json.dumps(result).encode()
+        results: list[bytes | None] = []
+        for text, eou_probability in zip(texts, eou_probabilities):
+            result: dict[str, Any] = {
+                "eou_probability": float(eou_probability),
+                "duration": round(end_time - start_time, 3),
+                "input": text,
+            }
+            results.append(json.dumps(result).encode())
+
+        return results
+
+    def _encode_cached(
+        self, session_id: str, chat_ctx: list[dict[str, Any]]
+    ) -> tuple[str, list[int]]:
+        """Format and tokenize the chat context, reusing the normalized messages and the token
+        ids of the turns that didn't change since the previous call of the same session."""
+        prev_entry = self._tokenization_cache.pop(session_id, None)
+        now = time.monotonic()
+        if prev_entry is not None and now - prev_entry.last_used > TOKENIZATION_CACHE_TTL:
+            prev_entry = None
+
+        # only keep what the current context uses, the history window slides every turn
+        entry = _TokenizationCacheEntry(last_used=now)
+        normalized = dict(prev_entry.normalized) if prev_entry else {}
+        contents = [msg["content"] for msg in chat_ctx if msg["content"]]
+        text = self._format_chat_ctx(chat_ctx, normalized)
+        entry.normalized = {content: normalized[content] for content in contents}
+
+        turns = [turn for turn in _TURN_SPLIT_RE.split(text) if turn]
+        prev_turns = prev_entry.turns if prev_entry else {}
+        new_turns = [turn for turn in turns if turn not in prev_turns]
+        if new_turns:
+            new_ids = self._tokenizer(new_turns, add_special_tokens=False)["input_ids"]
+            prev_turns = {**prev_turns, **dict(zip(new_turns, new_ids))}
+
+        ids: list[int] = []
+        for turn in turns:
+            entry.turns[turn] = prev_turns[turn]
+            ids.extend(prev_turns[turn])
+
+        self._tokenization_cache[session_id] = entry
+        while len(self._tokenization_cache) > TOKENIZATION_CACHE_SIZE:
+            self._tokenization_cache.popitem(last=False)
+
+        # entries are ordered by last use, expired ones are at the front
+        while self._tokenization_cache:
+            oldest = next(iter(self._tokenization_cache.values()))
+            if now - oldest.last_used <= TOKENIZATION_CACHE_TTL:
+                break
+            self._tokenization_cache.popitem(last=False)
+
+        # same as truncation_side="left"
+        return text, ids[-MAX_HISTORY_TOKENS:]
+
+    def _predict(self, input_ids: list[list[int]]) -> np.ndarray:
+        """Run the model on a batch of token sequences and return the EOU probability of each.
+
+        Sequences are right-padded: the model is causal, so the prediction at the last real
+        token of each row isn't affected by the padding that follows it. Models that only
+        output the last position get one sequence at a time instead."""
+        lengths = np.array([max(len(ids), 1) for ids in input_ids])
+        if len(input_ids) > 1 and lengths.min() != lengths.max() and not self._per_position_output:
+            return np.concatenate([self._predict([ids]) for ids in input_ids])
+
+        batch = np.full((len(input_ids), lengths.max()), self._pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros_like(batch)
+        for i, ids in enumerate(input_ids):
+            batch[i, : len(ids)] = ids
+            attention_mask[i, : len(ids)] = 1
+
+        feeds = {"input_ids": batch}
+        if self._use_attention_mask:
+            feeds["attention_mask"] = attention_mask
+
+        outputs = self._session.run(None, feeds)
+        if outputs[0].shape[:2] == batch.shape:
+            probs = outputs[0].reshape(batch.shape[0], batch.shape[1], -1)
+            return probs[np.arange(batch.shape[0]), lengths - 1, -1]  # type: ignore
+
+        if lengths.min() == lengths.max():
+            # no padding, the last position is the last real token of every row
+            return outputs[0].reshape(batch.shape[0], -1)[:, -1]  # type: ignore
+
+        logger.warning(
+            "turn detector model doesn't output every position, running inference unbatched",
+            extra={"output_shape": outputs[0].shape},
+        )
+        self._per_position_output = False
+        return np.concatenate([self._predict([ids]) for ids in input_ids])
 
     @classmethod
     def _download_files(cls) -> None:
@@ -211,6 +402,8 @@ class EOUModelBase(ABC):
         self._executor = inference_executor or get_job_context().inference_executor
         self._unlikely_threshold = unlikely_threshold
         self._languages: dict[str, Any] = {}
+        # lets the inference process reuse the tokenization of the previous turns
+        self._session_id = shortuuid("eou_session_")
 
         if load_languages:
             config_fname = _download_from_hf_hub(
@@ -283,10 +476,10 @@ class EOUModelBase(ABC):
                 )
 
         messages = messages[-MAX_HISTORY_TURNS:]
-        json_data = json.dumps({"chat_ctx": messages}).encode()
+        data = _encode_eou_request(messages, self._session_id)
 
         result = await asyncio.wait_for(
-            self._executor.do_inference(self._inference_method(), json_data), timeout=timeout
+            self._executor.do_inference(self._inference_method(), data), timeout=timeout
         )
         assert result is not None, "end_of_utterance prediction should always returns a result"
 
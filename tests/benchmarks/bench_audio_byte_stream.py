@@ -0,0 +1,87 @@
+"""Cost of chunking audio into frames with AudioByteStream, against the previous implementation
+which reallocated the remaining buffer for every emitted frame.
+
+    python tests/benchmarks/bench_audio_byte_stream.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import ctypes
+import time
+
+from livekit import rtc
+from livekit.agents.utils.audio import AudioByteStream
+
+SAMPLE_RATE = 24000
+NUM_CHANNELS = 1
+REPEATS = 5
+CHUNK_DURATIONS = [0.01, 0.05, 0.1, 0.5, 1.0, 5.0]
+
+
+class _PreviousAudioByteStream:
+    def __init__(self, sample_rate: int, num_channels: int, samples_per_channel: int) -> None:
+        self._sample_rate = sample_rate
+        self._num_channels = num_channels
+        self._bytes_per_sample = num_channels * ctypes.sizeof(ctypes.c_int16)
+        self._bytes_per_frame = samples_per_channel * self._bytes_per_sample
+        self._buf = bytearray()
+
+    def push(self, data: bytes) -> list[rtc.AudioFrame]:
+        self._buf.extend(data)
+
+        frames = []
+        while len(self._buf) >= self._bytes_per_frame:
+            frame_data = self._buf[: self._bytes_per_frame]
+            self._buf = self._buf[self._bytes_per_frame :]
+
+            frames.append(
+                rtc.AudioFrame(
+                    data=frame_data,
+                    sample_rate=self._sample_rate,
+                    num_channels=self._num_channels,
+                    samples_per_channel=len(frame_data) // self._bytes_per_sample,
+                )
+            )
+
+        return frames
+
+
+def _bench(stream_cls: type, chunk: bytes, samples_per_channel: int, total_bytes: int) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        stream = stream_cls(SAMPLE_RATE, NUM_CHANNELS, samples_per_channel)
+        pushed = 0
+        start = time.perf_counter()
+        while pushed < total_bytes:
+            stream.push(chunk)
+            pushed += len(chunk)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frame-ms", type=int, default=10)
+    parser.add_argument("--total", type=float, default=60.0, help="seconds of audio per run")
+    args = parser.parse_args()
+
+    samples_per_channel = SAMPLE_RATE * args.frame_ms // 1000
+    bytes_per_second = SAMPLE_RATE * NUM_CHANNELS * 2
+    total_bytes = int(args.total * bytes_per_second)
+
+    print(f"{args.total:.0f}s of audio, {args.frame_ms}ms frames")
+    print(f"{'chunk':>8} {'previous':>12} {'current':>12} {'speedup':>8}")
+    for duration in CHUNK_DURATIONS:
+        # odd sized chunks so frames straddle chunk boundaries
+        chunk = bytes(int(duration * bytes_per_second) + 2)
+        previous = _bench(_PreviousAudioByteStream, chunk, samples_per_channel, total_bytes)
+        current = _bench(AudioByteStream, chunk, samples_per_channel, total_bytes)
+        print(
+            f"{duration * 1000:>6.0f}ms {previous * 1000:>10.1f}ms {current * 1000:>10.1f}ms "
+            f"{previous / current:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Decode throughput and thread usage of AudioStreamDecoder against the previous implementation,
+which started a thread per decoder and recopied the unread input on every read.
+
+    python tests/benchmarks/bench_audio_decoder.py [--file tests/long.mp3]
+
+When the file isn't available (e.g. a git-lfs pointer), a synthetic mp3 of the same length is used.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import av
+import numpy as np
+
+from livekit.agents.utils.codecs import AudioStreamDecoder, StreamBuffer
+
+
+class _PreviousStreamBuffer(StreamBuffer):
+    def __init__(self) -> None:
+        self._buffer = io.BytesIO()
+        self._lock = threading.Lock()
+        self._data_available = threading.Condition(self._lock)
+        self._eof = False
+
+    def write(self, data: bytes) -> None:
+        with self._data_available:
+            self._buffer.seek(0, io.SEEK_END)
+            self._buffer.write(data)
+            self._data_available.notify_all()
+
+    def read(self, size: int = -1) -> bytes:
+        if self._buffer.closed:
+            return b""
+
+        with self._data_available:
+            while True:
+                if self._buffer.closed:
+                    return b""
+                self._buffer.seek(0)
+                data = self._buffer.read(size)
+                if data:
+                    remaining = self._buffer.read()
+                    self._buffer = io.BytesIO(remaining)
+                    return data
+                if self._eof:
+                    return b""
+                self._data_available.wait()
+
+    def close(self) -> None:
+        self._buffer.close()
+
+
+_threads: set[threading.Thread] = set()
+
+
+class _PreviousAudioStreamDecoder(AudioStreamDecoder):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._input_buf = _PreviousStreamBuffer()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="AudioDecoder")
+
+    def push(self, chunk: bytes) -> None:
+        self._input_buf.write(chunk)
+        if not self._started:
+            self._started = True
+            self._loop.run_in_executor(self._executor, self._decode_loop)
+
+    def _decode_loop(self) -> None:
+        _threads.add(threading.current_thread())
+        super()._decode_loop()
+
+    async def aclose(self) -> None:
+        await super().aclose()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _CurrentAudioStreamDecoder(AudioStreamDecoder):
+    def _decode_loop(self) -> None:
+        _threads.add(threading.current_thread())
+        super()._decode_loop()
+
+
+def _synthetic_mp3(size: int, sample_rate: int = 24000) -> bytes:
+    # the default mp3 encoder settings give ~32kbps for mono 24kHz
+    duration = size * 8 / 32000
+    buf = io.BytesIO()
+    container = av.open(buf, mode="w", format="mp3")
+    stream = container.add_stream("mp3", rate=sample_rate)
+    stream.layout = "mono"
+    rng = np.random.default_rng(0)
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    audio = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(len(t))
+    frame = av.AudioFrame.from_ndarray(
+        (audio * 32767).astype(np.int16)[None], format="s16", layout="mono"
+    )
+    frame.sample_rate = sample_rate
+    for packet in stream.encode(frame):
+        container.mux(packet)
+    for packet in stream.encode(None):
+        container.mux(packet)
+    container.close()
+    return buf.getvalue()
+
+
+def _load(path: Path) -> bytes:
+    data = path.read_bytes() if path.exists() else b""
+    if not data.startswith(b"version https://git-lfs"):
+        return data
+
+    size = int(data.split(b"size ")[1].split()[0])
+    print(f"{path} is a git-lfs pointer, using {size} bytes of synthetic mp3")
+    return _synthetic_mp3(size)
+
+
+async def _decode(cls: type[AudioStreamDecoder], data: bytes, chunk_size: int) -> float:
+    decoder = cls(sample_rate=24000, format="audio/mpeg")
+    for i in range(0, len(data), chunk_size):
+        decoder.push(data[i : i + chunk_size])
+    decoder.end_input()
+    samples = sum([frame.samples_per_channel async for frame in decoder])
+    await decoder.aclose()
+    return samples / 24000
+
+
+async def _run(
+    cls: type[AudioStreamDecoder], data: bytes, requests: int, concurrency: int, chunk_size: int
+) -> tuple[float, float, int, int]:
+    _threads.clear()
+    peak_threads = threading.active_count()
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _request() -> float:
+        nonlocal peak_threads
+        async with sem:
+            duration = await _decode(cls, data, chunk_size)
+            peak_threads = max(peak_threads, threading.active_count())
+            return duration
+
+    start = time.perf_counter()
+    durations = await asyncio.gather(*[_request() for _ in range(requests)])
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(durations), len(_threads), peak_threads
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file", type=Path, default=Path(__file__).parents[1] / "long.mp3")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    data = _load(args.file)
+    print(f"{args.requests} decodes of {len(data)} bytes, {args.concurrency} at a time")
+    print(
+        f"{'pushed as':>14} {'impl':>9} {'wall':>8} {'audio/s':>8} "
+        f"{'threads started':>16} {'peak threads':>13}"
+    )
+    for label, chunk_size in (("4KB chunks", 4096), ("whole body", len(data))):
+        for name, cls in (
+            ("previous", _PreviousAudioStreamDecoder),
+            ("current", _CurrentAudioStreamDecoder),
+        ):
+            elapsed, audio, threads, peak = await _run(
+                cls, data, args.requests, args.concurrency, chunk_size
+            )
+            print(
+                f"{label:>14} {name:>9} {elapsed:>7.2f}s {audio / elapsed:>7.0f}x "
+                f"{threads:>16} {peak:>13}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+"""Cost of compute_chat_ctx_diff as called by the realtime sessions on update_chat_ctx, against the
+previous quadratic dynamic-programming LCS.
+
+    python tests/benchmarks/bench_chat_ctx_diff.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from livekit.agents.llm import ChatContext, ChatMessage, utils
+
+
+def _contexts(n: int) -> tuple[ChatContext, ChatContext]:
+    # a typical update: a few items appended, one removed and one edited
+    old_ctx = ChatContext(
+        [ChatMessage(id=f"item_{i}", role="user", content=[f"message {i}"]) for i in range(n)]
+    )
+    new_ctx = old_ctx.copy()
+    new_ctx.items.pop(n // 3)
+    new_ctx.items[n // 2] = ChatMessage(id=f"item_{n // 2 + 1}", role="user", content=["edited"])
+    for i in range(n, n + 3):
+        new_ctx.items.append(ChatMessage(id=f"item_{i}", role="assistant", content=["reply"]))
+    return old_ctx, new_ctx
+
+
+def _timeit(fnc, min_time: float) -> float:
+    runs = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < min_time:
+        fnc()
+        runs += 1
+    return elapsed / runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds per measurement")
+    args = parser.parse_args()
+
+    print(f"{'items':>6} {'previous lcs':>13} {'current lcs':>12} {'speedup':>8} {'full diff':>10}")
+    for n in (10, 100, 1000):
+        old_ctx, new_ctx = _contexts(n)
+        old_ids = [item.id for item in old_ctx.items]
+        new_ids = [item.id for item in new_ctx.items]
+        assert utils._compute_lcs(old_ids, new_ids) == utils._compute_lcs_dp(old_ids, new_ids)
+
+        previous = _timeit(lambda: utils._compute_lcs_dp(old_ids, new_ids), args.min_time)  # noqa: B023
+        current = _timeit(lambda: utils._compute_lcs(old_ids, new_ids), args.min_time)  # noqa: B023
+        diff = _timeit(lambda: utils.compute_chat_ctx_diff(old_ctx, new_ctx), args.min_time)  # noqa: B023
+        print(
+            f"{n:>6} {previous * 1e6:>11.1f}us {current * 1e6:>10.1f}us "
+            f"{previous / current:>7.0f}x {diff * 1e6:>8.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Throughput of the end-of-turn model when running several sessions in a single batch.
+
+The model files must be downloaded beforehand (``python your_agent.py download-files``).
+
+    python tests/benchmarks/bench_eou_batch.py [--model en|multilingual]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+
+BATCH_SIZES = [1, 2, 4, 8, 16, 32]
+
+_SENTENCES = [
+    "hi, thanks for calling, how can I help you today?",
+    "I'd like to check the balance on my checking account",
+    "sure, can you give me the last four digits of the account number",
+    "yes it's four two one",
+    "I'm sorry, I didn't catch that, could you repeat the number",
+    "let me see, I think it's four two one seven but I need to",
+]
+
+
+def _make_request(rng: random.Random) -> bytes:
+    num_turns = rng.randint(2, 6)
+    chat_ctx = [
+        {"role": "assistant" if (num_turns - i) % 2 == 0 else "user", "content": s}
+        for i, s in enumerate(rng.choices(_SENTENCES, k=num_turns))
+    ]
+    return json.dumps({"chat_ctx": chat_ctx}).encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", choices=["en", "multilingual"], default="en")
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.model == "en":
+        from livekit.plugins.turn_detector.english import _EUORunnerEn as runner_cls
+    else:
+        from livekit.plugins.turn_detector.multilingual import (
+            _EUORunnerMultilingual as runner_cls,
+        )
+
+    runner = runner_cls()
+    runner.initialize()
+
+    rng = random.Random(42)
+    runner.run_batch([_make_request(rng) for _ in range(4)])  # warmup
+
+    print(f"{'batch':>6} {'sequential req/s':>18} {'batched req/s':>15} {'speedup':>8}")
+    for batch_size in BATCH_SIZES:
+        requests = [_make_request(rng) for _ in range(batch_size)]
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            for req in requests:
+                runner.run(req)
+        sequential = batch_size * args.iterations / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            runner.run_batch(requests)
+        batched = batch_size * args.iterations / (time.perf_counter() - start)
+
+        print(f"{batch_size:>6} {sequential:>18.1f} {batched:>15.1f} {batched / sequential:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
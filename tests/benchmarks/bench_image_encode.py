@@ -0,0 +1,92 @@
+"""Latency per frame of encoding camera frames for LLM vision input, against the previous
+implementation which converted the full resolution frame to RGBA, then to RGB, before resizing.
+
+    python tests/benchmarks/bench_image_encode.py
+
+Also reports the cost of an unchanged frame with a FrameEncodeCache, which reuses the previous
+encoding.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import io
+import time
+
+import numpy as np
+from PIL import Image
+
+from livekit import rtc
+from livekit.agents.utils.images import (
+    EncodeOptions,
+    FrameEncodeCache,
+    ResizeOptions,
+    encode,
+    image,
+)
+
+
+def _previous_encode(frame: rtc.VideoFrame, options: EncodeOptions) -> bytes:
+    converted = frame
+    if frame.type != rtc.VideoBufferType.RGBA:
+        converted = frame.convert(rtc.VideoBufferType.RGBA)
+    img = Image.frombytes("RGBA", (frame.width, frame.height), converted.data).convert("RGB")
+    resized = image._resize_image(img, options)
+    buffer = io.BytesIO()
+    resized.save(buffer, options.format, quality=options.quality)
+    return buffer.getvalue()
+
+
+def _frame(width: int, height: int, buffer_type: int, seed: int) -> rtc.VideoFrame:
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:height, 0:width]
+    rgba = np.stack(
+        [xx * 255 // width, yy * 255 // height, (xx + yy) * 255 // (width + height), xx * 0 + 255],
+        axis=-1,
+    ).astype(np.int16)
+    rgba[..., :3] += rng.integers(-4, 4, (height, width, 3), dtype=np.int16)
+    frame = rtc.VideoFrame(
+        width, height, rtc.VideoBufferType.RGBA, np.clip(rgba, 0, 255).astype(np.uint8).tobytes()
+    )
+    return frame if buffer_type == rtc.VideoBufferType.RGBA else frame.convert(buffer_type)
+
+
+def _timeit(fn, frames: list[rtc.VideoFrame]) -> float:
+    start = time.perf_counter()
+    for frame in frames:
+        fn(frame)
+    return (time.perf_counter() - start) / len(frames)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--size", type=int, default=512, help="inference width and height")
+    args = parser.parse_args()
+
+    # same options as llm.utils.serialize_image with inference_width/height set
+    opts = EncodeOptions(resize_options=ResizeOptions(args.size, args.size, "scale_aspect_fit"))
+    print(f"JPEG, scale_aspect_fit into {args.size}x{args.size}, ms per frame:")
+    print(f"{'input':>12} {'previous':>9} {'current':>9} {'unchanged':>10}")
+    for width, height in ((1280, 720), (1920, 1080)):
+        for name, buffer_type in (
+            ("I420", rtc.VideoBufferType.I420),
+            ("RGBA", rtc.VideoBufferType.RGBA),
+        ):
+            frames = [_frame(width, height, buffer_type, seed) for seed in range(args.frames)]
+            previous = _timeit(lambda f: _previous_encode(f, opts), frames)
+            current = _timeit(lambda f: encode(f, opts), frames)
+
+            encode_cache = FrameEncodeCache()
+            encode_cache.encode(frames[0], opts)
+            unchanged = _timeit(functools.partial(encode_cache.encode, options=opts), frames[1:])
+
+            print(
+                f"{f'{height}p {name}':>12} {previous * 1000:>8.1f} {current * 1000:>8.1f} "
+                f"{unchanged * 1000:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
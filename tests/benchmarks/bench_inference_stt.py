@@ -0,0 +1,139 @@
+"""Bytes on the wire and client CPU per audio minute of the inference gateway STT, sending audio
+as binary frames against the previous base64 encoded input_audio JSON messages.
+
+    python tests/benchmarks/bench_inference_stt.py [--minutes 5]
+
+The gateway is a local stand-in running in a separate process, so its CPU isn't counted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import multiprocessing as mp
+import time
+
+import aiohttp
+import numpy as np
+from aiohttp import web
+
+from livekit import rtc
+from livekit.agents import inference
+
+SAMPLE_RATE = 16000
+
+
+def _serve(binary: bool, port_queue: mp.Queue, bytes_queue: mp.Queue) -> None:
+    async def _handler(request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        session = json.loads((await ws.receive()).data)
+        created: dict = {"type": "session.created"}
+        if binary and session["settings"].get("audio_frames") == "binary":
+            created["audio_frames"] = "binary"
+        await ws.send_str(json.dumps(created))
+
+        wire_bytes = 0
+        async for msg in ws:
+            wire_bytes += len(msg.data)
+            if msg.type == aiohttp.WSMsgType.TEXT and '"session.finalize"' in msg.data:
+                await ws.send_str(json.dumps({"type": "final_transcript", "transcript": "ok"}))
+                await ws.close()
+
+        bytes_queue.put(wire_bytes)
+        return ws
+
+    async def _main() -> None:
+        app = web.Application()
+        app.router.add_get("/stt", _handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port_queue.put(site._server.sockets[0].getsockname()[1])  # type: ignore[union-attr]
+        await asyncio.Event().wait()
+
+    asyncio.run(_main())
+
+
+async def _session(base_url: str, audio: np.ndarray) -> float:
+    async with aiohttp.ClientSession() as session:
+        lk_stt = inference.STT(
+            "deepgram",
+            base_url=base_url,
+            api_key="devkey",
+            api_secret="secret" * 6,
+            http_session=session,
+        )
+        stream = lk_stt.stream()
+        frame_size = SAMPLE_RATE // 100  # 10ms frames, as from a room
+        frames = [
+            rtc.AudioFrame(
+                data=audio[i : i + frame_size].tobytes(),
+                sample_rate=SAMPLE_RATE,
+                num_channels=1,
+                samples_per_channel=frame_size,
+            )
+            for i in range(0, len(audio) - frame_size + 1, frame_size)
+        ]
+
+        start = time.process_time()
+        for i, frame in enumerate(frames):
+            stream.push_frame(frame)
+            if i % 100 == 0:
+                await asyncio.sleep(0)
+        stream.end_input()
+        async for _ in stream:
+            pass
+        cpu = time.process_time() - start
+        await stream.aclose()
+        return cpu
+
+
+def _encode_only(audio: np.ndarray, binary: bool) -> float:
+    chunk_size = SAMPLE_RATE // 20
+    chunks = [audio[i : i + chunk_size].tobytes() for i in range(0, len(audio), chunk_size)]
+    header = inference.stt._BINARY_AUDIO_HEADER
+    start = time.process_time()
+    for i, chunk in enumerate(chunks):
+        if binary:
+            b"".join((header.pack(inference.stt.BINARY_AUDIO_FRAME_TYPE, i), chunk))
+        else:
+            json.dumps({"type": "input_audio", "audio": base64.b64encode(chunk).decode("utf-8")})
+    return time.process_time() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=float, default=5.0, help="minutes of audio per session")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    audio = rng.integers(-3000, 3000, int(args.minutes * 60 * SAMPLE_RATE), dtype=np.int16)
+
+    print(f"{args.minutes:.0f} min of {SAMPLE_RATE // 1000}kHz audio, per audio minute:")
+    print(f"{'framing':>8} {'wire bytes':>11} {'encode CPU':>11} {'session CPU':>12}")
+    for binary in (False, True):
+        port_queue: mp.Queue = mp.Queue()
+        bytes_queue: mp.Queue = mp.Queue()
+        server = mp.Process(target=_serve, args=(binary, port_queue, bytes_queue), daemon=True)
+        server.start()
+        try:
+            base_url = f"http://127.0.0.1:{port_queue.get()}"
+            cpu = await _session(base_url, audio)
+            wire_bytes = bytes_queue.get()
+        finally:
+            server.terminate()
+
+        encode = _encode_only(audio, binary)
+        print(
+            f"{'binary' if binary else 'json':>8} {wire_bytes / args.minutes / 1e6:>9.2f}MB "
+            f"{encode / args.minutes * 1000:>9.1f}ms {cpu / args.minutes * 1000:>10.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+"""Round-trip latency of inference requests sent to the inference process, with the data
+inlined in the IPC message or written in the shared memory ring, and encoding cost of the
+end-of-turn request as JSON versus the binary codec.
+
+    python tests/benchmarks/bench_ipc_inference.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing as mp
+import statistics
+import time
+
+from livekit.agents import ipc
+from livekit.agents.inference_runner import _InferenceRunner
+
+PAYLOAD_SIZES = [256, 1024, 4 * 1024, 16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024]
+ITERATIONS = 200
+
+
+class _NoopRunner(_InferenceRunner):
+    INFERENCE_METHOD = "bench_noop"
+
+    def initialize(self) -> None:
+        pass
+
+    def run(self, data: bytes) -> bytes | None:
+        return b"ok"
+
+
+async def _bench_round_trip(shm_size: int) -> dict[int, float]:
+    proc = ipc.inference_proc_executor.InferenceProcExecutor(
+        runners={_NoopRunner.INFERENCE_METHOD: _NoopRunner},
+        initialize_timeout=20.0,
+        close_timeout=5.0,
+        memory_warn_mb=0,
+        memory_limit_mb=0,
+        ping_interval=5,
+        ping_timeout=60,
+        high_ping_threshold=2.5,
+        mp_ctx=mp.get_context("spawn"),
+        loop=asyncio.get_running_loop(),
+        http_proxy=None,
+        shm_size=shm_size,
+    )
+    await proc.start()
+    await proc.initialize()
+
+    results: dict[int, float] = {}
+    for size in PAYLOAD_SIZES:
+        payload = b"x" * size
+        samples = []
+        for _ in range(ITERATIONS):
+            start = time.perf_counter()
+            await proc.do_inference(_NoopRunner.INFERENCE_METHOD, payload)
+            samples.append(time.perf_counter() - start)
+        results[size] = statistics.median(samples)
+
+    await proc.aclose()
+    return results
+
+
+def _bench_codec() -> None:
+    from livekit.plugins.turn_detector.base import _decode_eou_request, _encode_eou_request
+
+    messages = [
+        {"role": "user" if i % 2 else "assistant", "content": "I'd like to book a table " * 4}
+        for i in range(6)
+    ]
+
+    def _timeit(fnc) -> float:  # type: ignore
+        start = time.perf_counter()
+        for _ in range(10_000):
+            fnc()
+        return (time.perf_counter() - start) / 10_000 * 1e6
+
+    json_data = json.dumps({"chat_ctx": messages, "session_id": "eou_session_1"}).encode()
+    bin_data = _encode_eou_request(messages, "eou_session_1")
+
+    print(f"\n{'codec':>8} {'size':>8} {'encode us':>10} {'decode us':>10}")
+    enc = _timeit(lambda: json.dumps({"chat_ctx": messages, "session_id": "s"}).encode())
+    dec = _timeit(lambda: json.loads(json_data))
+    print(f"{'json':>8} {len(json_data):>8} {enc:>10.2f} {dec:>10.2f}")
+    enc = _timeit(lambda: _encode_eou_request(messages, "eou_session_1"))
+    dec = _timeit(lambda: _decode_eou_request(bin_data))
+    print(f"{'binary':>8} {len(bin_data):>8} {enc:>10.2f} {dec:>10.2f}")
+
+
+async def main() -> None:
+    inline = await _bench_round_trip(shm_size=0)
+    shm = await _bench_round_trip(shm_size=8 * 1024 * 1024)
+
+    print(f"{'payload':>10} {'inline p50 us':>14} {'shm p50 us':>12}")
+    for size in PAYLOAD_SIZES:
+        print(f"{size:>10} {inline[size] * 1e6:>14.1f} {shm[size] * 1e6:>12.1f}")
+
+    try:
+        _bench_codec()
+    except ImportError:
+        print("\nlivekit-plugins-turn-detector isn't installed, skipping the codec benchmark")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
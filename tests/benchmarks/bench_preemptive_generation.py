@@ -0,0 +1,145 @@
+"""Preemptive generation while the transcript of a user turn grows, restarting the generation
+on every transcript change (the previous behaviour) against reusing the generation when the
+transcript is only re-punctuated, and with max_preemptive_generations=2 also keeping the ones whose
+transcript is extended.
+
+    python -m tests.benchmarks.bench_preemptive_generation [--interval 0.3] [--speed 5]
+
+Uses tests/fake_llm.py and tests/fake_tts.py, the transcript updates alternate preflight and final
+transcripts like an STT with preflight results, the turn ends on the last one. The fake LLM
+reports its usage when a request completes, the streamed chunks of the cancelled ones are counted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from livekit.agents import AgentStateChangedEvent, MetricsCollectedEvent
+from livekit.agents.metrics import PreemptiveGenerationMetrics, TTSMetrics
+from livekit.agents.voice.audio_recognition import _EndOfTurnInfo, _PreemptiveGenerationInfo
+from livekit.agents.voice.transcription.synchronizer import _SyncedAudioOutput
+from tests.fake_session import FakeActions, create_session
+from tests.test_agent_session import MyAgent
+
+TRANSCRIPTS = [
+    "I'd like to book",
+    "I'd like to book a table",
+    "I'd like to book a table.",
+    "I'd like to book a table for two",
+    "I'd like to book a table for two.",
+    "I'd like to book a table for two tonight",
+    "I'd like to book a table for two tonight.",
+]
+REPLY = "Sure. What time would you like to come? We are open until eleven."
+
+
+def _actions() -> FakeActions:
+    actions = FakeActions()
+    for transcript in TRANSCRIPTS:
+        actions.add_llm(REPLY, input=transcript, ttft=0.2, duration=0.8)
+
+    # the speculative first sentence is flushed on its own, the reply may also be scheduled
+    # before it is complete
+    first, rest = REPLY.split(" ", 1)
+    for text in (REPLY, first, first + " ", rest):
+        actions.add_tts(1.0, input=text, ttfb=0.2)
+    return actions
+
+
+async def _run(
+    restart: bool, max_generations: int, interval: float, speed: float
+) -> tuple[int, float, int, int, float]:
+    session = create_session(
+        _actions(),
+        speed_factor=speed,
+        extra_kwargs={
+            "preemptive_generation": True,
+            "max_preemptive_generations": max_generations,
+        },
+    )
+    assert isinstance(session.output.audio, _SyncedAudioOutput)
+    transcript_sync = session.output.audio._synchronizer
+
+    metrics: list[MetricsCollectedEvent] = []
+    session.on("metrics_collected", metrics.append)
+    speaking_at = 0.0
+
+    def _on_agent_state_changed(ev: AgentStateChangedEvent) -> None:
+        nonlocal speaking_at
+        if ev.new_state == "speaking" and not speaking_at:
+            speaking_at = time.perf_counter()
+
+    session.on("agent_state_changed", _on_agent_state_changed)
+
+    await session.start(MyAgent())
+    activity = session._activity
+    assert activity is not None
+
+    for transcript in TRANSCRIPTS:
+        if restart:
+            activity._cancel_preemptive_generation()
+        activity.on_preemptive_generation(
+            _PreemptiveGenerationInfo(
+                new_transcript=transcript, transcript_confidence=1.0, started_speaking_at=None
+            )
+        )
+        await asyncio.sleep(interval / speed)
+
+    end_of_turn_at = time.perf_counter()
+    activity.on_end_of_turn(
+        _EndOfTurnInfo(
+            new_transcript=TRANSCRIPTS[-1],
+            transcript_confidence=1.0,
+            started_speaking_at=None,
+            stopped_speaking_at=None,
+            transcription_delay=None,
+            end_of_turn_delay=None,
+        )
+    )
+    await asyncio.sleep(5.0 / speed)
+    await session.aclose()
+    await transcript_sync.aclose()
+
+    tts_characters = sum(
+        ev.metrics.characters_count for ev in metrics if isinstance(ev.metrics, TTSMetrics)
+    )
+    llm_requests = completion_tokens = wasted_tokens = 0
+    for ev in metrics:
+        if isinstance(ev.metrics, PreemptiveGenerationMetrics):
+            llm_requests += ev.metrics.candidates
+            completion_tokens += ev.metrics.completion_tokens
+            wasted_tokens += ev.metrics.wasted_completion_tokens
+    wasted_ratio = wasted_tokens / completion_tokens if completion_tokens else 0.0
+    latency = (speaking_at - end_of_turn_at) * speed
+    return llm_requests, latency, completion_tokens, tts_characters, wasted_ratio
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--interval", type=float, default=0.3, help="between transcripts")
+    parser.add_argument("--speed", type=float, default=5.0, help="speed up the fake timings")
+    args = parser.parse_args()
+
+    print(f"{len(TRANSCRIPTS)} transcript updates every {args.interval * 1000:.0f}ms:")
+    print(
+        f"{'generation':>22} {'llm requests':>13} {'latency':>8} {'tokens':>7} "
+        f"{'tts chars':>10} {'wasted tokens':>14}"
+    )
+    for name, restart, max_generations in [
+        ("restart (previous)", True, 1),
+        ("punctuation reuse, max 1", False, 1),
+        ("+ prefix kept, max 2", False, 2),
+    ]:
+        requests, latency, tokens, characters, wasted = await _run(
+            restart, max_generations, args.interval, args.speed
+        )
+        print(
+            f"{name:>22} {requests:>13} {latency * 1000:>6.0f}ms {tokens:>7} "
+            f"{characters:>10} {wasted * 100:>13.0f}%"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""Encoder CPU and output size per audio minute of the session recorder, for the default opus
+settings against the low CPU profile.
+
+    python tests/benchmarks/bench_recorder_io.py [--minutes 2]
+
+CPU covers resampling and encoding on the recorder thread, audio is pushed a minute at a time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import dataclasses
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from livekit import rtc
+from livekit.agents.voice import io
+from livekit.agents.voice.recorder_io import (
+    LOW_CPU_RECORDER_OPTIONS,
+    RecorderIO,
+    RecorderOptions,
+)
+
+
+def _frames(duration: float, sample_rate: int, seed: int) -> list[rtc.AudioFrame]:
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    samples = np.sin(2 * np.pi * 220 * t) * 6000 + rng.normal(0, 500, len(t))
+    samples = samples.astype(np.int16)
+    frame_size = sample_rate // 50
+    return [
+        rtc.AudioFrame(
+            data=samples[i : i + frame_size].tobytes(),
+            sample_rate=sample_rate,
+            num_channels=1,
+            samples_per_channel=len(samples[i : i + frame_size]),
+        )
+        for i in range(0, len(samples), frame_size)
+    ]
+
+
+async def _record(options: RecorderOptions, minutes: float, output: Path) -> tuple[float, int]:
+    recorder = RecorderIO(agent_session=None, options=options)  # type: ignore[arg-type]
+    recorder.record_input(io.AudioInput(label="bench"))
+    recorder.record_output(None)  # type: ignore[arg-type]
+
+    # push one minute at a time so the queue never drops audio
+    input_minute, output_minute = _frames(60, 16000, 0), _frames(60, 24000, 1)
+    start = time.process_time()
+    await recorder.start(output_path=output)
+    for _ in range(int(minutes)):
+        while recorder.stats.pending_duration > options.max_pending_duration - 60:
+            await asyncio.sleep(0.01)
+        recorder._push(input_minute, output_minute)
+    await recorder.aclose()
+    cpu = time.process_time() - start
+    return cpu, sum(path.stat().st_size for path in recorder.output_paths)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=int, default=2)
+    args = parser.parse_args()
+
+    profiles = {
+        "default": RecorderOptions(max_pending_duration=120.0),
+        "low cpu": dataclasses.replace(LOW_CPU_RECORDER_OPTIONS, max_pending_duration=120.0),
+    }
+
+    print(f"{args.minutes} min of stereo recording, per audio minute:")
+    print(f"{'profile':>8} {'encoder CPU':>12} {'size':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, options in profiles.items():
+            cpu, size = await _record(options, args.minutes, Path(tmp) / f"{name}.ogg")
+            print(
+                f"{name:>8} {cpu / args.minutes * 1000:>10.0f}ms "
+                f"{size / args.minutes / 1e3:>6.0f}kB"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
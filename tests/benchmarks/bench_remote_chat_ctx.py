@@ -0,0 +1,67 @@
+"""Cost of reading the chat_ctx of an OpenAI realtime session, against the previous
+implementation which rebuilt a ChatContext from the remote linked list on every read.
+
+    python tests/benchmarks/bench_remote_chat_ctx.py
+
+Each turn inserts two items, then reads the context and looks an item up a few times, like the
+session and the agent activity do in a turn. The diff of update_chat_ctx is timed separately.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from livekit.agents.llm import ChatContext, ChatItem, ChatMessage, utils
+from livekit.agents.llm.remote_chat_context import RemoteChatContext
+
+
+def _previous_to_chat_ctx(remote: RemoteChatContext) -> ChatContext:
+    items: list[ChatItem] = []
+    current_node = remote._head
+    while current_node is not None:
+        items.append(current_node.item)
+        current_node = current_node._next
+
+    return ChatContext(items=items)
+
+
+def _run(turns: int, reads: int, previous: bool) -> tuple[float, float]:
+    remote = RemoteChatContext()
+    prev_id = ""
+    read_time = diff_time = 0.0
+    for turn in range(turns):
+        for role in ("user", "assistant"):
+            item = ChatMessage(id=f"{role}_{turn}", role=role, content=[f"{role} {turn}"])
+            remote.insert(prev_id or None, item)
+            prev_id = item.id
+
+        start = time.perf_counter()
+        for _ in range(reads):
+            remote_ctx = _previous_to_chat_ctx(remote) if previous else remote.snapshot()
+            remote_ctx.get_by_id(prev_id)
+        read_time += time.perf_counter() - start
+
+        agent_ctx = ChatContext([item.model_copy() for item in remote_ctx.items])
+        start = time.perf_counter()
+        utils.compute_chat_ctx_diff(remote_ctx, agent_ctx)
+        diff_time += time.perf_counter() - start
+
+    return read_time / turns, diff_time / turns
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reads", type=int, default=4, help="reads per turn")
+    args = parser.parse_args()
+
+    print(f"{args.reads} reads per turn, ms per turn (mean over the conversation):")
+    print(f"{'turns':>6} {'previous':>9} {'current':>9} {'one diff':>9}")
+    for turns in (50, 200, 800):
+        previous, _ = _run(turns, args.reads, previous=True)
+        current, diff = _run(turns, args.reads, previous=False)
+        print(f"{turns:>6} {previous * 1000:>9.3f} {current * 1000:>9.3f} {diff * 1000:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Cost of streaming text through the sentence tokenizers, one LLM-like token at a time.
+
+Compares the incremental tokenizers used by the sentence streams against re-tokenizing the whole
+buffered text after every token.
+
+    python tests/benchmarks/bench_sentence_stream.py
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import re
+import time
+
+from livekit.agents.tokenize import _basic_sent, basic, blingfire, token_stream
+
+REPEATS = 5
+TEXT_PATH = os.path.join(os.path.dirname(__file__), "..", "long_synthesize.txt")
+
+
+def _run(stream: token_stream.BufferedTokenStream, deltas: list[str]) -> float:
+    start = time.perf_counter()
+    for delta in deltas:
+        stream.push_text(delta)
+    stream.end_input()
+    return time.perf_counter() - start
+
+
+def _bench(new_stream, full_buffer_fnc, deltas: list[str]) -> tuple[float, float]:  # type: ignore
+    full_buffer = min(
+        _run(
+            token_stream.BufferedSentenceStream(
+                tokenizer=full_buffer_fnc, min_token_len=20, min_ctx_len=10
+            ),
+            deltas,
+        )
+        for _ in range(REPEATS)
+    )
+    incremental = min(_run(new_stream(), deltas) for _ in range(REPEATS))
+    return full_buffer, incremental
+
+
+def main() -> None:
+    with open(TEXT_PATH) as f:
+        text = f.read()
+
+    texts = {
+        "long_synthesize.txt": text,
+        "long_synthesize.txt x20": text * 20,
+        # a long answer without any sentence boundary
+        "no boundary, 8k chars": (re.sub(r"[.!?]", ",", text) * 20)[:8000],
+    }
+
+    tokenizers = {
+        "basic": (
+            lambda: basic.SentenceTokenizer().stream(),
+            functools.partial(_basic_sent.split_sentences, min_sentence_len=20),
+        ),
+        "blingfire": (
+            lambda: blingfire.SentenceTokenizer().stream(),
+            functools.partial(blingfire._split_sentences, min_sentence_len=20),
+        ),
+    }
+
+    print(f"{'tokenizer':<10} {'text':<26} {'full buffer':>12} {'incremental':>12} {'speedup':>8}")
+    for name, (new_stream, full_buffer_fnc) in tokenizers.items():
+        for text_name, text in texts.items():
+            # roughly the size of LLM tokens
+            deltas = re.findall(r"\s*\S{1,4}", text)
+            full_buffer, incremental = _bench(new_stream, full_buffer_fnc, deltas)
+            print(
+                f"{name:<10} {text_name:<26} {full_buffer * 1000:>10.1f}ms "
+                f"{incremental * 1000:>10.1f}ms {full_buffer / incremental:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
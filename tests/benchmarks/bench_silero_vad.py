@@ -0,0 +1,245 @@
+"""CPU cost of the Silero VAD per session, and of the sample buffering in front of the model
+against the previous implementation which concatenated every pending frame for each 32ms window.
+With many concurrent sessions, compares one executor call per window against batched inference.
+
+    python tests/benchmarks/bench_silero_vad.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from livekit import rtc
+from livekit.agents import utils
+from livekit.plugins import silero
+from livekit.plugins.silero.vad import _SampleBuffer
+
+WINDOW_SIZE = 512
+MODEL_SAMPLE_RATE = 16000
+
+
+def _previous_buffering(frames: list[rtc.AudioFrame], resample: bool) -> int:
+    input_frames: list[rtc.AudioFrame] = []
+    inference_frames: list[rtc.AudioFrame] = []
+    inference_f32_data = np.empty(WINDOW_SIZE, dtype=np.float32)
+    resampler = (
+        rtc.AudioResampler(
+            input_rate=frames[0].sample_rate,
+            output_rate=MODEL_SAMPLE_RATE,
+            quality=rtc.AudioResamplerQuality.QUICK,
+        )
+        if resample
+        else None
+    )
+    input_copy_remaining_fract = 0.0
+    windows = 0
+
+    for input_frame in frames:
+        input_frames.append(input_frame)
+        if resampler is not None:
+            inference_frames.extend(resampler.push(input_frame))
+        else:
+            inference_frames.append(input_frame)
+
+        while True:
+            if sum([frame.samples_per_channel for frame in inference_frames]) < WINDOW_SIZE:
+                break
+
+            input_frame = utils.combine_frames(input_frames)
+            inference_frame = utils.combine_frames(inference_frames)
+            np.divide(
+                inference_frame.data[:WINDOW_SIZE],
+                np.iinfo(np.int16).max,
+                out=inference_f32_data,
+                dtype=np.float32,
+            )
+
+            to_copy = WINDOW_SIZE * input_frame.sample_rate / MODEL_SAMPLE_RATE
+            to_copy += input_copy_remaining_fract
+            to_copy_int = int(to_copy)
+            input_copy_remaining_fract = to_copy - to_copy_int
+            input_frame.data[:to_copy_int].tobytes()
+            windows += 1
+
+            input_frames = []
+            inference_frames = []
+            if len(input_frame.data) - to_copy_int > 0:
+                data = input_frame.data[to_copy_int:].tobytes()
+                input_frames.append(
+                    rtc.AudioFrame(
+                        data=data,
+                        sample_rate=input_frame.sample_rate,
+                        num_channels=1,
+                        samples_per_channel=len(data) // 2,
+                    )
+                )
+            if len(inference_frame.data) - WINDOW_SIZE > 0:
+                data = inference_frame.data[WINDOW_SIZE:].tobytes()
+                inference_frames.append(
+                    rtc.AudioFrame(
+                        data=data,
+                        sample_rate=MODEL_SAMPLE_RATE,
+                        num_channels=1,
+                        samples_per_channel=len(data) // 2,
+                    )
+                )
+
+    return windows
+
+
+def _current_buffering(frames: list[rtc.AudioFrame], resample: bool) -> int:
+    input_rate = frames[0].sample_rate
+    input_buffer = _SampleBuffer(WINDOW_SIZE * 4 * input_rate // MODEL_SAMPLE_RATE)
+    inference_buffer = _SampleBuffer(WINDOW_SIZE * 4)
+    inference_f32_data = np.empty(WINDOW_SIZE, dtype=np.float32)
+    resampler = (
+        rtc.AudioResampler(
+            input_rate=input_rate,
+            output_rate=MODEL_SAMPLE_RATE,
+            quality=rtc.AudioResamplerQuality.QUICK,
+        )
+        if resample
+        else None
+    )
+    input_copy_remaining_fract = 0.0
+    windows = 0
+
+    for input_frame in frames:
+        input_buffer.push(np.frombuffer(input_frame.data, dtype=np.int16))
+        if resampler is not None:
+            for frame in resampler.push(input_frame):
+                inference_buffer.push(np.frombuffer(frame.data, dtype=np.int16))
+        else:
+            inference_buffer.push(np.frombuffer(input_frame.data, dtype=np.int16))
+
+        while len(inference_buffer) >= WINDOW_SIZE:
+            input_data = input_buffer.peek()
+            np.divide(
+                inference_buffer.peek()[:WINDOW_SIZE],
+                np.iinfo(np.int16).max,
+                out=inference_f32_data,
+                dtype=np.float32,
+            )
+
+            to_copy = WINDOW_SIZE * input_rate / MODEL_SAMPLE_RATE + input_copy_remaining_fract
+            to_copy_int = int(to_copy)
+            input_copy_remaining_fract = to_copy - to_copy_int
+            input_data[:to_copy_int].tobytes()
+            windows += 1
+
+            input_buffer.consume(to_copy_int)
+            inference_buffer.consume(WINDOW_SIZE)
+
+    return windows
+
+
+def _frames(sample_rate: int, duration: float, frame_duration: float) -> list[rtc.AudioFrame]:
+    # bursts of harmonics separated by silence, enough to toggle the VAD
+    rng = np.random.default_rng(0)
+    t = np.arange(int(sample_rate * duration)) / sample_rate
+    phase = 2 * np.pi * 150 * t
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    envelope = np.sin(2 * np.pi * 0.25 * t) > 0
+    audio = 0.3 * voiced * envelope + 0.002 * rng.standard_normal(len(t))
+    audio = (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+
+    frame_size = int(sample_rate * frame_duration)
+    return [
+        rtc.AudioFrame(
+            data=audio[i : i + frame_size].tobytes(),
+            sample_rate=sample_rate,
+            num_channels=1,
+            samples_per_channel=frame_size,
+        )
+        for i in range(0, len(audio) - frame_size + 1, frame_size)
+    ]
+
+
+async def _run_session(vad: silero.VAD, frames: list[rtc.AudioFrame]) -> float:
+    stream = vad.stream()
+    start = time.process_time()
+    for frame in frames:
+        stream.push_frame(frame)
+    stream.end_input()
+    async for _ in stream:
+        pass
+    return time.process_time() - start
+
+
+async def _run_realtime(vad: silero.VAD, sessions: int, duration: float) -> float:
+    # sessions push 10ms frames at realtime pace, like participants of concurrent jobs would
+    frames = _frames(16000, duration, 0.01)
+
+    async def _session(offset: float) -> None:
+        await asyncio.sleep(offset)
+        stream = vad.stream()
+
+        async def _consume() -> None:
+            async for _ in stream:
+                pass
+
+        consume_task = asyncio.create_task(_consume())
+        start = time.perf_counter()
+        for i, frame in enumerate(frames):
+            stream.push_frame(frame)
+            await asyncio.sleep(max(0.0, start + (i + 1) * 0.01 - time.perf_counter()))
+        stream.end_input()
+        await consume_task
+
+    start = time.process_time()
+    await asyncio.gather(*[_session(i * 0.01 / sessions) for i in range(sessions)])
+    return time.process_time() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds of audio")
+    parser.add_argument("--sessions", type=int, default=50, help="concurrent realtime sessions")
+    args = parser.parse_args()
+
+    print(f"{args.duration:.0f}s of audio per session")
+    print("buffering only (model excluded):")
+    print(f"{'input':>16} {'previous':>10} {'current':>10} {'speedup':>8}")
+    for sample_rate, frame_duration in ((16000, 0.01), (48000, 0.01), (48000, 0.1), (48000, 1.0)):
+        frames = _frames(sample_rate, args.duration, frame_duration)
+        resample = sample_rate != MODEL_SAMPLE_RATE
+
+        start = time.process_time()
+        previous_windows = _previous_buffering(frames, resample)
+        previous = time.process_time() - start
+
+        start = time.process_time()
+        current_windows = _current_buffering(frames, resample)
+        current = time.process_time() - start
+
+        assert previous_windows == current_windows
+        label = f"{sample_rate // 1000}kHz/{frame_duration * 1000:.0f}ms"
+        print(
+            f"{label:>16} {previous * 1000:>8.1f}ms {current * 1000:>8.1f}ms "
+            f"{previous / current:>7.1f}x"
+        )
+
+    vad = silero.VAD.load(force_cpu=True)
+    print("full session (model included):")
+    for sample_rate in (16000, 48000):
+        frames = _frames(sample_rate, args.duration, 0.01)
+        cpu = await _run_session(vad, frames)
+        print(
+            f"{sample_rate // 1000:>13}kHz {cpu * 1000:>8.0f}ms CPU, "
+            f"{cpu / args.duration * 100:.2f}% of a core"
+        )
+
+    print(f"{args.sessions} concurrent realtime sessions of 10s:")
+    for batch_inference in (False, True):
+        vad = silero.VAD.load(force_cpu=True, batch_inference=batch_inference)
+        cpu = await _run_realtime(vad, args.sessions, 10.0)
+        label = "batched" if batch_inference else "per stream"
+        print(f"{label:>16} {cpu / args.sessions / 10.0 * 100:.2f}% of a core per session")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,160 @@
+"""CPU cost of the speaking rate detection used to synchronize transcripts with the TTS audio,
+against the previous implementation which transformed every STFT frame of every window one at a
+time.
+
+    python tests/benchmarks/bench_speaking_rate.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from livekit import rtc
+from livekit.agents.voice.transcription._speaking_rate import (
+    SpeakingRateDetector,
+    SpeakingRateEvent,
+    SpeakingRateStream,
+)
+
+
+class _PreviousSpeakingRateStream(SpeakingRateStream):
+    async def _main_task(self) -> None:  # type: ignore[override]
+        _inference_sample_rate = 0
+        inference_f32_data = np.empty(0, dtype=np.float32)
+
+        pub_timestamp = self._opts.window_duration / 2
+        inference_frames: list[rtc.AudioFrame] = []
+
+        async for input_frame in self._input_ch:
+            if not isinstance(input_frame, rtc.AudioFrame):
+                inference_frames = []
+                continue
+
+            if not self._input_sample_rate:
+                self._input_sample_rate = input_frame.sample_rate
+                _inference_sample_rate = self._input_sample_rate
+                self._window_size_samples = int(self._opts.window_duration * _inference_sample_rate)
+                self._step_size_samples = int(self._opts.step_size * _inference_sample_rate)
+                inference_f32_data = np.empty(self._window_size_samples, dtype=np.float32)
+
+            inference_frames.append(input_frame)
+            while True:
+                available_samples = sum(frame.samples_per_channel for frame in inference_frames)
+                if available_samples < self._window_size_samples:
+                    break
+
+                inference_frame = rtc.combine_audio_frames(inference_frames)
+                np.divide(
+                    inference_frame.data[: self._window_size_samples],
+                    np.iinfo(np.int16).max,
+                    out=inference_f32_data,
+                    dtype=np.float32,
+                )
+                sr = self._previous_speaking_rate(inference_f32_data, _inference_sample_rate)
+                self._event_ch.send_nowait(
+                    SpeakingRateEvent(timestamp=pub_timestamp, speaking=sr > 0, speaking_rate=sr)
+                )
+
+                pub_timestamp += self._opts.step_size
+                data = inference_frame.data[self._step_size_samples :]
+                inference_frames = [
+                    rtc.AudioFrame(
+                        data=data,
+                        sample_rate=inference_frame.sample_rate,
+                        num_channels=1,
+                        samples_per_channel=len(data) // 2,
+                    )
+                ]
+
+    def _previous_speaking_rate(self, audio: np.ndarray, sample_rate: int) -> float:
+        silence_threshold = self._opts._silence_threshold
+        audio_sq = audio**2
+        if np.sqrt(np.mean(audio_sq)) < silence_threshold:
+            return 0.0
+
+        tail_audio_sq = audio_sq[int(len(audio_sq) * 0.7) :]
+        if len(tail_audio_sq) > 0 and np.sqrt(np.mean(tail_audio_sq)) < silence_threshold * 0.5:
+            return 0.0
+
+        frame_length = int(sample_rate * 0.025)
+        hop_length = frame_length // 2
+        num_frames = (len(audio) - frame_length) // hop_length + 1
+        result = np.zeros((frame_length // 2 + 1, num_frames), dtype=np.complex128)
+        window = np.hanning(frame_length)
+        scale_factor = 1.0 / np.sqrt(np.sum(window**2))
+        for i in range(num_frames):
+            start = i * hop_length
+            result[:, i] = np.fft.rfft(audio[start : start + frame_length] * window) * scale_factor
+
+        magnitudes = np.abs(result)
+        flux_values = [
+            np.sum(np.abs(magnitudes[:, i] - magnitudes[:, i - 1]))
+            for i in range(1, magnitudes.shape[1])
+        ]
+        return float(np.mean(flux_values)) if flux_values else 0.0
+
+
+def _speech_like_audio(sample_rate: int, duration: float) -> np.ndarray:
+    # harmonics modulated at a syllable rate, with pauses
+    rng = np.random.default_rng(0)
+    t = np.arange(int(sample_rate * duration)) / sample_rate
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    envelope = np.clip(np.sin(2 * np.pi * 4.0 * t), 0, None) * (np.sin(2 * np.pi * 0.2 * t) > -0.7)
+    audio = 0.2 * voiced * envelope + 0.003 * rng.standard_normal(len(t))
+    return (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+
+
+async def _run(stream: SpeakingRateStream, frames: list[rtc.AudioFrame]) -> tuple[float, list]:
+    start = time.perf_counter()
+    for frame in frames:
+        stream.push_frame(frame)
+    stream.end_input()
+    events = [ev async for ev in stream]
+    return time.perf_counter() - start, events
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of audio")
+    args = parser.parse_args()
+
+    detector = SpeakingRateDetector()
+    print(f"{args.duration:.0f}s of audio pushed in 10ms frames")
+    print(
+        f"{'sample rate':>11} {'previous':>10} {'current':>10} {'speedup':>8} {'max rel diff':>13}"
+    )
+    for sample_rate in (16000, 24000, 44100, 48000):
+        audio = _speech_like_audio(sample_rate, args.duration)
+        frame_size = sample_rate // 100
+        frames = [
+            rtc.AudioFrame(
+                data=audio[i : i + frame_size].tobytes(),
+                sample_rate=sample_rate,
+                num_channels=1,
+                samples_per_channel=frame_size,
+            )
+            for i in range(0, len(audio) - frame_size + 1, frame_size)
+        ]
+
+        previous, previous_events = await _run(
+            _PreviousSpeakingRateStream(detector, detector._opts), frames
+        )
+        current, current_events = await _run(detector.stream(), frames)
+
+        previous_rates = np.array([ev.speaking_rate for ev in previous_events])
+        current_rates = np.array([ev.speaking_rate for ev in current_events[: len(previous_rates)]])
+        rel_diff = np.max(np.abs(previous_rates - current_rates) / np.maximum(previous_rates, 1e-9))
+        print(
+            f"{sample_rate:>11} {previous * 1000:>8.0f}ms {current * 1000:>8.0f}ms "
+            f"{previous / current:>7.1f}x {rel_diff:>13.2e}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
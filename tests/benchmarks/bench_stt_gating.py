@@ -0,0 +1,91 @@
+"""Audio uploaded to the STT over a call where the user is mostly on hold, sending everything
+(the previous behaviour) against the VAD gated STT input (STTGatingOptions).
+
+    python -m tests.benchmarks.bench_stt_gating [--minutes 10] [--talk 0.3]
+
+The user talks in short utterances, the VAD reports the start of speech 100ms late and the end
+of speech after 550ms of silence, like silero with its default options.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from livekit import rtc
+from livekit.agents.utils import aio
+from livekit.agents.voice import STTGatingOptions
+from livekit.agents.voice.audio_recognition import _STTAudioGate
+
+SAMPLE_RATE = 16000
+FRAME_DURATION = 0.01
+VAD_START_DELAY = 0.1
+VAD_END_DELAY = 0.55
+UTTERANCES = [3.0, 1.5, 2.5]  # spoken in a row, with 1s pauses, then the user is put on hold
+
+
+def _vad_events(minutes: float, talk: float) -> list[tuple[float, bool]]:
+    spoken = sum(UTTERANCES)
+    hold = spoken / talk - spoken - len(UTTERANCES)
+    events = []
+    t = 0.0
+    while t < minutes * 60:
+        for duration in UTTERANCES:
+            events.append((t + VAD_START_DELAY, True))
+            events.append((t + duration + VAD_END_DELAY, False))
+            t += duration + 1.0
+        t += hold
+    return events
+
+
+def _run(opts: STTGatingOptions | None, minutes: float, talk: float) -> tuple[float, int, float]:
+    ch = aio.Chan[rtc.AudioFrame]()
+    gate = _STTAudioGate(opts, ch) if opts is not None else None
+    events = _vad_events(minutes, talk)
+    frame = rtc.AudioFrame.create(SAMPLE_RATE, 1, int(SAMPLE_RATE * FRAME_DURATION))
+
+    sent_frames = 0
+    sent_duration = 0.0
+    elapsed = 0.0
+    for i in range(round(minutes * 60 / FRAME_DURATION)):
+        while events and events[0][0] <= i * FRAME_DURATION:
+            _, speaking = events.pop(0)
+            if gate is not None:
+                gate.update_speaking(speaking)
+
+        start = time.perf_counter()
+        if gate is not None:
+            gate.push_frame(frame)
+        else:
+            ch.send_nowait(frame)
+        elapsed += time.perf_counter() - start
+
+        while not ch.empty():
+            sent_duration += ch.recv_nowait().duration
+            sent_frames += 1
+
+    return sent_duration, sent_frames, elapsed / (i + 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=float, default=10.0, help="call duration")
+    parser.add_argument("--talk", type=float, default=0.3, help="fraction of the call talking")
+    args = parser.parse_args()
+
+    print(f"{args.minutes:g} minute call, user talking {args.talk * 100:.0f}% of the time:")
+    print(f"{'input':>22} {'uploaded':>9} {'of call':>8} {'frames':>7} {'per frame':>10}")
+    for name, opts in [
+        ("continuous (previous)", None),
+        ("gated", STTGatingOptions()),
+        ("gated, no keepalive", STTGatingOptions(keepalive_interval=None)),
+    ]:
+        sent, frames, per_frame = _run(opts, args.minutes, args.talk)
+        print(
+            f"{name:>22} {sent:>8.1f}s {sent / (args.minutes * 60) * 100:>7.1f}% "
+            f"{frames:>7} {per_frame * 1e6:>8.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Time for the first user audio to reach the STT server after a stream is created, opening the
+connection on demand (the previous behaviour) against adopting a prewarmed one.
+
+    python -m tests.benchmarks.bench_stt_preconnect [--handshake 0.3] [--runs 5]
+
+Uses a local stand-in for the LiveKit inference STT endpoint that delays the websocket
+handshake. "prewarm, no lead" calls STT.prewarm() right before stream(), like AgentActivity
+does when it starts, "prewarm ahead" gives the connection time to be established.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+import aiohttp
+from aiohttp import web
+
+from livekit import rtc
+from livekit.agents import inference
+
+SAMPLE_RATE = 16000
+
+
+# resolved by the stand-in server with the time it received the first audio
+_received: asyncio.Future[float] | None = None
+
+
+async def _first_audio(base_url: str, prewarm: float | None) -> float:
+    global _received
+    _received = received = asyncio.get_running_loop().create_future()
+
+    async with aiohttp.ClientSession() as session:
+        lk_stt = inference.STT(
+            "deepgram",
+            base_url=base_url,
+            api_key="devkey",
+            api_secret="secret" * 6,
+            http_session=session,
+        )
+        if prewarm is not None:
+            lk_stt.prewarm()
+            await asyncio.sleep(prewarm)
+
+        start = time.perf_counter()
+        stream = lk_stt.stream()
+        # 1s of pre-connect audio buffered before the stream is created
+        for _ in range(50):
+            stream.push_frame(rtc.AudioFrame.create(SAMPLE_RATE, 1, SAMPLE_RATE // 50))
+
+        elapsed = await received - start
+        await stream.aclose()
+        await lk_stt.aclose()
+        return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--handshake", type=float, default=0.3, help="handshake latency")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    async def _handler(request: web.Request) -> web.WebSocketResponse:
+        await asyncio.sleep(args.handshake)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.receive()  # session.create
+        await ws.send_str(json.dumps({"type": "session.created", "audio_frames": "binary"}))
+        async for msg in ws:
+            if msg.type == aiohttp.WSMsgType.BINARY and _received and not _received.done():
+                _received.set_result(time.perf_counter())
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/stt", _handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    base_url = f"http://127.0.0.1:{port}"
+
+    print(f"handshake {args.handshake * 1000:.0f}ms, mean of {args.runs} runs:")
+    print(f"{'connection':>24} {'first audio':>12}")
+    for name, prewarm in [
+        ("on demand (previous)", None),
+        ("prewarm, no lead", 0.0),
+        ("prewarm ahead", args.handshake * 2),
+    ]:
+        elapsed = [await _first_audio(base_url, prewarm) for _ in range(args.runs)]
+        print(f"{name:>24} {sum(elapsed) / len(elapsed) * 1000:>10.1f}ms")
+
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""Time to first audio of tts.CacheAdapter on a cache hit, against synthesizing the phrase again,
+for the pcm and opus formats (opus is decoded on every hit).
+
+    python -m tests.benchmarks.bench_tts_cache [--ttfb 0.3]
+
+Uses tests/fake_tts.py, hits are read back from a cache directory by a fresh CacheAdapter, like
+another worker process would.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+from livekit.agents.tts import CacheAdapter
+from tests.fake_tts import FakeTTS, FakeTTSResponse
+
+PHRASES = [
+    "Hi, thanks for calling! How can I help you today?",
+    "Please hold while I look that up for you.",
+    "This call may be recorded for quality and training purposes.",
+    "Is there anything else I can help you with?",
+]
+
+
+def _fake_tts(ttfb: float) -> FakeTTS:
+    return FakeTTS(
+        fake_responses=[
+            FakeTTSResponse(input=text, audio_duration=len(text) / 15, ttfb=ttfb, duration=ttfb)
+            for text in PHRASES
+        ]
+    )
+
+
+async def _first_audio(cache: CacheAdapter, text: str) -> float:
+    start = time.perf_counter()
+    async with cache.synthesize(text) as stream:
+        first_audio = 0.0
+        async for _ in stream:
+            first_audio = first_audio or time.perf_counter() - start
+    return first_audio
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ttfb", type=float, default=0.3, help="TTS time to first byte")
+    args = parser.parse_args()
+
+    print(f"{len(PHRASES)} phrases, TTS ttfb {args.ttfb * 1000:.0f}ms, mean per phrase:")
+    print(f"{'format':>7} {'miss':>8} {'disk hit':>9} {'memory hit':>11}")
+    for format in ("pcm", "opus"):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = CacheAdapter(_fake_tts(args.ttfb), cache_dir=cache_dir, format=format)
+            miss = [await _first_audio(cache, text) for text in PHRASES]
+            await cache.aclose()
+
+            cache = CacheAdapter(_fake_tts(args.ttfb), cache_dir=cache_dir, format=format)
+            disk_hit = [await _first_audio(cache, text) for text in PHRASES]
+            memory_hit = [await _first_audio(cache, text) for text in PHRASES]
+            assert cache.stats.hits == 2 * len(PHRASES), cache.stats
+
+        print(
+            f"{format:>7} {sum(miss) / len(PHRASES) * 1000:>6.1f}ms "
+            f"{sum(disk_hit) / len(PHRASES) * 1000:>7.2f}ms "
+            f"{sum(memory_hit) / len(PHRASES) * 1000:>9.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""Time to first audio and silence between sentences of tts.StreamAdapter over a non-streaming
+TTS, for several look-ahead depths. 0 is the previous behaviour, one sentence at a time.
+
+    python -m tests.benchmarks.bench_tts_stream_adapter [--latency 0.4] [--speed 2]
+
+Uses tests/fake_tts.py. The audio is played out in real time as soon as it arrives, a gap is
+time the player spends waiting for the next sentence once the previous one is played out.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from livekit.agents.tts import StreamAdapter
+from tests.fake_tts import FakeTTS, FakeTTSResponse
+
+SENTENCES = [
+    "Sure, let me check that.",
+    "I see that you are currently booked for Tuesday at three in the afternoon with Dr. Lee.",
+    "The next available slot is on Thursday.",
+    "Would nine or ten o'clock in the morning work better for you, or should I look at Friday?",
+    "Just let me know.",
+]
+
+
+async def _run(look_ahead: int, latency: float, speed: float) -> tuple[float, list[float]]:
+    # a non-streaming TTS returns the audio once all of it is generated
+    responses = []
+    for text in SENTENCES:
+        audio_duration = len(text) / 15  # ~15 characters per second of speech
+        generated_at = latency + audio_duration / speed
+        responses.append(
+            FakeTTSResponse(
+                input=text, audio_duration=audio_duration, ttfb=generated_at, duration=generated_at
+            )
+        )
+    fake_tts = FakeTTS(fake_responses=responses)
+    adapter = StreamAdapter(tts=fake_tts, look_ahead=look_ahead)
+
+    start = time.perf_counter()
+    first_audio = 0.0
+    play_end = 0.0
+    gaps: list[float] = []
+    async with adapter.stream() as stream:
+        stream.push_text(" ".join(SENTENCES))
+        stream.end_input()
+        async for audio in stream:
+            arrival = time.perf_counter() - start
+            if not first_audio:
+                first_audio = play_end = arrival
+            elif arrival > play_end:
+                gaps.append(arrival - play_end)
+                play_end = arrival
+            play_end += audio.frame.duration
+
+    return first_audio, gaps
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.4, help="TTS request round trip")
+    parser.add_argument("--speed", type=float, default=2.0, help="TTS generation, x realtime")
+    args = parser.parse_args()
+
+    print(
+        f"{len(SENTENCES)} sentences, {args.latency * 1000:.0f}ms round trip, "
+        f"generated at {args.speed:g}x realtime:"
+    )
+    print(f"{'look-ahead':>10} {'first audio':>12} {'gaps':>5} {'total gap':>10} {'max gap':>8}")
+    for look_ahead in (0, 1, 2):
+        first_audio, gaps = await _run(look_ahead, args.latency, args.speed)
+        print(
+            f"{look_ahead:>10} {first_audio * 1000:>10.0f}ms {len(gaps):>5} "
+            f"{sum(gaps) * 1000:>8.0f}ms {max(gaps, default=0.0) * 1000:>6.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -12,6 +12,7 @@ from livekit.agents.llm import (
     ChatChunk,
     ChatContext,
     ChoiceDelta,
+    CompletionUsage,
     FunctionTool,
     FunctionToolCall,
     LLMStream,
@@ -99,10 +100,18 @@ class FakeLLMStream(LLMStream):
 
         await asyncio.sleep(resp.duration - (time.perf_counter() - start_time))
 
-        self._send_chunk(tool_calls=resp.tool_calls)
+        # one token per content chunk
+        usage = CompletionUsage(
+            completion_tokens=num_chunks, prompt_tokens=0, total_tokens=num_chunks
+        )
+        self._send_chunk(tool_calls=resp.tool_calls, usage=usage)
 
     def _send_chunk(
-        self, *, delta: str | None = None, tool_calls: list[FunctionToolCall] | None = None
+        self,
+        *,
+        delta: str | None = None,
+        tool_calls: list[FunctionToolCall] | None = None,
+        usage: CompletionUsage | None = None,
     ) -> None:
         self._event_ch.send_nowait(
             ChatChunk(
@@ -112,6 +121,7 @@ class FakeLLMStream(LLMStream):
                     content=delta,
                     tool_calls=tool_calls or [],
                 ),
+                usage=usage,
             )
         )
 
@@ -15,8 +15,11 @@ from livekit.agents import (
 )
 from livekit.agents.llm import FunctionToolCall
 from livekit.agents.llm.chat_context import ChatContext, ChatMessage
+from livekit.agents.metrics import LLMMetrics, PreemptiveGenerationMetrics, TTSMetrics
+from livekit.agents.voice.audio_recognition import _EndOfTurnInfo, _PreemptiveGenerationInfo
 from livekit.agents.voice.events import FunctionToolsExecutedEvent
 from livekit.agents.voice.io import PlaybackFinishedEvent
+from livekit.agents.voice.transcription.synchronizer import _SyncedAudioOutput
 
 from .fake_session import FakeActions, create_session, run_session
 
@@ -624,6 +627,170 @@ async def test_interrupt_during_on_user_turn_completed(
     assert conversation_events[2].item.text_content == "Here is a story about a firefighter..."
 
 
+@pytest.mark.parametrize(
+    "max_preemptive_generations, final_transcript, reply, unused_first_sentence",
+    [
+        (1, "Hello, how are you?", "I'm fine. Thank you!", "Hi there. "),
+        (2, "Hello, how are you?", "I'm fine. Thank you!", "Hi there. "),
+        # the STT revised the end of the transcript, the first generation is still running
+        (2, "Hello!", "Hi there. Nice to meet you.", "I'm fine. "),
+    ],
+)
+async def test_preemptive_generation_candidates(
+    max_preemptive_generations: int, final_transcript: str, reply: str, unused_first_sentence: str
+) -> None:
+    """
+    Test that the running generations are kept while the transcript only extends them.
+    """
+    speed = 5.0
+    actions = FakeActions()
+    actions.add_llm("Hi there. Nice to meet you.", input="Hello", ttft=0.1, duration=0.3)
+    actions.add_tts(1.0, input="Hi there. ", ttfb=0.1)
+    actions.add_tts(1.0, input="Nice to meet you.", ttfb=0.1)
+    actions.add_llm("I'm fine. Thank you!", input="Hello how are you", ttft=0.1, duration=0.3)
+    actions.add_tts(1.0, input="I'm fine. ", ttfb=0.1)
+    actions.add_tts(1.0, input="Thank you!", ttfb=0.1)
+
+    session = create_session(
+        actions,
+        speed_factor=speed,
+        extra_kwargs={
+            "preemptive_generation": True,
+            "max_preemptive_generations": max_preemptive_generations,
+        },
+    )
+    assert isinstance(session.output.audio, _SyncedAudioOutput)
+    transcript_sync = session.output.audio._synchronizer
+    agent = MyAgent()
+
+    metrics_events: list[MetricsCollectedEvent] = []
+    conversation_events: list[ConversationItemAddedEvent] = []
+    session.on("metrics_collected", metrics_events.append)
+    session.on("conversation_item_added", conversation_events.append)
+
+    def _preemptive_info(transcript: str) -> _PreemptiveGenerationInfo:
+        return _PreemptiveGenerationInfo(
+            new_transcript=transcript, transcript_confidence=1.0, started_speaking_at=None
+        )
+
+    await session.start(agent)
+    activity = session._activity
+    assert activity is not None
+
+    activity.on_preemptive_generation(_preemptive_info("Hello"))
+    await asyncio.sleep(0.5 / speed)
+    activity.on_preemptive_generation(_preemptive_info("hello."))  # reuses the generation
+    activity.on_preemptive_generation(_preemptive_info("Hello how are you"))
+    await asyncio.sleep(1.0 / speed)
+    activity.on_end_of_turn(
+        _EndOfTurnInfo(
+            new_transcript=final_transcript,
+            transcript_confidence=1.0,
+            started_speaking_at=None,
+            stopped_speaking_at=None,
+            transcription_delay=None,
+            end_of_turn_delay=None,
+        )
+    )
+
+    await asyncio.sleep(3.0 / speed)
+    await session.aclose()
+    await transcript_sync.aclose()
+
+    # the final transcript is added to the chat context
+    assert len(conversation_events) == 2
+    assert conversation_events[0].item.type == "message"
+    assert conversation_events[0].item.text_content == final_transcript
+    assert conversation_events[1].item.type == "message"
+    assert conversation_events[1].item.text_content == reply
+
+    preemptive_metrics = [
+        ev.metrics for ev in metrics_events if isinstance(ev.metrics, PreemptiveGenerationMetrics)
+    ]
+    assert len(preemptive_metrics) == 1
+    metrics = preemptive_metrics[0]
+    assert metrics.candidates == 2
+    assert metrics.reused == 1
+    assert metrics.cancelled == 1
+    assert metrics.used
+    assert metrics.completion_tokens > metrics.wasted_completion_tokens > 0
+    assert 0.0 < metrics.wasted_ratio < 1.0
+
+    # only the first sentence of the unused generation is synthesized
+    tts_characters: dict[str | None, int] = {}
+    for ev in metrics_events:
+        if isinstance(ev.metrics, TTSMetrics):
+            speech_id = ev.metrics.speech_id
+            tts_characters[speech_id] = (
+                tts_characters.get(speech_id, 0) + ev.metrics.characters_count
+            )
+    assert tts_characters.pop(metrics.speech_id) == len(reply)
+    assert list(tts_characters.values()) == [len(unused_first_sentence)]
+
+
+async def test_preemptive_generation_cancelled_mid_stream() -> None:
+    """
+    Test that a speculative generation cancelled before its usage is reported counts as wasted.
+    """
+    speed = 5.0
+    actions = FakeActions()
+    # the fake LLM streams the whole reply after ttft and reports the usage after duration
+    actions.add_llm("Hi there. Nice to meet you.", input="Hello", ttft=0.1, duration=2.0)
+    actions.add_tts(1.0, input="Hi there. ", ttfb=0.1)
+    actions.add_llm("Goodbye!", input="Goodbye", ttft=0.1, duration=0.3)
+    actions.add_tts(1.0, input="Goodbye!", ttfb=0.1)
+
+    session = create_session(
+        actions, speed_factor=speed, extra_kwargs={"preemptive_generation": True}
+    )
+    assert isinstance(session.output.audio, _SyncedAudioOutput)
+    transcript_sync = session.output.audio._synchronizer
+
+    metrics_events: list[MetricsCollectedEvent] = []
+    session.on("metrics_collected", metrics_events.append)
+
+    await session.start(MyAgent())
+    activity = session._activity
+    assert activity is not None
+
+    for transcript in ("Hello", "Goodbye"):
+        activity.on_preemptive_generation(
+            _PreemptiveGenerationInfo(
+                new_transcript=transcript, transcript_confidence=1.0, started_speaking_at=None
+            )
+        )
+        await asyncio.sleep(0.5 / speed)
+    activity.on_end_of_turn(
+        _EndOfTurnInfo(
+            new_transcript="Goodbye",
+            transcript_confidence=1.0,
+            started_speaking_at=None,
+            stopped_speaking_at=None,
+            transcription_delay=None,
+            end_of_turn_delay=None,
+        )
+    )
+
+    await asyncio.sleep(3.0 / speed)
+    await session.aclose()
+    await transcript_sync.aclose()
+
+    llm_metrics = [ev.metrics for ev in metrics_events if isinstance(ev.metrics, LLMMetrics)]
+    assert [m.completion_tokens for m in llm_metrics if m.cancelled] == [0]
+
+    preemptive_metrics = [
+        ev.metrics for ev in metrics_events if isinstance(ev.metrics, PreemptiveGenerationMetrics)
+    ]
+    assert len(preemptive_metrics) == 1
+    metrics = preemptive_metrics[0]
+    assert metrics.candidates == 2
+    assert metrics.cancelled == 1
+    assert metrics.used
+    # the 9 chunks streamed of "Hi there. Nice to meet you.", one token per chunk
+    assert metrics.wasted_completion_tokens == 9
+    assert metrics.completion_tokens == 9 + 3
+
+
 # helpers
 
 
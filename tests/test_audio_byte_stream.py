@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import array
+import random
+
+from livekit.agents.utils.audio import AudioByteStream
+
+
+def test_audio_byte_stream_chunking():
+    rng = random.Random(42)
+    samples = array.array("h", (rng.randint(-32768, 32767) for _ in range(48000)))
+    data = samples.tobytes()
+
+    for chunk_size in (2, 6, 480, 959 * 2, 4800 * 2, len(data)):
+        bstream = AudioByteStream(sample_rate=48000, num_channels=2, samples_per_channel=480)
+        frames = []
+        for i in range(0, len(data), chunk_size):
+            frames.extend(bstream.push(data[i : i + chunk_size]))
+        frames.extend(bstream.flush())
+
+        assert all(f.samples_per_channel == 480 for f in frames[:-1])
+        assert b"".join(bytes(f.data) for f in frames) == data
+
+
+def test_audio_byte_stream_memoryview_input():
+    samples = array.array("h", range(1000))
+    bstream = AudioByteStream(sample_rate=16000, num_channels=1, samples_per_channel=160)
+
+    # int16 views are pushed as raw bytes, and the caller can reuse its buffer afterwards
+    frames = bstream.push(memoryview(samples)[:250])
+    samples[:250] = array.array("h", [0] * 250)
+    frames += bstream.push(memoryview(samples)[250:])
+    frames += bstream.flush()
+
+    assert [f.samples_per_channel for f in frames] == [160] * 6 + [40]
+    assert b"".join(bytes(f.data) for f in frames) == array.array("h", range(1000)).tobytes()
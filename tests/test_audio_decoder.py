@@ -1,3 +1,4 @@
+import asyncio
 import os
 import threading
 import time
@@ -7,7 +8,7 @@ import aiohttp
 import pytest
 
 from livekit.agents.stt import SpeechEventType
-from livekit.agents.utils.codecs import AudioStreamDecoder, StreamBuffer
+from livekit.agents.utils.codecs import AudioStreamDecoder, StreamBuffer, decoder as decoder_module
 from livekit.plugins import deepgram
 
 from .utils import wer
@@ -150,3 +151,83 @@ def test_stream_buffer_early_close():
 
     # Reading from closed buffer should return empty bytes
     assert buffer.read() == b""
+
+
+def test_stream_buffer_partial_reads():
+    buffer = StreamBuffer()
+    buffer.write(b"abc")
+    buffer.write(b"defgh")
+    buffer.write(b"ij")
+    buffer.end_input()
+
+    assert buffer.read(2) == b"ab"
+    assert buffer.read(4) == b"cdef"
+    assert buffer.read(2) == b"gh"
+    assert buffer.read() == b"ij"
+    assert buffer.read() == b""
+
+
+def _encode_mp3(duration: float, sample_rate: int = 24000) -> bytes:
+    import io
+
+    import av
+    import numpy as np
+
+    buf = io.BytesIO()
+    container = av.open(buf, mode="w", format="mp3")
+    stream = container.add_stream("mp3", rate=sample_rate)
+    stream.layout = "mono"
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    frame = av.AudioFrame.from_ndarray(
+        (np.sin(2 * np.pi * 220 * t) * 10000).astype(np.int16)[None], format="s16", layout="mono"
+    )
+    frame.sample_rate = sample_rate
+    for packet in stream.encode(frame):
+        container.mux(packet)
+    for packet in stream.encode(None):
+        container.mux(packet)
+    container.close()
+    return buf.getvalue()
+
+
+async def test_decoders_share_worker_threads():
+    mp3_data = _encode_mp3(1.0)
+
+    async def _decode() -> int:
+        decoder = AudioStreamDecoder(sample_rate=24000, format="audio/mpeg")
+        for i in range(0, len(mp3_data), 1024):
+            decoder.push(mp3_data[i : i + 1024])
+        decoder.end_input()
+        samples = sum([frame.samples_per_channel async for frame in decoder])
+        await decoder.aclose()
+        return samples
+
+    threads = decoder_module._decoder_threads()
+    started = threads._started
+    for _ in range(20):
+        assert await _decode() >= 24000
+
+    # a thread can still be finishing the previous stream when the next one is submitted
+    assert threads._started - started <= 2
+
+
+async def test_open_streams_dont_stall_new_decoders():
+    mp3_data = _encode_mp3(1.0)
+
+    # more streams than the previous pool size, each holds a thread waiting for more input
+    open_decoders = []
+    for _ in range(80):
+        decoder = AudioStreamDecoder(sample_rate=24000, format="audio/mpeg")
+        decoder.push(mp3_data[:1024])
+        open_decoders.append(decoder)
+
+    decoder = AudioStreamDecoder(sample_rate=24000, format="audio/mpeg")
+    decoder.push(mp3_data)
+    decoder.end_input()
+
+    async def _read() -> int:
+        return sum([frame.samples_per_channel async for frame in decoder])
+
+    assert await asyncio.wait_for(_read(), timeout=5) >= 24000
+    await decoder.aclose()
+    await asyncio.gather(*[d.aclose() for d in open_decoders])
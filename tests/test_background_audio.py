@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import wave
+
+import numpy as np
+
+from livekit.agents.utils.audio import audio_frames_from_file
+from livekit.agents.voice import background_audio
+from livekit.agents.voice.background_audio import _clip_frames, _ClipCache
+
+
+def _write_wav(path, duration: float, sample_rate: int = 48000) -> np.ndarray:
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    samples = (np.sin(2 * np.pi * 440 * t) * 10000).astype(np.int16)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(samples.tobytes())
+    return samples
+
+
+async def test_clip_cache(tmp_path):
+    _write_wav(tmp_path / "clip.wav", 0.5)
+    samples = np.concatenate(
+        [
+            np.frombuffer(frame.data, dtype=np.int16)
+            async for frame in audio_frames_from_file(str(tmp_path / "clip.wav"))
+        ]
+    )
+    cache = _ClipCache(max_bytes=1024 * 1024)
+
+    clip = await cache.get(str(tmp_path / "clip.wav"), 1.0)
+    assert clip is not None
+    assert np.array_equal(clip, samples)
+    assert await cache.get(str(tmp_path / "clip.wav"), 1.0) is clip
+
+    quiet = await cache.get(str(tmp_path / "clip.wav"), 0.5)
+    assert quiet is not None and quiet is not clip
+    assert np.array_equal(quiet, (samples.astype(np.float32) * 0.5).astype(np.int16))
+
+    frames = [frame async for frame in _clip_frames(clip, loop=False)]
+    assert sum(frame.samples_per_channel for frame in frames) == len(samples)
+    assert b"".join(bytes(frame.data) for frame in frames) == samples.tobytes()
+
+
+async def test_clip_cache_eviction(tmp_path):
+    for name in ("a", "b", "c"):
+        _write_wav(tmp_path / f"{name}.wav", 0.5)
+
+    # room for two clips of at most 24000 samples
+    cache = _ClipCache(max_bytes=2 * 24000 * 2)
+    a = await cache.get(str(tmp_path / "a.wav"), 1.0)
+    b = await cache.get(str(tmp_path / "b.wav"), 1.0)
+    assert await cache.get(str(tmp_path / "a.wav"), 1.0) is a
+
+    await cache.get(str(tmp_path / "c.wav"), 1.0)  # evicts b, the least recently used
+    assert await cache.get(str(tmp_path / "a.wav"), 1.0) is a
+    assert await cache.get(str(tmp_path / "b.wav"), 1.0) is not b
+
+    # clips that don't fit the budget aren't cached
+    _write_wav(tmp_path / "long.wav", 2.0)
+    assert await cache.get(str(tmp_path / "long.wav"), 1.0) is None
+
+
+def _count_decodes(monkeypatch) -> list[str]:
+    decoded: list[str] = []
+
+    def _audio_frames_from_file(path: str, **kwargs):
+        decoded.append(path)
+        return audio_frames_from_file(path, **kwargs)
+
+    monkeypatch.setattr(background_audio, "audio_frames_from_file", _audio_frames_from_file)
+    return decoded
+
+
+async def test_clip_cache_oversized(tmp_path, monkeypatch):
+    decoded = _count_decodes(monkeypatch)
+    # 64kB on disk, 192kB once resampled to 48kHz
+    _write_wav(tmp_path / "long.wav", 2.0, sample_rate=16000)
+    cache = _ClipCache(max_bytes=48000 * 2)
+
+    # the decode stops at the budget and isn't attempted again on the next plays
+    assert await cache.get(str(tmp_path / "long.wav"), 1.0) is None
+    assert await cache.get(str(tmp_path / "long.wav"), 1.0) is None
+    assert len(decoded) == 1
+
+
+async def test_clip_cache_concurrent_misses(tmp_path, monkeypatch):
+    decoded = _count_decodes(monkeypatch)
+    _write_wav(tmp_path / "clip.wav", 0.5)
+    cache = _ClipCache(max_bytes=1024 * 1024)
+
+    clips = await asyncio.gather(*[cache.get(str(tmp_path / "clip.wav"), 1.0) for _ in range(5)])
+    assert clips[0] is not None
+    assert all(clip is clips[0] for clip in clips)
+    assert len(decoded) == 1
@@ -217,3 +217,136 @@ async def test_summarize():
         summary = await chat_ctx.summarize(llm, keep_last_turns=1)
         print("\n=== Summary ===\n")
         print(json.dumps(summary.to_dict(), indent=2))
+
+
+def _random_ctx_pair(rng) -> tuple[list[str], list[str]]:
+    # edits a realtime session goes through: appends, removals, insertions and moves
+    old_ids = [f"item_{i}" for i in range(rng.randint(0, 30))]
+    new_ids = list(old_ids)
+    next_id = len(old_ids)
+    for _ in range(rng.randint(0, 10)):
+        op = rng.choice(["append", "insert", "remove", "move"])
+        if op == "append" or not new_ids:
+            new_ids.append(f"item_{next_id}")
+            next_id += 1
+        elif op == "insert":
+            new_ids.insert(rng.randrange(len(new_ids) + 1), f"item_{next_id}")
+            next_id += 1
+        elif op == "remove":
+            new_ids.pop(rng.randrange(len(new_ids)))
+        else:
+            new_ids.insert(rng.randrange(len(new_ids)), new_ids.pop(rng.randrange(len(new_ids))))
+
+    if rng.random() < 0.2:
+        rng.shuffle(new_ids)
+    return old_ids, new_ids
+
+
+def test_compute_lcs_matches_dp():
+    import random
+
+    from livekit.agents.llm.chat_context import ChatContext, ChatMessage
+
+    rng = random.Random(1234)
+    for _ in range(2000):
+        old_ids, new_ids = _random_ctx_pair(rng)
+        assert utils._compute_lcs(old_ids, new_ids) == utils._compute_lcs_dp(old_ids, new_ids)
+
+        old_ctx = ChatContext([ChatMessage(id=id, role="user", content=[id]) for id in old_ids])
+        new_ctx = ChatContext(
+            [
+                ChatMessage(id=id, role="user", content=[id if rng.random() < 0.9 else "edited"])
+                for id in new_ids
+            ]
+        )
+        diff = utils.compute_chat_ctx_diff(old_ctx, new_ctx)
+
+        # replaying the ops on the old ids gives the new ids
+        ids = [id for id in old_ids if id not in set(diff.to_remove)]
+        for prev_id, id in diff.to_create:
+            ids.insert(0 if prev_id is None else ids.index(prev_id) + 1, id)
+        assert ids == new_ids
+        assert len(ids) - len(diff.to_create) == len(utils._compute_lcs_dp(old_ids, new_ids))
+
+
+def test_chat_ctx_index_and_insertion():
+    import random
+
+    from livekit.agents.llm.chat_context import ChatContext, ChatMessage
+
+    def _reference_insertion_index(items, created_at: float) -> int:
+        for i in reversed(range(len(items))):
+            if items[i].created_at <= created_at:
+                return i + 1
+        return 0
+
+    rng = random.Random(42)
+    ctx = ChatContext.empty()
+    for i in range(300):
+        created_at = rng.uniform(0, 100)
+        op = rng.random()
+        if op < 0.4:
+            idx = _reference_insertion_index(ctx.items, created_at)
+            msg = ctx.add_message(role="user", content=str(i), id=f"m{i}", created_at=created_at)
+            assert ctx.items[idx] is msg
+        elif op < 0.6:
+            ctx.items.append(
+                ChatMessage(id=f"m{i}", role="user", content=[], created_at=created_at)
+            )
+        elif op < 0.7 and ctx.items:
+            ctx.items.pop(rng.randrange(len(ctx.items)))
+        elif op < 0.8:
+            ctx.insert(ChatMessage(id=f"m{i}", role="user", content=[], created_at=created_at))
+        elif op < 0.9 and len(ctx.items) > 1:
+            ctx.truncate(max_items=len(ctx.items) - 1)
+        else:
+            snapshot = ctx.copy()
+            assert snapshot.items == ctx.items and snapshot.items is not ctx.items
+            snapshot.items.append(ChatMessage(id="only_in_snapshot", role="user", content=[]))
+            assert ctx.get_by_id("only_in_snapshot") is None
+            assert snapshot.index_by_id("only_in_snapshot") == len(snapshot.items) - 1
+
+        assert ctx.find_insertion_index(created_at=50.0) == _reference_insertion_index(
+            ctx.items, 50.0
+        )
+        for idx, item in enumerate(ctx.items):
+            assert ctx.index_by_id(item.id) == idx
+            assert ctx.get_by_id(item.id) is item
+        assert ctx.get_by_id("missing") is None
+
+
+def test_remote_chat_ctx_snapshot():
+    import pytest
+
+    from livekit.agents.llm import ChatMessage
+    from livekit.agents.llm.remote_chat_context import RemoteChatContext
+
+    remote = RemoteChatContext()
+    remote.insert(None, ChatMessage(id="b", role="user", content=["b"]))
+    remote.insert(None, ChatMessage(id="a", role="user", content=["a"]))
+    remote.insert("b", ChatMessage(id="c", role="assistant", content=[]))
+
+    snapshot = remote.snapshot()
+    assert [item.id for item in snapshot.items] == ["a", "b", "c"]
+    assert snapshot.readonly and remote.snapshot() is snapshot
+    with pytest.raises(RuntimeError):
+        snapshot.items.append(ChatMessage(role="user", content=[]))
+
+    # in place updates are visible without invalidating the snapshot
+    remote_item = remote.get("c")
+    assert remote_item is not None and isinstance(remote_item.item, ChatMessage)
+    remote_item.item.content.append("c")
+    assert remote.snapshot() is snapshot and snapshot.items[2].text_content == "c"
+
+    # to_chat_ctx stays a mutable copy
+    chat_ctx = remote.to_chat_ctx()
+    chat_ctx.add_message(role="user", content="d")
+    assert len(remote.snapshot().items) == 3
+
+    version = remote.version
+    remote.delete("b")
+    assert remote.version == version + 1
+    assert snapshot is not remote.snapshot()
+    assert [item.id for item in snapshot.items] == ["a", "b", "c"]
+    assert [item.id for item in remote.snapshot().items] == ["a", "c"]
+    assert remote.snapshot().index_by_id("c") == 1
@@ -1,3 +1,4 @@
+import asyncio
 import time
 
 import pytest
@@ -16,7 +17,7 @@ class DummyConnection:
 def dummy_connect_factory():
     counter = 0
 
-    async def dummy_connect():
+    async def dummy_connect(timeout: float):
         nonlocal counter
         counter += 1
         return DummyConnection(counter)
@@ -29,14 +30,14 @@ async def test_get_reuses_connection():
     dummy_connect = dummy_connect_factory()
     pool = ConnectionPool(max_session_duration=60, connect_cb=dummy_connect)
 
-    conn1 = await pool.get()
+    conn1 = await pool.get(timeout=10)
     # Return the connection to the pool
     pool.put(conn1)
 
-    async with pool.connection() as conn:
+    async with pool.connection(timeout=10) as conn:
         assert conn is conn1, "Expected conn to be the same connection as conn1"
 
-    conn2 = await pool.get()
+    conn2 = await pool.get(timeout=10)
     assert conn1 is conn2, "Expected the same connection to be reused when it hasn't expired."
 
 
@@ -45,10 +46,10 @@ async def test_get_creates_new_connection_when_none_available():
     dummy_connect = dummy_connect_factory()
     pool = ConnectionPool(max_session_duration=60, connect_cb=dummy_connect)
 
-    conn1 = await pool.get()
+    conn1 = await pool.get(timeout=10)
     # Not putting conn1 back means the available pool is empty,
     # so calling get() again should create a new connection.
-    conn2 = await pool.get()
+    conn2 = await pool.get(timeout=10)
     assert conn1 is not conn2, "Expected a new connection when no available connection exists."
 
 
@@ -57,14 +58,14 @@ async def test_remove_connection():
     dummy_connect = dummy_connect_factory()
     pool = ConnectionPool(max_session_duration=60, connect_cb=dummy_connect)
 
-    conn = await pool.get()
+    conn = await pool.get(timeout=10)
     pool.put(conn)
     # Reset the connection which should remove it from the pool.
     pool.remove(conn)
 
     # Even if we try to put it back, it won't be added because it's not tracked anymore.
     pool.put(conn)
-    new_conn = await pool.get()
+    new_conn = await pool.get(timeout=10)
     assert new_conn is not conn, "Expected a removed connection to not be reused."
 
 
@@ -74,10 +75,117 @@ async def test_get_expired():
     dummy_connect = dummy_connect_factory()
     pool = ConnectionPool(max_session_duration=1, connect_cb=dummy_connect)
 
-    conn = await pool.get()
+    conn = await pool.get(timeout=10)
     pool.put(conn)
     # Artificially set the connection's timestamp in the past to simulate expiration.
     pool._connections[conn] = time.time() - 2  # 2 seconds ago (max_session_duration is 1)
 
-    conn2 = await pool.get()
+    conn2 = await pool.get(timeout=10)
     assert conn2 is not conn, "Expected a new connection to be returned."
+
+
+def slow_connect_factory(delay: float):
+    counter = 0
+
+    async def slow_connect(timeout: float):
+        nonlocal counter
+        counter += 1
+        conn = DummyConnection(counter)
+        await asyncio.sleep(delay)
+        return conn
+
+    return slow_connect
+
+
+@pytest.mark.asyncio
+async def test_concurrent_connects():
+    pool = ConnectionPool(connect_cb=slow_connect_factory(0.2))
+
+    start = time.perf_counter()
+    conns = await asyncio.gather(*[pool.get(timeout=10) for _ in range(5)])
+    # the handshakes happen concurrently, not one after the other
+    assert time.perf_counter() - start < 0.5
+    assert len(set(conns)) == 5
+    assert pool.stats.misses == 5 and pool.stats.connects == 5
+    assert pool.stats.avg_connect_latency >= 0.2
+
+
+@pytest.mark.asyncio
+async def test_min_idle_refill():
+    pool = ConnectionPool(connect_cb=slow_connect_factory(0.05), min_idle=2)
+    pool.prewarm()
+    await asyncio.sleep(0.1)
+    assert len(pool._available) == 2
+
+    conn = await pool.get(timeout=10)
+    assert pool.stats.hits == 1 and pool.stats.misses == 0
+    # the refiller replaces the idle connection that was handed out
+    await asyncio.sleep(0.1)
+    assert len(pool._available) == 2
+    assert conn not in pool._available
+
+    await pool.aclose()
+    assert not pool._connections
+
+
+@pytest.mark.asyncio
+async def test_max_size():
+    pool = ConnectionPool(connect_cb=slow_connect_factory(0.01), max_size=2)
+    conn1 = await pool.get(timeout=10)
+    await pool.get(timeout=10)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await pool.get(timeout=0.05)
+
+    waiter = asyncio.create_task(pool.get(timeout=10))
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+    pool.put(conn1)
+    assert await waiter is conn1
+
+
+@pytest.mark.asyncio
+async def test_health_check():
+    dead: set[DummyConnection] = set()
+
+    async def is_alive(conn: DummyConnection) -> bool:
+        return conn not in dead
+
+    closed: list[DummyConnection] = []
+
+    async def close(conn: DummyConnection) -> None:
+        closed.append(conn)
+
+    pool = ConnectionPool(
+        connect_cb=dummy_connect_factory(), close_cb=close, health_check_cb=is_alive
+    )
+    conn1 = await pool.get(timeout=10)
+    pool.put(conn1)
+    dead.add(conn1)
+
+    conn2 = await pool.get(timeout=10)
+    assert conn2 is not conn1
+    assert pool.stats.discarded == 1
+
+    await pool.get(timeout=10)
+    assert closed == [conn1]
+
+
+@pytest.mark.asyncio
+async def test_get_waits_for_prewarm():
+    pool = ConnectionPool(connect_cb=slow_connect_factory(0.1))
+    pool.prewarm(2)
+
+    # the connections being prewarmed are handed out, the third get() doesn't wait for them
+    # and connects on its own
+    start = time.perf_counter()
+    conns = await asyncio.gather(*[pool.get(timeout=10) for _ in range(3)])
+    assert time.perf_counter() - start < 0.18
+    assert len(set(conns)) == 3
+    assert pool.stats.hits == 2 and pool.stats.misses == 1
+    assert pool.stats.connects == 3
+
+    for conn in conns:
+        pool.detach(conn)
+    assert not pool._connections
+    await pool.aclose()
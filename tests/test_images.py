@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from livekit import rtc
+from livekit.agents.llm import ChatContext, ImageContent, utils as llm_utils
+from livekit.agents.utils.images import (
+    EncodeOptions,
+    FrameEncodeCache,
+    ResizeOptions,
+    encode,
+    image,
+)
+
+
+def _frame(width: int, height: int, buffer_type: str = "I420", seed: int = 0) -> rtc.VideoFrame:
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:height, 0:width]
+    rgba = np.stack(
+        [xx * 255 // width, yy * 255 // height, (xx + yy) * 255 // (width + height), xx * 0 + 255],
+        axis=-1,
+    ).astype(np.int16)
+    rgba[..., :3] += rng.integers(-3, 3, (height, width, 3), dtype=np.int16)
+    frame = rtc.VideoFrame(
+        width, height, rtc.VideoBufferType.RGBA, np.clip(rgba, 0, 255).astype(np.uint8).tobytes()
+    )
+    if buffer_type == "RGBA":
+        return frame
+    return frame.convert(rtc.VideoBufferType.Value(buffer_type))
+
+
+def _decode(data: bytes) -> np.ndarray:
+    return np.asarray(Image.open(io.BytesIO(data)).convert("RGB"), dtype=np.float32)
+
+
+@pytest.mark.parametrize("buffer_type", ["I420", "RGBA", "BGRA"])
+@pytest.mark.parametrize(
+    "strategy",
+    ["skew", "center_aspect_fit", "center_aspect_cover", "scale_aspect_fit", "scale_aspect_cover"],
+)
+def test_encode_downsampled(buffer_type: str, strategy):
+    frame = _frame(640, 360, buffer_type)
+    opts = EncodeOptions(format="PNG", resize_options=ResizeOptions(160, 160, strategy))
+    assert image._reduce_factor(frame, opts) > 1
+    data = encode(frame, opts)
+
+    # downsampling in the native format first gives the same image as resizing the full frame
+    reference = image._resize_image(image._image_from_frame(frame), opts)
+    decoded = _decode(data)
+    assert decoded.shape == np.asarray(reference).shape
+    assert np.abs(decoded - np.asarray(reference, dtype=np.float32)).mean() < 2
+
+
+def _rgba(frame: rtc.VideoFrame) -> np.ndarray:
+    rgba = (
+        frame if frame.type == rtc.VideoBufferType.RGBA else frame.convert(rtc.VideoBufferType.RGBA)
+    )
+    return np.frombuffer(rgba.data, dtype=np.uint8).reshape(frame.height, frame.width, 4).copy()
+
+
+def _from_rgba(pixels: np.ndarray, buffer_type: str = "I420") -> rtc.VideoFrame:
+    height, width = pixels.shape[:2]
+    frame = rtc.VideoFrame(width, height, rtc.VideoBufferType.RGBA, pixels.tobytes())
+    if buffer_type == "RGBA":
+        return frame
+    return frame.convert(rtc.VideoBufferType.Value(buffer_type))
+
+
+def test_frame_encode_cache():
+    cache = FrameEncodeCache()
+    opts = EncodeOptions(resize_options=ResizeOptions(256, 256, "scale_aspect_fit"))
+
+    data = cache.encode(_frame(640, 480, seed=0), opts)
+    # sensor noise only
+    assert cache.encode(_frame(640, 480, seed=1), opts) is data
+    # different options or size
+    assert cache.encode(_frame(640, 480, seed=1), EncodeOptions()) is not data
+    assert cache.encode(_frame(480, 360, seed=1), opts) is not data
+
+    # something moved
+    pixels = _rgba(_frame(640, 480, "RGBA", seed=1))
+    pixels[100:200, 100:200, :3] = 0
+    assert cache.encode(_from_rgba(pixels), opts) is not data
+
+
+@pytest.mark.parametrize("buffer_type", ["I420", "RGBA"])
+def test_frame_encode_cache_small_changes(buffer_type: str):
+    cache = FrameEncodeCache()
+    opts = EncodeOptions(resize_options=ResizeOptions(512, 512, "scale_aspect_fit"))
+    pixels = _rgba(_frame(1920, 1080, "RGBA"))
+
+    data = cache.encode(_from_rgba(pixels, buffer_type), opts)
+    assert cache.encode(_from_rgba(pixels, buffer_type), opts) is data
+
+    # a 1px line of text across a screen share
+    line = pixels.copy()
+    line[540, :, :3] = 0
+    line_data = cache.encode(_from_rgba(line, buffer_type), opts)
+    assert line_data is not data
+
+    # the whole frame shifted to red
+    red = line.copy()
+    red[..., 0] = np.minimum(red[..., 0].astype(np.int16) + 24, 255).astype(np.uint8)
+    assert cache.encode(_from_rgba(red, buffer_type), opts) is not line_data
+
+
+def test_serialize_image_encode_cache():
+    pixels = _rgba(_frame(640, 480, "RGBA"))
+    changed = pixels.copy()
+    changed[240, :, :3] = 0
+
+    # without a cache, every frame is encoded
+    first = llm_utils.serialize_image(ImageContent(image=_from_rgba(pixels)))
+    second = llm_utils.serialize_image(ImageContent(image=_from_rgba(pixels)))
+    assert first.data_bytes is not second.data_bytes
+
+    cache = FrameEncodeCache()
+    first = llm_utils.serialize_image(ImageContent(image=_from_rgba(pixels), encode_cache=cache))
+    same = llm_utils.serialize_image(ImageContent(image=_from_rgba(pixels), encode_cache=cache))
+    assert same.data_bytes is first.data_bytes
+
+    # a changed frame is encoded again
+    reencoded = llm_utils.serialize_image(
+        ImageContent(image=_from_rgba(changed), encode_cache=cache)
+    )
+    assert reencoded.data_bytes is not first.data_bytes
+    assert reencoded.data_bytes != first.data_bytes
+
+
+async def test_serialize_frames():
+    chat_ctx = ChatContext.empty()
+    image = ImageContent(image=_frame(640, 480))
+    chat_ctx.add_message(role="user", content=["what do you see?", image])
+
+    await llm_utils.serialize_frames(chat_ctx)
+    serialized = image._cache["serialized_image"]
+    assert llm_utils.serialize_image(image) is serialized
+    assert serialized.mime_type == "image/jpeg"
+    assert _decode(serialized.data_bytes).shape == (480, 640, 3)
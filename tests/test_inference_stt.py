@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import struct
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Literal
+
+import aiohttp
+import numpy as np
+from aiohttp import web
+
+from livekit import rtc
+from livekit.agents import APIConnectOptions, inference, stt
+
+SAMPLE_RATE = 16000
+
+ServerMode = Literal["binary", "legacy", "strict", "slow", "flaky"]
+
+
+@dataclass
+class _GatewayStats:
+    connections: int = 0
+    sessions: list[dict] = field(default_factory=list)
+    wire_bytes: int = 0
+    audio: bytearray = field(default_factory=bytearray)
+    frame_indexes: list[int] = field(default_factory=list)
+    json_frames: int = 0
+
+
+@asynccontextmanager
+async def _stand_in_gateway(mode: ServerMode) -> AsyncIterator[tuple[str, _GatewayStats]]:
+    """A local stand-in for the inference gateway STT endpoint.
+
+    binary: acknowledges binary audio. legacy: ignores the setting and only reads JSON audio.
+    strict: errors on settings it doesn't know. slow: binary, but creates the session late.
+    flaky: binary, but errors on the first connection before creating the session.
+    """
+    stats = _GatewayStats()
+
+    async def _handler(request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        stats.connections += 1
+
+        session = json.loads((await ws.receive()).data)
+        stats.sessions.append(session)
+        settings = session["settings"]
+        if mode == "strict" and "audio_frames" in settings:
+            await ws.send_str(json.dumps({"type": "error", "message": "unknown audio_frames"}))
+            await ws.close()
+            return ws
+        if mode == "flaky" and stats.connections == 1:
+            await ws.send_str(json.dumps({"type": "error", "message": "overloaded"}))
+            await ws.close()
+            return ws
+        if mode == "slow":
+            await asyncio.sleep(0.3)
+
+        created: dict = {"type": "session.created"}
+        if mode != "legacy" and settings.get("audio_frames") == "binary":
+            created["audio_frames"] = "binary"
+        await ws.send_str(json.dumps(created))
+
+        async for msg in ws:
+            stats.wire_bytes += len(msg.data)
+            if msg.type == aiohttp.WSMsgType.BINARY:
+                assert mode != "legacy"
+                frame_type, index = struct.unpack_from("<BI", msg.data)
+                assert frame_type == inference.stt.BINARY_AUDIO_FRAME_TYPE
+                stats.frame_indexes.append(index)
+                stats.audio.extend(msg.data[5:])
+                continue
+
+            data = json.loads(msg.data)
+            if data["type"] == "input_audio":
+                stats.json_frames += 1
+                stats.audio.extend(base64.b64decode(data["audio"]))
+            elif data["type"] == "session.finalize":
+                duration = len(stats.audio) / 2 / SAMPLE_RATE
+                await ws.send_str(
+                    json.dumps(
+                        {"type": "final_transcript", "transcript": "hello", "duration": duration}
+                    )
+                )
+                await ws.close()
+
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/stt", _handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    try:
+        yield f"http://127.0.0.1:{port}", stats
+    finally:
+        await runner.cleanup()
+
+
+def _audio(duration: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.integers(-3000, 3000, int(duration * SAMPLE_RATE), dtype=np.int16)
+
+
+def _stt(base_url: str, session: aiohttp.ClientSession) -> inference.STT:
+    return inference.STT(
+        "deepgram",
+        base_url=base_url,
+        api_key="devkey",
+        api_secret="secret" * 6,
+        http_session=session,
+    )
+
+
+async def _transcribe_with(lk_stt: inference.STT, audio: np.ndarray) -> list[stt.SpeechEvent]:
+    stream = lk_stt.stream(
+        conn_options=APIConnectOptions(max_retry=1, retry_interval=0.0, timeout=5.0)
+    )
+    for i in range(0, len(audio), SAMPLE_RATE // 100):
+        await asyncio.sleep(0.002)  # 5x realtime
+        chunk = audio[i : i + SAMPLE_RATE // 100]
+        stream.push_frame(
+            rtc.AudioFrame(
+                data=chunk.tobytes(),
+                sample_rate=SAMPLE_RATE,
+                num_channels=1,
+                samples_per_channel=len(chunk),
+            )
+        )
+    stream.end_input()
+    events = [ev async for ev in stream]
+    await stream.aclose()
+    return events
+
+
+async def _transcribe(base_url: str, audio: np.ndarray) -> list[stt.SpeechEvent]:
+    async with aiohttp.ClientSession() as session:
+        return await _transcribe_with(_stt(base_url, session), audio)
+
+
+async def test_binary_audio_frames():
+    audio = _audio(2.0)
+    async with _stand_in_gateway("binary") as (base_url, stats):
+        events = await _transcribe(base_url, audio)
+
+    assert stats.sessions[0]["settings"]["audio_frames"] == "binary"
+    assert bytes(stats.audio) == audio.tobytes()
+    # the frames sent before session.created are JSON, the frame index counts them
+    assert stats.json_frames <= 2
+    assert stats.frame_indexes == list(range(stats.json_frames, 40))
+    assert [ev.type for ev in events if ev.type == stt.SpeechEventType.FINAL_TRANSCRIPT]
+
+
+async def test_json_fallback():
+    audio = _audio(2.0)
+    async with _stand_in_gateway("legacy") as (base_url, legacy_stats):
+        await _transcribe(base_url, audio)
+    assert bytes(legacy_stats.audio) == audio.tobytes()
+
+    # the session is created again without asking for binary audio
+    async with _stand_in_gateway("strict") as (base_url, strict_stats):
+        events = await _transcribe(base_url, audio)
+    assert len(strict_stats.sessions) == 2
+    assert "audio_frames" not in strict_stats.sessions[1]["settings"]
+    assert bytes(strict_stats.audio) == audio.tobytes()
+    assert [ev.type for ev in events if ev.type == stt.SpeechEventType.FINAL_TRANSCRIPT]
+
+    async with _stand_in_gateway("binary") as (base_url, binary_stats):
+        await _transcribe(base_url, audio)
+    # base64 inflates the audio by a third, plus the JSON envelope
+    assert binary_stats.wire_bytes < legacy_stats.wire_bytes * 0.76
+
+
+async def test_audio_before_session_created():
+    audio = _audio(2.0)
+    async with _stand_in_gateway("slow") as (base_url, stats):
+        await _transcribe(base_url, audio)
+
+    # the audio isn't held until the session is created
+    assert stats.json_frames >= 3 and stats.frame_indexes
+    assert bytes(stats.audio) == audio.tobytes()
+
+
+async def test_error_before_session_created():
+    audio = _audio(1.0)
+    async with _stand_in_gateway("flaky") as (base_url, stats):
+        async with aiohttp.ClientSession() as session:
+            lk_stt = _stt(base_url, session)
+            await _transcribe_with(lk_stt, audio)
+            # the error isn't about audio_frames, binary audio is still asked for
+            assert lk_stt._binary_audio
+            await lk_stt.aclose()
+
+    assert len(stats.sessions) == 2
+    assert stats.sessions[1]["settings"]["audio_frames"] == "binary"
+    assert bytes(stats.audio) == audio.tobytes()
+
+
+async def test_prewarmed_connection():
+    audio = _audio(1.0)
+    async with _stand_in_gateway("binary") as (base_url, stats):
+        async with aiohttp.ClientSession() as session:
+            lk_stt = _stt(base_url, session)
+            # the stream adopts the connection being prewarmed instead of opening another one
+            lk_stt.prewarm()
+            await _transcribe_with(lk_stt, audio)
+            assert stats.connections == 1
+            assert lk_stt._pool.stats.hits == 1
+
+            lk_stt.prewarm()
+            await asyncio.sleep(0.2)
+            assert stats.connections == 2 and not stats.sessions[1:]
+            await _transcribe_with(lk_stt, audio)
+            assert stats.connections == 2
+            assert bytes(stats.audio[len(stats.audio) // 2 :]) == audio.tobytes()
+
+            # adopted connections belong to their stream
+            assert not lk_stt._pool._connections
+            await lk_stt.aclose()
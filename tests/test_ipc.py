@@ -4,6 +4,8 @@ import asyncio
 import ctypes
 import io
 import multiprocessing as mp
+import os
+import signal
 import socket
 import time
 import uuid
@@ -12,8 +14,10 @@ from multiprocessing.context import BaseContext
 from typing import ClassVar
 
 import psutil
+import pytest
 
 from livekit.agents import JobContext, JobProcess, ipc, job, utils
+from livekit.agents.inference_runner import _InferenceRunner
 from livekit.protocol import agent
 
 
@@ -392,3 +396,238 @@ async def test_job_graceful_shutdown():
     assert proc.exitcode == 0, "process should have exited cleanly"
     assert not proc.killed
     assert start_args.shutdown_counter.value == 1
+
+
+class _SlowEchoRunner(_InferenceRunner):
+    INFERENCE_METHOD = "test_slow_echo"
+
+    def initialize(self) -> None:
+        pass
+
+    def run(self, data: bytes) -> bytes | None:
+        time.sleep(0.5)
+        return data
+
+
+class _BatchEchoRunner(_InferenceRunner):
+    INFERENCE_METHOD = "test_batch_echo"
+    SUPPORTS_BATCHING = True
+
+    def initialize(self) -> None:
+        pass
+
+    def run(self, data: bytes) -> bytes | None:
+        return self.run_batch([data])[0]
+
+    def run_batch(self, data: list[bytes]) -> list[bytes | None]:
+        if b"invalid" in data:
+            raise ValueError("invalid input")
+
+        time.sleep(0.1)
+        return [f"{len(data)}:".encode() + d for d in data]
+
+
+async def test_inference_proc_concurrency_and_batching():
+    proc = ipc.inference_proc_executor.InferenceProcExecutor(
+        runners={
+            _SlowEchoRunner.INFERENCE_METHOD: _SlowEchoRunner,
+            _BatchEchoRunner.INFERENCE_METHOD: _BatchEchoRunner,
+        },
+        initialize_timeout=20.0,
+        close_timeout=5.0,
+        memory_warn_mb=0,
+        memory_limit_mb=0,
+        ping_interval=2.5,
+        ping_timeout=10.0,
+        high_ping_threshold=1.0,
+        mp_ctx=mp.get_context("spawn"),
+        loop=asyncio.get_running_loop(),
+        http_proxy=None,
+        batch_window=0.2,
+        max_batch_size=4,
+    )
+    await proc.start()
+    await proc.initialize()
+
+    # requests must not be processed one after the other
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(proc.do_inference(_SlowEchoRunner.INFERENCE_METHOD, f"{i}".encode()) for i in range(4))
+    )
+    assert results == [f"{i}".encode() for i in range(4)]
+    assert time.perf_counter() - start < 1.5
+
+    results = await asyncio.gather(
+        *(proc.do_inference(_BatchEchoRunner.INFERENCE_METHOD, f"{i}".encode()) for i in range(6))
+    )
+    batch_sizes = [int(r.split(b":")[0]) for r in results]
+    assert [r.split(b":")[1] for r in results] == [f"{i}".encode() for i in range(6)]
+    assert max(batch_sizes) == 4, "requests arriving together should be coalesced"
+
+    # a lone request doesn't wait for the batch window (the runner takes 0.1s)
+    start = time.perf_counter()
+    assert await proc.do_inference(_BatchEchoRunner.INFERENCE_METHOD, b"alone") == b"1:alone"
+    assert time.perf_counter() - start < 0.25
+
+    # an invalid input only fails its own request
+    results = await asyncio.gather(
+        proc.do_inference(_BatchEchoRunner.INFERENCE_METHOD, b"valid"),
+        proc.do_inference(_BatchEchoRunner.INFERENCE_METHOD, b"invalid"),
+        return_exceptions=True,
+    )
+    assert results[0] == b"1:valid"
+    assert isinstance(results[1], RuntimeError)
+
+    await proc.aclose()
+
+
+def test_shm_ring_allocation():
+    ring = ipc.shm_ring.SharedMemoryRing(100)
+    try:
+        a = ring.write(b"a" * 40)
+        b = ring.write(b"b" * 40)
+        assert (a, b) == (0, 40)
+        assert ring.write(b"c" * 40) is None, "not enough space left"
+
+        # released out of order, the space is reclaimed once the oldest region is released
+        ring.release(b)
+        assert ring.write(b"c" * 40) is None
+        ring.release(a)
+        assert ring.used == 0
+
+        c = ring.write(b"c" * 60)
+        d = ring.write(b"d" * 30)
+        ring.release(c)
+        assert ring.write(b"e" * 50) == 0, "should wrap around to the start"
+        assert ring.read(d, 30) == b"d" * 30
+
+        reader = ipc.shm_ring.SharedMemoryRing(name=ring.name)
+        assert reader.read(0, 50) == b"e" * 50
+        reader.close()
+    finally:
+        ring.close()
+
+
+class _LengthRunner(_InferenceRunner):
+    INFERENCE_METHOD = "test_length"
+
+    def initialize(self) -> None:
+        pass
+
+    def run(self, data: bytes) -> bytes | None:
+        return f"{len(data)}:{data[:1].decode()}{data[-1:].decode()}".encode()
+
+
+async def test_inference_proc_shared_memory(monkeypatch):
+    proc = ipc.inference_proc_executor.InferenceProcExecutor(
+        runners={_LengthRunner.INFERENCE_METHOD: _LengthRunner},
+        initialize_timeout=20.0,
+        close_timeout=5.0,
+        memory_warn_mb=0,
+        memory_limit_mb=0,
+        ping_interval=2.5,
+        ping_timeout=10.0,
+        high_ping_threshold=1.0,
+        mp_ctx=mp.get_context("spawn"),
+        loop=asyncio.get_running_loop(),
+        http_proxy=None,
+        shm_size=256 * 1024,
+    )
+    await proc.start()
+    await proc.initialize()
+
+    # small payloads are sent inline, big ones through the ring (or inline when it's full)
+    sizes = [10, 2_000, 100_000, 100_000, 300_000]
+    payloads = [b"a" + b"x" * (size - 2) + b"z" for size in sizes]
+    results = await asyncio.gather(
+        *(proc.do_inference(_LengthRunner.INFERENCE_METHOD, p) for p in payloads)
+    )
+    assert results == [f"{size}:az".encode() for size in sizes]
+    assert proc._shm_ring is not None and proc._shm_ring.used == 0
+
+    # the region of a request that couldn't be sent is released
+    async def _closed(*args) -> None:
+        raise utils.aio.duplex_unix.DuplexClosed()
+
+    monkeypatch.setattr(ipc.inference_proc_executor.channel, "asend_message", _closed)
+    with pytest.raises(ipc.inference_proc_executor.InferenceProcExitedError):
+        await proc.do_inference(_LengthRunner.INFERENCE_METHOD, payloads[2])
+    assert proc._shm_ring.used == 0 and not proc._shm_regions
+    monkeypatch.undo()
+
+    await proc.aclose()
+
+
+class _PidRunner(_InferenceRunner):
+    INFERENCE_METHOD = "test_pid"
+
+    def initialize(self) -> None:
+        pass
+
+    def run(self, data: bytes) -> bytes | None:
+        time.sleep(0.05)
+        return str(os.getpid()).encode()
+
+
+async def test_inference_proc_pool_routing_and_restart():
+    pool = ipc.inference_proc_pool.InferenceProcPool(
+        runners={_PidRunner.INFERENCE_METHOD: _PidRunner},
+        num_processes=2,
+        routing="job_affinity",
+        initialize_timeout=20.0,
+        close_timeout=5.0,
+        memory_warn_mb=0,
+        memory_limit_mb=0,
+        ping_interval=2.5,
+        ping_timeout=10.0,
+        high_ping_threshold=1.0,
+        mp_ctx=mp.get_context("spawn"),
+        loop=asyncio.get_running_loop(),
+        http_proxy=None,
+    )
+    await pool.start()
+    await pool.initialize()
+    pids = {proc.pid for proc in pool.processes}
+    assert len(pids) == 2
+
+    # the same job always lands on the same process
+    for key in ("job_a", "job_b", "job_c"):
+        results = await asyncio.gather(
+            *(
+                pool.do_inference(_PidRunner.INFERENCE_METHOD, b"", routing_key=key)
+                for _ in range(4)
+            )
+        )
+        assert len(set(results)) == 1
+
+    # without a routing key, the load is spread across the processes
+    results = await asyncio.gather(
+        *(pool.do_inference(_PidRunner.INFERENCE_METHOD, b"") for _ in range(8))
+    )
+    assert {int(r) for r in results} == pids
+
+    # requests in flight on a crashed process are retried on the other one
+    victim = int(await pool.do_inference(_PidRunner.INFERENCE_METHOD, b"", routing_key="job_a"))
+    survivor = next(pid for pid in pids if pid != victim)
+    pending = [
+        asyncio.create_task(
+            pool.do_inference(_PidRunner.INFERENCE_METHOD, b"", routing_key="job_a")
+        )
+        for _ in range(4)
+    ]
+    await asyncio.sleep(0.01)
+    os.kill(victim, signal.SIGKILL)
+    results = await asyncio.gather(*pending)
+    assert all(r is not None and int(r) != victim for r in results)
+
+    # and the crashed process is replaced, its jobs are routed back to it
+    for _ in range(100):
+        pid = int(await pool.do_inference(_PidRunner.INFERENCE_METHOD, b"", routing_key="job_a"))
+        if pid not in (victim, survivor):
+            break
+        await asyncio.sleep(0.2)
+    else:
+        raise AssertionError("crashed inference process was not restarted")
+
+    assert pool.is_alive()
+    await pool.aclose()
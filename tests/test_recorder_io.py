@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import av
+import numpy as np
+import pytest
+
+from livekit import rtc
+from livekit.agents.metrics import RecorderMetrics
+from livekit.agents.voice import MetricsCollectedEvent, io
+from livekit.agents.voice.recorder_io import RecorderIO, RecorderOptions
+from livekit.agents.voice.recorder_io.recorder_io import _StereoBlocks
+
+
+def _tone(freq: float, duration: float, sample_rate: int, frame_duration: float = 0.02):
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    samples = (np.sin(2 * np.pi * freq * t) * 10000).astype(np.int16)
+    frame_size = int(frame_duration * sample_rate)
+    return [
+        rtc.AudioFrame(
+            data=samples[i : i + frame_size].tobytes(),
+            sample_rate=sample_rate,
+            num_channels=1,
+            samples_per_channel=len(samples[i : i + frame_size]),
+        )
+        for i in range(0, len(samples), frame_size)
+    ]
+
+
+class _FakeSession:
+    def __init__(self) -> None:
+        self.metrics: list[RecorderMetrics] = []
+
+    def emit(self, event: str, ev: MetricsCollectedEvent) -> None:
+        assert event == "metrics_collected" and isinstance(ev.metrics, RecorderMetrics)
+        self.metrics.append(ev.metrics)
+
+
+def _recorder(options: RecorderOptions) -> RecorderIO:
+    recorder = RecorderIO(agent_session=_FakeSession(), options=options)  # type: ignore[arg-type]
+    recorder.record_input(io.AudioInput(label="test"))
+    recorder.record_output(None)  # type: ignore[arg-type]
+    return recorder
+
+
+def _decode(path) -> np.ndarray:
+    # opus is always decoded at 48kHz
+    with av.open(str(path)) as container:
+        frames = list(container.decode(audio=0))
+        assert frames[0].sample_rate == 48000
+        return np.concatenate([frame.to_ndarray() for frame in frames], axis=1)
+
+
+def test_stereo_blocks():
+    rng = np.random.default_rng(0)
+    encoded: list[np.ndarray] = []
+    blocks = _StereoBlocks(480)
+
+    left = rng.integers(-1000, 1000, 3000, dtype=np.int16)
+    right = rng.integers(-1000, 1000, (2000, 2), dtype=np.int16)
+
+    def _frames(samples: np.ndarray, size: int) -> list[rtc.AudioFrame]:
+        channels = samples.shape[1] if samples.ndim == 2 else 1
+        return [
+            rtc.AudioFrame(
+                data=samples[i : i + size].tobytes(),
+                sample_rate=48000,
+                num_channels=channels,
+                samples_per_channel=len(samples[i : i + size]),
+            )
+            for i in range(0, len(samples), size)
+        ]
+
+    # right is shorter and padded with 1000 samples of leading silence
+    blocks.write(
+        _frames(left, 333), [1000, *_frames(right, 700)], lambda b: encoded.append(b.copy())
+    )
+    blocks.flush(lambda b: encoded.append(b.copy()))
+
+    assert [b.shape[1] for b in encoded] == [480] * 6 + [120]
+    stereo = np.concatenate(encoded, axis=1)
+    assert np.allclose(stereo[0], left / 32768.0)
+    assert np.all(stereo[1, :1000] == 0)
+    assert np.allclose(stereo[1, 1000:], right.sum(axis=1) / 2 / 32768.0)
+
+
+async def test_segmented_recording(tmp_path):
+    recorder = _recorder(RecorderOptions(sample_rate=24000, segment_duration=1.0))
+    await recorder.start(output_path=tmp_path / "audio.ogg")
+    recorder._push(_tone(440, 2.5, 16000), _tone(880, 2.5, 22050))
+    await recorder.aclose()
+
+    assert [p.name for p in recorder.output_paths] == [
+        "audio-000.ogg",
+        "audio-001.ogg",
+        "audio-002.ogg",
+    ]
+    assert recorder.output_path == recorder.output_paths[0]
+
+    audio = np.concatenate([_decode(path) for path in recorder.output_paths], axis=1)
+    assert audio.shape[0] == 2
+    assert abs(audio.shape[1] / 48000 - 2.5) < 0.1
+    # input on the left, output on the right
+    left, right = np.abs(np.fft.rfft(audio[0])), np.abs(np.fft.rfft(audio[1]))
+    freqs = np.fft.rfftfreq(audio.shape[1], 1 / 48000)
+    assert abs(freqs[left.argmax()] - 440) < 5
+    assert abs(freqs[right.argmax()] - 880) < 5
+
+    stats = recorder.stats
+    assert abs(stats.encoded_duration - 2.5) < 0.05
+    assert stats.pending_duration == 0
+    assert stats.dropped_duration == 0
+    assert stats.max_encoder_lag >= stats.encoder_lag > 0
+
+
+async def test_recording_drops_when_encoder_lags(tmp_path):
+    recorder = _recorder(RecorderOptions(max_pending_duration=1.6))
+
+    # nothing is encoded before the recorder starts
+    recorder._push(_tone(440, 1.0, 48000), [])
+    recorder._push(_tone(440, 1.0, 48000), [])
+    recorder._push(_tone(440, 0.5, 48000), [])
+    assert recorder.stats.pending_duration == pytest.approx(1.5)
+    assert recorder.stats.dropped_duration == pytest.approx(1.0)
+
+    await recorder.start(output_path=tmp_path / "audio.ogg")
+    await recorder.aclose()
+
+    assert recorder.output_paths == [tmp_path / "audio.ogg"]
+    assert abs(_decode(tmp_path / "audio.ogg").shape[1] / 48000 - 1.5) < 0.05
+    assert abs(recorder.stats.encoded_duration - 1.5) < 0.01
+
+    # reported on the session when the recording ends
+    (metrics,) = recorder._session.metrics  # type: ignore[attr-defined]
+    assert metrics.dropped_duration == pytest.approx(1.0)
+    assert metrics.encoded_duration == recorder.stats.encoded_duration
+    assert metrics.max_encoder_lag > 0
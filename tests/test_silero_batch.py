@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+import numpy as np
+import pytest
+
+from livekit.plugins.silero.onnx_model import BatchedOnnxEngine, OnnxModel
+
+SAMPLE_RATE = 16000
+
+
+class FakeInferenceSession:
+    """Returns the mean of each input row as the probability and increments the RNN state"""
+
+    def __init__(self) -> None:
+        self.batch_sizes: list[int] = []
+        self.entered = threading.Event()
+        self.block = threading.Event()
+        self.block.set()
+
+    def run(self, output_names: Any, inputs: dict[str, np.ndarray]) -> list[np.ndarray]:
+        self.entered.set()
+        self.block.wait()
+        x, state = inputs["input"], inputs["state"]
+        self.batch_sizes.append(x.shape[0])
+        return [x.mean(axis=1, keepdims=True), state + 1.0]
+
+
+def _model(sess: FakeInferenceSession) -> OnnxModel:
+    return OnnxModel(onnx_session=sess, sample_rate=SAMPLE_RATE)
+
+
+def test_batch_streams() -> None:
+    sess = FakeInferenceSession()
+    engine = BatchedOnnxEngine(onnx_session=sess, sample_rate=SAMPLE_RATE, batch_window=0.2)
+    models = [_model(sess) for _ in range(3)]
+    windows = [np.full(models[0].window_size_samples, i + 1, dtype=np.float32) for i in range(3)]
+
+    futs = [engine.submit(model, x) for model, x in zip(models, windows)]
+    results = [fut.result(timeout=5) for fut in futs]
+    engine.close()
+
+    # a single session call for the three streams
+    assert sess.batch_sizes == [3]
+
+    context_size = models[0].context_size
+    for i, (model, result) in enumerate(zip(models, results)):
+        # the context was zero before the first window
+        expected = (i + 1) * model.window_size_samples / (model.window_size_samples + context_size)
+        assert result == pytest.approx(expected)
+
+        # the context and the state are written back to each stream
+        assert model._context.shape == (1, context_size)
+        assert np.all(model._context == i + 1)
+        assert model._state.shape == (2, 1, 128)
+        assert np.all(model._state == 1.0)
+
+    # the engine matches the unbatched path
+    for x, result in zip(windows, results):
+        unbatched = _model(sess)
+        assert unbatched(x) == pytest.approx(result)
+        assert np.all(unbatched._state == 1.0)
+
+
+def test_cancel_pending_windows() -> None:
+    sess = FakeInferenceSession()
+    sess.block.clear()
+    engine = BatchedOnnxEngine(onnx_session=sess, sample_rate=SAMPLE_RATE, batch_window=0.0)
+    model = _model(sess)
+    x = np.zeros(model.window_size_samples, dtype=np.float32)
+
+    # the first window blocks the engine thread inside the session call
+    running = engine.submit(model, x)
+    assert sess.entered.wait(timeout=5)
+    cancelled = engine.submit(_model(sess), x)
+    queued = engine.submit(_model(sess), x)
+    assert cancelled.cancel()
+
+    engine.close()
+    sess.block.set()
+
+    assert running.result(timeout=5) == 0.0
+    assert queued.cancelled()
+    with pytest.raises(RuntimeError):
+        engine.submit(model, x)
+
+    # the cancelled window never reached the session
+    assert sess.batch_sizes == [1]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from livekit import rtc
+from livekit.agents.voice.transcription._speaking_rate import SpeakingRateDetector, _SpectralFlux
+
+
+def _audio(sample_rate: int, duration: float, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(sample_rate * duration)) / sample_rate
+    audio = 0.3 * np.sin(2 * np.pi * 180 * t) * np.clip(np.sin(2 * np.pi * 4 * t), 0, None)
+    audio += 0.01 * rng.standard_normal(len(t))
+    # a pause in the middle, its windows are skipped by the spectral flux
+    audio[int(len(t) * 0.4) : int(len(t) * 0.6)] = 0
+    return (audio * 32767).astype(np.int16)
+
+
+@pytest.mark.parametrize("sample_rate", [16000, 44100])
+async def test_speaking_rate_sliding_windows(sample_rate: int):
+    detector = SpeakingRateDetector()
+    stream = detector.stream()
+    segments = [_audio(sample_rate, 4.0, seed=0), _audio(sample_rate, 2.55, seed=1)]
+
+    frame_size = sample_rate // 100
+    for segment in segments:
+        for i in range(0, len(segment), frame_size):
+            data = segment[i : i + frame_size]
+            stream.push_frame(
+                rtc.AudioFrame(
+                    data=data.tobytes(),
+                    sample_rate=sample_rate,
+                    num_channels=1,
+                    samples_per_channel=len(data),
+                )
+            )
+        stream.flush()
+    stream.end_input()
+    rates = [ev.speaking_rate async for ev in stream]
+
+    # every window computed from scratch
+    window_size = int(detector._opts.window_duration * sample_rate)
+    step_size = int(detector._opts.step_size * sample_rate)
+    expected = []
+    for segment in segments:
+        samples = segment.astype(np.float32) / np.iinfo(np.int16).max
+        offset = 0
+        while len(samples) - offset >= window_size:
+            window = samples[offset : offset + window_size]
+            expected.append(_rate(stream, window, sample_rate, window_size, step_size))
+            offset += step_size
+        if len(samples) - offset > window_size * 0.5:
+            expected.append(_rate(stream, samples[offset:], sample_rate, window_size, step_size))
+
+    assert len(rates) == len(expected)
+    assert any(rate == 0 for rate in rates) and any(rate > 0 for rate in rates)
+    np.testing.assert_allclose(rates, expected, rtol=1e-4)
+
+
+def _rate(stream, audio: np.ndarray, sample_rate: int, window_size: int, step_size: int) -> float:
+    spectral_flux = _SpectralFlux(
+        sample_rate=sample_rate, window_size=window_size, step_size=step_size
+    )
+    return stream._compute_speaking_rate(audio, spectral_flux)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pytest
+
+from livekit import rtc
+from livekit.agents import stt
+from livekit.agents.utils import aio
+from livekit.agents.voice import STTGatingOptions
+from livekit.agents.voice.audio_recognition import _STTAudioGate
+
+SAMPLE_RATE = 16000
+FRAME_DURATION = 0.01
+
+
+def _push(gate: _STTAudioGate, duration: float) -> None:
+    for _ in range(round(duration / FRAME_DURATION)):
+        gate.push_frame(rtc.AudioFrame.create(SAMPLE_RATE, 1, int(SAMPLE_RATE * FRAME_DURATION)))
+
+
+def _sent(ch: aio.Chan[rtc.AudioFrame]) -> list[float]:
+    durations = []
+    while not ch.empty():
+        durations.append(ch.recv_nowait().duration)
+    return durations
+
+
+def _remap(gate: _STTAudioGate, start_time: float, end_time: float) -> tuple[float, float]:
+    ev = stt.SpeechEvent(
+        type=stt.SpeechEventType.FINAL_TRANSCRIPT,
+        alternatives=[
+            stt.SpeechData(language="en", text="hi", start_time=start_time, end_time=end_time)
+        ],
+    )
+    gate.remap_event(ev)
+    return ev.alternatives[0].start_time, ev.alternatives[0].end_time
+
+
+def test_gate_speech_with_padding() -> None:
+    ch = aio.Chan[rtc.AudioFrame]()
+    gate = _STTAudioGate(STTGatingOptions(pre_roll=0.2, hangover=0.3, keepalive_interval=1.0), ch)
+
+    _push(gate, 1.0)
+    assert _sent(ch) == []
+
+    # the pre-roll is sent when the speech is detected
+    gate.update_speaking(True)
+    assert sum(_sent(ch)) == pytest.approx(0.2)
+    _push(gate, 0.5)
+    gate.update_speaking(False)
+    _push(gate, 2.0)
+
+    # speech + hangover, then a keepalive once 1s of audio was dropped
+    sent = _sent(ch)
+    assert sum(sent[:-1]) == pytest.approx(0.5 + 0.3)
+    assert sent[-1] == pytest.approx(_STTAudioGate.KEEPALIVE_DURATION)
+
+    gate.update_speaking(True)
+    _push(gate, 0.1)
+    assert gate.input_duration == pytest.approx(3.6)
+    assert gate.sent_duration == pytest.approx(0.2 + 0.5 + 0.3 + 0.02 + 0.2 + 0.1)
+
+    # the STT timestamps are on the timeline of the sent audio
+    assert _remap(gate, 0.25, 0.95) == (pytest.approx(1.05), pytest.approx(1.75))
+    assert _remap(gate, 1.05, 1.32) == (pytest.approx(3.33), pytest.approx(3.6))
+    # no timestamps reported
+    assert _remap(gate, 0.0, 0.0) == (0.0, 0.0)
+
+
+def test_gate_without_pre_roll_and_keepalive() -> None:
+    ch = aio.Chan[rtc.AudioFrame]()
+    gate = _STTAudioGate(STTGatingOptions(pre_roll=0.0, hangover=0.0, keepalive_interval=None), ch)
+
+    _push(gate, 30.0)
+    gate.update_speaking(True)
+    _push(gate, 1.0)
+    gate.update_speaking(False)
+    _push(gate, 30.0)
+
+    assert sum(_sent(ch)) == pytest.approx(1.0)
+    assert _remap(gate, 0.5, 1.0) == (pytest.approx(30.5), pytest.approx(31.0))
@@ -0,0 +1,67 @@
+import json
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+
+from livekit.agents.llm import ChatContext, FunctionCall, FunctionCallOutput
+from livekit.agents.telemetry import set_chat_ctx_tracing, trace_types, utils
+
+
+def _chat_ctx() -> ChatContext:
+    chat_ctx = ChatContext.empty()
+    chat_ctx.add_message(role="system", content="you are a helpful assistant")
+    for i in range(5):
+        chat_ctx.add_message(role="user", content=[f"question {i}", "details"])
+        chat_ctx.insert(FunctionCall(call_id=f"call_{i}", name="lookup", arguments="{}"))
+        chat_ctx.insert(
+            FunctionCallOutput(call_id=f"call_{i}", name="lookup", output="ok", is_error=False)
+        )
+        chat_ctx.add_message(role="assistant", content=f"answer {i}")
+    return chat_ctx
+
+
+def _recorded(chat_ctx: ChatContext) -> str:
+    tracer = TracerProvider().get_tracer("test")
+    with tracer.start_as_current_span("span") as span:
+        utils.record_chat_ctx(span, chat_ctx)
+        return span.attributes[trace_types.ATTR_CHAT_CTX]
+
+
+def test_record_chat_ctx():
+    chat_ctx = _chat_ctx()
+
+    def _expected() -> str:
+        return json.dumps(
+            chat_ctx.to_dict(exclude_audio=True, exclude_image=True, exclude_timestamp=False)
+        )
+
+    assert _recorded(chat_ctx) == _expected()
+
+    # modified and added items are serialized again
+    chat_ctx.items[1].content.append("edited")
+    chat_ctx.items[2].arguments = '{"q": 1}'
+    chat_ctx.add_message(role="user", content="new turn")
+    assert _recorded(chat_ctx) == _expected()
+
+    try:
+        set_chat_ctx_tracing("last_n", max_items=3)
+        recorded = json.loads(_recorded(chat_ctx))
+        assert [item["id"] for item in recorded["items"]] == [
+            item.id for item in chat_ctx.items[-3:]
+        ]
+        assert recorded["omitted_items"] == len(chat_ctx.items) - 3
+
+        set_chat_ctx_tracing("hash")
+        recorded = json.loads(_recorded(chat_ctx))
+        assert recorded["items_count"] == len(chat_ctx.items)
+        chat_ctx.add_message(role="assistant", content="reply")
+        assert json.loads(_recorded(chat_ctx))["hash"] != recorded["hash"]
+    finally:
+        set_chat_ctx_tracing("full")
+
+
+def test_record_chat_ctx_not_recording():
+    chat_ctx = _chat_ctx()
+    cached = len(utils._chat_item_cache)
+    utils.record_chat_ctx(trace.NonRecordingSpan(trace.INVALID_SPAN_CONTEXT), chat_ctx)
+    assert len(utils._chat_item_cache) == cached  # nothing was serialized
@@ -1,7 +1,10 @@
+import functools
+import random
+
 import pytest
 
 from livekit.agents import tokenize
-from livekit.agents.tokenize import basic, blingfire
+from livekit.agents.tokenize import _basic_sent, basic, blingfire
 from livekit.agents.tokenize._basic_paragraph import split_paragraphs
 from livekit.plugins import nltk
 
@@ -118,6 +121,46 @@ async def test_streamed_sent_tokenizer(tokenizer: tokenize.SentenceTokenizer, ex
         assert ev.token == expected[i]
 
 
+@pytest.mark.parametrize("retain_format", [False, True])
+@pytest.mark.parametrize(
+    "tokenizer_cls, split_fnc",
+    [
+        (basic.SentenceTokenizer, _basic_sent.split_sentences),
+        (blingfire.SentenceTokenizer, blingfire._split_sentences),
+    ],
+)
+async def test_incremental_sent_stream(tokenizer_cls, split_fnc, retain_format: bool):
+    # the incremental tokenizers must split exactly like re-tokenizing the whole buffered text
+    async def _collect(stream: tokenize.SentenceStream, chunks: list[str]) -> list[str]:
+        for chunk in chunks:
+            stream.push_text(chunk)
+        stream.end_input()
+        return [ev.token async for ev in stream]
+
+    text = TEXT + " Dr. Smith went to example.com... " + "word " * 200 + "the end."
+    rng = random.Random(42)
+    for _ in range(5):
+        chunks = []
+        i = 0
+        while i < len(text):
+            size = rng.randint(1, 16)
+            chunks.append(text[i : i + size])
+            i += size
+
+        expected = await _collect(
+            tokenize.BufferedSentenceStream(
+                tokenizer=functools.partial(
+                    split_fnc, min_sentence_len=20, retain_format=retain_format
+                ),
+                min_token_len=20,
+                min_ctx_len=10,
+            ),
+            chunks,
+        )
+        tokenizer = tokenizer_cls(min_sentence_len=20, retain_format=retain_format)
+        assert await _collect(tokenizer.stream(), chunks) == expected
+
+
 WORDS_TEXT = "This is a test. Blabla another test! multiple consecutive spaces:     done"
 WORDS_EXPECTED = [
     "This",
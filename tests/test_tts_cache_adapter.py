@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+
+from livekit.agents.tts import CacheAdapter, StreamAdapter, cache_adapter
+from livekit.agents.tts.cache_adapter import _default_voice_key
+from livekit.agents.types import USERDATA_TIMED_TRANSCRIPT
+
+from .fake_tts import FakeTTS
+
+
+async def _stored(cache: CacheAdapter) -> None:
+    await asyncio.gather(*cache._store_tasks)
+
+
+async def _synthesize(cache: CacheAdapter, text: str) -> float:
+    async with cache.synthesize(text) as stream:
+        frame = await stream.collect()
+    return frame.duration
+
+
+async def _stream(cache: CacheAdapter, *chunks: str) -> tuple[float, list]:
+    duration = 0.0
+    timed_transcripts = []
+    async with cache.stream() as stream:
+        for i, chunk in enumerate(chunks):
+            if i > 0:
+                await asyncio.sleep(0.01)
+            stream.push_text(chunk)
+        stream.end_input()
+        async for audio in stream:
+            duration += audio.frame.duration
+            for text in audio.frame.userdata.get(USERDATA_TIMED_TRANSCRIPT, []):
+                timed_transcripts.append((str(text), text.start_time))
+
+    return duration, timed_transcripts
+
+
+async def test_synthesize_cached() -> None:
+    fake_tts = FakeTTS(fake_audio_duration=0.5)
+    cache = CacheAdapter(fake_tts)
+
+    duration = await _synthesize(cache, "Hello, how can I help you today?")
+    assert abs(duration - 0.5) < 0.05
+    await _stored(cache)
+    # whitespace is normalized
+    assert await _synthesize(cache, "  Hello, how can I help\nyou today?") == duration
+    await _synthesize(cache, "Goodbye!")
+
+    assert fake_tts.synthesize_ch.recv_nowait().input_text == "Hello, how can I help you today?"
+    assert fake_tts.synthesize_ch.recv_nowait().input_text == "Goodbye!"
+    assert fake_tts.synthesize_ch.empty()
+
+    stats = cache.stats
+    assert (stats.hits, stats.misses) == (1, 2)
+    assert abs(stats.hit_ratio - 1 / 3) < 1e-6
+    await cache.aclose()
+    assert abs(cache.stats.memory_bytes - 2 * duration * 24000 * 2) < 2000
+
+
+async def test_disk_cache_shared(tmp_path) -> None:
+    phrases = ["Please hold while I transfer your call.", "This call may be recorded."]
+
+    fake_tts = FakeTTS(fake_audio_duration=1.0)
+    cache = CacheAdapter(fake_tts, cache_dir=tmp_path, format="opus")
+    await cache.populate(phrases)
+    await cache.populate(phrases)
+    assert len(list(tmp_path.iterdir())) == 2
+    assert cache.stats.stored == 2
+    # opus is about a tenth of 16-bit pcm, even for silence
+    assert cache.stats.disk_bytes < 2 * 24000 * 2 / 10
+
+    # another process using the same directory
+    fake_tts = FakeTTS(fake_audio_duration=1.0)
+    cache = CacheAdapter(fake_tts, cache_dir=tmp_path, format="opus")
+    for phrase in phrases:
+        assert abs(await _synthesize(cache, phrase) - 1.0) < 0.05
+    assert fake_tts.synthesize_ch.empty()
+    assert cache.stats.hits == 2
+
+    # expired entries are synthesized again
+    cache = CacheAdapter(fake_tts, cache_dir=tmp_path, format="opus", ttl=0.0)
+    await _synthesize(cache, phrases[0])
+    assert fake_tts.synthesize_ch.recv_nowait().input_text == phrases[0]
+    assert cache.stats.expired == 1
+    await cache.aclose()
+
+
+async def test_cache_budgets(tmp_path) -> None:
+    fake_tts = FakeTTS(fake_audio_duration=0.5)
+    entry_size = 25000  # a bit more than 0.5s of 24kHz 16-bit mono
+    cache = CacheAdapter(
+        fake_tts,
+        cache_dir=tmp_path,
+        max_memory_bytes=2 * entry_size,
+        max_disk_bytes=3 * entry_size,
+    )
+
+    for i in range(4):
+        await _synthesize(cache, f"phrase {i}")
+        await _stored(cache)
+
+    stats = cache.stats
+    assert entry_size < stats.memory_bytes <= 2 * entry_size
+    assert 2 * entry_size < stats.disk_bytes <= 3 * entry_size
+    assert len(list(tmp_path.iterdir())) == 3
+    assert stats.evicted == 2 + 1
+
+    # the oldest entry is gone, the others are in memory or read back from the disk
+    for i in reversed(range(4)):
+        await _synthesize(cache, f"phrase {i}")
+    assert (cache.stats.hits, cache.stats.misses) == (3, 5)
+    await cache.aclose()
+
+
+async def test_disk_budget_shared(tmp_path, monkeypatch) -> None:
+    entry_size = 25000  # a bit more than 0.5s of 24kHz 16-bit mono
+    scans = 0
+    scan_dir = cache_adapter._AudioCache._scan_dir
+
+    def _scan_dir(self: cache_adapter._AudioCache) -> None:
+        nonlocal scans
+        scans += 1
+        scan_dir(self)
+
+    monkeypatch.setattr(cache_adapter._AudioCache, "_scan_dir", _scan_dir)
+
+    def _caches(cache_dir) -> list[CacheAdapter]:
+        return [
+            CacheAdapter(
+                FakeTTS(fake_audio_duration=0.5), cache_dir=cache_dir, max_disk_bytes=3 * entry_size
+            )
+            for _ in range(2)
+        ]
+
+    # two processes writing to the same directory, a process only scans it again when its
+    # index crosses the budget, the files of the other one are evicted then
+    caches = _caches(tmp_path / "a")
+    for i in range(6):
+        cache = caches[i % 2]
+        await _synthesize(cache, f"phrase {i}")
+        await _stored(cache)
+    assert len(list((tmp_path / "a").iterdir())) == 3
+    assert scans == 3  # the first store of each process and the one crossing the budget
+
+    # the most recent entries are kept
+    fake_tts = FakeTTS(fake_audio_duration=0.5)
+    cache = CacheAdapter(fake_tts, cache_dir=tmp_path / "a")
+    for i in range(3, 6):
+        await _synthesize(cache, f"phrase {i}")
+    assert fake_tts.synthesize_ch.empty()
+
+    # a stale index is scanned again
+    monkeypatch.setattr(cache_adapter, "_DISK_RESCAN_INTERVAL", 0.0)
+    caches += _caches(tmp_path / "b")
+    for i in range(6):
+        cache = caches[2 + i % 2]
+        await _synthesize(cache, f"phrase {i}")
+        await _stored(cache)
+        assert len(list((tmp_path / "b").iterdir())) <= 3
+
+    for cache in caches:
+        await cache.aclose()
+
+
+async def test_stream_cached_with_timed_transcripts() -> None:
+    fake_tts = FakeTTS(fake_audio_duration=0.5)
+    cache = CacheAdapter(StreamAdapter(tts=fake_tts))
+    text = "Thanks for calling our support line. Your order should arrive tomorrow."
+
+    duration, timed_transcripts = await _stream(cache, text)
+    await _stored(cache)
+    assert abs(duration - 1.0) < 0.05
+    assert [t.strip() for t, _ in timed_transcripts if t.strip()] == [
+        "Thanks for calling our support line.",
+        "Your order should arrive tomorrow.",
+    ]
+
+    assert await _stream(cache, text) == (duration, timed_transcripts)
+    assert cache.stats.hits == 1
+
+    # text streamed token by token goes to the wrapped TTS and isn't stored
+    await _stream(cache, "Thanks for calling our support line. ", "Your order has shipped.")
+    await _stored(cache)
+    assert (cache.stats.hits, cache.stats.stored) == (1, 1)
+    await cache.aclose()
+
+
+def test_default_voice_key() -> None:
+    @dataclass
+    class _Options:
+        voice: str
+        speed: float
+        api_key: str
+        http_session: object
+
+    class _TTS(FakeTTS):
+        def __init__(self, **kwargs: object) -> None:
+            super().__init__()
+            self._opts = _Options(**kwargs)  # type: ignore[arg-type]
+
+    voice_key = _default_voice_key(_TTS(voice="a", speed=1.0, api_key="secret", http_session=1))
+    assert voice_key == {"voice": "a", "speed": 1.0}
+    assert _default_voice_key(FakeTTS()) is None
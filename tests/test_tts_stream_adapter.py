@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from livekit.agents.tts import StreamAdapter
+from livekit.agents.types import USERDATA_TIMED_TRANSCRIPT
+
+from .fake_tts import FakeTTS, FakeTTSResponse
+
+SENTENCES = [
+    "This is the first sentence of the reply.",
+    "Here comes a second, shorter one.",
+    "And the third sentence ends the reply.",
+]
+
+
+def _fake_tts(ttfbs: list[float], audio_durations: list[float]) -> FakeTTS:
+    return FakeTTS(
+        fake_responses=[
+            FakeTTSResponse(input=text, audio_duration=audio_duration, ttfb=ttfb, duration=ttfb)
+            for text, ttfb, audio_duration in zip(SENTENCES, ttfbs, audio_durations)
+        ]
+    )
+
+
+async def _synthesize(adapter: StreamAdapter) -> tuple[float, float, list]:
+    """Returns the time to the first audio frame, the total time and the timed transcripts"""
+    start = time.perf_counter()
+    first_audio = 0.0
+    timed_transcripts = []
+    async with adapter.stream() as stream:
+        stream.push_text(" ".join(SENTENCES))
+        stream.end_input()
+        async for audio in stream:
+            first_audio = first_audio or time.perf_counter() - start
+            timed_transcripts.extend(audio.frame.userdata.get(USERDATA_TIMED_TRANSCRIPT, []))
+
+    return first_audio, time.perf_counter() - start, timed_transcripts
+
+
+@pytest.mark.parametrize("look_ahead, expected_duration", [(0, 0.6), (1, 0.4), (2, 0.2)])
+async def test_look_ahead(look_ahead: int, expected_duration: float) -> None:
+    fake_tts = _fake_tts([0.2, 0.2, 0.2], [0.5, 0.5, 0.5])
+    adapter = StreamAdapter(tts=fake_tts, look_ahead=look_ahead)
+
+    first_audio, duration, _ = await _synthesize(adapter)
+    assert first_audio == pytest.approx(0.2, abs=0.1)
+    assert duration == pytest.approx(expected_duration, abs=0.1)
+
+
+async def test_look_ahead_keeps_order() -> None:
+    # the later sentences are ready first
+    fake_tts = _fake_tts([0.3, 0.1, 0.0], [1.0, 0.5, 0.25])
+    adapter = StreamAdapter(tts=fake_tts, look_ahead=2)
+
+    _, _, timed_transcripts = await _synthesize(adapter)
+    sentences = [(t.strip(), t.start_time) for t in timed_transcripts if t.strip()]
+    assert sentences == [
+        (SENTENCES[0], 0.0),
+        (SENTENCES[1], pytest.approx(1.0, abs=0.05)),
+        (SENTENCES[2], pytest.approx(1.5, abs=0.05)),
+    ]
+
+
+async def test_look_ahead_cancelled_on_close() -> None:
+    fake_tts = _fake_tts([0.0, 5.0, 5.0], [0.5, 0.5, 0.5])
+    adapter = StreamAdapter(tts=fake_tts, look_ahead=2)
+
+    stream = adapter.stream()
+    stream.push_text(" ".join(SENTENCES))
+    stream.end_input()
+    await stream.__anext__()
+
+    requests = [fake_tts.synthesize_ch.recv_nowait() for _ in range(3)]
+    await asyncio.wait_for(stream.aclose(), timeout=1.0)
+    assert all(request.done for request in requests)
+
+    with pytest.raises(ValueError):
+        StreamAdapter(tts=fake_tts, look_ahead=-1)
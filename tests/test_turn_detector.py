@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from livekit.plugins.turn_detector.base import (
+    _decode_eou_request,
+    _encode_eou_request,
+    _EUORunnerBase,
+)
+
+
+class _FakeTokenizer:
+    pad_token_id = 1
+
+    def __init__(self) -> None:
+        self.tokenized: list[str] = []
+
+    def apply_chat_template(self, chat_ctx, **kwargs) -> str:
+        return "".join(
+            f"<|im_start|>{msg['role']}\n{msg['content']}<|im_end|>\n" for msg in chat_ctx
+        )
+
+    def __call__(self, texts: str | list[str], *, max_length: int | None = None, **kwargs) -> dict:
+        if isinstance(texts, str):
+            return {"input_ids": self([texts], max_length=max_length)["input_ids"][0]}
+
+        self.tokenized.extend(texts)
+        return {"input_ids": [[ord(c) for c in text][-(max_length or 0) :] for text in texts]}
+
+
+class _FakeInput:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class _FakeCausalSession:
+    """every output position only depends on the tokens before it, like a causal LM"""
+
+    def get_inputs(self) -> list[_FakeInput]:
+        return [_FakeInput("input_ids")]
+
+    def run(self, output_names, feeds: dict[str, np.ndarray]) -> list[np.ndarray]:
+        input_ids = feeds["input_ids"]
+        assert input_ids.dtype == np.int64
+        return [(np.cumsum(input_ids, axis=1) % 997 / 997.0)[..., None]]
+
+
+class _FakeLastTokenSession(_FakeCausalSession):
+    """only outputs the prediction at the last position of each row"""
+
+    def __init__(self) -> None:
+        self.batch_sizes: list[int] = []
+
+    def run(self, output_names, feeds: dict[str, np.ndarray]) -> list[np.ndarray]:
+        self.batch_sizes.append(len(feeds["input_ids"]))
+        return [super().run(output_names, feeds)[0][:, -1]]
+
+
+class _FakeRunner(_EUORunnerBase):
+    INFERENCE_METHOD = "test_fake_eou"
+
+    @classmethod
+    def model_type(cls):
+        return "en"
+
+    def initialize(self) -> None:
+        self._tokenizer = _FakeTokenizer()
+        self._session = _FakeCausalSession()
+        self._tokenizer_lock = threading.Lock()
+        self._pad_token_id = self._tokenizer.pad_token_id
+        self._use_attention_mask = False
+        self._tokenization_cache = OrderedDict()
+
+
+def _request(*contents: str) -> bytes:
+    roles = ["user", "assistant"]
+    chat_ctx = [{"role": roles[i % 2], "content": c} for i, c in enumerate(contents)]
+    return json.dumps({"chat_ctx": chat_ctx}).encode()
+
+
+def test_eou_batch_matches_single_inference():
+    runner = _FakeRunner()
+    runner.initialize()
+
+    requests = [
+        _request("hello"),
+        _request("hi, how can I help you today?", "I'd like to book a table for"),
+        _request("what's the weather", "it is sunny", "and tomorrow"),
+        _request("a" * 300),  # truncated to MAX_HISTORY_TOKENS
+    ]
+
+    single = [json.loads(runner.run(req)) for req in requests]
+    batched = [json.loads(res) for res in runner.run_batch(requests)]
+
+    assert [r["input"] for r in batched] == [r["input"] for r in single]
+    for b, s in zip(batched, single):
+        assert abs(b["eou_probability"] - s["eou_probability"]) < 1e-6
+
+
+def test_eou_batch_last_token_output():
+    runner = _FakeRunner()
+    runner.initialize()
+    session = runner._session = _FakeLastTokenSession()
+
+    requests = [
+        _request("hello"),
+        _request("hi, how can I help you today?", "I'd like to book a table for"),
+        _request("what's the weather", "it is sunny", "and tomorrow"),
+    ]
+    single = [json.loads(runner.run(req)) for req in requests]
+
+    # the padded batch can't be read, the rows are run one at a time
+    batched = [json.loads(res) for res in runner.run_batch(requests)]
+    for b, s in zip(batched, single):
+        assert abs(b["eou_probability"] - s["eou_probability"]) < 1e-6
+    assert not runner._per_position_output
+
+    # and the following batches aren't padded anymore
+    session.batch_sizes.clear()
+    runner.run_batch(requests)
+    assert session.batch_sizes == [1, 1, 1]
+
+
+def test_eou_tokenization_cache():
+    runner = _FakeRunner()
+    runner.initialize()
+
+    turns = ["hello there", "hi! how can I help?", "I want to", "sure, what do you want?", "a"]
+    for i in range(1, len(turns) + 1):
+        # the history window slides, older turns are dropped
+        start = max(0, i - 3)
+        chat_ctx = [
+            {"role": "user" if j % 2 == 0 else "assistant", "content": turns[j]}
+            for j in range(start, i)
+        ]
+        cached = runner.run(json.dumps({"chat_ctx": chat_ctx, "session_id": "s1"}).encode())
+        uncached = runner.run(json.dumps({"chat_ctx": chat_ctx}).encode())
+        cached, uncached = json.loads(cached), json.loads(uncached)
+        assert cached == {**uncached, "duration": cached["duration"]}
+
+    # only the new messages get tokenized when the session continues
+    runner._tokenizer.tokenized.clear()
+    chat_ctx = [
+        {"role": "user", "content": "a"},
+        {"role": "assistant", "content": "ok"},
+        {"role": "user", "content": "book a table"},
+    ]
+    runner.run(json.dumps({"chat_ctx": chat_ctx, "session_id": "s1"}).encode())
+    assert runner._tokenizer.tokenized == [
+        "<|im_start|>assistant\nok",
+        "<|im_start|>user\nbook a table",
+    ]
+
+
+def test_eou_binary_request_codec():
+    messages = [
+        {"role": "assistant", "content": "hello, how can I help?"},
+        {"role": "user", "content": "je voudrais réserver une table 🍽️"},
+    ]
+    data = _encode_eou_request(messages, "session_1")
+    assert len(data) < len(json.dumps({"chat_ctx": messages, "session_id": "session_1"}))
+    assert _decode_eou_request(data) == (messages, "session_1")
+    assert _decode_eou_request(_encode_eou_request(messages, None)) == (messages, None)
+
+    # JSON requests are still accepted
+    assert _decode_eou_request(json.dumps({"chat_ctx": messages}).encode()) == (messages, None)
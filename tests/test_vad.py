@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 from livekit.agents import vad
@@ -83,3 +85,30 @@ async def test_file_vad(sample_rate):
 
     assert start_of_speech_i > 0, "no start of speech detected"
     assert start_of_speech_i == end_of_speech_i, "start and end of speech mismatch"
+
+
+async def test_batched_vad():
+    frames, _ = await utils.make_test_speech(chunk_duration_ms=10, sample_rate=16000)
+
+    batched_vad = silero.VAD.load(
+        min_speech_duration=0.5,
+        min_silence_duration=0.75,
+        batch_inference=True,
+    )
+
+    async def _probabilities(stream: vad.VADStream, offset: int) -> list[float]:
+        for frame in frames[offset:]:
+            stream.push_frame(frame)
+        stream.end_input()
+
+        return [ev.probability async for ev in stream if ev.type == vad.VADEventType.INFERENCE_DONE]
+
+    # the streams start at different offsets so their states differ inside a batch
+    offsets = [0, 7, 31]
+    expected = [await _probabilities(VAD.stream(), offset) for offset in offsets]
+    results = await asyncio.gather(
+        *[_probabilities(batched_vad.stream(), offset) for offset in offsets]
+    )
+
+    for probs, expected_probs in zip(results, expected):
+        assert probs == pytest.approx(expected_probs, abs=1e-4)